@@ -9,7 +9,8 @@
 1. 自动识别时钟信号和时钟域
 2. 检测跨时钟域信号
 3. 生成完整的SGDC约束文件
-4. 支持交互式配置时钟属性
+4. 支持交互式配置时钟属性，或从时钟配置文件加载
+5. 批处理模式，一次解析为多个顶层模块生成SGDC文件
 
 作者：Auto SGDC Generator Team
 """
@@ -17,14 +18,18 @@
 import os
 import re
 import sys
+import json
+import time
 import argparse
 import logging
-from typing import List, Dict, Tuple, Set, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Set, Optional, Union, Any
 
 # 导入自定义模块
-from verilog_parser import VerilogParser
+from verilog_parser import VerilogParser, VerilogModule
 from cdc_analyzer import CDCAnalyzer
-from sgdc_generator import SGDCGenerator
+from sgdc_generator import SGDCGenerator, ClockConfig, load_clock_config
+from design_db import DesignDatabase
 from utils import setup_logger
 
 # 设置默认日志
@@ -40,143 +45,460 @@ def parse_arguments():
     parser.add_argument("-o", "--output", help="输出SGDC文件名 (默认为<top_module>.sgdc)")
     parser.add_argument("-t", "--top", help="顶层模块名称 (默认自动检测)")
     parser.add_argument("-i", "--include", nargs='+', help="包含的目录路径，用于查找其他模块文件")
-    parser.add_argument("-c", "--clock-file", help="时钟配置文件路径，用于预设时钟属性")
+    parser.add_argument("-c", "--clock-file", help="时钟配置文件路径(JSON)，文件中给出的时钟不再交互询问")
     parser.add_argument("-n", "--non-interactive", action="store_true", help="非交互模式，使用默认时钟周期")
     parser.add_argument("-s", "--skip-cdc", action="store_true", help="跳过CDC检测分析")
     parser.add_argument("-r", "--report", action="store_true", help="生成详细分析报告")
     parser.add_argument("-v", "--verbose", action="store_true", help="显示详细日志")
+    parser.add_argument("--mmap", action="store_true", help="通过内存映射读取文件，只解码模块内容，用于大型ASCII RTL")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="并行进程数，用于解析文件和批处理模式中的各顶层模块，0表示使用全部CPU核心")
+    parser.add_argument("--db", help="设计数据库文件(SQLite)，未变化的文件和分析结果直接从数据库载入")
+    parser.add_argument("-z", "--gzip", action="store_true",
+                        help="以gzip压缩输出SGDC文件，文件名补上.gz后缀（输出文件名以.gz结尾时总是压缩）")
+    parser.add_argument("--batch", metavar="MANIFEST",
+                        help="批处理清单(JSON)，每项给出top、clock_file和output，共享一次解析结果生成多个SGDC文件")
     return parser.parse_args()
 
+def find_top_module(modules: Dict[str, VerilogModule], top: Optional[str] = None) -> Optional[VerilogModule]:
+    """
+    确定顶层模块
+
+    参数:
+        modules: 模块字典
+        top: 用户指定的顶层模块名，None表示自动检测
+
+    返回:
+        顶层模块对象，指定的模块不存在时返回None
+    """
+    if top:
+        # 用户指定顶层模块
+        if top in modules:
+            logger.info(f"使用用户指定的顶层模块: {top}")
+            return modules[top]
+        logger.error(f"指定的顶层模块 {top} 未找到！")
+        return None
+
+    # 自动推断顶层模块
+    top_candidates = [m for name, m in modules.items() if not m.is_instantiated]
+    if len(top_candidates) == 1:
+        top_module = top_candidates[0]
+        logger.info(f"自动检测到顶层模块: {top_module.name}")
+    elif len(top_candidates) > 1:
+        # 多个候选，选择最复杂的一个作为顶层
+        top_module = max(top_candidates, key=lambda m: len(m.instances))
+        logger.warning(f"检测到多个可能的顶层模块，选择最复杂的一个: {top_module.name}")
+    else:
+        # 如果所有模块都被实例化，选择包含最多实例的模块作为顶层
+        top_module = max(modules.values(), key=lambda m: len(m.instances))
+        logger.warning(f"未检测到明确的顶层模块，选择包含最多实例的模块: {top_module.name}")
+    return top_module
+
+def analyze_top(modules: Dict[str, VerilogModule], top_module: VerilogModule,
+                skip_cdc: bool = False) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    识别顶层模块的时钟信号并进行CDC分析
+
+    参数:
+        modules: 模块字典
+        top_module: 顶层模块对象
+        skip_cdc: 是否跳过CDC分析
+
+    返回:
+        (时钟信号列表, CDC信号字典)
+    """
+    # 检测时钟信号
+    logger.info(f"正在识别 {top_module.name} 的时钟信号...")
+    clock_signals = top_module.identify_clock_signals()
+
+    if not clock_signals:
+        logger.warning("未检测到时钟信号！请检查信号命名或手动添加时钟约束。")
+    else:
+        logger.info(f"检测到 {len(clock_signals)} 个时钟信号: {', '.join(clock_signals)}")
+
+    # CDC分析
+    cdc_signals = {}
+    if not skip_cdc and len(clock_signals) > 1:
+        logger.info("开始CDC分析...")
+        analyzer = CDCAnalyzer(modules, top_module.name)
+        cdc_signals = analyzer.detect_cdc()
+
+        if cdc_signals:
+            logger.info(f"检测到 {sum(len(signals) for signals in cdc_signals.values())} 个可能的跨时钟域信号")
+            for path, signals in cdc_signals.items():
+                logger.debug(f"  {path}: {', '.join(signals)}")
+        else:
+            logger.info("未检测到跨时钟域信号")
+    elif skip_cdc:
+        logger.info("已跳过CDC分析")
+    elif len(clock_signals) <= 1:
+        logger.info("只有一个时钟域，跳过CDC分析")
+
+    return clock_signals, cdc_signals
+
+def parse_design(args, database: Optional[DesignDatabase] = None) -> Dict[str, VerilogModule]:
+    """
+    解析所有Verilog文件
+
+    参数:
+        args: 命令行参数
+        database: 可选的设计数据库，未变化的文件直接从数据库载入
+
+    返回:
+        模块字典
+    """
+    parser = VerilogParser(args.verilog_files, include_dirs=args.include, use_mmap=args.mmap,
+                           jobs=args.jobs, database=database)
+    modules = parser.parse_all()
+    logger.info(parser.throughput())
+    if not modules:
+        logger.error("未能成功解析任何模块！")
+    return modules
+
+def analyze_design(args, database: Optional[DesignDatabase] = None):
+    """
+    解析Verilog文件，确定顶层模块，识别时钟信号并进行CDC分析
+
+    参数:
+        args: 命令行参数
+        database: 可选的设计数据库，未变化的文件直接从数据库载入
+
+    返回:
+        (顶层模块, 时钟信号列表, CDC信号字典)，失败时返回None
+    """
+    modules = parse_design(args, database)
+    if not modules:
+        return None
+
+    top_module = find_top_module(modules, args.top)
+    if top_module is None:
+        return None
+
+    clock_signals, cdc_signals = analyze_top(modules, top_module, args.skip_cdc)
+    return top_module, clock_signals, cdc_signals
+
+def load_design(args, database: Optional[DesignDatabase] = None):
+    """
+    获取设计分析结果：源文件都未变化且数据库中有相同选项的分析结果时直接载入，否则调用analyze_design()并保存
+
+    参数:
+        args: 命令行参数
+        database: 可选的设计数据库
+
+    返回:
+        (顶层模块, 时钟信号列表, CDC信号字典)，失败时返回None
+    """
+    if database is None:
+        return analyze_design(args)
+
+    options = {'skip_cdc': args.skip_cdc}
+    key = database.analysis_key(args.verilog_files, args.top, options)
+    cached = database.load_analysis(key) if key is not None else None
+    if cached is not None:
+        top_data, clock_signals, cdc_signals = cached
+        top_module = VerilogModule.from_compact(top_data)
+        logger.info(f"源文件未变化，从设计数据库载入顶层模块 {top_module.name} 的分析结果")
+        logger.info(f"时钟信号: {', '.join(clock_signals) or '无'}, "
+                    f"跨时钟域信号: {sum(len(signals) for signals in cdc_signals.values())} 个")
+        return top_module, clock_signals, cdc_signals
+
+    design = analyze_design(args, database)
+    if design is not None:
+        top_module, clock_signals, cdc_signals = design
+        key = database.analysis_key(args.verilog_files, args.top, options)
+        if key is not None:
+            database.store_analysis(key, top_module.name, (top_module.to_compact(), clock_signals, cdc_signals))
+    return design
+
+def load_clock_file(clock_file: Optional[str]) -> Dict[str, ClockConfig]:
+    """
+    加载时钟配置文件
+
+    参数:
+        clock_file: 时钟配置文件路径，None表示不使用
+
+    返回:
+        字典，键为时钟名，值为时钟配置对象；文件不存在或格式无效时抛出ValueError
+    """
+    if not clock_file:
+        return {}
+    if not os.path.isfile(clock_file):
+        raise ValueError(f"找不到时钟配置文件: {clock_file}")
+    clock_config = load_clock_config(clock_file)
+    logger.info(f"从配置文件 {clock_file} 加载了 {len(clock_config)} 个时钟的属性")
+    return clock_config
+
+def write_sgdc(top_module: VerilogModule, clock_signals: List[str], cdc_signals: Dict[str, List[str]],
+               clock_config: Dict[str, ClockConfig], output_file: str, interactive: bool = False,
+               report_file: Optional[str] = None, compress: bool = False) -> None:
+    """
+    生成并写入SGDC约束文件，以及可选的分析报告
+
+    参数:
+        top_module: 顶层模块对象
+        clock_signals: 时钟信号列表
+        cdc_signals: CDC信号字典
+        clock_config: 时钟配置，其中的时钟不再交互询问或按默认规则配置
+        output_file: 输出SGDC文件路径
+        interactive: 是否交互式配置其余时钟，否则使用默认配置
+        report_file: 分析报告路径，None表示不生成
+        compress: 是否以gzip压缩SGDC文件，文件名不以.gz结尾时补上后缀
+    """
+    sgdc_gen = SGDCGenerator(
+        top_module=top_module,
+        clock_signals=clock_signals,
+        cdc_signals=cdc_signals,
+        clock_config=clock_config
+    )
+
+    # 设置时钟属性
+    if interactive:
+        sgdc_gen.configure_clocks_interactive()
+    else:
+        sgdc_gen.configure_clocks_default()
+
+    # 逐批写入文件
+    if compress and not output_file.endswith('.gz'):
+        output_file += '.gz'
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    sgdc_gen.write_sgdc(output_file)
+    logger.info(f"SGDC约束文件已生成: {output_file}")
+
+    # 生成报告
+    if report_file:
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(sgdc_gen.generate_report())
+        logger.info(f"CDC分析报告已生成: {report_file}")
+
+def load_manifest(manifest_file: str) -> List[Dict[str, Optional[str]]]:
+    """
+    加载批处理清单
+
+    清单为JSON列表，每项包含top（必需）、clock_file和output（默认<top>.sgdc），
+    相对路径相对于清单文件所在目录
+
+    参数:
+        manifest_file: 清单文件路径
+
+    返回:
+        清单项列表，路径已解析；格式无效时抛出ValueError
+    """
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"批处理清单 {manifest_file} 不是有效的JSON: {str(e)}")
+    if not isinstance(data, list):
+        raise ValueError(f"批处理清单 {manifest_file} 的顶层必须是列表")
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_file))
+    entries = []
+    outputs = set()
+    for index, item in enumerate(data):
+        if not isinstance(item, dict) or not item.get('top'):
+            raise ValueError(f"批处理清单 {manifest_file} 第 {index + 1} 项缺少top")
+        top = item['top']
+        clock_file = item.get('clock_file')
+        output = item.get('output') or f"{top}.sgdc"
+        entry = {
+            'top': top,
+            'clock_file': os.path.join(base_dir, clock_file) if clock_file else None,
+            'output': os.path.join(base_dir, output),
+        }
+        if entry['output'] in outputs:
+            raise ValueError(f"批处理清单 {manifest_file} 中输出文件重复: {output}")
+        outputs.add(entry['output'])
+        entries.append(entry)
+    return entries
+
+def run_batch_entry(entry: Dict[str, Optional[str]], design: Optional[tuple], modules: Dict[str, VerilogModule],
+                    skip_cdc: bool = False, report: bool = False) -> Tuple[Optional[tuple], Optional[str], float]:
+    """
+    为批处理清单中的一项生成SGDC文件
+
+    参数:
+        entry: 清单项
+        design: 数据库中的分析结果 (顶层模块紧凑形式, 时钟信号列表, CDC信号字典)，None表示需要分析
+        modules: 模块字典，design为None时使用
+        skip_cdc: 是否跳过CDC分析
+        report: 是否在输出文件旁生成分析报告
+
+    返回:
+        (分析结果, 错误信息, 用时秒数)，成功时错误信息为None
+    """
+    start = time.perf_counter()
+    try:
+        if design is None:
+            top_module = modules.get(entry['top'])
+            if top_module is None:
+                return None, f"顶层模块 {entry['top']} 未找到", time.perf_counter() - start
+            clock_signals, cdc_signals = analyze_top(modules, top_module, skip_cdc)
+            design = (top_module.to_compact(), clock_signals, cdc_signals)
+
+        top_data, clock_signals, cdc_signals = design
+        report_file = None
+        if report:
+            report_file = os.path.join(os.path.dirname(entry['output']), f"{entry['top']}_cdc_report.txt")
+        write_sgdc(VerilogModule.from_compact(top_data), clock_signals, cdc_signals,
+                   load_clock_file(entry['clock_file']), entry['output'], report_file=report_file)
+        return design, None, time.perf_counter() - start
+    except Exception as e:
+        return design, str(e), time.perf_counter() - start
+
+# 批处理工作进程中的模块字典，由_init_batch_worker()在进程启动时设置一次
+_BATCH_MODULES = {}
+
+def _init_batch_worker(records: List[Tuple[tuple, Optional[Dict[str, Set[str]]]]], level: int) -> None:
+    """批处理工作进程初始化：重建模块字典（包括已计算的时钟域划分），各顶层模块的任务共享"""
+    logger.setLevel(level)
+    for data, clock_domains in records:
+        module = VerilogModule.from_compact(data)
+        module.clock_domain_cache = clock_domains
+        _BATCH_MODULES[module.name] = module
+
+def _run_batch_entry_worker(task: tuple) -> Tuple[Optional[tuple], Optional[str], float]:
+    """在工作进程中执行run_batch_entry()"""
+    entry, design, skip_cdc, report = task
+    return run_batch_entry(entry, design, _BATCH_MODULES, skip_cdc, report)
+
+def run_batch(args, database: Optional[DesignDatabase] = None) -> int:
+    """
+    批处理模式：解析一次设计，为清单中的每个顶层模块生成SGDC文件
+
+    使用设计数据库时，分析结果已在数据库中的顶层模块不需要解析和CDC分析，全部命中时不解析任何文件；
+    jobs大于1时各顶层模块在进程池中并行处理，模块字典在每个工作进程启动时传递一次
+
+    参数:
+        args: 命令行参数
+        database: 可选的设计数据库
+
+    返回:
+        退出码，有任一项失败时为1
+    """
+    start = time.perf_counter()
+    entries = load_manifest(args.batch)
+    if args.top or args.output or args.clock_file:
+        logger.warning("批处理模式下忽略 -t/-o/-c，使用清单中的设置")
+    logger.info(f"批处理清单 {args.batch}: {len(entries)} 个顶层模块")
+    if args.gzip:
+        for entry in entries:
+            if not entry['output'].endswith('.gz'):
+                entry['output'] += '.gz'
+
+    # 先从数据库查找分析结果，只有未命中的顶层模块需要解析后的设计
+    options = {'skip_cdc': args.skip_cdc}
+    designs = [None] * len(entries)
+    if database is not None:
+        for index, entry in enumerate(entries):
+            key = database.analysis_key(args.verilog_files, entry['top'], options)
+            if key is not None:
+                designs[index] = database.load_analysis(key)
+    pending = sum(1 for design in designs if design is None)
+
+    modules = {}
+    if pending:
+        modules = parse_design(args, database)
+        if not modules:
+            return 1
+
+    tasks = [(entry, design, args.skip_cdc, args.report) for entry, design in zip(entries, designs)]
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    jobs = max(1, min(jobs, pending))
+    if jobs > 1:
+        records = [(module.to_compact(), module.clock_domain_cache) for module in modules.values()]
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker,
+                                 initargs=(records, logger.level)) as executor:
+            results = list(executor.map(_run_batch_entry_worker, tasks))
+    else:
+        results = [run_batch_entry(entry, design, modules, skip_cdc, report)
+                   for entry, design, skip_cdc, report in tasks]
+
+    failures = 0
+    for entry, cached, (design, error, seconds) in zip(entries, designs, results):
+        if error is not None:
+            failures += 1
+            logger.error(f"顶层模块 {entry['top']} 处理失败: {error}")
+            continue
+        source = "数据库" if cached is not None else "分析"
+        logger.info(f"  {entry['top']} -> {entry['output']} ({source}, {seconds:.2f} 秒)")
+        if database is not None and cached is None:
+            key = database.analysis_key(args.verilog_files, entry['top'], options)
+            if key is not None:
+                database.store_analysis(key, entry['top'], design)
+
+    if database is not None:
+        logger.info(database.summary())
+    logger.info(f"批处理完成: {len(entries) - failures} 个成功, {failures} 个失败, "
+                f"其中 {len(entries) - pending} 个分析结果来自数据库, "
+                f"总用时 {time.perf_counter() - start:.2f} 秒 ({jobs} 进程)")
+    return 1 if failures else 0
+
 def main():
     """主函数"""
     # 解析命令行参数
     args = parse_arguments()
-    
+
     # 设置日志级别
     if args.verbose:
         logger.setLevel(logging.DEBUG)
-    
+
+    database = None
     try:
         # 检查文件存在
         for vfile in args.verilog_files:
             if not os.path.exists(vfile):
                 logger.error(f"找不到文件: {vfile}")
                 return 1
-        
+
         logger.info(f"开始处理 {len(args.verilog_files)} 个Verilog文件...")
-        
-        # 解析所有Verilog文件
-        parser = VerilogParser(args.verilog_files, include_dirs=args.include)
-        modules = parser.parse_all()
-        
-        if not modules:
-            logger.error("未能成功解析任何模块！")
+        if args.db:
+            database = DesignDatabase(args.db, include_dirs=args.include)
+
+        # 批处理模式
+        if args.batch:
+            return run_batch(args, database)
+
+        # 加载时钟配置，在解析前检查以便尽早报告格式错误
+        clock_config = load_clock_file(args.clock_file)
+
+        # 解析和分析设计，使用设计数据库时未变化的部分直接载入
+        start = time.perf_counter()
+        design = load_design(args, database)
+        if design is None:
             return 1
-        
-        # 确定顶层模块
-        top_module = None
-        if args.top:
-            # 用户指定顶层模块
-            if args.top in modules:
-                top_module = modules[args.top]
-                logger.info(f"使用用户指定的顶层模块: {args.top}")
-            else:
-                logger.error(f"指定的顶层模块 {args.top} 未找到！")
-                return 1
-        else:
-            # 自动推断顶层模块
-            top_candidates = [m for name, m in modules.items() if not m.is_instantiated]
-            if len(top_candidates) == 1:
-                top_module = top_candidates[0]
-                logger.info(f"自动检测到顶层模块: {top_module.name}")
-            elif len(top_candidates) > 1:
-                # 多个候选，选择最复杂的一个作为顶层
-                top_module = max(top_candidates, key=lambda m: len(m.instances))
-                logger.warning(f"检测到多个可能的顶层模块，选择最复杂的一个: {top_module.name}")
-            else:
-                # 如果所有模块都被实例化，选择包含最多实例的模块作为顶层
-                top_module = max(modules.values(), key=lambda m: len(m.instances))
-                logger.warning(f"未检测到明确的顶层模块，选择包含最多实例的模块: {top_module.name}")
-        
-        # 检测时钟信号
-        logger.info("正在识别时钟信号...")
-        clock_signals = top_module.identify_clock_signals()
-        
-        if not clock_signals:
-            logger.warning("未检测到时钟信号！请检查信号命名或手动添加时钟约束。")
-        else:
-            logger.info(f"检测到 {len(clock_signals)} 个时钟信号: {', '.join(clock_signals)}")
-        
-        # 加载时钟配置
-        clock_config = {}
-        if args.clock_file and os.path.exists(args.clock_file):
-            logger.info(f"从配置文件加载时钟属性: {args.clock_file}")
-            # TODO: 实现时钟配置文件加载
-        
-        # CDC分析
-        cdc_signals = {}
-        if not args.skip_cdc and len(clock_signals) > 1:
-            logger.info("开始CDC分析...")
-            analyzer = CDCAnalyzer(modules, top_module.name)
-            cdc_signals = analyzer.detect_cdc()
-            
-            if cdc_signals:
-                logger.info(f"检测到 {sum(len(signals) for signals in cdc_signals.values())} 个可能的跨时钟域信号")
-                for path, signals in cdc_signals.items():
-                    logger.debug(f"  {path}: {', '.join(signals)}")
-            else:
-                logger.info("未检测到跨时钟域信号")
-        elif args.skip_cdc:
-            logger.info("已跳过CDC分析")
-        elif len(clock_signals) <= 1:
-            logger.info("只有一个时钟域，跳过CDC分析")
-        
+        top_module, clock_signals, cdc_signals = design
+        analysis_seconds = time.perf_counter() - start
+
         # 生成SGDC文件
         logger.info("正在生成SGDC约束文件...")
-        sgdc_gen = SGDCGenerator(
-            top_module=top_module,
-            clock_signals=clock_signals,
-            cdc_signals=cdc_signals,
-            clock_config=clock_config
-        )
-        
-        # 设置时钟属性
-        if not args.non_interactive:
-            sgdc_gen.configure_clocks_interactive()
-        else:
-            sgdc_gen.configure_clocks_default()
-        
-        # 生成SGDC内容
-        sgdc_content = sgdc_gen.generate_sgdc()
-        
-        # 确定输出文件名
-        if args.output:
-            output_file = args.output
+        start = time.perf_counter()
+        output_file = args.output or f"{top_module.name}.sgdc"
+        report_file = f"{top_module.name}_cdc_report.txt" if args.report else None
+        write_sgdc(top_module, clock_signals, cdc_signals, clock_config, output_file,
+                   interactive=not args.non_interactive, report_file=report_file, compress=args.gzip)
+
+        # 报告各阶段用时，使用设计数据库时区分冷启动和热启动
+        generate_seconds = time.perf_counter() - start
+        if database is not None:
+            logger.info(database.summary())
+            mode = "热启动" if database.stats['analysis_hits'] else "冷启动"
+            logger.info(f"用时({mode}): 设计解析和分析 {analysis_seconds:.2f} 秒, SGDC生成 {generate_seconds:.2f} 秒")
         else:
-            output_file = f"{top_module.name}.sgdc"
-        
-        # 写入文件
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(sgdc_content)
-        
-        logger.info(f"SGDC约束文件已生成: {output_file}")
-        
-        # 生成报告
-        if args.report:
-            report_file = f"{top_module.name}_cdc_report.txt"
-            logger.info(f"生成CDC分析报告: {report_file}")
-            with open(report_file, 'w', encoding='utf-8') as f:
-                f.write(sgdc_gen.generate_report())
-            logger.info(f"CDC分析报告已生成: {report_file}")
-        
+            logger.info(f"用时: 设计解析和分析 {analysis_seconds:.2f} 秒, SGDC生成 {generate_seconds:.2f} 秒")
+
         return 0
-        
+
     except Exception as e:
         logger.error(f"处理过程中发生错误: {str(e)}")
         if args.verbose:
             import traceback
             logger.debug(traceback.format_exc())
         return 1
+    finally:
+        if database is not None:
+            database.close()
 
 if __name__ == "__main__":
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
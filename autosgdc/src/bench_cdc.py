@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CDC检测基准测试 - 在合成的多时钟设计上测量跨时钟域检测的耗时
+
+合成设计包含若干时钟域，每个时钟域的寄存器串成链，每隔若干个寄存器从上一个时钟域取一个输入，
+其中一部分输入经过2FF同步链。分别测量解析、时钟域划分、基于扇入图的CDC检测和沿同步链的同步器识别的耗时；
+较小的规模上同时运行原有的逐对正则扫描（源信号 × 目标信号 × 模块内容）和按名称在目标时钟域中
+查找同步器的扫描（跨时钟域信号 × 目标时钟域信号）作为对照，并检查结果一致。
+另在同一叶子模块被实例化多次的宽顶层设计上，对比按模块定义缓存的层次遍历与原有的逐实例时钟域划分
+
+用法:
+    python bench_cdc.py
+    python bench_cdc.py --flops 10000 20000 50000 --clocks 4
+    python bench_cdc.py --legacy-max 0
+    python bench_cdc.py --sync-every 0
+    python bench_cdc.py --flops 1000 --instances 500 2000 5000
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+from typing import List, Dict, Any
+
+from verilog_parser import VerilogParser, VerilogModule
+from cdc_analyzer import CDCAnalyzer
+from utils import is_synchronizer
+
+
+def generate_design(num_flops: int, num_clocks: int = 2, cross_every: int = 8, block_size: int = 64,
+                    sync_every: int = 4) -> str:
+    """
+    生成合成的多时钟设计
+
+    参数:
+        num_flops: 寄存器总数，平均分配到各时钟域
+        num_clocks: 时钟数量
+        cross_every: 每隔多少个寄存器从上一个时钟域取一个输入
+        block_size: 每个always块中的寄存器数
+        sync_every: 每隔多少个跨时钟域输入有一个经过2FF同步链（源信号名加_sync1、_sync2），0表示没有
+
+    返回:
+        Verilog源代码
+    """
+    per_clock = max(1, num_flops // num_clocks)
+    lines = ["module cdc_bench ("]
+    lines.extend(f"    input wire clk{clock}," for clock in range(num_clocks))
+    lines.append("    input wire din")
+    lines.append(");")
+    crossings = [index for index in range(per_clock) if index % cross_every == cross_every - 1]
+    synced = set(crossings[::sync_every]) if sync_every > 0 else set()
+    for clock in range(num_clocks):
+        src_clock = (clock - 1) % num_clocks
+        for index in range(per_clock):
+            lines.append(f"    reg c{clock}_r{index};")
+            if index in synced:
+                lines.append(f"    reg c{src_clock}_r{index}_sync1, c{src_clock}_r{index}_sync2;")
+    for clock in range(num_clocks):
+        src_clock = (clock - 1) % num_clocks
+        for block in range(0, per_clock, block_size):
+            lines.append(f"    always @(posedge clk{clock}) begin")
+            for index in range(block, min(block + block_size, per_clock)):
+                rhs = f"c{clock}_r{index - 1}" if index else "din"
+                source = f"c{src_clock}_r{index}"
+                if index in synced:
+                    lines.append(f"        {source}_sync1 <= {source};")
+                    lines.append(f"        {source}_sync2 <= {source}_sync1;")
+                    rhs += f" ^ {source}_sync2"
+                elif index % cross_every == cross_every - 1:
+                    rhs += f" ^ {source}"
+                lines.append(f"        c{clock}_r{index} <= {rhs};")
+            lines.append("    end")
+    lines.append("endmodule")
+    return "\n".join(lines) + "\n"
+
+
+def generate_hierarchy(num_instances: int, leaf_flops: int = 64) -> str:
+    """
+    生成宽顶层设计：同一个叶子模块被实例化多次，相邻实例交替使用两个时钟并首尾相连
+
+    参数:
+        num_instances: 实例数量
+        leaf_flops: 叶子模块中的寄存器数
+
+    返回:
+        Verilog源代码
+    """
+    lines = ["module cdc_leaf (", "    input wire clk,", "    input wire d,", "    output wire q", ");"]
+    lines.extend(f"    reg r{index};" for index in range(leaf_flops))
+    lines.append("    always @(posedge clk) begin")
+    for index in range(leaf_flops):
+        lines.append(f"        r{index} <= {f'r{index - 1}' if index else 'd'};")
+    lines.append("    end")
+    lines.append(f"    assign q = r{leaf_flops - 1};")
+    lines.append("endmodule")
+    lines.extend(["module cdc_soc (", "    input wire clk_a,", "    input wire clk_b,", "    input wire din", ");"])
+    lines.extend(f"    wire link{index};" for index in range(num_instances))
+    for index in range(num_instances):
+        clock = 'clk_a' if index % 2 == 0 else 'clk_b'
+        source = f"link{index - 1}" if index else "din"
+        lines.append(f"    cdc_leaf u{index} (.clk({clock}), .d({source}), .q(link{index}));")
+    lines.append("endmodule")
+    return "\n".join(lines) + "\n"
+
+
+def legacy_clock_domains(analyzer: CDCAnalyzer, module: VerilogModule) -> int:
+    """
+    原有的层次遍历：每个实例都重新划分时钟域，只按时钟名合并，仅用于对照
+
+    参数:
+        analyzer: 已初始化时钟域的CDC分析器
+        module: 当前模块
+
+    返回:
+        划分时钟域的次数
+    """
+    count = 1
+    for clock, signals in module.extract_clock_domains().items():
+        if clock in analyzer.clock_domains:
+            for signal in signals:
+                analyzer.clock_domains[clock].add(f"{module.name}.{signal}")
+    for instance in module.instances:
+        if instance.module_name in analyzer.modules:
+            count += legacy_clock_domains(analyzer, analyzer.modules[instance.module_name])
+    return count
+
+
+def legacy_cdc_signals(analyzer: CDCAnalyzer) -> Dict[str, List[str]]:
+    """
+    原有的逐对检测：对每对源、目标信号构造正则表达式并扫描模块内容，仅用于对照
+
+    参数:
+        analyzer: 已构建时钟域的CDC分析器
+
+    返回:
+        字典，键为"src_clk->dst_clk"，值为跨时钟域信号列表
+    """
+    result = {}
+    for src_clock, src_signals in analyzer.clock_domains.items():
+        for dst_clock, dst_signals in analyzer.clock_domains.items():
+            if src_clock == dst_clock:
+                continue
+            signals = result.setdefault(f"{src_clock}->{dst_clock}", [])
+            for src_module_signal in src_signals:
+                src_module, src_signal = src_module_signal.split('.', 1)
+                for dst_module_signal in dst_signals:
+                    dst_module, dst_signal = dst_module_signal.split('.', 1)
+                    if src_module != dst_module or src_module not in analyzer.modules:
+                        continue
+                    pattern = fr'{dst_signal}\s*(?:=|<=)\s*[^;]*\b{src_signal}\b'
+                    if re.search(pattern, analyzer.modules[src_module].content) and src_signal not in signals:
+                        signals.append(src_signal)
+    return result
+
+
+def legacy_synchronizers(analyzer: CDCAnalyzer, cdc_signals: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    原有的同步器识别：按命名模式在目标时钟域的全部信号中查找同步链，仅用于对照
+
+    参数:
+        analyzer: 已构建时钟域的CDC分析器
+        cdc_signals: 同步器识别前的跨时钟域信号
+
+    返回:
+        字典，键为目标时钟，值为被同步的信号列表
+    """
+    content = analyzer.top_module.content
+    result = {}
+    for cdc_path, signals in cdc_signals.items():
+        dst_clock = cdc_path.split('->')[1]
+        for signal in signals:
+            candidates = sorted(
+                name for name in (node.split('.', 1)[1] for node in analyzer.clock_domains.get(dst_clock, ()))
+                if name.startswith(f"{signal}_sync") or name == f"{signal}_meta"
+                or (name.startswith(signal) and name.endswith("_sync"))
+            )
+            if len(candidates) >= 2 and is_synchronizer(candidates, content):
+                result.setdefault(dst_clock, []).append(signal)
+    return result
+
+
+def run_benchmark(num_flops: int, num_clocks: int, cross_every: int, sync_every: int,
+                  legacy: bool) -> Dict[str, Any]:
+    """
+    在一个规模上测量各阶段耗时
+
+    参数:
+        num_flops: 寄存器总数
+        num_clocks: 时钟数量
+        cross_every: 跨时钟域输入的间隔
+        sync_every: 经过同步链的跨时钟域输入的间隔
+        legacy: 是否同时运行原有的逐对检测和按名称的同步器识别
+
+    返回:
+        结果字典
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'cdc_bench.v')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(generate_design(num_flops, num_clocks, cross_every, sync_every=sync_every))
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        modules = VerilogParser(path).parse_all()
+        parse_seconds = time.perf_counter() - start
+
+    analyzer = CDCAnalyzer(modules, 'cdc_bench')
+    start = time.perf_counter()
+    analyzer._build_clock_domains(analyzer.top_module.identify_clock_signals())
+    domain_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    analyzer._detect_cdc_signals()
+    graph_seconds = time.perf_counter() - start
+    unsynchronized = {key: list(signals) for key, signals in analyzer.cdc_signals.items()}
+    start = time.perf_counter()
+    analyzer._identify_synchronizers()
+    sync_seconds = time.perf_counter() - start
+
+    result = {
+        'flops': sum(len(signals) for signals in analyzer.clock_domains.values()),
+        'bytes': size,
+        'edges': analyzer.graph.edge_count,
+        'cdc_signals': sum(len(signals) for signals in unsynchronized.values()),
+        'synchronizers': sum(len(syncs) for syncs in analyzer.synchronizers.values()),
+        'parse_seconds': round(parse_seconds, 4),
+        'domain_seconds': round(domain_seconds, 4),
+        'graph_seconds': round(graph_seconds, 4),
+        'sync_seconds': round(sync_seconds, 4),
+        'legacy_seconds': None,
+        'legacy_sync_seconds': None,
+        'match': None,
+    }
+    if legacy:
+        start = time.perf_counter()
+        expected = legacy_cdc_signals(analyzer)
+        result['legacy_seconds'] = round(time.perf_counter() - start, 4)
+        start = time.perf_counter()
+        expected_syncs = legacy_synchronizers(analyzer, unsynchronized)
+        result['legacy_sync_seconds'] = round(time.perf_counter() - start, 4)
+        synchronized = {clock: sorted(syncs) for clock, syncs in analyzer.synchronizers.items()}
+        result['match'] = ({key: sorted(signals) for key, signals in expected.items()} == unsynchronized
+                           and {clock: sorted(signals) for clock, signals in expected_syncs.items()} == synchronized)
+    return result
+
+
+def run_hierarchy_benchmark(num_instances: int, leaf_flops: int, legacy: bool) -> Dict[str, Any]:
+    """
+    在宽顶层设计上测量层次遍历和CDC检测的耗时
+
+    参数:
+        num_instances: 实例数量
+        leaf_flops: 叶子模块中的寄存器数
+        legacy: 是否同时运行原有的逐实例时钟域划分
+
+    返回:
+        结果字典
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'cdc_soc.v')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(generate_hierarchy(num_instances, leaf_flops))
+        modules = VerilogParser(path).parse_all()
+
+    clocks = modules['cdc_soc'].identify_clock_signals()
+    analyzer = CDCAnalyzer(modules, 'cdc_soc')
+    start = time.perf_counter()
+    analyzer._build_clock_domains(clocks)
+    domain_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    analyzer._detect_cdc_signals()
+    graph_seconds = time.perf_counter() - start
+
+    result = {
+        'instances': num_instances,
+        'flops': sum(len(signals) for signals in analyzer.clock_domains.values()),
+        'cdc_signals': sum(len(signals) for signals in analyzer.cdc_signals.values()),
+        'definitions': len(analyzer._visited_definitions),
+        'domain_seconds': round(domain_seconds, 4),
+        'graph_seconds': round(graph_seconds, 4),
+        'legacy_analyses': None,
+        'legacy_seconds': None,
+    }
+    if legacy:
+        reference = CDCAnalyzer(modules, 'cdc_soc')
+        reference.clock_domains = {clock: set() for clock in clocks}
+        start = time.perf_counter()
+        result['legacy_analyses'] = legacy_clock_domains(reference, reference.top_module)
+        result['legacy_seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def main() -> int:
+    """基准测试入口，结果不一致时返回1"""
+    arg_parser = argparse.ArgumentParser(description='CDC检测基准测试')
+    arg_parser.add_argument('--flops', type=int, nargs='+', default=[250, 500, 10000, 20000],
+                            help='合成设计的寄存器总数')
+    arg_parser.add_argument('--clocks', type=int, default=2, help='时钟数量')
+    arg_parser.add_argument('--cross-every', type=int, default=8, help='每隔多少个寄存器有一个跨时钟域输入')
+    arg_parser.add_argument('--sync-every', type=int, default=4,
+                            help='每隔多少个跨时钟域输入有一个经过2FF同步链，0表示没有')
+    arg_parser.add_argument('--legacy-max', type=int, default=500,
+                            help='运行原有逐对检测和按名称的同步器识别作为对照的最大寄存器数，0表示不运行')
+    arg_parser.add_argument('--instances', type=int, nargs='*', default=[100, 500, 2000],
+                            help='宽顶层设计的实例数量，不指定数值时跳过层次测试')
+    arg_parser.add_argument('--leaf-flops', type=int, default=64, help='宽顶层设计中叶子模块的寄存器数')
+    arg_parser.add_argument('--json', type=str, help='将结果写入JSON文件')
+    options = arg_parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = []
+    print(f"{'寄存器':>10}{'边':>10}{'CDC信号':>10}{'同步器':>8}{'解析(s)':>10}{'时钟域(s)':>12}{'扇入图(s)':>12}"
+          f"{'同步链(s)':>12}{'逐对(s)':>10}{'按名称(s)':>12}  一致")
+    for num_flops in sorted(options.flops):
+        result = run_benchmark(num_flops, options.clocks, options.cross_every, options.sync_every,
+                               num_flops <= options.legacy_max)
+        results.append(result)
+        legacy = '-' if result['legacy_seconds'] is None else f"{result['legacy_seconds']:.4f}"
+        legacy_sync = '-' if result['legacy_sync_seconds'] is None else f"{result['legacy_sync_seconds']:.4f}"
+        match = '-' if result['match'] is None else ('是' if result['match'] else '否')
+        print(f"{result['flops']:>10}{result['edges']:>10}{result['cdc_signals']:>10}{result['synchronizers']:>8}"
+              f"{result['parse_seconds']:>10.4f}{result['domain_seconds']:>12.4f}"
+              f"{result['graph_seconds']:>12.4f}{result['sync_seconds']:>12.4f}{legacy:>10}{legacy_sync:>12}  {match}")
+
+    hierarchy_results = []
+    if options.instances:
+        print(f"\n{'实例':>10}{'寄存器':>10}{'CDC信号':>10}{'模块分析':>10}{'层次遍历(s)':>14}{'扇入图(s)':>12}"
+              f"{'逐实例分析':>12}{'逐实例(s)':>12}")
+    for num_instances in sorted(options.instances):
+        result = run_hierarchy_benchmark(num_instances, options.leaf_flops, options.legacy_max > 0)
+        hierarchy_results.append(result)
+        legacy = '-' if result['legacy_seconds'] is None else f"{result['legacy_seconds']:.4f}"
+        analyses = '-' if result['legacy_analyses'] is None else str(result['legacy_analyses'])
+        print(f"{result['instances']:>10}{result['flops']:>10}{result['cdc_signals']:>10}{result['definitions']:>10}"
+              f"{result['domain_seconds']:>14.4f}{result['graph_seconds']:>12.4f}{analyses:>12}{legacy:>12}")
+
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as f:
+            json.dump({'flat': results, 'hierarchy': hierarchy_results}, f, indent=2, ensure_ascii=False)
+    return 1 if any(result['match'] is False for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
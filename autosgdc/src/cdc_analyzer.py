@@ -11,12 +11,13 @@ CDC分析器模块 - 负责检测跨时钟域信号
 - 提供CDC分析报告
 """
 
-import re
 import logging
 from typing import List, Dict, Tuple, Set, Optional, Union, Any
 
-from utils import setup_logger, is_synchronizer
-from verilog_parser import VerilogModule
+from utils import setup_logger
+from verilog_parser import VerilogModule, ModuleInstance
+from fanin_graph import FaninGraph, signal_names
+from sync_chains import ChainIndex, Synchronizer
 
 # 设置日志
 logger = setup_logger('cdc_analyzer')
@@ -43,9 +44,12 @@ class CDCAnalyzer:
         self.top_module = modules[top_module_name]
         
         # 初始化时钟域字典和跨时钟域信号字典
-        self.clock_domains = {}      # 时钟域，键为时钟名，值为信号集合
+        self.clock_domains = {}      # 时钟域，键为时钟名，值为"实例路径.信号名"集合
         self.cdc_signals = {}        # 跨时钟域信号，键为"src_clk->dst_clk"，值为信号列表
-        self.synchronizers = {}      # 已识别的同步器，键为目标时钟，值为同步器信号列表
+        self.synchronizers = {}      # 已识别的同步器，键为目标时钟，值为源信号名到Synchronizer的映射
+        self.graph = FaninGraph()    # 信号扇入图，节点为"实例路径.信号名"
+        self.chain_index = None      # 触发器链索引，识别同步器时建立
+        self._visited_definitions = set()  # 层次遍历中分析过的模块定义
     
     def detect_cdc(self) -> Dict[str, List[str]]:
         """
@@ -77,7 +81,7 @@ class CDCAnalyzer:
     
     def _build_clock_domains(self, clocks: List[str]) -> None:
         """
-        构建每个时钟的时钟域
+        构建每个时钟的时钟域，同时将各实例加入扇入图
         
         参数:
             clocks: 时钟信号列表
@@ -86,194 +90,144 @@ class CDCAnalyzer:
         for clock in clocks:
             self.clock_domains[clock] = set()
         
-        # 从顶层模块开始，递归分析每个模块的时钟域
-        self._analyze_module_clock_domains(self.top_module)
+        # 从顶层模块开始遍历实例层次，顶层实例的路径为顶层模块名
+        top = self.top_module
+        self._walk_hierarchy(top, top.name, {clock: clock for clock in clocks}, [])
+        logger.debug(f"层次遍历: {len(self.graph.paths)} 个实例, {len(self._visited_definitions)} 个模块定义")
     
-    def _analyze_module_clock_domains(self, module: VerilogModule) -> None:
+    def _walk_hierarchy(self, module: VerilogModule, path: str, net_clocks: Dict[str, str],
+                        stack: List[str]) -> None:
         """
-        分析单个模块的时钟域
+        遍历一个实例及其子实例，将寄存器按层次名加入时钟域
+        
+        时钟域划分和赋值语句解析按模块定义缓存，每个模块定义只分析一次；
+        各实例只需将模块内的时钟经端口连接映射到顶层时钟，并把信号名加上实例路径
         
         参数:
-            module: 要分析的模块
+            module: 实例的模块对象
+            path: 实例的层次路径
+            net_clocks: 模块内的线网名到顶层时钟名的映射
+            stack: 当前路径上的模块名，用于跳过递归实例化
         """
-        # 获取模块内的时钟域划分
-        module_domains = module.find_clock_domains()
+        self._visited_definitions.add(module.name)
+        self.graph.add_module(module, path)
         
-        # 合并到全局时钟域
-        for clock, signals in module_domains.items():
-            if clock in self.clock_domains:
-                # 对于顶层模块中的信号，直接添加
-                for signal in signals:
-                    self.clock_domains[clock].add(f"{module.name}.{signal}")
+        # 模块内的时钟经端口映射到顶层时钟；未连接到顶层时钟的内部时钟按同名归入顶层时钟域
+        for local_clock, signals in module.find_clock_domains().items():
+            clock = net_clocks.get(local_clock)
+            if clock is None and local_clock in self.clock_domains and local_clock not in module.ports:
+                clock = local_clock
+            if clock is not None:
+                self.clock_domains[clock].update(f"{path}.{signal}" for signal in signals)
         
-        # 递归分析实例化的子模块
+        stack.append(module.name)
         for instance in module.instances:
-            inst_module_name = instance.module_name
-            if inst_module_name in self.modules:
-                # 递归分析子模块
-                inst_module = self.modules[inst_module_name]
-                self._analyze_module_clock_domains(inst_module)
-    
-    def _detect_cdc_signals(self) -> None:
-        """检测跨时钟域信号"""
-        # 检查每个时钟域中的信号
-        for src_clock, src_signals in self.clock_domains.items():
-            for dst_clock, dst_signals in self.clock_domains.items():
-                if src_clock != dst_clock:  # 不同时钟域
-                    # 寻找潜在的CDC信号
-                    cdc_key = f"{src_clock}->{dst_clock}"
-                    self.cdc_signals[cdc_key] = []
-                    
-                    # 分析从源时钟域流向目标时钟域的信号
-                    self._analyze_signal_flow(src_clock, dst_clock, src_signals, dst_signals)
-    
-    def _analyze_signal_flow(self, src_clock: str, dst_clock: str, 
-                            src_signals: Set[str], dst_signals: Set[str]) -> None:
-        """
-        分析从源时钟域到目标时钟域的信号流
-        
-        参数:
-            src_clock: 源时钟名称
-            dst_clock: 目标时钟名称
-            src_signals: 源时钟域中的信号集合
-            dst_signals: 目标时钟域中的信号集合
-        """
-        # 遍历每个目标时钟域中的信号，检查其是否使用了源时钟域的信号
-        # 这里采用简化的方法：检查模块内容中是否存在源信号流向目标信号的赋值
-        for src_module_signal in src_signals:
-            # 提取模块名和信号名
-            if '.' in src_module_signal:
-                src_module, src_signal = src_module_signal.split('.', 1)
-            else:
-                continue  # 跳过不完整的信号引用
-                
-            # 检查该源信号是否被目标时钟域使用
-            for dst_module_signal in dst_signals:
-                if '.' in dst_module_signal:
-                    dst_module, dst_signal = dst_module_signal.split('.', 1)
-                else:
-                    continue  # 跳过不完整的信号引用
-                
-                # 如果源模块和目标模块相同，检查信号赋值关系
-                if src_module == dst_module and src_module in self.modules:
-                    module = self.modules[src_module]
-                    
-                    # 检查是否有从源信号到目标信号的赋值
-                    # 注意：这是一个简化的检查，实际上需要更复杂的数据流分析
-                    if self._check_signal_assignment(module, src_signal, dst_signal):
-                        cdc_key = f"{src_clock}->{dst_clock}"
-                        if src_signal not in self.cdc_signals[cdc_key]:
-                            self.cdc_signals[cdc_key].append(src_signal)
+            child = self.modules.get(instance.module_name)
+            if child is None or child.name in stack:
+                continue
+            child_path = f"{path}.{instance.instance_name}"
+            connections = self._instance_connections(module, child, instance)
+            self.graph.connect_instance(path, child_path, child, connections)
+            child_clocks = {}
+            for port_name, nets in connections.items():
+                clock = next((net_clocks[net] for net in nets if net in net_clocks), None)
+                if clock is not None:
+                    child_clocks[port_name] = clock
+            self._walk_hierarchy(child, child_path, child_clocks, stack)
+        stack.pop()
     
-    def _check_signal_assignment(self, module: VerilogModule, 
-                                src_signal: str, dst_signal: str) -> bool:
+    def _instance_connections(self, parent: VerilogModule, child: VerilogModule,
+                              instance: ModuleInstance) -> Dict[str, List[str]]:
         """
-        检查模块中是否存在从源信号到目标信号的赋值
+        获取实例端口所连接的上层信号，位置连接按子模块的端口顺序对应
         
         参数:
-            module: 要检查的模块
-            src_signal: 源信号名
-            dst_signal: 目标信号名
+            parent: 上层模块
+            child: 实例的模块
+            instance: 实例
             
         返回:
-            如果存在赋值关系则返回True
+            端口名到上层信号名列表的映射，只包含上层模块中声明的信号
         """
-        # 简化的检查：查找是否有类似 dst_signal = ... src_signal ... 的语句
-        # 这里仅做基本检查，实际上需要更完整的解析器
-        assignment_pattern = fr'{dst_signal}\s*(?:=|<=)\s*[^;]*\b{src_signal}\b'
-        return bool(re.search(assignment_pattern, module.content))
+        known = parent.ports.keys() | parent.signals.keys()
+        port_names = list(child.ports)
+        connections = {}
+        for port_name, expression in instance.port_connections.items():
+            if port_name not in child.ports and port_name.startswith('PORT_') and port_name[5:].isdigit():
+                index = int(port_name[5:])
+                if index >= len(port_names):
+                    continue
+                port_name = port_names[index]
+            nets = [name for name in signal_names(expression) if name in known]
+            if nets:
+                connections[port_name] = nets
+        return connections
     
-    def _identify_synchronizers(self) -> None:
-        """识别常见的CDC同步器结构"""
-        # 对每个跨时钟域路径
-        for cdc_path, signals in self.cdc_signals.items():
-            src_clock, dst_clock = cdc_path.split('->')
-            
-            # 同步器集合，键为同步信号输入，值为同步器链中的所有信号
-            synchronizers = {}
-            
-            # 对于每个潜在的CDC信号，检查是否有同步器
-            for signal in signals[:]:  # 创建副本以便在迭代时修改
-                # 在目标时钟域中查找可能是同步器的信号
-                sync_candidates = self._find_sync_candidates(signal, dst_clock)
-                
-                if sync_candidates and len(sync_candidates) >= 2:
-                    # 检查这些信号是否构成同步器
-                    if self._check_synchronizer_structure(sync_candidates, signal, dst_clock):
-                        # 找到了同步器，记录下来
-                        synchronizers[signal] = sync_candidates
-                        
-                        # 从CDC信号列表中移除这个信号，因为它已被同步
-                        self.cdc_signals[cdc_path].remove(signal)
-            
-            # 记录识别到的同步器
-            if synchronizers:
-                self.synchronizers[dst_clock] = synchronizers
-    
-    def _find_sync_candidates(self, signal: str, dst_clock: str) -> List[str]:
+    def _detect_cdc_signals(self) -> None:
         """
-        查找可能是同步器的信号
+        检测跨时钟域信号
         
-        参数:
-            signal: 输入信号名
-            dst_clock: 目标时钟域
-            
-        返回:
-            可能构成同步器的信号列表
+        各实例的赋值语句和端口连接已在层次遍历时加入扇入图，这里为寄存器标注时钟，
+        再对每个目标时钟域做一次反向遍历
         """
-        # 常见的同步器命名模式
-        # 例如: signal_sync, signal_sync1, signal_sync2, ...
-        sync_candidates = []
+        for clock, signals in self.clock_domains.items():
+            self.graph.label_registers(clock, signals)
+        logger.debug(f"扇入图: {len(self.graph.paths)} 个实例, {self.graph.edge_count} 条边, "
+                     f"{len(self.graph.clocks)} 个寄存器")
         
-        # 在目标时钟域中的所有信号中查找
-        for dom_signal in self.clock_domains.get(dst_clock, set()):
-            if '.' in dom_signal:
-                module_name, signal_name = dom_signal.split('.', 1)
-            else:
-                continue
-                
-            # 检查是否匹配同步器命名模式
-            if (signal_name.startswith(f"{signal}_sync") or 
-                signal_name == f"{signal}_meta" or
-                (signal_name.startswith(signal) and signal_name.endswith("_sync"))):
-                sync_candidates.append(signal_name)
+        # 保持"src_clk->dst_clk"键的顺序：按源时钟、目标时钟的时钟域顺序列出全部组合
+        for src_clock in self.clock_domains:
+            for dst_clock in self.clock_domains:
+                if src_clock != dst_clock:
+                    self.cdc_signals[f"{src_clock}->{dst_clock}"] = []
         
-        return sorted(sync_candidates)
+        for dst_clock, dst_signals in self.clock_domains.items():
+            self._analyze_signal_flow(dst_clock, dst_signals)
     
-    def _check_synchronizer_structure(self, sync_candidates: List[str], 
-                                     input_signal: str, dst_clock: str) -> bool:
+    def _analyze_signal_flow(self, dst_clock: str, dst_signals: Set[str]) -> None:
         """
-        检查信号列表是否构成同步器结构
+        分析流入目标时钟域的信号
+        
+        从目标时钟域的寄存器沿扇入图反向遍历，经过组合逻辑到达的其他时钟域寄存器即为跨时钟域信号
         
         参数:
-            sync_candidates: 候选同步器信号列表
-            input_signal: 输入信号
-            dst_clock: 目标时钟域
-            
-        返回:
-            如果构成同步器则返回True
+            dst_clock: 目标时钟名称
+            dst_signals: 目标时钟域中的信号集合
+        """
+        registers = [signal for signal in dst_signals if self.graph.clocks.get(signal) == dst_clock]
+        for src_clock, sources in self.graph.crossing_sources(dst_clock, registers).items():
+            names = {source.split('.', 1)[1] for source in sources}
+            self.cdc_signals[f"{src_clock}->{dst_clock}"] = sorted(names)
+    
+    def _identify_synchronizers(self) -> None:
         """
-        # 检查是否至少有2个触发器
-        if len(sync_candidates) < 2:
-            return False
+        识别常见的CDC同步器结构，被同步的信号从跨时钟域信号列表中移除
         
-        # 找到包含这些信号的模块
-        containing_module = None
-        for module in self.modules.values():
-            all_found = True
-            for sig in sync_candidates:
-                if sig not in module.signals:
-                    all_found = False
-                    break
-            if all_found:
-                containing_module = module
-                break
+        触发器链索引建立一次，每个跨时钟域信号只沿自己的扇出和同步链遍历
+        """
+        self.chain_index = ChainIndex(self.graph)
+        prefix = self.top_module.name + '.'
+        found = []
+        for cdc_path, signals in self.cdc_signals.items():
+            dst_clock = cdc_path.split('->')[1]
+            for signal in signals:
+                sync = self.chain_index.synchronizer(prefix + signal, dst_clock)
+                if sync is not None:
+                    found.append(sync)
         
-        if not containing_module:
-            return False
+        # 请求和应答的同步链配对后才能确定是握手结构
+        self.chain_index.mark_handshakes(found)
         
-        # 使用辅助函数检查是否构成同步器
-        return is_synchronizer(sync_candidates, containing_module.content)
+        for sync in found:
+            signal = self._relative_name(sync.source)
+            self.cdc_signals[f"{sync.src_clock}->{sync.dst_clock}"].remove(signal)
+            self.synchronizers.setdefault(sync.dst_clock, {})[signal] = sync
+        logger.debug(f"识别到 {len(found)} 个同步器")
+    
+    @staticmethod
+    def _relative_name(node: str) -> str:
+        """节点名去掉顶层实例路径，即跨时钟域信号列表中使用的名称"""
+        return node.split('.', 1)[1]
     
     def get_report(self) -> str:
         """
@@ -299,8 +253,10 @@ class CDCAnalyzer:
         if self.synchronizers:
             for dst_clock, sync_dict in self.synchronizers.items():
                 report_lines.append(f"目标时钟域 {dst_clock}:")
-                for input_signal, sync_signals in sync_dict.items():
-                    report_lines.append(f"  输入信号 {input_signal} -> 同步器: {', '.join(sync_signals)}")
+                for input_signal, sync in sync_dict.items():
+                    stages = ', '.join(self._relative_name(stage) for stage in sync.stages)
+                    report_lines.append(f"  输入信号 {input_signal} ({sync.src_clock}) -> "
+                                        f"{sync.type} 同步器, {sync.depth} 级: {stages}")
         else:
             report_lines.append("未检测到同步器")
         
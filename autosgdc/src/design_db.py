@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+设计数据库模块 - 负责将解析和分析结果保存到磁盘，在多次运行之间复用
+
+此模块提供:
+- 按源文件保存的模块（端口、信号、实例）和每个模块的时钟域划分，以文件内容的SHA-256为键
+- 源文件展开时用到的头文件状态，头文件变化时引用它的源文件重新解析
+- 按全部源文件内容、顶层模块和分析选项保存的顶层模块、时钟信号和CDC分析结果
+
+数据库是单个SQLite文件，模块数据只在对应文件被使用时读取和反序列化；
+源文件都未变化时（例如只修改了时钟配置文件），一次运行只读取文件索引和一条分析结果
+"""
+
+import os
+import json
+import pickle
+import sqlite3
+import hashlib
+from typing import List, Dict, Tuple, Optional, Any
+
+from utils import setup_logger
+from include_cache import files_unchanged
+
+# 设置日志
+logger = setup_logger('design_db')
+
+# 数据格式版本，解析或分析结果的格式变化时递增，旧版本的数据库会被清空
+FORMAT_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT, variant TEXT, hash TEXT, mtime_ns INTEGER, size INTEGER,
+    dependencies TEXT, modules BLOB, PRIMARY KEY (path, variant)
+);
+CREATE TABLE IF NOT EXISTS analyses (key TEXT PRIMARY KEY, top TEXT, data BLOB);
+"""
+
+
+def content_hash(file_path: str) -> str:
+    """
+    计算文件内容的SHA-256
+
+    参数:
+        file_path: 文件路径
+
+    返回:
+        十六进制摘要
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DesignDatabase:
+    """设计数据库类"""
+
+    def __init__(self, db_path: str, include_dirs: Optional[List[str]] = None):
+        """
+        打开（必要时创建）数据库
+
+        参数:
+            db_path: SQLite数据库文件路径
+            include_dirs: 包含目录列表，头文件查找结果依赖于它，不同的目录列表分别保存
+        """
+        self.db_path = db_path
+        self.variant = json.dumps([os.path.abspath(d) for d in include_dirs or []])
+        self.stats = {'hits': 0, 'misses': 0, 'hashed': 0, 'analysis_hits': 0}
+        self._hashes = {}  # 本次运行中检查过的文件路径到内容摘要的映射，无有效数据时为None
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(SCHEMA)
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+        if row is None or row[0] != str(FORMAT_VERSION):
+            if row is not None:
+                logger.info(f"设计数据库格式已变化，清空 {db_path}")
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("DELETE FROM analyses")
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('format', ?)", (str(FORMAT_VERSION),))
+            self._conn.commit()
+
+    def lookup(self, file_path: str) -> Optional[List[Tuple[tuple, Dict[str, Any]]]]:
+        """
+        读取文件的模块数据，文件或它依赖的头文件变化后返回None
+
+        参数:
+            file_path: Verilog文件路径
+
+        返回:
+            (模块紧凑形式, 时钟域划分) 列表，紧凑形式见VerilogModule.to_compact()；无有效数据时返回None
+        """
+        if self._validate(file_path) is None:
+            self.stats['misses'] += 1
+            return None
+        row = self._conn.execute("SELECT modules FROM files WHERE path = ? AND variant = ?",
+                                 (os.path.abspath(file_path), self.variant)).fetchone()
+        self.stats['hits'] += 1
+        return pickle.loads(row[0])
+
+    def store(self, file_path: str, state: Tuple[str, int, int, List[Tuple[str, int, int]]],
+              entries: List[Tuple[tuple, Dict[str, Any]]]) -> None:
+        """
+        保存文件的模块数据
+
+        参数:
+            file_path: Verilog文件路径
+            state: (内容摘要, 修改时间, 大小, 依赖的头文件状态列表)，在解析前记录
+            entries: (模块紧凑形式, 时钟域划分) 列表
+        """
+        file_hash, mtime_ns, size, dependencies = state
+        path = os.path.abspath(file_path)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, self.variant, file_hash, mtime_ns, size, json.dumps(dependencies),
+             pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL))
+        )
+        self._hashes[path] = file_hash
+
+    def analysis_key(self, files: List[str], top: Optional[str], options: Dict[str, Any]) -> Optional[str]:
+        """
+        计算分析结果的键，不读取模块数据
+
+        参数:
+            files: Verilog文件路径列表
+            top: 用户指定的顶层模块名，None表示自动检测
+            options: 影响分析结果的其他选项
+
+        返回:
+            键；有文件没有有效数据（新文件或已变化）时返回None
+        """
+        hashes = []
+        for file_path in files:
+            file_hash = self._validate(file_path)
+            if file_hash is None:
+                return None
+            hashes.append((os.path.abspath(file_path), file_hash))
+        key = json.dumps([FORMAT_VERSION, self.variant, top, hashes, options], sort_keys=True)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def load_analysis(self, key: str) -> Optional[Any]:
+        """
+        读取分析结果
+
+        参数:
+            key: analysis_key()返回的键
+
+        返回:
+            保存的分析结果，不存在时返回None
+        """
+        row = self._conn.execute("SELECT data FROM analyses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.stats['analysis_hits'] += 1
+        return pickle.loads(row[0])
+
+    def store_analysis(self, key: str, top: str, data: Any) -> None:
+        """
+        保存分析结果，同一顶层模块的旧结果被替换
+
+        参数:
+            key: analysis_key()返回的键
+            top: 顶层模块名
+            data: 分析结果
+        """
+        self._conn.execute("DELETE FROM analyses WHERE top = ?", (top,))
+        self._conn.execute("INSERT OR REPLACE INTO analyses VALUES (?, ?, ?)",
+                           (key, top, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)))
+        self._conn.commit()
+
+    def commit(self) -> None:
+        """提交未保存的修改"""
+        self._conn.commit()
+
+    def close(self) -> None:
+        """提交修改并关闭数据库"""
+        self._conn.commit()
+        self._conn.close()
+
+    def summary(self) -> str:
+        """
+        本次运行的数据库使用情况
+
+        返回:
+            形如"设计数据库: 命中 118 个文件, 未命中 2 个文件, 重新计算摘要 3 个文件, 分析结果命中 0 次"的描述
+        """
+        return (f"设计数据库: 命中 {self.stats['hits']} 个文件, 未命中 {self.stats['misses']} 个文件, "
+                f"重新计算摘要 {self.stats['hashed']} 个文件, 分析结果命中 {self.stats['analysis_hits']} 次")
+
+    def _validate(self, file_path: str) -> Optional[str]:
+        """
+        检查文件是否有有效数据，结果在本次运行中缓存
+
+        返回:
+            有效时返回内容摘要，否则返回None
+        """
+        path = os.path.abspath(file_path)
+        if path not in self._hashes:
+            self._hashes[path] = self._check(path)
+        return self._hashes[path]
+
+    def _check(self, path: str) -> Optional[str]:
+        """修改时间和大小未变化时直接采用保存的摘要，否则重新计算内容摘要比较；依赖的头文件必须都未变化"""
+        row = self._conn.execute(
+            "SELECT hash, mtime_ns, size, dependencies FROM files WHERE path = ? AND variant = ?",
+            (path, self.variant)
+        ).fetchone()
+        if row is None:
+            return None
+        file_hash, mtime_ns, size, dependencies = row
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_mtime_ns != mtime_ns or st.st_size != size:
+            self.stats['hashed'] += 1
+            if content_hash(path) != file_hash:
+                return None
+            # 内容未变化（例如只是touch），更新修改时间避免下次重新计算
+            self._conn.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ? AND variant = ?",
+                               (st.st_mtime_ns, st.st_size, path, self.variant))
+        if not files_unchanged([tuple(state) for state in json.loads(dependencies)]):
+            return None
+        return file_hash
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+扇入图模块 - 负责构建信号级的驱动→负载图并查找跨时钟域路径
+
+此模块提供:
+- 单遍解析模块中的赋值语句（assign、阻塞和非阻塞赋值、带初值的声明）
+- 由驱动信号指向负载信号的边表，以及反向的扇入表
+- 为寄存器节点标注时钟
+- 记录同步器识别所需的结构信息：移位寄存器写法的同步器（q <= {q[0], d}）和格雷码编码的信号
+- 每个时钟域一次反向遍历，找出驱动该时钟域寄存器的其他时钟域寄存器
+
+节点名为"实例层次路径.信号名"（顶层实例的路径为顶层模块名），实例端口按方向与上层线网相连；
+遍历穿过组合逻辑节点（wire、组合always块中的reg、端口），在寄存器节点处停止
+"""
+
+import re
+from collections import deque
+from typing import List, Dict, Tuple, Set, Optional, Iterator, Iterable
+
+from verilog_parser import VerilogModule
+
+# 语句切分和赋值运算符识别：括号内的分号和比较运算符被跳过
+_STATEMENT_TOKEN_PATTERN = re.compile(r'===?|!==?|<=|>=|=|[();]')
+
+# 赋值左侧末尾的左值：拼接、或带位选择的（层次）标识符
+_LVALUE_PATTERN = re.compile(
+    r'(\{[^{}]*\}|[A-Za-z_][\w$]*(?:\.[A-Za-z_][\w$]*)*)\s*(?:\[[^\[\]]*\]\s*)*$'
+)
+
+# 标识符，排除数字常量中的进制部分（8'h00）、系统函数（$clog2）和层次名的后续部分
+_IDENTIFIER_PATTERN = re.compile(r"(?<!['\w$.])[A-Za-z_][\w$]*")
+
+# 移位寄存器写法的同步器右侧：{q[0], d}，q为被赋值的寄存器本身
+_SHIFT_PATTERN = re.compile(r'^\{\s*([A-Za-z_][\w$]*)\s*\[[^\[\]]*\]\s*,\s*([A-Za-z_][\w$]*)\s*\}$')
+
+# 二进制转格雷码：b ^ (b >> 1) 或 (b >> 1) ^ b
+_GRAY_PATTERN = re.compile(
+    r'\b([A-Za-z_][\w$]*)\s*\^\s*\(?\s*\1\s*>>\s*1\b|\b([A-Za-z_][\w$]*)\s*>>\s*1\s*\)?\s*\^\s*\(?\s*\2\b'
+)
+
+
+def iter_assignments(content: str) -> Iterator[Tuple[str, str]]:
+    """
+    遍历模块内容中的赋值语句
+
+    只在括号外识别 = 和 <=，因此条件中的比较运算符和for循环头部的赋值不会被当作赋值语句
+
+    参数:
+        content: 去除注释后的模块内容
+
+    返回:
+        (左侧文本, 右侧文本) 迭代器；左侧文本从上一条语句结束处开始，末尾是被赋值的左值
+    """
+    start = 0
+    depth = 0
+    operator = None
+    for match in _STATEMENT_TOKEN_PATTERN.finditer(content):
+        token = match.group()
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            if depth:
+                depth -= 1
+        elif token == ';':
+            if depth == 0:
+                if operator is not None:
+                    yield content[start:operator.start()], content[operator.end():match.start()]
+                start = match.end()
+                operator = None
+        elif depth == 0 and operator is None and (token == '=' or token == '<='):
+            operator = match
+
+
+def assignment_targets(lhs: str) -> List[str]:
+    """
+    提取赋值左侧的被赋值信号名
+
+    参数:
+        lhs: iter_assignments()返回的左侧文本
+
+    返回:
+        信号名列表，拼接左值返回其中的全部信号
+    """
+    lvalue = _lvalue(lhs)
+    if lvalue is None:
+        return []
+    if lvalue.startswith('{'):
+        return signal_names(lvalue)
+    return [lvalue]
+
+
+def _lvalue(lhs: str) -> Optional[str]:
+    """赋值左侧末尾的左值文本（拼接或标识符），不含位选择"""
+    match = _LVALUE_PATTERN.search(lhs)
+    return match.group(1) if match else None
+
+
+def _concat_items(expression: str) -> Optional[List[str]]:
+    """
+    拆分整体为一个拼接的表达式
+
+    返回:
+        拼接中各项的文本，表达式不是单个拼接时返回None
+    """
+    expression = expression.strip()
+    if not (expression.startswith('{') and expression.endswith('}')):
+        return None
+    items = []
+    depth = 0
+    start = 1
+    for index in range(1, len(expression) - 1):
+        char = expression[index]
+        if char in '({[':
+            depth += 1
+        elif char in ')}]':
+            depth -= 1
+            if depth < 0:
+                return None  # 首尾的花括号不属于同一个拼接
+        elif char == ',' and depth == 0:
+            items.append(expression[start:index])
+            start = index + 1
+    items.append(expression[start:-1])
+    return items
+
+
+def signal_names(expression: str) -> List[str]:
+    """
+    提取表达式中引用的标识符，不含数字常量中的进制部分和系统函数名，参数名和关键字未被过滤
+
+    参数:
+        expression: Verilog表达式
+
+    返回:
+        标识符列表，按出现顺序，可能重复
+    """
+    return _IDENTIFIER_PATTERN.findall(expression)
+
+
+class FaninGraph:
+    """信号扇入图，节点为"实例路径.信号名"，边由驱动信号指向负载信号"""
+
+    def __init__(self):
+        """初始化空图"""
+        self.fanout = {}      # 驱动节点到负载节点集合的映射
+        self.fanin = {}       # 负载节点到驱动节点集合的映射
+        self.clocks = {}      # 寄存器节点到时钟名的映射
+        self.paths = set()    # 已加入的实例路径
+        self.edge_count = 0
+        self.instances = {}     # 实例路径到模块对象的映射
+        self.shift_registers = set()  # 移位寄存器写法的同步器节点（q <= {q[0], d}）
+        self.gray_nodes = set()       # 由二进制转格雷码表达式赋值的节点
+        self._local_structure = {}  # 模块名到module_structure()结果的映射，每个模块定义只解析一次
+
+    def add_edge(self, driver: str, load: str) -> None:
+        """
+        添加一条驱动→负载边，重复的边只记录一次
+
+        参数:
+            driver: 驱动节点
+            load: 负载节点
+        """
+        loads = self.fanout.setdefault(driver, set())
+        if load in loads:
+            return
+        loads.add(load)
+        self.fanin.setdefault(load, set()).add(driver)
+        self.edge_count += 1
+
+    def add_module(self, module: VerilogModule, path: Optional[str] = None) -> None:
+        """
+        将模块的一个实例加入图中，节点名为"实例路径.信号名"
+
+        模块的赋值语句按模块定义只解析一次，同一模块的多个实例复用解析结果；同一实例路径只加入一次
+
+        参数:
+            module: 模块对象
+            path: 实例的层次路径，默认为模块名
+        """
+        path = path or module.name
+        if path in self.paths:
+            return
+        self.paths.add(path)
+        self.instances[path] = module
+        structure = self._local_structure.get(module.name)
+        if structure is None:
+            structure = self._local_structure[module.name] = self.module_structure(module)
+        edges, shift_registers, gray_nodes = structure
+        prefix = path + '.'
+        for driver, load in edges:
+            self.add_edge(prefix + driver, prefix + load)
+        self.shift_registers.update(prefix + name for name in shift_registers)
+        self.gray_nodes.update(prefix + name for name in gray_nodes)
+
+    @staticmethod
+    def module_edges(module: VerilogModule) -> List[Tuple[str, str]]:
+        """
+        单遍解析模块中的赋值语句，得到模块内的驱动→负载边
+
+        只保留模块端口和已声明信号之间的边，参数、函数名和关键字不会成为节点
+
+        参数:
+            module: 模块对象
+
+        返回:
+            (驱动信号名, 负载信号名) 列表
+        """
+        return FaninGraph.module_structure(module)[0]
+
+    @staticmethod
+    def module_structure(module: VerilogModule) -> Tuple[List[Tuple[str, str]], Set[str], Set[str]]:
+        """
+        单遍解析模块中的赋值语句，得到模块内的边和同步器识别所需的结构信息
+
+        两侧都是项数相同的拼接时（{a, b} <= {c, d}）按位置逐项连边，否则右侧的每个信号驱动左侧的每个信号
+
+        参数:
+            module: 模块对象
+
+        返回:
+            (驱动→负载边列表, 移位寄存器写法的同步器信号集合, 由格雷码表达式赋值的信号集合)
+        """
+        known = set(module.ports) | set(module.signals)
+        edges = []
+        shift_registers = set()
+        gray_nodes = set()
+        for lhs, rhs in iter_assignments(module.content):
+            targets = [name for name in assignment_targets(lhs) if name in known]
+            if not targets:
+                continue
+            lvalue = _lvalue(lhs)
+            left_items = _concat_items(lvalue)
+            right_items = _concat_items(rhs) if left_items is not None else None
+            if right_items is not None and len(right_items) == len(left_items):
+                pairs = zip(left_items, right_items)
+            else:
+                pairs = [(lvalue, rhs)]
+            for left, right in pairs:
+                drivers = sorted({name for name in signal_names(right) if name in known})
+                for target in signal_names(left):
+                    if target in known:
+                        edges.extend((driver, target) for driver in drivers)
+            if len(targets) == 1:
+                match = _SHIFT_PATTERN.match(rhs.strip())
+                if match and match.group(1) == targets[0] and match.group(2) in known:
+                    shift_registers.add(targets[0])
+            if _GRAY_PATTERN.search(rhs):
+                gray_nodes.update(targets)
+        return edges, shift_registers, gray_nodes
+
+    def connect_instance(self, parent_path: str, path: str, module: VerilogModule,
+                         connections: Dict[str, List[str]]) -> None:
+        """
+        按端口方向连接实例端口和上层线网：输入端口由上层线网驱动，输出端口驱动上层线网，双向端口两者都有
+
+        参数:
+            parent_path: 上层实例的层次路径
+            path: 实例的层次路径
+            module: 实例的模块对象
+            connections: 端口名到所连接的上层信号名列表的映射
+        """
+        for port_name, nets in connections.items():
+            port = module.ports.get(port_name)
+            direction = port.direction if port is not None else 'input'
+            port_node = f"{path}.{port_name}"
+            for net in nets:
+                net_node = f"{parent_path}.{net}"
+                if direction != 'output':
+                    self.add_edge(net_node, port_node)
+                if direction != 'input':
+                    self.add_edge(port_node, net_node)
+
+    def label_registers(self, clock: str, registers: Iterable[str]) -> None:
+        """
+        为寄存器节点标注时钟，已标注的寄存器保留第一次标注的时钟
+
+        参数:
+            clock: 时钟名
+            registers: 寄存器节点名
+        """
+        for register in registers:
+            self.clocks.setdefault(register, clock)
+
+    def registers(self, clock: str) -> List[str]:
+        """
+        获取时钟域中的寄存器节点
+
+        参数:
+            clock: 时钟名
+
+        返回:
+            寄存器节点列表
+        """
+        return [node for node, node_clock in self.clocks.items() if node_clock == clock]
+
+    def crossing_sources(self, dst_clock: str, registers: Optional[Iterable[str]] = None) -> Dict[str, Set[str]]:
+        """
+        从目标时钟域的寄存器出发沿扇入方向遍历一次，找出驱动它们的其他时钟域寄存器
+
+        遍历穿过未标注时钟的节点（组合逻辑），在寄存器节点处停止，每个节点最多访问一次
+
+        参数:
+            dst_clock: 目标时钟名
+            registers: 目标时钟域的寄存器节点，默认为图中标注为该时钟的全部寄存器
+
+        返回:
+            字典，键为源时钟名，值为源寄存器节点集合
+        """
+        if registers is None:
+            registers = self.registers(dst_clock)
+        sources = {}
+        visited = set(registers)
+        queue = deque(visited)
+        fanin = self.fanin
+        clocks = self.clocks
+        while queue:
+            for driver in fanin.get(queue.popleft(), ()):
+                if driver in visited:
+                    continue
+                visited.add(driver)
+                src_clock = clocks.get(driver)
+                if src_clock is None:
+                    queue.append(driver)
+                elif src_clock != dst_clock:
+                    sources.setdefault(src_clock, set()).add(driver)
+        return sources
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+包含文件缓存模块 - 负责`include的解析、缓存和递归展开
+
+此模块提供:
+- 按 (所在目录, 文件名) 缓存的路径解析结果，不在每次引用时重复探测include目录
+- 按 (路径, 修改时间, 大小) 缓存的头文件展开结果，同一头文件只读取和展开一次，之后按引用拼接
+- 包含关系图和循环包含检测
+- 命中、未命中和节省读取字节数的统计
+- 每个文件展开时用到的头文件状态，供设计数据库判断文件是否需要重新解析；
+  查找头文件时探测过但不存在的路径也记录在内，之后出现同名头文件（包括遮蔽原有头文件）时同样需要重新解析
+
+缓存在同一进程中按include目录列表共享，多个文件（以及进程池中同一工作进程处理的文件）
+引用同一个头文件时只读取一次
+"""
+
+import os
+import re
+from typing import List, Dict, Tuple, Set, Optional, Any
+
+from utils import setup_logger
+
+# 设置日志
+logger = setup_logger('include_cache')
+
+# `include指令
+INCLUDE_PATTERN = re.compile(r'`include\s+(["\']\S+["\'])')
+
+# 统计项
+STAT_KEYS = ('references', 'hits', 'misses', 'bytes_read', 'bytes_saved', 'not_found', 'cycles')
+
+
+class IncludeCache:
+    """包含文件缓存类"""
+
+    def __init__(self, include_dirs: Optional[List[str]] = None):
+        """
+        初始化缓存
+
+        参数:
+            include_dirs: 包含目录列表，在引用文件所在目录之后按顺序查找
+        """
+        self.include_dirs = list(include_dirs or [])
+        self.graph = {}        # 头文件路径到其直接包含的头文件路径列表的映射
+        self.stats = dict.fromkeys(STAT_KEYS, 0)
+        self._resolved = {}    # (所在目录, 文件名) 到 (头文件路径, 之前探测过的不存在路径列表) 的映射，未找到时路径为None
+        self._entries = {}     # 头文件路径到 (依赖文件状态列表, 展开后内容, 读取字节数) 的映射
+
+    def resolve(self, name: str, base_dir: str) -> Optional[str]:
+        """
+        查找头文件：先在引用文件所在目录，再按顺序在include目录中查找，结果按 (目录, 文件名) 缓存
+
+        参数:
+            name: `include中的文件名（不含引号）
+            base_dir: 引用文件所在目录
+
+        返回:
+            头文件的绝对路径，未找到时返回None（只在第一次查找时记录警告）
+        """
+        return self._resolve(name, base_dir)[0]
+
+    def _resolve(self, name: str, base_dir: str) -> Tuple[Optional[str], List[str]]:
+        """
+        查找头文件，缓存的结果在之前不存在的路径出现文件时失效
+
+        返回:
+            (头文件的绝对路径, 在其之前探测过的不存在路径列表)，未找到时路径为None
+        """
+        key = (base_dir, name)
+        cached = self._resolved.get(key)
+        if cached is not None and not any(os.path.isfile(candidate) for candidate in cached[1]):
+            return cached
+        path = None
+        missing = []
+        for directory in [base_dir] + self.include_dirs:
+            candidate = os.path.abspath(os.path.join(directory, name))
+            if os.path.isfile(candidate):
+                path = candidate
+                break
+            missing.append(candidate)
+        if path is None and cached is None:
+            logger.warning(f"找不到包含文件: {name}")
+        self._resolved[key] = (path, missing)
+        return path, missing
+
+    def expand(self, content: str, base_dir: str, dependencies: Optional[List[Tuple[str, int, int]]] = None) -> str:
+        """
+        递归展开内容中的`include指令
+
+        参数:
+            content: 文件内容
+            base_dir: 文件所在目录，用于相对路径
+            dependencies: 可选列表，展开过程中用到的头文件状态 (路径, 修改时间, 大小) 追加到其中，
+                          探测过但不存在的路径以 (路径, None, None) 追加
+
+        返回:
+            展开后的内容；找不到、无法读取或循环包含的头文件替换为 // ERROR 注释
+        """
+        if '`include' not in content:
+            return content
+        text, _, states = self._expand(content, base_dir, [])
+        if dependencies is not None:
+            dependencies.extend(states)
+        return text
+
+    def _expand(self, content: str, base_dir: str,
+                stack: List[str]) -> Tuple[str, bool, List[Tuple[str, int, int]]]:
+        """
+        展开内容中的`include指令
+
+        返回:
+            (展开后的内容, 是否遇到循环包含, 用到的头文件状态列表)；遇到循环包含的展开结果依赖于包含路径，不能缓存
+        """
+        cyclic = False
+        pieces = []
+        states = []
+        seen = set()
+        last = 0
+        for match in INCLUDE_PATTERN.finditer(content):
+            include_file = match.group(1).strip('"\'')
+            self.stats['references'] += 1
+            path, missing = self._resolve(include_file, base_dir)
+            for candidate in missing:
+                if candidate not in seen:
+                    seen.add(candidate)
+                    states.append((candidate, None, None))
+            if path is None:
+                self.stats['not_found'] += 1
+                text = f"// ERROR: 找不到包含文件 {include_file}"
+            elif path in stack:
+                self.stats['cycles'] += 1
+                cycle = ' -> '.join(stack[stack.index(path):] + [path])
+                logger.warning(f"检测到循环包含: {cycle}")
+                text = f"// ERROR: 循环包含 {include_file}"
+                cyclic = True
+            else:
+                text, header_cyclic, header_states = self._load(path, stack)
+                cyclic = cyclic or header_cyclic
+                for state in header_states:
+                    if state[0] not in seen:
+                        seen.add(state[0])
+                        states.append(state)
+            if stack:
+                children = self.graph.setdefault(stack[-1], [])
+                if path is not None and path not in children:
+                    children.append(path)
+            pieces.append(content[last:match.start()])
+            pieces.append(text)
+            last = match.end()
+        pieces.append(content[last:])
+        return ''.join(pieces), cyclic, states
+
+    def _load(self, path: str, stack: List[str]) -> Tuple[str, bool, List[Tuple[str, int, int]]]:
+        """读取并展开头文件，依赖的头文件都未变化时直接返回缓存的展开结果"""
+        entry = self._entries.get(path)
+        if entry is not None and files_unchanged(entry[0]):
+            self.stats['hits'] += 1
+            self.stats['bytes_saved'] += entry[2]
+            return entry[1], False, entry[0]
+
+        self.stats['misses'] += 1
+        try:
+            st = os.stat(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                raw = f.read()
+        except Exception as e:
+            logger.warning(f"读取包含文件 {path} 时出错: {str(e)}")
+            return f"// ERROR: 无法读取包含文件 {os.path.basename(path)}", False, []
+        self.stats['bytes_read'] += st.st_size
+        self.graph.setdefault(path, [])
+
+        stack.append(path)
+        try:
+            text, cyclic, child_states = self._expand(raw, os.path.dirname(path), stack)
+        finally:
+            stack.pop()
+        # 依赖状态包含本文件和所有被展开的嵌套头文件
+        states = [(path, st.st_mtime_ns, st.st_size)]
+        states.extend(state for state in child_states if state[0] != path)
+        if not cyclic:
+            self._entries[path] = (states, text, sum(state[2] for state in states if state[2] is not None))
+        return text, cyclic, states
+
+    def snapshot(self) -> Dict[str, int]:
+        """当前统计的副本，用于计算一次解析的增量"""
+        return dict(self.stats)
+
+
+# 进程内共享的缓存，按include目录列表区分
+_CACHES = {}
+
+
+def get_include_cache(include_dirs: Optional[List[str]] = None) -> IncludeCache:
+    """
+    获取进程内共享的包含文件缓存
+
+    参数:
+        include_dirs: 包含目录列表
+
+    返回:
+        对应这组include目录的缓存
+    """
+    key = tuple(include_dirs or [])
+    cache = _CACHES.get(key)
+    if cache is None:
+        cache = _CACHES[key] = IncludeCache(list(key))
+    return cache
+
+
+def stats_delta(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+    """
+    两次snapshot()之间的统计增量
+
+    参数:
+        before: 较早的统计
+        after: 较晚的统计
+
+    返回:
+        各统计项的差值
+    """
+    return {key: after.get(key, 0) - before.get(key, 0) for key in STAT_KEYS}
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """
+    格式化包含文件统计
+
+    参数:
+        stats: 统计字典
+
+    返回:
+        形如"包含文件: 引用 4000 次, 命中 3999, 未命中 1, 读取 2.0 KB, 节省读取 7996.0 KB"的描述
+    """
+    text = (f"包含文件: 引用 {stats['references']} 次, 命中 {stats['hits']}, 未命中 {stats['misses']}, "
+            f"读取 {stats['bytes_read'] / 1024:.1f} KB, 节省读取 {stats['bytes_saved'] / 1024:.1f} KB")
+    if stats['not_found']:
+        text += f", 未找到 {stats['not_found']}"
+    if stats['cycles']:
+        text += f", 循环包含 {stats['cycles']}"
+    return text
+
+
+def files_unchanged(states: List[Tuple[str, int, int]]) -> bool:
+    """
+    判断依赖文件的修改时间和大小是否都未变化
+
+    参数:
+        states: (路径, 修改时间, 大小) 列表，修改时间为None表示该路径当时不存在文件
+
+    返回:
+        全部文件都存在且修改时间和大小未变化、当时不存在的路径仍不存在文件时返回True
+    """
+    for path, mtime_ns, size in states:
+        if mtime_ns is None:
+            if os.path.isfile(path):
+                return False
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_mtime_ns != mtime_ns or st.st_size != size:
+            return False
+    return True
@@ -14,9 +14,13 @@ SGDC生成器模块 - 负责生成SGDC约束文件内容
 
 import os
 import re
+import gzip
+import json
+import copy
 import logging
 import datetime
-from typing import List, Dict, Tuple, Set, Optional, Union, Any
+import itertools
+from typing import List, Dict, Tuple, Set, Optional, Union, Any, Iterator
 
 from utils import setup_logger
 from verilog_parser import VerilogModule
@@ -24,6 +28,23 @@ from verilog_parser import VerilogModule
 # 设置日志
 logger = setup_logger('sgdc_generator')
 
+# write_sgdc()每次写入的行数和非压缩输出的缓冲区大小
+WRITE_BATCH_LINES = 4096
+WRITE_BUFFER_SIZE = 1 << 20
+
+# gzip压缩级别，约束文件重复度高，较低的级别已能得到接近的压缩率
+GZIP_LEVEL = 6
+
+# 时钟配置文件中每个时钟允许的字段
+CLOCK_FIELDS = ('period', 'uncertainty', 'waveform', 'generated', 'source', 'divide_by', 'multiply_by', 'phase')
+
+def _number(name: str, data: Dict[str, Any], key: str, default: float) -> float:
+    """读取配置中的数字字段，类型错误时抛出ValueError"""
+    value = data.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"时钟 {name} 的{key}必须是数字")
+    return value
+
 class ClockConfig:
     """时钟配置类，存储时钟相关信息"""
     
@@ -44,6 +65,76 @@ class ClockConfig:
         self.divide_by = 1                          # 分频系数
         self.multiply_by = 1                        # 倍频系数
         self.phase = 0.0                            # 相位偏移(度)
+    
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> 'ClockConfig':
+        """
+        由配置字典创建时钟配置，未给出的字段使用默认值（不确定性和波形由周期推算）
+        
+        参数:
+            name: 时钟名称
+            data: 配置字典，字段见CLOCK_FIELDS
+            
+        返回:
+            时钟配置对象；字段类型或取值无效时抛出ValueError
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"时钟 {name} 的配置必须是对象")
+        unknown = sorted(set(data) - set(CLOCK_FIELDS))
+        if unknown:
+            logger.warning(f"时钟 {name} 的配置包含未知字段，已忽略: {', '.join(unknown)}")
+        
+        config = cls(name, _number(name, data, 'period', 10.0))
+        if config.period <= 0:
+            raise ValueError(f"时钟 {name} 的period必须为正数")
+        config.uncertainty = _number(name, data, 'uncertainty', config.uncertainty)
+        if config.uncertainty < 0:
+            raise ValueError(f"时钟 {name} 的uncertainty必须为非负数")
+        if 'waveform' in data:
+            waveform = data['waveform']
+            if (not isinstance(waveform, (list, tuple)) or len(waveform) != 2
+                    or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in waveform)):
+                raise ValueError(f"时钟 {name} 的waveform必须是两个数字 [上升沿, 下降沿]")
+            config.waveform = tuple(waveform)
+        config.generated = bool(data.get('generated', False))
+        config.source = str(data.get('source', "") or "")
+        config.divide_by = int(_number(name, data, 'divide_by', 1))
+        config.multiply_by = int(_number(name, data, 'multiply_by', 1))
+        if config.divide_by <= 0 or config.multiply_by <= 0:
+            raise ValueError(f"时钟 {name} 的分频和倍频系数必须为正整数")
+        config.phase = _number(name, data, 'phase', 0.0)
+        return config
+
+def load_clock_config(file_path: str) -> Dict[str, ClockConfig]:
+    """
+    加载JSON时钟配置文件
+    
+    参数:
+        file_path: 配置文件路径，顶层为时钟名到配置对象的映射
+        
+    返回:
+        字典，键为时钟名，值为时钟配置对象；文件格式或字段无效时抛出ValueError
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"时钟配置文件 {file_path} 不是有效的JSON: {str(e)}")
+    if not isinstance(data, dict):
+        raise ValueError(f"时钟配置文件 {file_path} 的顶层必须是时钟名到配置的映射")
+    
+    configs = {}
+    for name, item in data.items():
+        try:
+            configs[name] = ClockConfig.from_dict(name, item)
+        except ValueError as e:
+            raise ValueError(f"时钟配置文件 {file_path}: {str(e)}")
+    
+    # 生成时钟的源时钟应在同一文件中定义
+    for name, config in configs.items():
+        if config.generated and config.source and config.source not in configs:
+            logger.warning(f"时钟配置文件 {file_path}: 生成时钟 {name} 的源时钟 {config.source} 未定义")
+    return configs
 
 class SGDCGenerator:
     """SGDC约束文件生成器"""
@@ -57,38 +148,45 @@ class SGDCGenerator:
             top_module: 顶层模块对象
             clock_signals: 时钟信号列表
             cdc_signals: 跨时钟域信号字典，键为"src_clk->dst_clk"，值为信号列表
-            clock_config: 时钟配置字典，键为时钟名，值为配置信息
+            clock_config: 时钟配置字典，键为时钟名，值为ClockConfig对象（如load_clock_config()的结果）或配置字典
         """
         self.top_module = top_module
         self.clock_signals = clock_signals
         self.cdc_signals = cdc_signals
         self.clock_configs = {}
+        self.preset_clocks = set()  # 由时钟配置给出的时钟，交互和默认配置不再修改
         
         # 初始化时钟配置
         for clock in clock_signals:
-            # 如果提供了配置，使用提供的配置
+            # 如果提供了配置，使用提供的配置（复制，同一配置可用于多个生成器）
             if clock_config and clock in clock_config:
                 cfg = clock_config[clock]
-                clock_cfg = ClockConfig(clock, cfg.get('period', 10.0))
-                clock_cfg.uncertainty = cfg.get('uncertainty', clock_cfg.uncertainty)
-                clock_cfg.waveform = cfg.get('waveform', clock_cfg.waveform)
-                clock_cfg.generated = cfg.get('generated', False)
-                clock_cfg.source = cfg.get('source', "")
-                clock_cfg.divide_by = cfg.get('divide_by', 1)
-                clock_cfg.multiply_by = cfg.get('multiply_by', 1)
-                clock_cfg.phase = cfg.get('phase', 0.0)
+                if isinstance(cfg, ClockConfig):
+                    clock_cfg = copy.copy(cfg)
+                else:
+                    clock_cfg = ClockConfig.from_dict(clock, cfg)
+                self.preset_clocks.add(clock)
             else:
                 # 否则使用默认配置
                 clock_cfg = ClockConfig(clock)
             
             self.clock_configs[clock] = clock_cfg
+        
+        if clock_config:
+            unused = sorted(set(clock_config) - set(clock_signals))
+            if unused:
+                logger.warning(f"时钟配置中的时钟未在设计中检测到，已忽略: {', '.join(unused)}")
     
     def configure_clocks_interactive(self) -> None:
-        """交互式配置时钟属性"""
+        """交互式配置时钟属性，已由时钟配置给出的时钟不再询问"""
+        pending = [clock for clock in self.clock_signals if clock not in self.preset_clocks]
+        if not pending:
+            return
+        
         print("\n时钟配置:")
         print("-" * 40)
         
-        for clock in self.clock_signals:
+        for clock in pending:
             config = self.clock_configs[clock]
             
             # 配置时钟周期
@@ -221,9 +319,11 @@ class SGDCGenerator:
             print("-" * 40)
     
     def configure_clocks_default(self) -> None:
-        """使用默认值配置时钟属性"""
+        """使用默认值配置时钟属性，已由时钟配置给出的时钟保持不变"""
         # 对于每个时钟，使用默认配置
         for clock in self.clock_signals:
+            if clock in self.preset_clocks:
+                continue
             config = self.clock_configs[clock]
             # 可以在这里基于频率名称进行一些智能猜测
             
@@ -266,32 +366,73 @@ class SGDCGenerator:
                         except ValueError:
                             pass  # 忽略非数字的后缀
     
+    def iter_sgdc_lines(self) -> Iterator[str]:
+        """
+        逐行生成SGDC约束文件内容，各部分依次由对应的生成器产生，不在内存中保留整个文件
+        
+        返回:
+            行的迭代器，行中不含结尾的换行符（部分行以换行符开头，用于分隔各部分）
+        """
+        for section in (self._header_lines, self._clock_definition_lines, self._clock_uncertainty_lines,
+                        self._clock_group_lines, self._cdc_lines, self._false_path_lines,
+                        self._multicycle_lines, self._input_delay_lines, self._output_delay_lines,
+                        self._footer_lines):
+            yield from section()
+    
     def generate_sgdc(self) -> str:
         """
-        生成SGDC约束文件内容
+        生成SGDC约束文件内容，大型设计应使用write_sgdc()直接写入文件
         
         返回:
             SGDC文件内容字符串
         """
-        template = []
-        
-        # 文件头
-        template.append("//==============================================================================")
-        template.append(f"// Auto-generated SGDC file for Spyglass CDC analysis")
-        template.append(f"// Module: {self.top_module.name}")
-        template.append(f"// Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        template.append(f"// Generator: AutoSGDC v2.0")
-        template.append("//==============================================================================\n")
+        return "\n".join(self.iter_sgdc_lines())
+    
+    def write_sgdc(self, file_path: str, compress: Optional[bool] = None) -> None:
+        """
+        将SGDC约束文件逐批写入文件，内存占用与CDC信号数量无关，内容与generate_sgdc()相同
         
-        # 时钟定义
-        template.append("//------------------------------------------------------------------------------")
-        template.append("// 时钟定义 (Clock Definitions)")
-        template.append("//------------------------------------------------------------------------------")
+        参数:
+            file_path: 输出文件路径
+            compress: 是否以gzip压缩，None表示文件名以.gz结尾时压缩
+        """
+        if compress is None:
+            compress = file_path.endswith('.gz')
+        if compress:
+            f = gzip.open(file_path, 'wt', encoding='utf-8', compresslevel=GZIP_LEVEL)
+        else:
+            f = open(file_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+        with f:
+            lines = self.iter_sgdc_lines()
+            first = True
+            while True:
+                batch = list(itertools.islice(lines, WRITE_BATCH_LINES))
+                if not batch:
+                    break
+                if not first:
+                    f.write("\n")
+                f.write("\n".join(batch))
+                first = False
+    
+    def _header_lines(self) -> Iterator[str]:
+        """文件头"""
+        yield "//=============================================================================="
+        yield f"// Auto-generated SGDC file for Spyglass CDC analysis"
+        yield f"// Module: {self.top_module.name}"
+        yield f"// Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"// Generator: AutoSGDC v2.0"
+        yield "//==============================================================================\n"
+    
+    def _clock_definition_lines(self) -> Iterator[str]:
+        """时钟定义"""
+        yield "//------------------------------------------------------------------------------"
+        yield "// 时钟定义 (Clock Definitions)"
+        yield "//------------------------------------------------------------------------------"
         
         for clock_name, config in self.clock_configs.items():
             if not config.generated:
                 # 主时钟定义
-                template.append(f"create_clock -name {clock_name} -period {config.period} -waveform {{{config.waveform[0]} {config.waveform[1]}}} [get_ports {clock_name}]")
+                yield f"create_clock -name {clock_name} -period {config.period} -waveform {{{config.waveform[0]} {config.waveform[1]}}} [get_ports {clock_name}]"
             else:
                 # 生成的时钟
                 if config.source:
@@ -301,91 +442,96 @@ class SGDCGenerator:
                         if config.divide_by != 1 or config.multiply_by != 1:
                             # 使用分频/倍频系数
                             period = source_clock.period * config.divide_by / config.multiply_by
-                            template.append(f"# 从 {config.source} 生成，分频系数 = {config.divide_by}，倍频系数 = {config.multiply_by}")
-                            template.append(f"create_generated_clock -name {clock_name} -source [get_ports {config.source}] -divide_by {config.divide_by} -multiply_by {config.multiply_by} -phase {config.phase} [get_pins <clock_generator_pin>]")
+                            yield f"# 从 {config.source} 生成，分频系数 = {config.divide_by}，倍频系数 = {config.multiply_by}"
+                            yield f"create_generated_clock -name {clock_name} -source [get_ports {config.source}] -divide_by {config.divide_by} -multiply_by {config.multiply_by} -phase {config.phase} [get_pins <clock_generator_pin>]"
                         else:
                             # 直接使用周期
-                            template.append(f"# 从 {config.source} 生成")
-                            template.append(f"create_generated_clock -name {clock_name} -source [get_ports {config.source}] -phase {config.phase} [get_pins <clock_generator_pin>]")
+                            yield f"# 从 {config.source} 生成"
+                            yield f"create_generated_clock -name {clock_name} -source [get_ports {config.source}] -phase {config.phase} [get_pins <clock_generator_pin>]"
                     else:
                         # 源时钟不存在，使用默认形式
-                        template.append(f"# 生成的时钟，源时钟未知")
-                        template.append(f"create_generated_clock -name {clock_name} -period {config.period} [get_pins <clock_generator_pin>]")
+                        yield f"# 生成的时钟，源时钟未知"
+                        yield f"create_generated_clock -name {clock_name} -period {config.period} [get_pins <clock_generator_pin>]"
                 else:
                     # 没有指定源时钟，使用默认形式
-                    template.append(f"# 生成的时钟，无源时钟指定")
-                    template.append(f"create_generated_clock -name {clock_name} -period {config.period} [get_pins <clock_generator_pin>]")
-        
-        # 时钟不确定性
-        template.append("\n//------------------------------------------------------------------------------")
-        template.append("// 时钟不确定性 (Clock Uncertainty)")
-        template.append("//------------------------------------------------------------------------------")
+                    yield f"# 生成的时钟，无源时钟指定"
+                    yield f"create_generated_clock -name {clock_name} -period {config.period} [get_pins <clock_generator_pin>]"
+    
+    def _clock_uncertainty_lines(self) -> Iterator[str]:
+        """时钟不确定性"""
+        yield "\n//------------------------------------------------------------------------------"
+        yield "// 时钟不确定性 (Clock Uncertainty)"
+        yield "//------------------------------------------------------------------------------"
         for clock_name, config in self.clock_configs.items():
-            template.append(f"set_clock_uncertainty {config.uncertainty} [get_clocks {clock_name}]")
-        
-        # 异步时钟组
+            yield f"set_clock_uncertainty {config.uncertainty} [get_clocks {clock_name}]"
+    
+    def _clock_group_lines(self) -> Iterator[str]:
+        """异步时钟组，只有一个时钟时没有这一部分"""
         if len(self.clock_signals) > 1:
-            template.append("\n//------------------------------------------------------------------------------")
-            template.append("// 异步时钟组 (Asynchronous Clock Groups)")
-            template.append("//------------------------------------------------------------------------------")
+            yield "\n//------------------------------------------------------------------------------"
+            yield "// 异步时钟组 (Asynchronous Clock Groups)"
+            yield "//------------------------------------------------------------------------------"
             
             # 所有时钟都是异步的情况
             groups = " -group ".join([f"{{{clock}}}" for clock in self.clock_signals])
-            template.append(f"set_clock_groups -asynchronous -group {groups}")
+            yield f"set_clock_groups -asynchronous -group {groups}"
             
             # 注释说明
-            template.append("\n# 注意: 如果某些时钟是同步的，请移除它们并创建单独的时钟组")
-            template.append("# 例如: 如果clk1和clk2是同步的，但与clk3异步:")
-            template.append("# set_clock_groups -asynchronous -group {clk1 clk2} -group {clk3}")
-        
-        # 时钟域交叉约束
+            yield "\n# 注意: 如果某些时钟是同步的，请移除它们并创建单独的时钟组"
+            yield "# 例如: 如果clk1和clk2是同步的，但与clk3异步:"
+            yield "# set_clock_groups -asynchronous -group {clk1 clk2} -group {clk3}"
+    
+    def _cdc_lines(self) -> Iterator[str]:
+        """跨时钟域信号约束，每个CDC信号一行"""
         if any(signals for signals in self.cdc_signals.values()):
-            template.append("\n//------------------------------------------------------------------------------")
-            template.append("// 跨时钟域信号约束 (Clock Domain Crossing Constraints)")
-            template.append("//------------------------------------------------------------------------------")
+            yield "\n//------------------------------------------------------------------------------"
+            yield "// 跨时钟域信号约束 (Clock Domain Crossing Constraints)"
+            yield "//------------------------------------------------------------------------------"
             
             for cdc_path, signals in self.cdc_signals.items():
                 if not signals:
                     continue  # 跳过空路径
                     
                 src_clock, dst_clock = cdc_path.split("->")
-                template.append(f"\n# CDC路径: {src_clock} -> {dst_clock}")
+                yield f"\n# CDC路径: {src_clock} -> {dst_clock}"
                 
                 for signal in signals:
-                    template.append(f"set_cdc_signal -src_clock {src_clock} -dst_clock {dst_clock} [get_nets {signal}]")
+                    yield f"set_cdc_signal -src_clock {src_clock} -dst_clock {dst_clock} [get_nets {signal}]"
                 
-                template.append(f"set_cdc_property -type async -from {src_clock} -to {dst_clock}")
-                template.append("# 提示: 确认上述信号是否需要同步器")
+                yield f"set_cdc_property -type async -from {src_clock} -to {dst_clock}"
+                yield "# 提示: 确认上述信号是否需要同步器"
         else:
-            template.append("\n//------------------------------------------------------------------------------")
-            template.append("// 跨时钟域信号约束 (Clock Domain Crossing Constraints) - 未检测到CDC")
-            template.append("//------------------------------------------------------------------------------")
-            template.append("# 未检测到跨时钟域信号，或CDC信号已有同步器")
+            yield "\n//------------------------------------------------------------------------------"
+            yield "// 跨时钟域信号约束 (Clock Domain Crossing Constraints) - 未检测到CDC"
+            yield "//------------------------------------------------------------------------------"
+            yield "# 未检测到跨时钟域信号，或CDC信号已有同步器"
             
             if len(self.clock_signals) > 1:
-                template.append("# 如果您知道存在CDC路径，请手动添加约束:")
+                yield "# 如果您知道存在CDC路径，请手动添加约束:"
                 for i, src_clock in enumerate(self.clock_signals):
                     for dst_clock in self.clock_signals[i+1:]:
-                        template.append(f"# set_cdc_signal -src_clock {src_clock} -dst_clock {dst_clock} [get_nets <signal_name>]")
-                        template.append(f"# set_cdc_property -type async -from {src_clock} -to {dst_clock}")
-        
-        # 虚假路径排除
-        template.append("\n//------------------------------------------------------------------------------")
-        template.append("// 虚假路径排除 (False Path Exclusions)")
-        template.append("//------------------------------------------------------------------------------")
+                        yield f"# set_cdc_signal -src_clock {src_clock} -dst_clock {dst_clock} [get_nets <signal_name>]"
+                        yield f"# set_cdc_property -type async -from {src_clock} -to {dst_clock}"
+    
+    def _false_path_lines(self) -> Iterator[str]:
+        """虚假路径排除，每对时钟一组模板"""
+        yield "\n//------------------------------------------------------------------------------"
+        yield "// 虚假路径排除 (False Path Exclusions)"
+        yield "//------------------------------------------------------------------------------"
         if len(self.clock_signals) > 1:
-            template.append("# 如果某些跨时钟域路径不需要进行时序分析，可以设置为虚假路径")
+            yield "# 如果某些跨时钟域路径不需要进行时序分析，可以设置为虚假路径"
             for i, src_clock in enumerate(self.clock_signals):
                 for dst_clock in self.clock_signals[i+1:]:
-                    template.append(f"# set_false_path -from [get_clocks {src_clock}] -to [get_clocks {dst_clock}]")
-                    template.append(f"# set_false_path -from [get_clocks {dst_clock}] -to [get_clocks {src_clock}]")
+                    yield f"# set_false_path -from [get_clocks {src_clock}] -to [get_clocks {dst_clock}]"
+                    yield f"# set_false_path -from [get_clocks {dst_clock}] -to [get_clocks {src_clock}]"
         else:
-            template.append("# 单时钟设计，无需设置虚假路径")
-        
-        # 多周期路径
-        template.append("\n//------------------------------------------------------------------------------")
-        template.append("// 多周期路径 (Multicycle Paths)")
-        template.append("//------------------------------------------------------------------------------")
+            yield "# 单时钟设计，无需设置虚假路径"
+    
+    def _multicycle_lines(self) -> Iterator[str]:
+        """多周期路径，每对周期差异较大的时钟一组模板"""
+        yield "\n//------------------------------------------------------------------------------"
+        yield "// 多周期路径 (Multicycle Paths)"
+        yield "//------------------------------------------------------------------------------"
         if len(self.clock_signals) > 1:
             # 尝试基于时钟周期比例推荐多周期路径
             for i, clock_a_name in enumerate(self.clock_signals):
@@ -399,69 +545,71 @@ class SGDCGenerator:
                     
                     if ratio_a_to_b >= 1.5:
                         mc_value = max(2, int(ratio_a_to_b))
-                        template.append(f"# {clock_a_name}到{clock_b_name}的多周期路径 (周期比约为 {ratio_a_to_b:.1f}:1)")
-                        template.append(f"# set_multicycle_path -setup {mc_value} -from [get_clocks {clock_a_name}] -to [get_clocks {clock_b_name}]")
-                        template.append(f"# set_multicycle_path -hold {mc_value-1} -from [get_clocks {clock_a_name}] -to [get_clocks {clock_b_name}]")
+                        yield f"# {clock_a_name}到{clock_b_name}的多周期路径 (周期比约为 {ratio_a_to_b:.1f}:1)"
+                        yield f"# set_multicycle_path -setup {mc_value} -from [get_clocks {clock_a_name}] -to [get_clocks {clock_b_name}]"
+                        yield f"# set_multicycle_path -hold {mc_value-1} -from [get_clocks {clock_a_name}] -to [get_clocks {clock_b_name}]"
                     
                     if ratio_b_to_a >= 1.5:
                         mc_value = max(2, int(ratio_b_to_a))
-                        template.append(f"# {clock_b_name}到{clock_a_name}的多周期路径 (周期比约为 {ratio_b_to_a:.1f}:1)")
-                        template.append(f"# set_multicycle_path -setup {mc_value} -from [get_clocks {clock_b_name}] -to [get_clocks {clock_a_name}]")
-                        template.append(f"# set_multicycle_path -hold {mc_value-1} -from [get_clocks {clock_b_name}] -to [get_clocks {clock_a_name}]")
+                        yield f"# {clock_b_name}到{clock_a_name}的多周期路径 (周期比约为 {ratio_b_to_a:.1f}:1)"
+                        yield f"# set_multicycle_path -setup {mc_value} -from [get_clocks {clock_b_name}] -to [get_clocks {clock_a_name}]"
+                        yield f"# set_multicycle_path -hold {mc_value-1} -from [get_clocks {clock_b_name}] -to [get_clocks {clock_a_name}]"
         else:
-            template.append("# 单时钟设计，可能仍需要设置多周期路径")
-            template.append("# set_multicycle_path -setup <num_cycles> -from [get_pins <source_pin>] -to [get_pins <destination_pin>]")
-            template.append("# set_multicycle_path -hold <num_cycles-1> -from [get_pins <source_pin>] -to [get_pins <destination_pin>]")
-        
-        # 输入输出延迟
-        template.append("\n//------------------------------------------------------------------------------")
-        template.append("// 输入延迟 (Input Delays)")
-        template.append("//------------------------------------------------------------------------------")
-        template.append("# 设置相对于时钟的输入延迟")
+            yield "# 单时钟设计，可能仍需要设置多周期路径"
+            yield "# set_multicycle_path -setup <num_cycles> -from [get_pins <source_pin>] -to [get_pins <destination_pin>]"
+            yield "# set_multicycle_path -hold <num_cycles-1> -from [get_pins <source_pin>] -to [get_pins <destination_pin>]"
+    
+    def _input_delay_lines(self) -> Iterator[str]:
+        """输入延迟"""
+        yield "\n//------------------------------------------------------------------------------"
+        yield "// 输入延迟 (Input Delays)"
+        yield "//------------------------------------------------------------------------------"
+        yield "# 设置相对于时钟的输入延迟"
         if self.clock_signals:
             default_clock = self.clock_signals[0]
             period = self.clock_configs[default_clock].period
             in_delay_max = round(period * 0.3, 2)
             in_delay_min = round(period * 0.1, 2)
             
-            template.append(f"# 默认输入延迟: 最大 = {in_delay_max}ns, 最小 = {in_delay_min}ns")
-            template.append(f"# set_input_delay -clock {default_clock} -max {in_delay_max} [get_ports <input_port>]")
-            template.append(f"# set_input_delay -clock {default_clock} -min {in_delay_min} [get_ports <input_port>]")
+            yield f"# 默认输入延迟: 最大 = {in_delay_max}ns, 最小 = {in_delay_min}ns"
+            yield f"# set_input_delay -clock {default_clock} -max {in_delay_max} [get_ports <input_port>]"
+            yield f"# set_input_delay -clock {default_clock} -min {in_delay_min} [get_ports <input_port>]"
             
             # 对每个端口类型提供模板
-            template.append("\n# 控制信号输入延迟")
-            template.append(f"# set_input_delay -clock {default_clock} -max {in_delay_max} [get_ports {{{self.top_module.name}/control*}}]")
+            yield "\n# 控制信号输入延迟"
+            yield f"# set_input_delay -clock {default_clock} -max {in_delay_max} [get_ports {{{self.top_module.name}/control*}}]"
             
-            template.append("\n# 数据信号输入延迟")
-            template.append(f"# set_input_delay -clock {default_clock} -max {in_delay_max} [get_ports {{{self.top_module.name}/data*}}]")
-        
-        template.append("\n//------------------------------------------------------------------------------")
-        template.append("// 输出延迟 (Output Delays)")
-        template.append("//------------------------------------------------------------------------------")
-        template.append("# 设置相对于时钟的输出延迟")
+            yield "\n# 数据信号输入延迟"
+            yield f"# set_input_delay -clock {default_clock} -max {in_delay_max} [get_ports {{{self.top_module.name}/data*}}]"
+    
+    def _output_delay_lines(self) -> Iterator[str]:
+        """输出延迟"""
+        yield "\n//------------------------------------------------------------------------------"
+        yield "// 输出延迟 (Output Delays)"
+        yield "//------------------------------------------------------------------------------"
+        yield "# 设置相对于时钟的输出延迟"
         if self.clock_signals:
             default_clock = self.clock_signals[0]
             period = self.clock_configs[default_clock].period
             out_delay_max = round(period * 0.3, 2)
             out_delay_min = round(period * 0.1, 2)
             
-            template.append(f"# 默认输出延迟: 最大 = {out_delay_max}ns, 最小 = {out_delay_min}ns")
-            template.append(f"# set_output_delay -clock {default_clock} -max {out_delay_max} [get_ports <output_port>]")
-            template.append(f"# set_output_delay -clock {default_clock} -min {out_delay_min} [get_ports <output_port>]")
+            yield f"# 默认输出延迟: 最大 = {out_delay_max}ns, 最小 = {out_delay_min}ns"
+            yield f"# set_output_delay -clock {default_clock} -max {out_delay_max} [get_ports <output_port>]"
+            yield f"# set_output_delay -clock {default_clock} -min {out_delay_min} [get_ports <output_port>]"
             
             # 对每个端口类型提供模板
-            template.append("\n# 控制信号输出延迟")
-            template.append(f"# set_output_delay -clock {default_clock} -max {out_delay_max} [get_ports {{{self.top_module.name}/control*}}]")
+            yield "\n# 控制信号输出延迟"
+            yield f"# set_output_delay -clock {default_clock} -max {out_delay_max} [get_ports {{{self.top_module.name}/control*}}]"
             
-            template.append("\n# 数据信号输出延迟")
-            template.append(f"# set_output_delay -clock {default_clock} -max {out_delay_max} [get_ports {{{self.top_module.name}/data*}}]")
-        
-        # 结束
-        template.append("\n//==============================================================================")
-        template.append("// 结束 (End of File)")
-        template.append("//==============================================================================")
-        
-        return "\n".join(template)
+            yield "\n# 数据信号输出延迟"
+            yield f"# set_output_delay -clock {default_clock} -max {out_delay_max} [get_ports {{{self.top_module.name}/data*}}]"
+    
+    def _footer_lines(self) -> Iterator[str]:
+        """文件结束"""
+        yield "\n//=============================================================================="
+        yield "// 结束 (End of File)"
+        yield "//=============================================================================="
     
     def generate_report(self) -> str:
         """
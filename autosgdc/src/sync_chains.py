@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+同步器识别模块 - 负责在扇入图上建立触发器链索引，并沿链识别CDC同步器结构
+
+此模块提供:
+- 触发器链索引：寄存器到其唯一驱动寄存器的映射（中间只允许单输入的组合节点，如端口和缓冲线网），以及反向的后继表
+- 沿同步链识别2FF、3FF同步器，格雷码编码的异步FIFO指针同步，以及请求和应答各经一条同步链的握手
+- 同步器的结构类型、级数和各级寄存器
+
+索引在寄存器标注时钟后建立一次；每个跨时钟域信号只沿它自己的扇出和同步链遍历，
+不按名称在目标时钟域中搜索候选信号
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Dict, Set, Optional
+
+from fanin_graph import FaninGraph
+
+# 同步器结构类型
+SYNC_2FF = '2FF'
+SYNC_3FF = '3FF'
+SYNC_HANDSHAKE = 'handshake'
+SYNC_GRAY = 'async_fifo_gray'
+
+# 位宽声明，如[7:0]
+_RANGE_PATTERN = re.compile(r'^\[\s*(\d+)\s*:\s*(\d+)\s*\]$')
+
+
+@dataclass
+class Synchronizer:
+    """识别到的同步器"""
+    source: str                      # 源时钟域中的寄存器节点
+    src_clock: str                   # 源时钟
+    dst_clock: str                   # 目标时钟
+    stages: List[str]                # 同步链各级寄存器节点，移位寄存器写法的向量只列出一次
+    depth: int                       # 同步级数
+    type: str                        # 结构类型：2FF、3FF、handshake、async_fifo_gray
+
+
+class ChainIndex:
+    """触发器链索引，由标注了寄存器时钟的扇入图建立"""
+
+    def __init__(self, graph: FaninGraph):
+        """
+        建立索引：每个寄存器只回溯一次驱动
+
+        参数:
+            graph: 已标注寄存器时钟的扇入图
+        """
+        self.graph = graph
+        self.previous = {}    # 寄存器到其唯一驱动寄存器的映射
+        self.following = {}   # 寄存器到以它为唯一驱动的寄存器列表的映射
+        for register in graph.clocks:
+            driver = self._single_driver(register)
+            if driver is not None:
+                self.previous[register] = driver
+                self.following.setdefault(driver, []).append(register)
+
+    def _single_driver(self, register: str) -> Optional[str]:
+        """
+        沿扇入回溯到唯一的驱动寄存器，途经的组合节点都只能有一个驱动
+
+        移位寄存器写法的同步器对自身的反馈不计入驱动
+        """
+        fanin = self.graph.fanin
+        drivers = fanin.get(register, set())
+        if register in self.graph.shift_registers:
+            drivers = drivers - {register}
+        visited = {register}
+        while len(drivers) == 1:
+            driver = next(iter(drivers))
+            if driver in visited:
+                return None
+            if driver in self.graph.clocks:
+                return driver
+            visited.add(driver)
+            drivers = fanin.get(driver, ())
+        return None
+
+    def chain(self, first: str) -> List[str]:
+        """
+        从同步链的第一级出发，沿唯一的同时钟后继寄存器遍历
+
+        参数:
+            first: 第一级寄存器节点
+
+        返回:
+            同步链各级寄存器节点；后继不唯一或换了时钟时结束
+        """
+        clock = self.graph.clocks.get(first)
+        stages = [first]
+        node = first
+        while True:
+            successors = [r for r in self.following.get(node, ()) if self.graph.clocks.get(r) == clock]
+            if len(successors) != 1 or successors[0] in stages:
+                return stages
+            node = successors[0]
+            stages.append(node)
+
+    def synchronizer(self, source: str, dst_clock: str) -> Optional[Synchronizer]:
+        """
+        判断源寄存器进入目标时钟域的路径是否经过同步链
+
+        源寄存器在目标时钟域中到达的寄存器必须只有一个，且以源寄存器为唯一驱动；
+        多位的第一级只在源寄存器为格雷码时视为同步（异步FIFO指针），否则是多位总线直接跨时钟域
+
+        参数:
+            source: 源寄存器节点
+            dst_clock: 目标时钟
+
+        返回:
+            同步器，未经过同步链时返回None
+        """
+        reached = self._reached_registers(source, dst_clock)
+        if len(reached) != 1 or self.previous.get(reached[0]) != source:
+            return None
+        first = reached[0]
+        stages = self.chain(first)
+        if first in self.graph.shift_registers:
+            depth = (self.bit_width(first) or 2) + len(stages) - 1
+        else:
+            depth = len(stages)
+        if depth < 2:
+            return None
+
+        gray = self._is_gray(source)
+        if first not in self.graph.shift_registers and self.bit_width(first) != 1 and not gray:
+            return None
+        if gray:
+            sync_type = SYNC_GRAY
+        else:
+            sync_type = SYNC_3FF if depth >= 3 else SYNC_2FF
+        return Synchronizer(source, self.graph.clocks[source], dst_clock, stages, depth, sync_type)
+
+    def mark_handshakes(self, synchronizers: List[Synchronizer]) -> None:
+        """
+        将请求和应答配对的同步器标为握手：应答寄存器在请求的同步链上或由链上寄存器直接驱动，
+        经同步链回到请求的时钟域，且应答同步链又驱动请求寄存器（闭合的请求/应答环）
+
+        参数:
+            synchronizers: synchronizer()识别到的同步器，类型被原地修改
+        """
+        by_source = {sync.source: sync for sync in synchronizers if sync.type != SYNC_GRAY}
+        for sync in synchronizers:
+            if sync.type == SYNC_GRAY:
+                continue
+            for node in sync.stages:
+                for candidate in [node] + self.following.get(node, []):
+                    reply = by_source.get(candidate)
+                    if (reply is not None and reply is not sync and reply.dst_clock == sync.src_clock
+                            and self._register_drivers(sync.source) & set(reply.stages)):
+                        sync.type = reply.type = SYNC_HANDSHAKE
+
+    def bit_width(self, node: str) -> Optional[int]:
+        """
+        节点的声明位宽
+
+        参数:
+            node: "实例路径.信号名"
+
+        返回:
+            位数，标量为1；位宽由参数给出等无法确定时返回None
+        """
+        path, name = node.rsplit('.', 1)
+        module = self.graph.instances.get(path)
+        if module is None:
+            return None
+        declaration = module.signals.get(name) or module.ports.get(name)
+        if declaration is None:
+            return None
+        width = declaration.width.strip()
+        if not width:
+            return 1
+        match = _RANGE_PATTERN.match(width)
+        if not match:
+            return None
+        return abs(int(match.group(1)) - int(match.group(2))) + 1
+
+    def _reached_registers(self, source: str, dst_clock: str) -> List[str]:
+        """沿扇出穿过组合节点，找出源寄存器在目标时钟域中直接到达的寄存器"""
+        fanout = self.graph.fanout
+        clocks = self.graph.clocks
+        reached = []
+        visited = {source}
+        queue = deque([source])
+        while queue:
+            for load in fanout.get(queue.popleft(), ()):
+                if load in visited:
+                    continue
+                visited.add(load)
+                clock = clocks.get(load)
+                if clock is None:
+                    queue.append(load)
+                elif clock == dst_clock:
+                    reached.append(load)
+        return reached
+
+    def _register_drivers(self, register: str) -> Set[str]:
+        """沿扇入穿过组合节点，找出直接驱动寄存器的寄存器"""
+        fanin = self.graph.fanin
+        clocks = self.graph.clocks
+        drivers = set()
+        visited = {register}
+        queue = deque([register])
+        while queue:
+            for driver in fanin.get(queue.popleft(), ()):
+                if driver in visited:
+                    continue
+                visited.add(driver)
+                if driver in clocks:
+                    drivers.add(driver)
+                else:
+                    queue.append(driver)
+        return drivers
+
+    def _is_gray(self, source: str) -> bool:
+        """源寄存器由格雷码表达式赋值，或其直接驱动节点是格雷码"""
+        gray_nodes = self.graph.gray_nodes
+        if source in gray_nodes:
+            return True
+        return any(driver in gray_nodes for driver in self.graph.fanin.get(source, ()))
@@ -13,15 +13,28 @@ Verilog解析器模块 - 负责解析Verilog文件并提取关键信息
 
 import os
 import re
+import mmap
+import time
 import logging
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Tuple, Set, Optional, Union, Any
 from dataclasses import dataclass, field
 
 from utils import setup_logger, is_clock_name, is_reset_name, remove_comments
+from include_cache import get_include_cache, stats_delta, format_stats
+from design_db import DesignDatabase, content_hash
 
 # 设置日志
 logger = setup_logger('verilog_parser')
 
+# 内存映射路径中定位模块的字节正则：注释整体跳过，其余只识别模块头和endmodule，
+# 与文本路径中 module\s+(\w+)[\s\S]*?endmodule 在去注释内容上的匹配范围一致
+MODULE_SPAN_PATTERN = re.compile(rb'//[^\n]*|/\*.*?\*/|(endmodule)|module\s+(\w+)', re.DOTALL)
+
+# 端口列表中的ANSI风格端口声明：方向、类型、位宽和端口名
+ANSI_PORT_PATTERN = re.compile(r'(input|output|inout)\s+(?:(reg|wire|logic)\b)?\s*(\[[^\]]*\])?\s*(\w+)$')
+
 @dataclass
 class VerilogPort:
     """Verilog端口定义"""
@@ -69,6 +82,42 @@ class VerilogModule:
     signals: Dict[str, VerilogSignal] = field(default_factory=dict)  # 内部信号
     instances: List[ModuleInstance] = field(default_factory=list)  # 模块实例
     is_instantiated: bool = False    # 是否被其他模块实例化
+    clock_domain_cache: Optional[Dict[str, Set[str]]] = field(default=None, repr=False, compare=False)  # 时钟域划分结果
+    
+    def to_compact(self) -> tuple:
+        """
+        转换为紧凑的元组形式，用于在进程间传递（不含字段名和可重新计算的时钟、复位标志）
+        
+        返回:
+            (名称, 文件路径, 内容, 端口元组, 信号元组, 实例元组)
+        """
+        return (
+            self.name, self.file_path, self.content,
+            tuple((p.name, p.direction, p.width, p.is_reg, p.is_wire) for p in self.ports.values()),
+            tuple((s.name, s.type, s.width) for s in self.signals.values()),
+            tuple((i.module_name, i.instance_name, tuple(i.port_connections.items())) for i in self.instances),
+        )
+    
+    @classmethod
+    def from_compact(cls, data: tuple) -> 'VerilogModule':
+        """
+        由to_compact()的结果重建模块对象
+        
+        参数:
+            data: to_compact()返回的元组
+            
+        返回:
+            模块对象
+        """
+        name, file_path, content, ports, signals, instances = data
+        module = cls(name=name, file_path=file_path, content=content)
+        for port_name, direction, width, is_reg, is_wire in ports:
+            module.ports[port_name] = VerilogPort(port_name, direction, width, is_reg, is_wire)
+        for signal_name, signal_type, width in signals:
+            module.signals[signal_name] = VerilogSignal(signal_name, signal_type, width)
+        for module_name, instance_name, connections in instances:
+            module.instances.append(ModuleInstance(module_name, instance_name, dict(connections)))
+        return module
     
     def identify_clock_signals(self) -> List[str]:
         """识别模块中的时钟信号"""
@@ -91,6 +140,19 @@ class VerilogModule:
         """
         识别模块中的时钟域和属于每个时钟域的信号
         
+        结果按模块定义缓存，同一模块被多次实例化时只分析一次；调用者不应修改返回的字典
+        
+        返回:
+            字典，键为时钟名，值为这个时钟域中的信号集合
+        """
+        if self.clock_domain_cache is None:
+            self.clock_domain_cache = self.extract_clock_domains()
+        return self.clock_domain_cache
+    
+    def extract_clock_domains(self) -> Dict[str, Set[str]]:
+        """
+        分析always块的敏感列表，划分模块中的时钟域（不使用缓存）
+        
         返回:
             字典，键为时钟名，值为这个时钟域中的信号集合
         """
@@ -123,34 +185,41 @@ class VerilogModule:
             for clock in clocks:
                 # 检查时钟是否在敏感列表中
                 if re.search(rf'\b{re.escape(clock)}\b', sensitivity):
-                    # 确认是在上升沿或下降沿
-                    if re.search(rf'pos\w*\s*\(\s*{re.escape(clock)}\s*\)', sensitivity) or \
-                       re.search(rf'neg\w*\s*\(\s*{re.escape(clock)}\s*\)', sensitivity):
+                    # 确认是在上升沿或下降沿，支持 posedge clk 和 posedge(clk) 两种写法
+                    if re.search(rf'(?:pos|neg)edge\s*\(?\s*{re.escape(clock)}\b', sensitivity):
                         block_clock = clock
                         break
             
             # 如果找到了时钟，提取这个always块中赋值的信号
             if block_clock:
-                # 查找非阻塞赋值 (<=)
-                assignments = re.findall(r'(\w+)\s*<=', block_content)
+                # 查找非阻塞赋值 (<=)，左侧可以带位选择或是拼接（移位寄存器写法的同步链）
+                assignments = []
+                for lvalue in re.findall(r'(\{[^{}]*\}|\w+)\s*(?:\[[^\[\]]*\]\s*)*<=', block_content):
+                    assignments.extend(re.findall(r'\w+', lvalue) if lvalue.startswith('{') else [lvalue])
                 
-                # 添加到对应的时钟域
+                # 添加到对应的时钟域，包括output reg端口
                 for signal in assignments:
                     if signal in self.signals and self.signals[signal].type == 'reg':
                         clock_domains[block_clock].add(signal)
+                    elif signal in self.ports and self.ports[signal].is_reg:
+                        clock_domains[block_clock].add(signal)
         
         return clock_domains
 
 class VerilogParser:
     """Verilog文件解析器"""
     
-    def __init__(self, verilog_files: Union[str, List[str]], include_dirs: List[str] = None):
+    def __init__(self, verilog_files: Union[str, List[str]], include_dirs: List[str] = None,
+                 use_mmap: bool = False, jobs: int = 1, database: Optional[DesignDatabase] = None):
         """
         初始化解析器
         
         参数:
             verilog_files: 单个Verilog文件路径或文件路径列表
             include_dirs: 包含目录列表，用于查找include文件
+            use_mmap: 是否通过内存映射读取文件，只解码模块内容（用于大型ASCII RTL）
+            jobs: 并行解析文件的进程数，0表示使用全部CPU核心
+            database: 可选的设计数据库，未变化的文件直接从数据库载入，其余文件解析后保存
         """
         if isinstance(verilog_files, str):
             self.verilog_files = [verilog_files]
@@ -158,24 +227,128 @@ class VerilogParser:
             self.verilog_files = verilog_files
             
         self.include_dirs = include_dirs or []
+        self.include_cache = get_include_cache(self.include_dirs)
+        self.include_stats = stats_delta({}, {})  # 最近一次parse_all()的包含文件统计
+        self.use_mmap = use_mmap
+        self.jobs = jobs
+        self.database = database
         self.modules = {}  # 所有解析到的模块
+        self.include_dependencies = []  # 展开过的头文件状态 (路径, 修改时间, 大小)，探测过但不存在的路径为 (路径, None, None)
+        self.stats = {'files': 0, 'bytes': 0, 'seconds': 0.0, 'jobs': 1, 'cached': 0}  # 最近一次parse_all()的统计
     
     def parse_all(self) -> Dict[str, VerilogModule]:
         """
         解析所有指定的Verilog文件
         
+        jobs不为1且有多个文件时，文件在进程池中并行解析，模块以紧凑形式返回后按文件顺序合并，
+        结果与顺序解析相同（同名模块以后出现的定义为准）
+        
+        使用设计数据库时，内容和依赖的头文件都未变化的文件直接从数据库载入（包括时钟域划分），
+        只有其余文件被解析，解析结果连同时钟域划分保存到数据库
+        
         返回:
             字典，键为模块名，值为模块对象
         """
-        # 首先解析所有文件中的模块
-        for file_path in self.verilog_files:
-            self._parse_file(file_path)
+        start = time.perf_counter()
+        jobs = self.jobs if self.jobs > 0 else (os.cpu_count() or 1)
+        jobs = min(jobs, len(self.verilog_files))
+        
+        # 首先解析所有文件中的模块，工作进程各自的包含文件统计随结果返回后累加
+        include_stats = stats_delta({}, {})
+        cached = 0
+        if self.database is not None:
+            include_stats, cached = self._parse_with_database(jobs)
+        elif jobs > 1:
+            worker = partial(_parse_file_compact, include_dirs=self.include_dirs, use_mmap=self.use_mmap)
+            chunksize = max(1, len(self.verilog_files) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                for compact_modules, file_stats in executor.map(worker, self.verilog_files, chunksize=chunksize):
+                    for data in compact_modules:
+                        self.modules[data[0]] = VerilogModule.from_compact(data)
+                    for key, value in file_stats.items():
+                        include_stats[key] += value
+        else:
+            before = self.include_cache.snapshot()
+            for file_path in self.verilog_files:
+                self._parse_file(file_path)
+            include_stats = stats_delta(before, self.include_cache.snapshot())
+        self.include_stats = include_stats
+        if include_stats['references']:
+            logger.info(format_stats(include_stats))
         
         # 然后构建模块实例化关系
         self._build_instance_relationships()
         
+        self.stats = {
+            'files': len(self.verilog_files),
+            'bytes': sum(os.path.getsize(path) for path in self.verilog_files if os.path.isfile(path)),
+            'seconds': time.perf_counter() - start,
+            'jobs': max(jobs, 1),
+            'cached': cached,
+        }
         return self.modules
     
+    def throughput(self) -> str:
+        """
+        最近一次parse_all()的解析吞吐量
+        
+        返回:
+            形如"解析 120 个文件 (3.4 MB) 用时 0.52 秒: 230.8 文件/秒, 6.5 MB/秒 (4 进程)"的描述
+        """
+        seconds = max(self.stats['seconds'], 1e-9)
+        megabytes = self.stats['bytes'] / (1024 * 1024)
+        text = (f"解析 {self.stats['files']} 个文件 ({megabytes:.1f} MB) 用时 {self.stats['seconds']:.2f} 秒: "
+                f"{self.stats['files'] / seconds:.1f} 文件/秒, {megabytes / seconds:.1f} MB/秒 "
+                f"({self.stats['jobs']} 进程)")
+        if self.stats['cached']:
+            text += f", 其中 {self.stats['cached']} 个文件从设计数据库载入"
+        return text
+    
+    def _parse_with_database(self, jobs: int) -> Tuple[Dict[str, int], int]:
+        """
+        通过设计数据库解析所有文件：未变化的文件直接载入，其余文件（并行）解析后保存
+        
+        参数:
+            jobs: 进程数
+            
+        返回:
+            (包含文件统计, 从数据库载入的文件数)
+        """
+        include_stats = stats_delta({}, {})
+        records = {}
+        misses = []
+        for file_path in self.verilog_files:
+            entries = self.database.lookup(file_path)
+            if entries is None:
+                misses.append(file_path)
+            else:
+                records[file_path] = entries
+        cached = len(records)
+        
+        if misses:
+            worker = partial(_parse_file_record, include_dirs=self.include_dirs, use_mmap=self.use_mmap)
+            if jobs > 1 and len(misses) > 1:
+                chunksize = max(1, len(misses) // (jobs * 4))
+                with ProcessPoolExecutor(max_workers=jobs) as executor:
+                    results = list(executor.map(worker, misses, chunksize=chunksize))
+            else:
+                results = [worker(file_path) for file_path in misses]
+            for file_path, (entries, file_stats, state) in zip(misses, results):
+                records[file_path] = entries
+                for key, value in file_stats.items():
+                    include_stats[key] += value
+                if state is not None:
+                    self.database.store(file_path, state, entries)
+            self.database.commit()
+        
+        # 按文件顺序合并，同名模块以后出现的定义为准
+        for file_path in self.verilog_files:
+            for data, clock_domains in records[file_path]:
+                module = VerilogModule.from_compact(data)
+                module.clock_domain_cache = clock_domains
+                self.modules[module.name] = module
+        return include_stats, cached
+    
     def _parse_file(self, file_path: str) -> None:
         """
         解析单个Verilog文件
@@ -184,6 +357,10 @@ class VerilogParser:
             file_path: Verilog文件路径
         """
         try:
+            # 内存映射路径，文件包含`include时回退到文本路径
+            if self.use_mmap and self._parse_file_mapped(file_path):
+                return
+            
             # 读取文件内容
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -199,9 +376,42 @@ class VerilogParser:
             import traceback
             logger.debug(traceback.format_exc())
     
+    def _parse_file_mapped(self, file_path: str) -> bool:
+        """
+        通过内存映射解析单个Verilog文件
+        
+        在文件字节上直接定位模块范围，只有模块内容被解码和去除注释，
+        模块之外的内容（注释、编译指令等）不解码，也不在内存中复制整个文件
+        
+        参数:
+            file_path: Verilog文件路径
+            
+        返回:
+            是否已完成解析；文件包含`include指令时返回False，由文本路径处理
+        """
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return True
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if buffer.find(b'`include') != -1:
+                    return False
+                start = None
+                module_name = None
+                for match in MODULE_SPAN_PATTERN.finditer(buffer):
+                    if match.group(2) is not None:
+                        if start is None:
+                            start = match.start()
+                            module_name = match.group(2).decode('ascii')
+                    elif match.group(1) is not None and start is not None:
+                        module_content = remove_comments(buffer[start:match.end()].decode('utf-8'))
+                        self._add_module(module_name, module_content, file_path)
+                        start = None
+                        module_name = None
+        return True
+    
     def _process_includes(self, content: str, base_dir: str) -> str:
         """
-        处理Verilog文件中的include指令
+        处理Verilog文件中的include指令，递归展开，头文件通过进程内共享的缓存读取
         
         参数:
             content: 文件内容
@@ -210,37 +420,7 @@ class VerilogParser:
         返回:
             处理后的内容
         """
-        def replace_include(match):
-            include_file = match.group(1).strip('"\'')
-            
-            # 查找include文件
-            include_path = None
-            
-            # 首先检查相对于当前文件的路径
-            rel_path = os.path.join(base_dir, include_file)
-            if os.path.exists(rel_path):
-                include_path = rel_path
-            else:
-                # 然后检查include目录
-                for inc_dir in self.include_dirs:
-                    inc_path = os.path.join(inc_dir, include_file)
-                    if os.path.exists(inc_path):
-                        include_path = inc_path
-                        break
-            
-            if include_path:
-                try:
-                    with open(include_path, 'r', encoding='utf-8') as f:
-                        return f.read()
-                except Exception as e:
-                    logger.warning(f"读取包含文件 {include_path} 时出错: {str(e)}")
-                    return f"// ERROR: 无法读取包含文件 {include_file}"
-            else:
-                logger.warning(f"找不到包含文件: {include_file}")
-                return f"// ERROR: 找不到包含文件 {include_file}"
-        
-        # 替换所有`include指令
-        return re.sub(r'`include\s+(["\']\S+["\'])', replace_include, content)
+        return self.include_cache.expand(content, base_dir, self.include_dependencies)
     
     def _extract_modules(self, content: str, file_path: str) -> None:
         """
@@ -258,29 +438,37 @@ class VerilogParser:
         module_pattern = r'module\s+(\w+)[\s\S]*?endmodule'
         
         for match in re.finditer(module_pattern, content_no_comments):
-            module_content = match.group(0)
-            module_name = match.group(1)
-            
-            logger.debug(f"在文件 {file_path} 中找到模块: {module_name}")
-            
-            # 创建模块对象
-            module = VerilogModule(
-                name=module_name,
-                file_path=file_path,
-                content=module_content
-            )
-            
-            # 提取端口
-            self._extract_ports(module)
-            
-            # 提取内部信号
-            self._extract_signals(module)
-            
-            # 提取模块实例化
-            self._extract_instances(module)
-            
-            # 添加到模块字典
-            self.modules[module_name] = module
+            self._add_module(match.group(1), match.group(0), file_path)
+    
+    def _add_module(self, module_name: str, module_content: str, file_path: str) -> None:
+        """
+        创建模块对象并提取端口、信号和实例
+        
+        参数:
+            module_name: 模块名称
+            module_content: 去除注释后的模块内容
+            file_path: 文件路径
+        """
+        logger.debug(f"在文件 {file_path} 中找到模块: {module_name}")
+        
+        # 创建模块对象
+        module = VerilogModule(
+            name=module_name,
+            file_path=file_path,
+            content=module_content
+        )
+        
+        # 提取端口
+        self._extract_ports(module)
+        
+        # 提取内部信号
+        self._extract_signals(module)
+        
+        # 提取模块实例化
+        self._extract_instances(module)
+        
+        # 添加到模块字典
+        self.modules[module_name] = module
     
     def _extract_ports(self, module: VerilogModule) -> None:
         """
@@ -296,12 +484,22 @@ class VerilogParser:
         if port_list_match:
             port_list = port_list_match.group(1).strip()
             
-            # 提取所有端口名称
+            # 提取所有端口名称，ANSI风格的端口（input wire [7:0] name）直接记录方向和类型
             port_names = []
+            ansi_defs = {}
             for port in re.split(r',\s*', port_list):
                 port = port.strip()
-                if port:
-                    port_names.append(port)
+                if not port:
+                    continue
+                ansi_match = ANSI_PORT_PATTERN.match(port)
+                if ansi_match:
+                    port = ansi_match.group(4)
+                    ansi_defs[port] = {
+                        'direction': ansi_match.group(1),
+                        'type': ansi_match.group(2) or "",
+                        'width': ansi_match.group(3) or ""
+                    }
+                port_names.append(port)
             
             # 查找端口方向和类型定义
             port_defs = {}
@@ -360,6 +558,8 @@ class VerilogParser:
                         'width': width_str
                     }
             
+            port_defs.update(ansi_defs)
+            
             # 创建端口对象
             for name in port_names:
                 if name in port_defs:
@@ -496,4 +696,52 @@ class VerilogParser:
         # 计算可能的顶层模块
         top_candidates = [m.name for m in self.modules.values() if not m.is_instantiated]
         if top_candidates:
-            logger.debug(f"可能的顶层模块: {', '.join(top_candidates)}") 
\ No newline at end of file
+            logger.debug(f"可能的顶层模块: {', '.join(top_candidates)}") 
+
+
+def _parse_file_compact(file_path: str, include_dirs: List[str],
+                        use_mmap: bool) -> Tuple[List[tuple], Dict[str, int]]:
+    """
+    在工作进程中解析单个文件，包含文件缓存在同一工作进程处理的文件之间共享
+    
+    参数:
+        file_path: Verilog文件路径
+        include_dirs: 包含目录列表
+        use_mmap: 是否通过内存映射读取文件
+        
+    返回:
+        (文件中模块的紧凑形式列表, 本文件的包含文件统计)，紧凑形式见VerilogModule.to_compact()
+    """
+    parser = VerilogParser(file_path, include_dirs=include_dirs, use_mmap=use_mmap)
+    before = parser.include_cache.snapshot()
+    parser._parse_file(file_path)
+    return ([module.to_compact() for module in parser.modules.values()],
+            stats_delta(before, parser.include_cache.snapshot()))
+
+
+def _parse_file_record(file_path: str, include_dirs: List[str],
+                       use_mmap: bool) -> Tuple[List[Tuple[tuple, Dict[str, Set[str]]]], Dict[str, int], Optional[tuple]]:
+    """
+    解析单个文件并计算时钟域划分，得到保存到设计数据库的记录（可在工作进程中运行）
+    
+    参数:
+        file_path: Verilog文件路径
+        include_dirs: 包含目录列表
+        use_mmap: 是否通过内存映射读取文件
+        
+    返回:
+        ((模块紧凑形式, 时钟域划分) 列表, 本文件的包含文件统计, 文件状态)，
+        文件状态为 (内容摘要, 修改时间, 大小, 依赖的头文件状态列表)，文件无法读取时为None
+    """
+    try:
+        st = os.stat(file_path)
+        file_hash = content_hash(file_path)
+    except OSError as e:
+        logger.error(f"读取文件 {file_path} 时出错: {str(e)}")
+        return [], stats_delta({}, {}), None
+    parser = VerilogParser(file_path, include_dirs=include_dirs, use_mmap=use_mmap)
+    before = parser.include_cache.snapshot()
+    parser._parse_file(file_path)
+    entries = [(module.to_compact(), module.find_clock_domains()) for module in parser.modules.values()]
+    state = (file_hash, st.st_mtime_ns, st.st_size, parser.include_dependencies)
+    return entries, stats_delta(before, parser.include_cache.snapshot()), state
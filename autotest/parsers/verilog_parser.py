@@ -271,10 +271,10 @@ class VerilogParser:
         """解析信号和参数"""
         for line in module_lines:
             # 解析参数
-            param_match = re.search(r"^\s*(parameter|localparam)\s+(\w+)\s*=\s*([\$\(\)\w\']+)", line)
-            if param_match:
+            param_match = re.search(r"^\s*(parameter|localparam)\s+(\w+)\s*=\s*([^,;]+)", line)
+            param_value = self._param_value(param_match.group(3)) if param_match else None
+            if param_value:
                 param_name = param_match.group(2)
-                param_value = param_match.group(3)
                 self.parameters.append(param_name)
                 self.param_dict[param_name] = param_value
                 continue
@@ -312,6 +312,23 @@ class VerilogParser:
                             self.signals.append(signal)
                             self.signal_dict[name] = signal
     
+    def _param_value(self, value):
+        """
+        取出参数值表达式
+        
+        去除两端的空白和模块头参数列表结尾多余的右括号；跨行或含逗号的值（如拼接）括号不完整，
+        只取开头的简单部分。不以数字、标识符、$或括号开头的值（如宏、拼接）不作为参数
+        """
+        value = value.strip()
+        while value.endswith(')') and value.count(')') > value.count('('):
+            value = value[:-1].rstrip()
+        match = re.match(r"[\$\(\)\w\']+", value)
+        if not match:
+            return None
+        if any(value.count(left) != value.count(right) for left, right in ('()', '[]', '{}')):
+            return match.group(0)
+        return value
+    
     def _find_valid_ready_relationships(self):
         """查找valid和ready信号之间的关系"""
         # 查找valid信号对应的ready信号
@@ -4,11 +4,14 @@ Verilog自动线网声明工具 (Auto Wire Generator)
 版本：2.0.0
 """
 
+__version__ = "2.0.0"
+
 from .core.parser import VerilogParser
 from .core.analyzer import SignalAnalyzer
 from .core.generator import CodeGenerator
 from .config.config import Config
+from .api import analyze_text, analyze_many, AnalysisResult
 from .cli.main import main
 
-__version__ = "2.0.0"
-__all__ = ['VerilogParser', 'SignalAnalyzer', 'CodeGenerator', 'Config', 'main']
+__all__ = ['VerilogParser', 'SignalAnalyzer', 'CodeGenerator', 'Config', 'analyze_text', 'analyze_many',
+           'AnalysisResult', 'main']
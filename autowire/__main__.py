@@ -3,7 +3,9 @@
 允许直接执行模块：python -m autowire
 """
 
+import sys
+
 from .cli.main import main
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
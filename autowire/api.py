@@ -0,0 +1,138 @@
+"""
+库接口模块
+直接分析内存中的Verilog源代码并以数据形式返回结果，不读写任何文件，
+便于在其他代码生成流程中串联使用
+
+用法:
+    from autowire import analyze_text, analyze_many
+
+    result = analyze_text(rtl_source)
+    print(result.declaration_block)
+
+    for result in analyze_many([('a.v', source_a), ('b.v', source_b)], config):
+        print(result.name, result.undefined_signals)
+"""
+
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .core.parser import VerilogParser
+from .core.analyzer import SignalAnalyzer
+from .core.generator import CodeGenerator
+from .core.signal_filter import SignalFilter
+from .core.profiling import PhaseProfiler, profile_phase
+from .config.config import Config
+
+
+class AnalysisResult:
+    """单个源代码的分析结果"""
+
+    def __init__(self, name: str, module_name: str, undefined_signals: List[str],
+                 signal_widths: Dict[str, Optional[str]], definitions: Dict[str, str],
+                 declaration_block: str, parameter_cycles: List[List[str]],
+                 profile: Optional[Dict[str, Any]] = None):
+        """
+        初始化分析结果
+
+        参数:
+            name: 源代码名称（如文件名），只用于标识
+            module_name: 模块名
+            undefined_signals: 未定义信号列表，按出现顺序排列
+            signal_widths: 信号名到推断位宽的字典，无法推断时为None
+            definitions: 信号名到wire声明的有序字典，已应用默认位宽
+            declaration_block: 按配置的输出格式生成的内容，与输出文件的内容相同；没有未定义信号时为空字符串
+            parameter_cycles: 参数循环引用路径列表
+            profile: 分阶段剖析记录，见PhaseProfiler.to_dict()，未剖析时为None
+        """
+        self.name = name
+        self.module_name = module_name
+        self.undefined_signals = undefined_signals
+        self.signal_widths = signal_widths
+        self.definitions = definitions
+        self.declaration_block = declaration_block
+        self.parameter_cycles = parameter_cycles
+        self.profile = profile
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的字典"""
+        return {
+            'name': self.name,
+            'module_name': self.module_name,
+            'undefined_signals': self.undefined_signals,
+            'signal_widths': self.signal_widths,
+            'definitions': list(self.definitions.values()),
+            'declaration_block': self.declaration_block,
+            'parameter_cycles': self.parameter_cycles,
+            'profile': self.profile,
+        }
+
+    def __repr__(self) -> str:
+        return f"AnalysisResult(name={self.name!r}, undefined_signals={self.undefined_signals!r})"
+
+
+def analyze_text(source: str, config: Optional[Config] = None, name: str = "",
+                 profiler: Optional[PhaseProfiler] = None) -> AnalysisResult:
+    """
+    分析一段Verilog源代码
+
+    参数:
+        source: 源代码
+        config: 配置对象，使用其中的排除模式、默认位宽、宏定义和头文件搜索路径；为None时使用默认配置
+        name: 源代码名称，只用于标识结果
+        profiler: 分阶段剖析器，记录结果见AnalysisResult.profile
+
+    返回:
+        分析结果
+    """
+    config = config or Config()
+    return _analyze(source, name, config, config.get_signal_filter(), profiler)
+
+
+def analyze_many(sources: Iterable[Union[str, Tuple[str, str]]],
+                 config: Optional[Config] = None, profile: bool = False) -> Iterator[AnalysisResult]:
+    """
+    逐个分析多段Verilog源代码，排除模式只编译一次，结果按输入顺序逐个产生
+
+    参数:
+        sources: 源代码，或 (名称, 源代码) 元组的可迭代对象
+        config: 配置对象，见analyze_text()
+        profile: 是否剖析每段源代码，记录可用aggregate_profiles()汇总
+
+    返回:
+        分析结果的迭代器
+    """
+    config = config or Config()
+    signal_filter = config.get_signal_filter()
+    for index, item in enumerate(sources):
+        name, source = item if isinstance(item, tuple) else (f"<source {index}>", item)
+        profiler = PhaseProfiler(name) if profile else None
+        yield _analyze(source, name, config, signal_filter, profiler)
+
+
+def _analyze(source: str, name: str, config: Config, signal_filter: SignalFilter,
+             profiler: Optional[PhaseProfiler] = None) -> AnalysisResult:
+    """解析并分析源代码，生成声明代码块"""
+    with profiler.active() if profiler is not None else nullcontext():
+        parser = VerilogParser(profiler=profiler, defines=config.defines, include_dirs=config.include_dirs)
+        parser.parse_text(source, name)
+        analyzer = SignalAnalyzer()
+        analyzer.setup(parser, exclude_patterns=signal_filter, default_width=config.default_width)
+        analyzer.analyze()
+
+        declaration_block = ""
+        if analyzer.undefined_signals:
+            generator = CodeGenerator()
+            generator.setup(analyzer, name, emitter=config.emit)
+            with profile_phase(profiler, 'generate'):
+                declaration_block = ''.join(generator.generate())
+
+    return AnalysisResult(
+        name=name,
+        module_name=parser.module_name,
+        undefined_signals=analyzer.undefined_signals,
+        signal_widths=analyzer.signal_widths,
+        definitions=analyzer.get_signal_definitions(),
+        declaration_block=declaration_block,
+        parameter_cycles=parser.parameter_cycles,
+        profile=profiler.to_dict() if profiler is not None else None,
+    )
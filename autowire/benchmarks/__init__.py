@@ -0,0 +1,4 @@
+"""
+性能基准测试包
+包含合成Verilog生成器和各阶段的计时脚本
+"""
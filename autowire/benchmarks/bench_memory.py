@@ -0,0 +1,143 @@
+"""
+解析内存基准测试
+在独立子进程中分别以整体读入、流式和内存映射方式解析合成网表，
+对比峰值内存、第一个词法单元的延迟和完整分析的耗时
+
+用法:
+    python -m autowire.benchmarks.bench_memory
+    python -m autowire.benchmarks.bench_memory --lines 100000 1000000
+    python -m autowire.benchmarks.bench_memory --size-mb 1024 --modes stream mmap
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+from ..core.parser import VerilogParser
+from ..core.lexer import tokenize, tokenize_stream, tokenize_buffer
+from ..core.utils import read_file, iter_file_chunks, map_file, peak_memory_mb
+from .synthetic import generate_module, write_module
+
+# 解析方式
+MODES = ('whole', 'stream', 'mmap')
+
+
+def measure(file_path: str, mode: str) -> Dict:
+    """
+    在子进程中解析文件并测量峰值内存，避免不同测试项之间互相影响
+
+    参数:
+        file_path: Verilog文件路径
+        mode: 解析方式，whole/stream/mmap
+
+    返回:
+        测量结果字典，包含峰值内存(MB)、第一个词法单元的延迟、完整分析耗时和未定义信号数
+    """
+    command = [sys.executable, '-m', 'autowire.benchmarks.bench_memory', '--child', file_path, '--mode', mode]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def _first_token_seconds(file_path: str, mode: str) -> float:
+    """测量从打开文件到得到第一个词法单元的耗时"""
+    start = time.perf_counter()
+    if mode == 'whole':
+        next(tokenize(read_file(file_path)), None)
+    elif mode == 'stream':
+        next(tokenize_stream(iter_file_chunks(file_path)), None)
+    else:
+        with map_file(file_path) as buffer:
+            tokens = tokenize_buffer(buffer)
+            next(tokens, None)
+            tokens.close()
+    return time.perf_counter() - start
+
+
+def _child(file_path: str, mode: str) -> int:
+    """子进程入口：解析文件并以JSON输出测量结果"""
+    first_token = _first_token_seconds(file_path, mode)
+    start = time.perf_counter()
+    parser = VerilogParser()
+    if mode == 'stream':
+        parser.parse_stream(file_path)
+    elif mode == 'mmap':
+        parser.parse_mapped(file_path)
+    else:
+        parser.parse_file(file_path)
+    undefined = parser.get_undefined_signals()
+    parser.get_signal_widths(undefined)
+    seconds = time.perf_counter() - start
+    print(json.dumps({
+        "peak_mb": peak_memory_mb(),
+        "first_token_seconds": round(first_token, 4),
+        "seconds": round(seconds, 3),
+        "undefined": len(undefined),
+    }))
+    return 0
+
+
+def main(args: List[str] = None) -> int:
+    """
+    基准测试入口
+
+    参数:
+        args: 命令行参数列表
+
+    返回:
+        执行状态码，各解析方式的分析结果不一致时返回1
+    """
+    arg_parser = argparse.ArgumentParser(description='autowire解析内存基准测试')
+    arg_parser.add_argument('--lines', type=int, nargs='+', default=[100000, 400000],
+                            help='合成文件的行数规模')
+    arg_parser.add_argument('--size-mb', type=int, nargs='+', default=[],
+                            help='按大小（MB）生成的合成文件，逐块写入，可用于GB级输入')
+    arg_parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES), help='参与对比的解析方式')
+    arg_parser.add_argument('--json', type=str, help='将结果写入JSON文件')
+    arg_parser.add_argument('--child', type=str, help=argparse.SUPPRESS)
+    arg_parser.add_argument('--mode', choices=MODES, default='whole', help=argparse.SUPPRESS)
+    options = arg_parser.parse_args(args)
+
+    if options.child:
+        return _child(options.child, options.mode)
+    if peak_memory_mb() is None:
+        print("当前平台不支持峰值内存统计")
+        return 1
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        inputs = []
+        for line_count in options.lines:
+            path = os.path.join(tmp_dir, f'synthetic_{line_count}.v')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(generate_module(line_count))
+            inputs.append((f'synthetic_{line_count}', path))
+        for size_mb in options.size_mb:
+            path = os.path.join(tmp_dir, f'synthetic_{size_mb}mb.v')
+            write_module(path, size_mb * 1024 * 1024)
+            inputs.append((f'synthetic_{size_mb}mb', path))
+
+        for name, path in inputs:
+            result = {"file": name, "size_mb": round(os.path.getsize(path) / (1024 * 1024), 1)}
+            for mode in options.modes:
+                result[mode] = measure(path, mode)
+            results.append(result)
+
+    print(f"{'文件':<24}{'大小(MB)':>10}{'方式':>8}{'峰值内存(MB)':>14}{'首个单元(s)':>13}{'总耗时(s)':>11}{'未定义':>8}")
+    for r in results:
+        for mode in options.modes:
+            m = r[mode]
+            print(f"{r['file']:<24}{r['size_mb']:>10.1f}{mode:>8}{m['peak_mb']:>14.1f}"
+                  f"{m['first_token_seconds']:>13.4f}{m['seconds']:>11.2f}{m['undefined']:>8}")
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    return 1 if any(len({r[mode]['undefined'] for mode in options.modes}) > 1 for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
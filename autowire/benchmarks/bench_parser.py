@@ -0,0 +1,125 @@
+"""
+解析阶段基准测试
+对比单遍词法分析路径与原有正则扫描路径的解析耗时
+
+用法:
+    python -m autowire.benchmarks.bench_parser
+    python -m autowire.benchmarks.bench_parser --lines 10000 100000 --repeat 3
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from typing import Dict, List, Optional
+
+from ..core.parser import VerilogParser
+from .synthetic import generate_module
+
+# 默认的真实RTL样例
+DEFAULT_RTL = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rtl', 'i3c_regs.v')
+
+
+def time_parse(file_path: str, use_lexer: bool, repeat: int = 3) -> float:
+    """
+    测量解析一个文件的耗时
+
+    参数:
+        file_path: Verilog文件路径
+        use_lexer: 是否使用词法分析路径
+        repeat: 重复次数，取最小值
+
+    返回:
+        最短耗时（秒）
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        parser = VerilogParser(use_lexer=use_lexer)
+        start = time.perf_counter()
+        parser.parse_file(file_path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(files: Dict[str, str], repeat: int = 3, skip_regex_above: Optional[int] = None) -> List[Dict]:
+    """
+    对一组文件运行两种解析路径的基准测试
+
+    参数:
+        files: 名称到文件路径的映射
+        repeat: 每个文件的重复次数
+        skip_regex_above: 行数超过此值时跳过正则路径（正则路径过慢）
+
+    返回:
+        每个文件的测试结果列表
+    """
+    results = []
+    for name, path in files.items():
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            line_count = sum(1 for _ in f)
+        lexer_time = time_parse(path, use_lexer=True, repeat=repeat)
+        regex_time = None
+        if skip_regex_above is None or line_count <= skip_regex_above:
+            regex_time = time_parse(path, use_lexer=False, repeat=repeat)
+        results.append({
+            "name": name,
+            "lines": line_count,
+            "lexer_seconds": round(lexer_time, 4),
+            "regex_seconds": None if regex_time is None else round(regex_time, 4),
+            "speedup": None if regex_time is None else round(regex_time / lexer_time, 2),
+        })
+    return results
+
+
+def print_results(results: List[Dict]) -> None:
+    """打印基准测试结果表"""
+    print(f"{'文件':<24}{'行数':>10}{'词法(s)':>12}{'正则(s)':>12}{'加速比':>10}")
+    for r in results:
+        regex = '跳过' if r['regex_seconds'] is None else f"{r['regex_seconds']:.4f}"
+        speedup = '-' if r['speedup'] is None else f"{r['speedup']:.2f}x"
+        print(f"{r['name']:<24}{r['lines']:>10}{r['lexer_seconds']:>12.4f}{regex:>12}{speedup:>10}")
+
+
+def main(args: List[str] = None) -> int:
+    """
+    基准测试入口
+
+    参数:
+        args: 命令行参数列表
+
+    返回:
+        执行状态码
+    """
+    arg_parser = argparse.ArgumentParser(description='autowire解析阶段基准测试')
+    arg_parser.add_argument('--lines', type=int, nargs='+', default=[1000, 10000, 100000],
+                            help='合成文件的行数规模')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='每项测试的重复次数')
+    arg_parser.add_argument('--skip-regex-above', type=int, default=None,
+                            help='行数超过此值时跳过正则路径')
+    arg_parser.add_argument('--json', type=str, help='将结果写入JSON文件')
+    options = arg_parser.parse_args(args)
+
+    files = {}
+    if os.path.exists(DEFAULT_RTL):
+        files['i3c_regs.v'] = DEFAULT_RTL
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for line_count in options.lines:
+            path = os.path.join(tmp_dir, f'synthetic_{line_count}.v')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(generate_module(line_count))
+            files[f'synthetic_{line_count}'] = path
+
+        results = run_benchmark(files, repeat=options.repeat, skip_regex_above=options.skip_regex_above)
+
+    print_results(results)
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+规模扩展基准测试
+在1千到1百万行的合成多模块设计上测量autowire各阶段的耗时，按 耗时 ∝ 行数^k 拟合每个阶段的扩展指数，
+结果追加到JSON历史文件。指数超过上限或比历史记录明显变大时返回非零状态码，
+用于在本地发现重新引入的二次复杂度
+
+用法:
+    python -m autowire.benchmarks.bench_scaling
+    python -m autowire.benchmarks.bench_scaling --sizes 1000 10000 100000 1000000 --repeat 1
+    python -m autowire.benchmarks.bench_scaling --modules 8 --ports 32 --instances 16 --generate-depth 3
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..core.parser import VerilogParser
+from ..core.analyzer import SignalAnalyzer
+from ..core.generator import CodeGenerator
+from ..core.profiling import PhaseProfiler, profile_phase
+from .. import __version__
+from .synthetic import write_design
+
+# 默认的历史文件
+DEFAULT_HISTORY = 'autowire_bench_history.json'
+
+# 解析方式
+MODES = ('whole', 'stream', 'mmap')
+
+# 参与拟合的最短耗时（秒），更短的测量值噪声太大
+MIN_FIT_SECONDS = 5e-4
+
+# 默认的扩展指数上限，线性阶段的指数约为1.0，二次复杂度约为2.0
+DEFAULT_MAX_EXPONENT = 1.35
+
+# 与上一条历史记录相比允许的指数增量
+DEFAULT_MAX_INCREASE = 0.15
+
+
+def time_stages(file_path: str, mode: str = 'whole', repeat: int = 3) -> Dict[str, float]:
+    """
+    测量一个文件各阶段的耗时，每个阶段取多次运行中的最小值
+
+    参数:
+        file_path: Verilog文件路径
+        mode: 解析方式，whole/stream/mmap
+        repeat: 重复次数
+
+    返回:
+        阶段名到耗时（秒）的有序字典，另含total
+    """
+    best = OrderedDict()
+    for _ in range(max(1, repeat)):
+        profiler = PhaseProfiler(file_path, regex_counts=False)
+        with profiler.active():
+            parser = VerilogParser(profiler=profiler)
+            if mode == 'stream':
+                parser.parse_stream(file_path)
+            elif mode == 'mmap':
+                parser.parse_mapped(file_path)
+            else:
+                parser.parse_file(file_path)
+            analyzer = SignalAnalyzer()
+            analyzer.setup(parser)
+            analyzer.analyze()
+            generator = CodeGenerator()
+            generator.setup(analyzer, file_path)
+            with profile_phase(profiler, 'generate'):
+                generator.generate()
+        for name, record in profiler.phases.items():
+            best[name] = min(best.get(name, float('inf')), record['seconds'])
+        best['total'] = min(best.get('total', float('inf')), profiler.total_seconds)
+    return best
+
+
+def fit_exponent(sizes: Sequence[int], seconds: Sequence[float]) -> Optional[float]:
+    """
+    按最小二乘法在对数坐标下拟合 耗时 = c * 行数^k
+
+    参数:
+        sizes: 行数
+        seconds: 对应的耗时
+
+    返回:
+        扩展指数k，耗时不低于MIN_FIT_SECONDS的点少于两个时返回None
+    """
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, seconds) if n > 0 and t >= MIN_FIT_SECONDS]
+    if len(points) < 2 or len({x for x, _ in points}) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    return round(numerator / denominator, 3)
+
+
+def run_scaling(sizes: Sequence[int], design_options: Dict[str, int], mode: str = 'whole',
+                repeat: int = 3) -> Dict[str, Any]:
+    """
+    在各规模的合成设计上测量各阶段耗时并拟合扩展指数
+
+    参数:
+        sizes: 目标行数列表
+        design_options: 传给synthetic.write_design()的参数
+        mode: 解析方式
+        repeat: 每个规模的重复次数
+
+    返回:
+        结果字典，包含lines（实际行数）和stages（阶段名到 {'seconds': [...], 'exponent': k}）
+    """
+    lines = []
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sorted(sizes):
+            path = os.path.join(tmp_dir, f'design_{size}.v')
+            lines.append(write_design(path, size, **design_options))
+            timings.append(time_stages(path, mode, repeat))
+            os.remove(path)
+
+    stages = OrderedDict()
+    for name in timings[-1]:
+        seconds = [timing.get(name, 0.0) for timing in timings]
+        stages[name] = {
+            'seconds': [round(value, 6) for value in seconds],
+            'exponent': fit_exponent(lines, seconds),
+        }
+    return {'lines': lines, 'stages': stages}
+
+
+def check_regressions(result: Dict[str, Any], previous: Optional[Dict[str, Any]],
+                      max_exponent: float, max_increase: float) -> List[str]:
+    """
+    检查扩展指数是否超过上限，或比上一条可比的历史记录明显变大
+
+    参数:
+        result: run_scaling()的结果
+        previous: 上一条可比的历史记录
+        max_exponent: 指数上限
+        max_increase: 允许的指数增量
+
+    返回:
+        问题描述列表
+    """
+    problems = []
+    for name, stage in result['stages'].items():
+        exponent = stage['exponent']
+        if exponent is None:
+            continue
+        if exponent > max_exponent:
+            problems.append(f"阶段 {name} 的扩展指数为 {exponent:.2f}，超过上限 {max_exponent:.2f}")
+        if previous is not None:
+            old = previous['stages'].get(name, {}).get('exponent')
+            if old is not None and exponent - old > max_increase:
+                problems.append(f"阶段 {name} 的扩展指数由 {old:.2f} 增至 {exponent:.2f}"
+                                f"（{previous.get('commit') or previous.get('time')}）")
+    return problems
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    """读取历史文件，不存在时返回空列表"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def find_previous(history: List[Dict[str, Any]], entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """查找规模、设计参数和解析方式都相同的最近一条历史记录"""
+    for record in reversed(history):
+        if all(record.get(key) == entry[key] for key in ('sizes', 'design', 'mode')):
+            return record
+    return None
+
+
+def _git_commit() -> Optional[str]:
+    """当前代码的git提交，不在git仓库中时返回None"""
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def print_results(entry: Dict[str, Any]) -> None:
+    """打印各阶段在各规模下的耗时和扩展指数"""
+    header = ''.join(f"{n:>12}" for n in entry['lines'])
+    print(f"{'阶段':<24}{header}{'指数':>8}")
+    for name, stage in entry['stages'].items():
+        cells = ''.join(f"{value:>12.4f}" for value in stage['seconds'])
+        exponent = '-' if stage['exponent'] is None else f"{stage['exponent']:.2f}"
+        print(f"{name:<24}{cells}{exponent:>8}")
+
+
+def main(args: List[str] = None) -> int:
+    """
+    基准测试入口
+
+    参数:
+        args: 命令行参数列表
+
+    返回:
+        执行状态码，发现扩展指数退化时返回1
+    """
+    arg_parser = argparse.ArgumentParser(description='autowire规模扩展基准测试')
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                            help='合成设计的目标行数，最大可到1000000')
+    arg_parser.add_argument('--modules', type=int, default=4, help='子模块数量')
+    arg_parser.add_argument('--ports', type=int, default=16, help='每个子模块的端口数量')
+    arg_parser.add_argument('--instances', type=int, default=8, help='每个重复块的实例数量')
+    arg_parser.add_argument('--generate-depth', type=int, default=2, help='generate for循环的嵌套层数')
+    arg_parser.add_argument('--comment-lines', type=int, default=40, help='每个长注释块的行数')
+    arg_parser.add_argument('--mode', choices=MODES, default='whole', help='解析方式')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='每个规模的重复次数，取最小值')
+    arg_parser.add_argument('--history', type=str, default=DEFAULT_HISTORY, help='JSON历史文件')
+    arg_parser.add_argument('--no-history', action='store_true', help='不读写历史文件')
+    arg_parser.add_argument('--max-exponent', type=float, default=DEFAULT_MAX_EXPONENT, help='扩展指数上限')
+    arg_parser.add_argument('--max-increase', type=float, default=DEFAULT_MAX_INCREASE,
+                            help='与上一条可比历史记录相比允许的指数增量')
+    options = arg_parser.parse_args(args)
+
+    design = {
+        'num_modules': options.modules,
+        'num_ports': options.ports,
+        'num_instances': options.instances,
+        'generate_depth': options.generate_depth,
+        'comment_lines': options.comment_lines,
+    }
+    result = run_scaling(options.sizes, design, options.mode, options.repeat)
+    entry = OrderedDict([
+        ('time', time.strftime('%Y-%m-%dT%H:%M:%S')),
+        ('version', __version__),
+        ('commit', _git_commit()),
+        ('python', platform.python_version()),
+        ('platform', platform.platform()),
+        ('mode', options.mode),
+        ('design', design),
+        ('sizes', sorted(options.sizes)),
+        ('lines', result['lines']),
+        ('stages', result['stages']),
+    ])
+    print_results(entry)
+
+    previous = None
+    if not options.no_history:
+        history = load_history(options.history)
+        previous = find_previous(history, entry)
+        history.append(entry)
+        with open(options.history, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2, ensure_ascii=False)
+        print(f"\n结果已追加到 {options.history}（共 {len(history)} 条记录）")
+
+    problems = check_regressions(entry, previous, options.max_exponent, options.max_increase)
+    for problem in problems:
+        print(f"警告：{problem}")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+分析服务延迟基准测试
+对比每次启动命令行进程（冷启动）与常驻服务（热启动）完成一次分析的延迟，
+热启动分别测量首次请求、文件未变化的重复请求和编辑文件后的请求
+
+用法:
+    python -m autowire.benchmarks.bench_server
+    python -m autowire.benchmarks.bench_server --lines 2000 20000 --repeat 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, List
+
+from ..cli.client import AutowireClient
+from .synthetic import generate_module
+
+
+def _median_ms(samples: List[float]) -> float:
+    """样本中位数，单位毫秒"""
+    return round(statistics.median(samples) * 1000, 2)
+
+
+def measure_cold(file_path: str, output_dir: str, repeat: int) -> float:
+    """
+    每次启动一个 python -m autowire 进程分析文件
+
+    参数:
+        file_path: Verilog文件路径
+        output_dir: 输出目录
+        repeat: 重复次数
+
+    返回:
+        延迟中位数（毫秒）
+    """
+    command = [sys.executable, '-m', 'autowire', file_path, '--no-cache', '-o', output_dir]
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, capture_output=True)
+        samples.append(time.perf_counter() - start)
+    return _median_ms(samples)
+
+
+def measure_warm(file_path: str, repeat: int) -> Dict[str, float]:
+    """
+    通过常驻服务分析文件
+
+    参数:
+        file_path: Verilog文件路径
+        repeat: 重复次数
+
+    返回:
+        {'first': 首次请求, 'unchanged': 未变化的重复请求, 'edited': 编辑后的请求}，均为延迟中位数（毫秒）
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    with AutowireClient() as client:
+        # 等待服务进程启动完成，不计入首次请求的延迟
+        client.stats()
+        start = time.perf_counter()
+        client.analyze(file_path)
+        first = time.perf_counter() - start
+
+        unchanged = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            client.analyze(file_path)
+            unchanged.append(time.perf_counter() - start)
+
+        edited = []
+        for k in range(repeat):
+            # 模拟编辑器发送的未保存内容，每次末尾的注释不同
+            start = time.perf_counter()
+            client.analyze(file_path, content + f"\n// edit {k}\n")
+            edited.append(time.perf_counter() - start)
+        client.shutdown()
+    return {'first': round(first * 1000, 2), 'unchanged': _median_ms(unchanged), 'edited': _median_ms(edited)}
+
+
+def main(args: List[str] = None) -> int:
+    """
+    基准测试入口
+
+    参数:
+        args: 命令行参数列表
+
+    返回:
+        执行状态码
+    """
+    arg_parser = argparse.ArgumentParser(description='autowire分析服务延迟基准测试')
+    arg_parser.add_argument('--lines', type=int, nargs='+', default=[1000, 10000], help='合成文件的行数规模')
+    arg_parser.add_argument('--repeat', type=int, default=10, help='每项测量的重复次数')
+    arg_parser.add_argument('--json', type=str, help='将结果写入JSON文件')
+    options = arg_parser.parse_args(args)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for line_count in options.lines:
+            path = os.path.join(tmp_dir, f'synthetic_{line_count}.v')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(generate_module(line_count))
+            result = {'file': f'synthetic_{line_count}', 'cold': measure_cold(path, tmp_dir, options.repeat)}
+            result.update(measure_warm(path, options.repeat))
+            results.append(result)
+
+    print(f"{'文件':<24}{'冷启动(ms)':>12}{'首次请求(ms)':>14}{'未变化(ms)':>12}{'编辑后(ms)':>12}")
+    for r in results:
+        print(f"{r['file']:<24}{r['cold']:>12.2f}{r['first']:>14.2f}{r['unchanged']:>12.2f}{r['edited']:>12.2f}")
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+位宽推断回归与基准测试
+对比批量位宽表与逐信号正则匹配两种推断路径的结果和耗时
+
+用法:
+    python -m autowire.benchmarks.bench_widths
+    python -m autowire.benchmarks.bench_widths path/to/a.v path/to/b.v --all-signals
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from typing import Dict, List
+
+from ..core.parser import VerilogParser
+
+# 默认的回归样例：仓库根目录tests下的Verilog文件
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_FIXTURES = os.path.join(PROJECT_ROOT, 'tests', '*.v')
+
+
+def compare_widths(file_path: str, all_signals: bool = False) -> Dict:
+    """
+    对一个文件比较两种位宽推断路径
+
+    参数:
+        file_path: Verilog文件路径
+        all_signals: 是否对所有标识符推断位宽，默认只推断未定义信号
+
+    返回:
+        比较结果字典，包含信号数、两种路径的耗时和不一致的信号
+    """
+    parser = VerilogParser()
+    parser.parse_file(file_path)
+    signals = list(parser.all_signals) if all_signals else parser.get_undefined_signals()
+
+    start = time.perf_counter()
+    regex_widths = parser.get_signal_widths(signals, batched=False)
+    regex_time = time.perf_counter() - start
+
+    # 位宽表在解析时已构建，这里重新构建以计入完整开销
+    parser.width_table = None
+    start = time.perf_counter()
+    batched_widths = parser.get_signal_widths(signals, batched=True)
+    batched_time = time.perf_counter() - start
+
+    mismatches = {
+        signal: {"regex": regex_widths[signal], "batched": batched_widths[signal]}
+        for signal in signals if regex_widths[signal] != batched_widths[signal]
+    }
+    return {
+        "file": file_path,
+        "signals": len(signals),
+        "regex_seconds": round(regex_time, 4),
+        "batched_seconds": round(batched_time, 4),
+        "mismatches": mismatches,
+    }
+
+
+def main(args: List[str] = None) -> int:
+    """
+    回归测试入口
+
+    参数:
+        args: 命令行参数列表
+
+    返回:
+        执行状态码，存在不一致时返回1
+    """
+    arg_parser = argparse.ArgumentParser(description='autowire位宽推断回归与基准测试')
+    arg_parser.add_argument('files', nargs='*', help='Verilog文件，默认使用tests目录下的样例')
+    arg_parser.add_argument('--all-signals', action='store_true', help='对所有标识符推断位宽')
+    arg_parser.add_argument('--json', type=str, help='将结果写入JSON文件')
+    options = arg_parser.parse_args(args)
+
+    files = options.files or sorted(glob.glob(DEFAULT_FIXTURES))
+    results = [compare_widths(path, options.all_signals) for path in files]
+
+    print(f"{'文件':<36}{'信号数':>8}{'正则(s)':>12}{'批量(s)':>12}{'不一致':>8}")
+    for r in results:
+        print(f"{os.path.basename(r['file']):<36}{r['signals']:>8}"
+              f"{r['regex_seconds']:>12.4f}{r['batched_seconds']:>12.4f}{len(r['mismatches']):>8}")
+        for signal, widths in r['mismatches'].items():
+            print(f"    {signal}: 正则={widths['regex']} 批量={widths['batched']}")
+
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    return 1 if any(r['mismatches'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+合成Verilog生成模块
+按指定规模生成结构接近真实RTL的Verilog代码，用于性能基准测试
+"""
+
+from typing import Iterator, List
+
+
+def generate_module(target_lines: int, num_ports: int = 64, module_name: str = "synthetic_top") -> str:
+    """
+    生成指定行数规模的单个Verilog模块
+
+    模块包含端口声明、wire/reg声明、assign语句、always块、模块实例化和注释，
+    其中约十分之一的信号故意不声明，作为未定义信号
+
+    参数:
+        target_lines: 目标行数（近似值）
+        num_ports: 端口数量
+        module_name: 模块名
+
+    返回:
+        Verilog源代码
+    """
+    lines: List[str] = []
+    for block in iter_module_blocks(target_lines, num_ports, module_name):
+        lines.extend(block)
+    return "\n".join(lines) + "\n"
+
+
+def write_module(file_path: str, target_bytes: int, num_ports: int = 64, module_name: str = "synthetic_top") -> int:
+    """
+    逐块生成并写入指定大小的Verilog模块，不在内存中拼接整个文件，用于生成GB级测试输入
+
+    参数:
+        file_path: 输出文件路径
+        target_bytes: 目标字节数（近似值）
+        num_ports: 端口数量
+        module_name: 模块名
+
+    返回:
+        实际写入的字节数
+    """
+    written = 0
+    with open(file_path, 'w', encoding='utf-8', newline='\n') as f:
+        blocks = iter_module_blocks(None, num_ports, module_name)
+        for block in blocks:
+            text = "\n".join(block) + "\n"
+            f.write(text)
+            written += len(text.encode('utf-8'))
+            if written >= target_bytes:
+                break
+        f.write("endmodule\n")
+    return written + len("endmodule\n")
+
+
+def iter_module_blocks(target_lines: int = None, num_ports: int = 64,
+                       module_name: str = "synthetic_top") -> Iterator[List[str]]:
+    """
+    按代码块逐段生成模块内容
+
+    参数:
+        target_lines: 目标行数（近似值），为None时不断生成且不输出endmodule
+        num_ports: 端口数量
+        module_name: 模块名
+
+    返回:
+        代码行列表的迭代器，第一段为模块头
+    """
+    lines: List[str] = []
+    lines.append(f"module {module_name} #(")
+    lines.append("    parameter DATA_W = 32,")
+    lines.append("    parameter ADDR_W = 16")
+    lines.append(") (")
+    for i in range(num_ports):
+        direction = "input " if i % 2 == 0 else "output"
+        separator = "," if i < num_ports - 1 else ""
+        lines.append(f"    {direction} wire [DATA_W-1:0] port_{i}{separator}")
+    lines.append(");")
+    lines.append("")
+
+    yield lines
+    count = len(lines)
+
+    block = 0
+    while target_lines is None or count < target_lines:
+        b = block
+        lines = []
+        lines.append(f"    // block {b}: 数据通路")
+        lines.append(f"    wire [7:0] data_{b};")
+        lines.append(f"    reg  [DATA_W-1:0] state_{b}, next_{b};")
+        lines.append(f"    assign data_{b} = port_{(2 * b) % num_ports}[7:0] ^ state_{b}[15:8];")
+        lines.append(f"    assign next_{b} = {{state_{b}[DATA_W-2:0], data_{b}[0]}};")
+        if b % 10 == 0:
+            # 未声明的信号
+            lines.append(f"    assign undecl_{b}[3:0] = data_{b}[3:0] & state_{b}[3:0];")
+        lines.append(f"    always @(posedge port_0 or negedge port_2) begin")
+        lines.append(f"        if (!port_2)")
+        lines.append(f"            state_{b} <= {{DATA_W{{1'b0}}}};")
+        lines.append(f"        else")
+        lines.append(f"            state_{b} <= next_{b};")
+        lines.append(f"    end")
+        if b % 5 == 0:
+            lines.append(f"    /* instance {b}")
+            lines.append(f"       wire commented_out_{b}; */")
+            lines.append(f"    sub_unit u_sub_{b} (")
+            lines.append(f"        .clk   (port_0),")
+            lines.append(f"        .din   (data_{b}),")
+            lines.append(f"        .dout  (sub_out_{b})")
+            lines.append(f"    );")
+        lines.append("")
+        block += 1
+        count += len(lines)
+        yield lines
+
+    yield ["endmodule"]
+
+
+def generate_design(target_lines: int, num_modules: int = 4, num_ports: int = 16, num_instances: int = 8,
+                    generate_depth: int = 2, comment_lines: int = 40) -> str:
+    """
+    生成包含多个模块的参数化设计，覆盖模块实例化、嵌套generate块和长注释块
+
+    参数:
+        target_lines: 目标行数（近似值）
+        num_modules: 子模块数量
+        num_ports: 每个子模块的端口数量
+        num_instances: 顶层模块中每个重复块的实例数量
+        generate_depth: generate for循环的嵌套层数
+        comment_lines: 每个长注释块的行数
+
+    返回:
+        Verilog源代码
+    """
+    lines: List[str] = []
+    for block in iter_design_blocks(target_lines, num_modules, num_ports, num_instances,
+                                    generate_depth, comment_lines):
+        lines.extend(block)
+    return "\n".join(lines) + "\n"
+
+
+def write_design(file_path: str, target_lines: int, **options) -> int:
+    """
+    逐块生成并写入多模块设计，不在内存中拼接整个文件，参数见generate_design()
+
+    参数:
+        file_path: 输出文件路径
+        target_lines: 目标行数（近似值）
+
+    返回:
+        实际写入的行数
+    """
+    count = 0
+    with open(file_path, 'w', encoding='utf-8', newline='\n') as f:
+        for block in iter_design_blocks(target_lines, **options):
+            f.write("\n".join(block) + "\n")
+            count += len(block)
+    return count
+
+
+def iter_design_blocks(target_lines: int, num_modules: int = 4, num_ports: int = 16, num_instances: int = 8,
+                       generate_depth: int = 2, comment_lines: int = 40) -> Iterator[List[str]]:
+    """
+    按代码块逐段生成多模块设计：先输出子模块，再输出由重复块组成的顶层模块
+
+    每个重复块包含一个长注释块、num_instances个子模块实例、generate_depth层嵌套的generate for循环
+    以及assign语句，其中部分连接信号和generate块内的信号故意不声明，作为未定义信号
+
+    参数:
+        target_lines: 目标行数（近似值）
+        其余参数见generate_design()
+
+    返回:
+        代码行列表的迭代器
+    """
+    num_modules = max(1, num_modules)
+    num_ports = max(2, num_ports)
+    count = 0
+    for m in range(num_modules):
+        lines = [f"module leaf_{m} #(parameter W = {8 * (m % 4 + 1)}) ("]
+        for p in range(num_ports):
+            direction = "input " if p < num_ports // 2 else "output"
+            separator = "," if p < num_ports - 1 else ""
+            lines.append(f"    {direction} wire [W-1:0] p{p}{separator}")
+        lines.append(");")
+        for p in range(num_ports // 2, num_ports):
+            lines.append(f"    assign p{p} = p{p - num_ports // 2} + {p};")
+        lines.append("endmodule")
+        lines.append("")
+        count += len(lines)
+        yield lines
+
+    lines = ["module design_top (", "    input wire clk,", "    input wire rst_n", ");", ""]
+    count += len(lines)
+    yield lines
+
+    block = 0
+    while count < target_lines:
+        b = block
+        lines = [f"    /* block {b}"]
+        for c in range(comment_lines):
+            # 注释中类似代码的内容不应被识别为信号
+            lines.append(f"     * 说明 {c}: assign fake_{b}_{c} = wire_in_comment; module not_real();")
+        lines.append("     */")
+        for k in range(num_instances):
+            m = (b + k) % num_modules
+            lines.append(f"    leaf_{m} #(.W({8 * (m % 4 + 1)})) u_leaf_{b}_{k} (")
+            for p in range(num_ports):
+                separator = "," if p < num_ports - 1 else ""
+                if p < num_ports // 2:
+                    source = "clk" if p == 0 else f"bus_{b}_{k}_{p}"
+                else:
+                    source = f"out_{b}_{k}_{p}"
+                lines.append(f"        .p{p}({source}){separator}")
+            lines.append("    );")
+        indent = "    "
+        for d in range(generate_depth):
+            lines.append(f"{indent}genvar g{b}_{d};")
+        lines.append(f"{indent}generate")
+        for d in range(generate_depth):
+            lines.append(f"{indent}for (g{b}_{d} = 0; g{b}_{d} < 4; g{b}_{d} = g{b}_{d} + 1) begin : gen_{b}_{d}")
+            indent += "    "
+        index = f"g{b}_0" if generate_depth else "0"
+        lines.append(f"{indent}assign gen_sig_{b}[{index}] = out_{b}_0_{num_ports - 1}[0];")
+        for d in reversed(range(generate_depth)):
+            indent = indent[:-4]
+            lines.append(f"{indent}end")
+        lines.append(f"{indent}endgenerate")
+        lines.append(f"    assign sum_{b}[7:0] = out_{b}_0_{num_ports - 1}[7:0] + bus_{b}_0_1[7:0];")
+        lines.append("")
+        block += 1
+        count += len(lines)
+        yield lines
+
+    yield ["endmodule"]
@@ -0,0 +1,151 @@
+"""
+分析服务客户端模块
+连接 autowire serve 的Unix套接字，或以标准输入输出启动一个服务子进程，发送JSON-RPC请求
+
+用法:
+    python -m autowire.cli.client --socket /tmp/autowire.sock my_design.v
+    python -m autowire.cli.client my_design.v        # 启动临时服务子进程
+"""
+
+import sys
+import json
+import socket
+import argparse
+import subprocess
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..core.utils import ServiceError
+
+
+class AutowireClient:
+    """分析服务客户端类，请求按顺序同步发送，可用作上下文管理器"""
+
+    def __init__(self, socket_path: Optional[str] = None, serve_args: Sequence[str] = (),
+                 env: Optional[Dict[str, str]] = None):
+        """
+        初始化客户端
+
+        参数:
+            socket_path: 服务的Unix套接字路径，为None时以标准输入输出启动服务子进程
+            serve_args: 启动子进程时传给serve的参数，如 ['--config', 'cfg.json']
+            env: 子进程的环境变量
+        """
+        self.process = None
+        self.socket = None
+        self._next_id = 0
+        if socket_path:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(socket_path)
+            self._reader = self.socket.makefile('r', encoding='utf-8')
+            self._writer = self.socket.makefile('w', encoding='utf-8')
+        else:
+            command = [sys.executable, '-m', 'autowire', 'serve', *serve_args]
+            self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                            text=True, encoding='utf-8', env=env)
+            self._reader = self.process.stdout
+            self._writer = self.process.stdin
+
+    def call(self, method: str, **params: Any) -> Any:
+        """
+        发送请求并等待响应
+
+        参数:
+            method: 方法名，如analyze、generate、invalidate、stats、shutdown
+            params: 方法参数
+
+        返回:
+            响应中的result
+
+        异常:
+            ServiceError: 服务返回错误或连接已关闭
+        """
+        self._next_id += 1
+        request = {'jsonrpc': '2.0', 'id': self._next_id, 'method': method, 'params': params}
+        self._writer.write(json.dumps(request, ensure_ascii=False) + '\n')
+        self._writer.flush()
+        line = self._reader.readline()
+        if not line:
+            raise ServiceError("分析服务已关闭连接")
+        response = json.loads(line)
+        if 'error' in response:
+            raise ServiceError(response['error']['message'], response['error']['code'])
+        return response['result']
+
+    def analyze(self, file: str, content: Optional[str] = None) -> Dict[str, Any]:
+        """分析文件，返回未定义信号、位宽和生成的声明，见AnalysisService.analyze()"""
+        params = {'file': file}
+        if content is not None:
+            params['content'] = content
+        return self.call('analyze', **params)
+
+    def generate(self, file: str, content: Optional[str] = None, output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """分析文件并写出声明文件，见AnalysisService.generate()"""
+        params = {'file': file}
+        if content is not None:
+            params['content'] = content
+        if output_dir is not None:
+            params['output_dir'] = output_dir
+        return self.call('generate', **params)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取服务状态"""
+        return self.call('stats')
+
+    def shutdown(self) -> None:
+        """请求服务退出"""
+        self.call('shutdown')
+
+    def close(self) -> None:
+        """关闭连接；子进程模式下关闭其标准输入并等待退出"""
+        if self.socket is not None:
+            self._reader.close()
+            self._writer.close()
+            self.socket.close()
+            self.socket = None
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait()
+            self.process.stdout.close()
+            self.process = None
+
+    def __enter__(self) -> 'AutowireClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main(args: List[str] = None) -> int:
+    """
+    客户端命令行入口，打印每个文件的未定义信号声明
+
+    参数:
+        args: 命令行参数列表
+
+    返回:
+        执行状态码，任一请求失败时返回1
+    """
+    parser = argparse.ArgumentParser(description='autowire分析服务客户端')
+    parser.add_argument('files', nargs='+', metavar='file', help='Verilog源文件')
+    parser.add_argument('--socket', type=str, help='服务的Unix套接字路径，默认启动临时服务子进程')
+    parser.add_argument('--generate', action='store_true', help='按服务配置写出声明文件')
+    options = parser.parse_args(args)
+
+    status = 0
+    with AutowireClient(options.socket) as client:
+        for file_path in options.files:
+            try:
+                result = client.generate(file_path) if options.generate else client.analyze(file_path)
+            except (ServiceError, OSError) as e:
+                print(f"{file_path}: {e}", file=sys.stderr)
+                status = 1
+                continue
+            if len(options.files) > 1:
+                print(f"// {result['file']}")
+            for definition in result['definitions']:
+                print(definition)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,13 +6,27 @@
 import sys
 import os
 import argparse
-from typing import List, Dict, Optional
+import cProfile
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Any
 
 from ..core.parser import VerilogParser
 from ..core.analyzer import SignalAnalyzer
 from ..core.generator import CodeGenerator
-from ..core.utils import handle_error, VerilogError
+from ..core.filelist import collect_sources
+from ..core.cache import ResultCache
+from ..core.project import ProjectIndex
+from ..core.preprocessor import include_state, includes_unchanged
+from ..core.emitters import EMITTERS
+from ..core.profiling import PhaseProfiler, profile_phase, write_profile
+from ..core.utils import handle_error, format_error, peak_memory_mb, VerilogError, ParseError
 from ..config.config import Config
+from .watch import SourceWatcher, WatchSession, watch, DEFAULT_INTERVAL, DEFAULT_DEBOUNCE
+from .. import __version__
+
+# --profile未指定路径时的剖析结果文件
+DEFAULT_PROFILE_PATH = 'autowire_profile.json'
 
 def parse_arguments(args: List[str] = None) -> argparse.Namespace:
     """
@@ -25,18 +39,41 @@ def parse_arguments(args: List[str] = None) -> argparse.Namespace:
         解析后的参数对象
     """
     parser = argparse.ArgumentParser(description='Verilog自动线网声明工具')
-    parser.add_argument('file', help='Verilog源文件路径')
+    parser.add_argument('files', nargs='*', metavar='file', help='Verilog源文件、通配符或目录（递归查找.v/.sv文件）')
+    parser.add_argument('--filelist', '-f', type=str, action='append', help='EDA工具格式的.f文件列表，可多次指定')
+    parser.add_argument('--define', '-D', type=str, action='append', metavar='NAME[=VALUE]',
+                        help='预定义宏，决定`ifdef等条件编译中生效的分支，可多次指定')
+    parser.add_argument('--include-dir', '-I', type=str, action='append', metavar='DIR',
+                        help='`include头文件的搜索路径，可多次指定')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='并行处理的进程数，0表示使用全部CPU核心')
     parser.add_argument('--width', '-w', action='store_true', help='尝试提取信号位宽')
     parser.add_argument('--default-width', '-d', type=str, help='默认位宽，如 "[7:0]" 或 "8" (会转换为[7:0]格式)')
-    parser.add_argument('--append', '-a', action='store_true', help='将定义追加到原始文件')
+    parser.add_argument('--append', '-a', action='store_true',
+                        help='将定义写入原始文件的生成区域，重复运行时整体替换该区域')
+    parser.add_argument('--emit', type=str, choices=list(EMITTERS),
+                        help='生成内容的格式：wire（默认）、sv（logic声明）、json（报告）、tcl（脚本变量）')
     parser.add_argument('--output-dir', '-o', type=str, help='输出目录路径')
     parser.add_argument('--exclude', '-e', type=str, nargs='+', help='排除匹配模式列表，支持正则表达式')
     parser.add_argument('--config', '-c', type=str, help='配置文件路径')
+    parser.add_argument('--cache-dir', type=str, help='结果缓存目录，默认为当前目录下的.autowire_cache')
+    parser.add_argument('--no-cache', action='store_true', help='禁用结果缓存')
+    parser.add_argument('--stream', action='store_true', help='流式解析，分块读入文件且不保留源文本，用于超大的生成网表')
+    parser.add_argument('--mmap', action='store_true', help='内存映射解析，直接在文件字节上进行词法分析，用于大型ASCII RTL')
+    parser.add_argument('--project', action='store_true',
+                        help='项目模式：先解析全部输入文件建立模块接口索引，实例端口连接的信号使用子模块端口位宽')
+    parser.add_argument('--watch', action='store_true', help='监视模式：处理一次后持续监视输入，源文件保存后只重新处理受影响的文件')
+    parser.add_argument('--watch-interval', type=float, default=DEFAULT_INTERVAL, help='监视模式的轮询间隔（秒）')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help='监视模式的防抖时间（秒），连续保存时等待最后一次保存后再处理')
+    parser.add_argument('--profile', type=str, nargs='?', const=DEFAULT_PROFILE_PATH, metavar='JSON',
+                        help=f'记录每个文件各阶段的耗时、正则表达式调用次数和内存并汇总写入JSON（默认{DEFAULT_PROFILE_PATH}）')
+    parser.add_argument('--profile-memory', action='store_true', help='剖析时使用tracemalloc记录各阶段的内存分配峰值（较慢）')
+    parser.add_argument('--profile-dump', type=str, metavar='FILE', help='将cProfile结果写入文件，可用pstats或snakeviz查看')
     parser.add_argument('--verbose', '-v', action='store_true', help='显示详细信息')
     parser.add_argument('--help-detail', action='store_true', help='显示详细使用说明')
     parser.add_argument('--debug', action='store_true', help='启用调试模式，显示中间处理结果')
     
-    return parser.parse_args(args)
+    return parser.parse_intermixed_args(args)
 
 def print_detailed_help() -> None:
     """打印详细帮助信息"""
@@ -56,7 +93,7 @@ Verilog自动线网声明工具 (Auto Wire Generator) 2.0.0
   6. 增强的模块实例化名称识别（支持常用前缀如u_、i_等）
   7. 支持generate/endgenerate关键字
   8. 支持Verilog数值常量（如1'h0, 8'b00101010等）
-  9. 支持多行注释和宏定义
+  9. 支持多行注释和宏定义，按 -D/+define+ 求值`ifdef等条件编译
   
 用法示例：
   # 基本用法：生成单独的wire声明文件
@@ -69,9 +106,13 @@ Verilog自动线网声明工具 (Auto Wire Generator) 2.0.0
   python -m autowire.cli.main --default-width "[31:0]" my_design.v  # 直接使用指定位宽
   python -m autowire.cli.main --default-width "32" my_design.v     # 自动转换为[31:0]格式
   
-  # 直接追加到原始文件
+  # 直接追加到原始文件（写入 // autowire:begin 与 // autowire:end 之间的区域，重复运行时整体替换）
   python -m autowire.cli.main --append my_design.v
   
+  # 生成SystemVerilog logic声明、JSON报告或Tcl变量
+  python -m autowire.cli.main --emit sv my_design.sv
+  python -m autowire.cli.main --emit json --width my_design.v
+  
   # 指定输出目录
   python -m autowire.cli.main --output-dir ./generated my_design.v
   
@@ -81,6 +122,21 @@ Verilog自动线网声明工具 (Auto Wire Generator) 2.0.0
   # 使用配置文件排除特定模式的信号
   python -m autowire.cli.main --config ./config/auto_wire_config.json my_design.v
   
+  # 批量处理多个文件、通配符、目录或.f文件列表，使用8个进程并行
+  python -m autowire.cli.main rtl/ "ip/**/*.sv" -f design.f --jobs 8
+  
+  # 按宏定义选择条件编译分支，从头文件搜索路径读取`include中的宏定义
+  python -m autowire.cli.main -D SYNTHESIS -D DATA_W=32 -I rtl/include my_design.v
+  
+  # 项目模式：按子模块端口位宽声明实例连接的信号
+  python -m autowire.cli.main --project -f design.f --jobs 8
+  
+  # 监视模式：保存后自动重新追加声明
+  python -m autowire.cli.main --watch --append rtl/
+  
+  # 常驻分析服务（JSON-RPC，供编辑器和提交钩子使用），客户端见autowire.cli.client
+  python -m autowire serve --socket /tmp/autowire.sock
+  
 配置文件说明：
   配置文件为JSON格式，包含以下字段：
   {
@@ -93,7 +149,10 @@ Verilog自动线网声明工具 (Auto Wire Generator) 2.0.0
     ],
     "default_width": "[7:0]",
     "output_format": "separate",
+    "emit": "wire",
     "output_dir": "./output",
+    "defines": {"SYNTHESIS": ""},
+    "include_dirs": ["rtl/include"],
     "version": "2.0.0"
   }
   
@@ -101,56 +160,128 @@ Verilog自动线网声明工具 (Auto Wire Generator) 2.0.0
     """
     print(help_text)
 
-def run(args: argparse.Namespace) -> int:
+def load_config(args: argparse.Namespace) -> Config:
     """
-    执行主程序
+    加载配置：配置文件（或默认配置）以及命令行参数
     
     参数:
         args: 解析后的命令行参数
         
     返回:
-        执行状态码，0表示成功
+        验证后的配置对象
     """
-    try:
-        # 显示详细帮助
-        if args.help_detail:
-            print_detailed_help()
-            return 0
+    config = Config()
+    
+    # 加载配置文件
+    if args.config:
+        config.load_from_file(args.config)
+    else:
+        # 尝试加载默认配置
+        default_config = config.get_default_config_path()
+        if os.path.exists(default_config):
+            config.load_from_file(default_config)
             
-        # 初始化配置
-        config = Config()
-        
-        # 加载配置文件
-        if args.config:
-            config.load_from_file(args.config)
-        else:
-            # 尝试加载默认配置
-            default_config = config.get_default_config_path()
-            if os.path.exists(default_config):
-                config.load_from_file(default_config)
-                
-        # 从命令行参数加载配置
-        config.load_from_args(args)
-        
-        # 验证配置
-        config.validate()
-        
-        # 解析文件
-        file_path = args.file
-        extract_width = args.width
-        
-        # 创建解析器
-        parser = VerilogParser()
-        parser.parse_file(file_path)
+    # 从命令行参数加载配置
+    config.load_from_args(args)
+    
+    # 验证配置
+    config.validate()
+    return config
+
+def process_file(file_path: str, config: Config, extract_width: bool = False,
+                 project_index: Optional[ProjectIndex] = None, profile: bool = False,
+                 trace_memory: bool = False) -> Dict[str, Any]:
+    """
+    处理单个Verilog文件
+    
+    输出信息不直接打印，而是随结果返回，由主进程按文件顺序统一输出，保证并行时输出确定
+    
+    参数:
+        file_path: Verilog文件路径
+        config: 配置对象
+        extract_width: 是否显示位宽信息
+        project_index: 项目模式的模块接口索引
+        profile: 是否记录各阶段的耗时、正则表达式调用次数和内存
+        trace_memory: 剖析时是否使用tracemalloc记录各阶段的内存分配峰值
         
+    返回:
+        处理结果字典，包含file、success、cached、summary、messages和error字段，剖析时另含profile字段
+    """
+    if not profile:
+        return _process_file(file_path, config, extract_width, project_index)
+    profiler = PhaseProfiler(file_path, trace_memory)
+    with profiler.active():
+        result = _process_file(file_path, config, extract_width, project_index, profiler)
+    result["profile"] = profiler.to_dict()
+    return result
+
+def _process_file(file_path: str, config: Config, extract_width: bool,
+                  project_index: Optional[ProjectIndex], profiler: Optional[PhaseProfiler] = None) -> Dict[str, Any]:
+    """处理单个Verilog文件，见process_file()"""
+    messages = []
+    result = {"file": file_path, "success": True, "cached": False, "summary": None, "messages": messages, "error": None}
+    try:
         # 创建分析器
         analyzer = SignalAnalyzer()
         analyzer.setup(
-            parser=parser,
-            exclude_patterns=config.exclude_patterns,
-            default_width=config.default_width
+            parser=None,
+            exclude_patterns=config.get_signal_filter(),
+            default_width=config.default_width,
+            project_index=project_index
         )
-        analyzer.analyze()
+        
+        # 查询结果缓存，命中时跳过解析和分析
+        cache = None
+        cached = None
+        if config.cache_dir:
+            with profile_phase(profiler, 'cache_lookup'):
+                cache = ResultCache(config.cache_dir)
+                fingerprint = config.fingerprint()
+                if project_index is not None:
+                    # 子模块接口变化时结果也随之变化
+                    fingerprint += project_index.dependency_fingerprint(file_path)
+                cache_key = cache.make_file_key(file_path, fingerprint, __version__)
+                cached = cache.get(cache_key)
+                if cached is not None and not includes_unchanged(cached.get("includes", [])):
+                    # 包含的头文件变化后宏定义可能不同
+                    cached = None
+            
+        if cached is not None:
+            analyzer.load_results(cached["undefined_signals"], cached["signal_widths"], cached["module_name"])
+            result["cached"] = True
+            if config.debug:
+                messages.append(f"\n使用缓存结果：{cache_key}")
+        else:
+            # 创建解析器
+            parser = VerilogParser(record_connections=project_index is not None, profiler=profiler,
+                                   defines=config.defines, include_dirs=config.include_dirs)
+            if config.stream:
+                parser.parse_stream(file_path)
+            elif config.mmap:
+                parser.parse_mapped(file_path)
+            else:
+                parser.parse_file(file_path)
+            analyzer.parser = parser
+            analyzer.analyze()
+            for cycle in parser.parameter_cycles:
+                messages.append(f"\n警告：参数循环引用 {' -> '.join(cycle)}，相关位宽无法计算")
+            if config.verbose or config.debug:
+                for name in parser.preprocessor.missing_includes:
+                    messages.append(f"\n警告：未找到头文件 {name}，其中的宏定义被忽略")
+            
+            if cache is not None:
+                try:
+                    with profile_phase(profiler, 'cache_store'):
+                        cache.put(cache_key, {
+                            "module_name": analyzer.module_name,
+                            "undefined_signals": analyzer.undefined_signals,
+                            "signal_widths": analyzer.signal_widths,
+                            "includes": include_state(parser.included_files),
+                        })
+                except OSError as e:
+                    # 缓存写入失败不影响本次结果
+                    if config.debug:
+                        messages.append(f"\n警告：无法写入缓存 {config.cache_dir}: {e}")
         
         # 获取结果
         undefined_signals = analyzer.get_undefined_signals()
@@ -158,17 +289,19 @@ def run(args: argparse.Namespace) -> int:
         # 输出结果
         if undefined_signals:
             if config.verbose or config.debug:
-                print(f"\n发现未定义信号：{', '.join(undefined_signals)}")
+                messages.append(f"\n发现未定义信号：{', '.join(undefined_signals)}")
                 
                 # 如果提取位宽，显示位宽信息
                 if extract_width:
-                    print("\n信号位宽信息：")
+                    messages.append("\n信号位宽信息：")
                     signal_widths = analyzer.signal_widths
                     for signal in undefined_signals:
                         width = signal_widths.get(signal)
-                        print(f"  {signal}: {'无位宽信息' if width is None else width}")
+                        messages.append(f"  {signal}: {'无位宽信息' if width is None else width}")
+                    if analyzer.port_width_signals:
+                        messages.append(f"位宽来自子模块端口的信号: {len(analyzer.port_width_signals)}")
             else:
-                print(f"\n发现未定义信号：{len(undefined_signals)}个")
+                messages.append(f"\n发现未定义信号：{len(undefined_signals)}个")
                 
             # 创建生成器
             generator = CodeGenerator()
@@ -176,37 +309,188 @@ def run(args: argparse.Namespace) -> int:
                 analyzer=analyzer,
                 file_path=file_path,
                 output_dir=config.output_dir,
-                append=config.append_to_original
+                append=config.append_to_original,
+                emitter=config.emit
             )
             
             # 生成代码
-            generator.generate()
+            with profile_phase(profiler, 'generate'):
+                generator.generate()
             
             # 输出调试信息
             if config.debug:
-                print("\n生成的wire声明：")
+                messages.append("\n生成的内容：")
                 for definition in generator.definitions:
-                    print(f"  {definition.strip()}")
+                    messages.append(f"  {definition.strip()}")
                     
             # 写入文件
-            output_file = generator.write_to_file()
+            with profile_phase(profiler, 'write'):
+                output_file = generator.write_to_file()
+            summary = generator.get_summary()
+            summary["output_file"] = output_file
+            summary["output_written"] = generator.output_written
+            result["summary"] = summary
+            unchanged = '' if generator.output_written else '（内容未变化，未重写）'
             
             # 输出摘要
             if config.verbose or config.debug:
-                summary = generator.get_summary()
-                print(f"\n处理完成。")
-                print(f"总共处理信号数量: {summary['total_signals']}")
-                print(f"具有自动推断位宽的信号: {summary['signals_with_width']}")
-                print(f"使用默认位宽的信号: {summary['signals_with_default_width']}")
-                print(f"无位宽信息的信号: {summary['signals_without_width']}")
-                print(f"输出模式: {summary['output_mode']}")
-                print(f"输出文件: {output_file}")
+                messages.append(f"\n处理完成。")
+                messages.append(f"总共处理信号数量: {summary['total_signals']}")
+                messages.append(f"具有自动推断位宽的信号: {summary['signals_with_width']}")
+                messages.append(f"使用默认位宽的信号: {summary['signals_with_default_width']}")
+                messages.append(f"无位宽信息的信号: {summary['signals_without_width']}")
+                messages.append(f"输出模式: {summary['output_mode']}")
+                messages.append(f"输出文件: {output_file}{unchanged}")
             else:
-                print(f"\n处理完成。{'已追加到原始文件' if config.append_to_original else '输出文件：' + output_file}")
+                messages.append(f"\n处理完成。{'已写入原始文件的生成区域' if config.append_to_original else '输出文件：' + output_file}{unchanged}")
         else:
-            print("\n未发现未定义信号。")
+            messages.append("\n未发现未定义信号。")
+            if config.append_to_original:
+                # 清空上次运行留下的生成区域，否则其中的声明与源代码中新增的声明重复
+                generator = CodeGenerator()
+                generator.setup(
+                    analyzer=analyzer,
+                    file_path=file_path,
+                    append=True,
+                    emitter=config.emit
+                )
+                with profile_phase(profiler, 'write'):
+                    if generator.clear_region():
+                        messages.append("已清空原始文件的生成区域")
+            
+    except Exception as e:
+        result["success"] = False
+        result["error"] = format_error(e, config.debug)
+        
+    if config.verbose or config.debug:
+        peak = peak_memory_mb()
+        if peak is not None:
+            messages.append(f"进程峰值内存: {peak:.1f} MB")
+        
+    return result
+
+def process_files(files: List[str], config: Config, extract_width: bool = False, jobs: int = 1,
+                  project_index: Optional[ProjectIndex] = None, profile: bool = False,
+                  trace_memory: bool = False) -> List[Dict[str, Any]]:
+    """
+    处理多个Verilog文件，jobs大于1时使用进程池并行处理
+    
+    参数:
+        files: 文件路径列表
+        config: 配置对象
+        extract_width: 是否显示位宽信息
+        jobs: 进程数，0表示使用全部CPU核心
+        project_index: 项目模式的模块接口索引，随任务传给工作进程
+        profile: 是否剖析每个文件，见process_file()
+        trace_memory: 剖析时是否记录内存分配峰值
+        
+    返回:
+        与files顺序一致的处理结果列表
+    """
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    worker = partial(process_file, config=config, extract_width=extract_width, project_index=project_index,
+                     profile=profile, trace_memory=trace_memory)
+    if jobs == 1 or len(files) == 1:
+        return [worker(file_path) for file_path in files]
+    
+    jobs = min(jobs, len(files))
+    chunksize = max(1, len(files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(worker, files, chunksize=chunksize))
+
+def print_summary(results: List[Dict[str, Any]], verbose: bool = False) -> None:
+    """
+    打印多文件处理的汇总信息
+    
+    参数:
+        results: 处理结果列表
+        verbose: 是否显示峰值内存
+    """
+    summaries = [r["summary"] for r in results if r["summary"]]
+    failed = [r for r in results if not r["success"]]
+    
+    print("\n==================== 汇总 ====================")
+    print(f"处理文件数: {len(results)}")
+    print(f"成功: {len(results) - len(failed)}")
+    print(f"失败: {len(failed)}")
+    print(f"缓存命中: {sum(1 for r in results if r['cached'])}")
+    print(f"存在未定义信号的文件: {len(summaries)}")
+    print(f"未变化未重写的输出文件: {sum(1 for s in summaries if not s['output_written'])}")
+    print(f"总共处理信号数量: {sum(s['total_signals'] for s in summaries)}")
+    print(f"具有自动推断位宽的信号: {sum(s['signals_with_width'] for s in summaries)}")
+    print(f"使用默认位宽的信号: {sum(s['signals_with_default_width'] for s in summaries)}")
+    print(f"无位宽信息的信号: {sum(s['signals_without_width'] for s in summaries)}")
+    if verbose:
+        peak = peak_memory_mb(children=True)
+        if peak is not None:
+            print(f"峰值内存（含工作进程）: {peak:.1f} MB")
+    if failed:
+        print("\n失败的文件：")
+        for r in failed:
+            print(f"  {r['file']}")
+
+def run(args: argparse.Namespace) -> int:
+    """
+    执行主程序
+    
+    参数:
+        args: 解析后的命令行参数
+        
+    返回:
+        执行状态码，0表示成功，任一文件处理失败时返回1
+    """
+    try:
+        # 显示详细帮助
+        if args.help_detail:
+            print_detailed_help()
+            return 0
             
-        return 0
+        # 初始化配置
+        config = load_config(args)
+        
+        # 收集源文件，监视模式下由监视器展开输入并记录文件状态
+        watcher = None
+        if getattr(args, 'watch', False):
+            watcher = SourceWatcher(args.files or [], getattr(args, 'filelist', None),
+                                    args.watch_interval, args.debounce)
+            sources = watcher.sources
+        else:
+            sources = collect_sources(args.files or [], getattr(args, 'filelist', None))
+        files = sources.files
+        if not files:
+            raise ParseError("未指定Verilog源文件")
+        config.add_filelist_options(sources.defines, sources.include_dirs)
+        
+        # 项目模式先建立模块接口索引，未变化的文件使用缓存的接口
+        project_index = None
+        if config.project:
+            project_index = ProjectIndex(config.cache_dir, __version__, config.defines,
+                                         config.include_dirs).build(files)
+            if config.verbose or config.debug:
+                print(f"模块接口索引: {len(project_index)}个模块"
+                      f"（解析{project_index.parsed_files}个文件，缓存{project_index.cached_files}个文件）")
+            for name in sorted(set(project_index.duplicates)):
+                print(f"警告：模块 {name} 重复定义，使用最先出现的定义", file=sys.stderr)
+        
+        jobs = getattr(args, 'jobs', 1)
+        profile = bool(getattr(args, 'profile', None))
+        profile_dump = getattr(args, 'profile_dump', None)
+        if profile_dump:
+            if jobs != 1 and len(files) > 1:
+                print("警告：cProfile只记录主进程，使用 --jobs 1 可得到完整的调用数据", file=sys.stderr)
+            cprofiler = cProfile.Profile()
+            cprofiler.enable()
+        try:
+            results = process_files(files, config, args.width, jobs, project_index,
+                                    profile, getattr(args, 'profile_memory', False))
+        finally:
+            if profile_dump:
+                cprofiler.disable()
+                cprofiler.dump_stats(profile_dump)
+        if watcher is not None and config.append_to_original:
+            # 追加模式写回的原始文件不算作修改
+            watcher.refresh(r['file'] for r in results if r['summary'] and r['summary']['output_written'])
         
     except VerilogError as e:
         handle_error(e, args.debug if hasattr(args, 'debug') else False)
@@ -214,16 +498,70 @@ def run(args: argparse.Namespace) -> int:
     except Exception as e:
         handle_error(e, args.debug if hasattr(args, 'debug') else False)
         return 1
+    
+    print_results(results, config)
+    if profile:
+        report = write_profile(args.profile, [r["profile"] for r in results if "profile" in r])
+        print_profile(report, args.profile)
+    if watcher is not None:
+        return watch(watcher, WatchSession(config, args.width, getattr(args, 'jobs', 1)), project_index)
+    return 0 if all(r["success"] for r in results) else 1
 
-def main() -> int:
+def print_results(results: List[Dict[str, Any]], config: Config) -> None:
     """
-    主函数
+    按输入顺序输出每个文件的处理结果，多个文件时输出汇总信息
     
+    参数:
+        results: 处理结果列表
+        config: 配置对象
+    """
+    multiple = len(results) > 1
+    for result in results:
+        if multiple:
+            print(f"\n[{result['file']}]")
+        for message in result["messages"]:
+            print(message)
+        if result["error"]:
+            print(result["error"], file=sys.stderr)
+            
+    if multiple:
+        print_summary(results, config.verbose or config.debug)
+
+def print_profile(report: Dict[str, Any], path: str) -> None:
+    """
+    打印剖析汇总：各阶段累计耗时及占比，以及最慢的文件
+    
+    参数:
+        report: 汇总字典，见aggregate_profiles()
+        path: 剖析结果文件路径
+    """
+    print("\n==================== 性能剖析 ====================")
+    print(f"{'阶段':<24}{'耗时(s)':>10}{'占比':>8}{'正则调用':>10}{'正则匹配':>10}")
+    for name, phase in report["phases"].items():
+        print(f"{name:<24}{phase['seconds']:>10.3f}{phase['share']:>8.1%}"
+              f"{phase['regex_calls']:>10}{phase['regex_matches']:>10}")
+    if len(report["files"]) > 1:
+        print("\n最慢的文件：")
+        for item in report["slowest_files"][:5]:
+            print(f"  {item['total_seconds']:.3f}s  {item['file']}")
+    print(f"\n剖析结果已写入：{path}")
+
+def main(args: List[str] = None) -> int:
+    """
+    主函数，第一个参数为serve时启动常驻分析服务（见server.py）
+    
+    参数:
+        args: 命令行参数列表，默认为None使用sys.argv
+        
     返回:
         执行状态码，0表示成功
     """
-    args = parse_arguments()
-    return run(args)
+    if args is None:
+        args = sys.argv[1:]
+    if args and args[0] == 'serve':
+        from .server import main as serve_main
+        return serve_main(args[1:])
+    return run(parse_arguments(args))
 
 if __name__ == '__main__':
     sys.exit(main())
@@ -0,0 +1,424 @@
+"""
+分析服务模块
+autowire serve 常驻进程，以JSON-RPC 2.0协议（每行一个JSON对象）通过标准输入输出或Unix套接字提供分析，
+配置只加载一次，按文件缓存解析结果，只重新分析内容发生变化的文件
+
+用法:
+    autowire serve                         # 标准输入输出
+    autowire serve --socket /tmp/autowire.sock
+"""
+
+import os
+import sys
+import stat
+import json
+import time
+import socket
+import inspect
+import hashlib
+import argparse
+import threading
+import socketserver
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+from ..core.parser import VerilogParser
+from ..core.analyzer import SignalAnalyzer
+from ..core.generator import CodeGenerator
+from ..core.emitters import EMITTERS
+from ..core.preprocessor import include_state, includes_unchanged
+from ..core.utils import read_file, format_error, VerilogError, ServiceError
+from ..config.config import Config
+from .. import __version__
+
+# 默认缓存的文件数
+DEFAULT_MAX_FILES = 128
+
+# JSON-RPC 2.0 错误码
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class _Entry:
+    """单个文件的缓存条目"""
+
+    __slots__ = ('digest', 'parser', 'analyzer', 'includes')
+
+    def __init__(self, digest: str, parser: VerilogParser, analyzer: SignalAnalyzer):
+        self.digest = digest
+        self.parser = parser
+        self.analyzer = analyzer
+        self.includes = include_state(parser.included_files)   # 包含的头文件状态
+
+
+class AnalysisService:
+    """
+    分析服务类，与传输方式无关
+
+    按文件绝对路径在LRU中保存解析器和分析结果，请求时比较源代码摘要，未变化时直接返回缓存的结果
+    """
+
+    def __init__(self, config: Config, max_files: int = DEFAULT_MAX_FILES):
+        """
+        初始化服务
+
+        参数:
+            config: 已验证的配置对象
+            max_files: LRU中最多保存的文件数
+        """
+        self.config = config
+        self.max_files = max(1, max_files)
+        self.signal_filter = config.get_signal_filter()
+        self.entries = OrderedDict()   # 文件绝对路径到缓存条目的映射，按最近使用排序
+        self.hits = 0
+        self.misses = 0
+        self.running = True
+        self.lock = threading.Lock()
+        self.methods = {
+            'analyze': self.analyze,
+            'generate': self.generate,
+            'invalidate': self.invalidate,
+            'stats': self.stats,
+            'shutdown': self.shutdown,
+        }
+
+    def handle(self, line: str) -> Optional[str]:
+        """
+        处理一行JSON-RPC请求
+
+        参数:
+            line: 请求文本
+
+        返回:
+            响应文本（不含换行），通知请求（无id）返回None
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return _error_response(None, PARSE_ERROR, f"无效的JSON：{e}")
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return _error_response(request.get('id') if isinstance(request, dict) else None,
+                                   INVALID_REQUEST, "无效的请求")
+
+        request_id = request.get('id')
+        method = self.methods.get(request['method'])
+        params = request.get('params', {})
+        try:
+            if method is None:
+                raise ServiceError(f"未知的方法：{request['method']}", METHOD_NOT_FOUND)
+            if not isinstance(params, dict):
+                raise ServiceError("params必须是对象", INVALID_PARAMS)
+            try:
+                inspect.signature(method).bind(**params)
+            except TypeError as e:
+                raise ServiceError(f"无效的参数：{e}", INVALID_PARAMS)
+            with self.lock:
+                result = method(**params)
+        except ServiceError as e:
+            response = _error_response(request_id, e.code, str(e))
+        except Exception as e:
+            # 单个请求失败不影响服务继续运行
+            response = _error_response(request_id, SERVER_ERROR, format_error(e, self.config.debug))
+        else:
+            response = json.dumps({'jsonrpc': '2.0', 'id': request_id, 'result': result}, ensure_ascii=False)
+        return None if 'id' not in request else response
+
+    def analyze(self, file: str, content: Optional[str] = None) -> Dict[str, Any]:
+        """
+        分析文件并返回未定义信号和生成的声明
+
+        参数:
+            file: 源文件路径
+            content: 编辑器中尚未保存的源代码，为None时读取文件
+
+        返回:
+            结果字典，包含file、cached、undefined_signals、signal_widths、definitions和elapsed_ms
+        """
+        start = time.perf_counter()
+        path, entry, cached = self._get_entry(file, content)
+        return _analysis_result(path, entry, cached, start)
+
+    def generate(self, file: str, content: Optional[str] = None, output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        分析文件并按配置写出声明文件，与命令行的输出相同
+
+        参数:
+            file: 源文件路径
+            content: 编辑器中尚未保存的源代码，为None时读取文件
+            output_dir: 输出目录，默认使用配置中的输出目录
+
+        返回:
+            analyze()的结果，另含output_file和output_written；没有未定义信号时output_file为None
+        """
+        start = time.perf_counter()
+        path, entry, cached = self._get_entry(file, content)
+        output_file = None
+        output_written = False
+        if entry.analyzer.undefined_signals:
+            generator = CodeGenerator()
+            generator.setup(
+                analyzer=entry.analyzer,
+                file_path=path,
+                output_dir=output_dir or self.config.output_dir,
+                append=self.config.append_to_original,
+                emitter=self.config.emit
+            )
+            generator.generate()
+            output_file = generator.write_to_file()
+            output_written = generator.output_written
+        result = _analysis_result(path, entry, cached, start)
+        result['output_file'] = output_file
+        result['output_written'] = output_written
+        return result
+
+    def invalidate(self, file: Optional[str] = None) -> Dict[str, int]:
+        """
+        丢弃缓存的解析结果
+
+        参数:
+            file: 源文件路径，为None时丢弃全部
+
+        返回:
+            {'removed': 丢弃的条目数}
+        """
+        if file is None:
+            removed = len(self.entries)
+            self.entries.clear()
+        else:
+            removed = 1 if self.entries.pop(os.path.abspath(file), None) is not None else 0
+        return {'removed': removed}
+
+    def stats(self) -> Dict[str, Any]:
+        """获取服务状态：版本、缓存的文件数、命中和未命中次数"""
+        return {
+            'version': __version__,
+            'files': len(self.entries),
+            'max_files': self.max_files,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def shutdown(self) -> bool:
+        """请求服务在响应后退出"""
+        self.running = False
+        return True
+
+    def _get_entry(self, file: Any, content: Optional[str]) -> tuple:
+        """
+        获取文件的缓存条目，源代码变化或不在缓存中时重新解析和分析
+
+        返回:
+            (文件绝对路径, 缓存条目, 是否命中缓存)
+        """
+        if not isinstance(file, str) or not file:
+            raise ServiceError("file必须是非空字符串", INVALID_PARAMS)
+        if content is not None and not isinstance(content, str):
+            raise ServiceError("content必须是字符串", INVALID_PARAMS)
+        path = os.path.abspath(file)
+        if content is None:
+            content = read_file(path)
+        digest = hashlib.sha256(content.encode('utf-8', 'surrogatepass')).hexdigest()
+
+        entry = self.entries.get(path)
+        if entry is not None and entry.digest == digest and includes_unchanged(entry.includes):
+            self.entries.move_to_end(path)
+            self.hits += 1
+            return path, entry, True
+
+        parser = VerilogParser(defines=self.config.defines, include_dirs=self.config.include_dirs)
+        parser.parse_text(content, path)
+        analyzer = SignalAnalyzer()
+        analyzer.setup(parser, exclude_patterns=self.signal_filter, default_width=self.config.default_width)
+        analyzer.analyze()
+        entry = _Entry(digest, parser, analyzer)
+        self.entries[path] = entry
+        self.entries.move_to_end(path)
+        while len(self.entries) > self.max_files:
+            self.entries.popitem(last=False)
+        self.misses += 1
+        return path, entry, False
+
+
+def _analysis_result(path: str, entry: _Entry, cached: bool, start: float) -> Dict[str, Any]:
+    """构造analyze/generate的结果字典"""
+    analyzer = entry.analyzer
+    return {
+        'file': path,
+        'cached': cached,
+        'undefined_signals': analyzer.undefined_signals,
+        'signal_widths': analyzer.signal_widths,
+        'definitions': list(analyzer.get_signal_definitions().values()),
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def _error_response(request_id: Any, code: int, message: str) -> str:
+    """构造JSON-RPC错误响应"""
+    return json.dumps({'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}},
+                      ensure_ascii=False)
+
+
+def serve_stdio(service: AnalysisService, stdin: TextIO, stdout: TextIO) -> None:
+    """
+    通过文本流提供服务，每行一个请求，直到输入结束或收到shutdown
+
+    参数:
+        service: 分析服务
+        stdin: 请求输入流
+        stdout: 响应输出流
+    """
+    for line in stdin:
+        if not line.strip():
+            continue
+        response = service.handle(line)
+        if response is not None:
+            stdout.write(response + '\n')
+            stdout.flush()
+        if not service.running:
+            break
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """
+    删除上次运行遗留的套接字文件，路径不存在时不做任何操作
+
+    参数:
+        socket_path: 套接字文件路径
+
+    异常:
+        ServiceError: 路径不是套接字文件，或已有服务在该套接字上监听
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ServiceError(f"{socket_path} 已存在且不是套接字文件，请指定其他路径")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        # 无法连接，是已退出的服务遗留的套接字
+        os.remove(socket_path)
+        return
+    finally:
+        probe.close()
+    raise ServiceError(f"已有服务在 {socket_path} 上监听")
+
+
+def serve_socket(service: AnalysisService, socket_path: str, ready: Optional[Callable[[], None]] = None) -> None:
+    """
+    通过Unix套接字提供服务，每个连接内每行一个请求，直到收到shutdown
+
+    参数:
+        service: 分析服务
+        socket_path: 套接字文件路径，已退出的服务遗留的套接字文件会被替换
+        ready: 开始监听后调用的回调
+
+    异常:
+        ServiceError: 当前平台不支持Unix套接字，路径已存在且不是套接字文件，或已有服务在该套接字上监听
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise ServiceError("当前平台不支持Unix套接字，请使用标准输入输出模式")
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                line = raw.decode('utf-8', errors='replace')
+                if not line.strip():
+                    continue
+                response = service.handle(line)
+                if response is not None:
+                    self.wfile.write((response + '\n').encode('utf-8'))
+                    self.wfile.flush()
+                if not service.running:
+                    # shutdown()会等待serve_forever()返回，不能在处理请求的线程中直接调用
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    break
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    _remove_stale_socket(socket_path)
+    server = Server(socket_path, Handler)
+    bound = os.lstat(socket_path)
+    try:
+        if ready is not None:
+            ready()
+        server.serve_forever()
+    finally:
+        server.server_close()
+        # 只删除本服务创建的套接字文件
+        try:
+            current = os.lstat(socket_path)
+        except FileNotFoundError:
+            pass
+        else:
+            if (current.st_dev, current.st_ino) == (bound.st_dev, bound.st_ino):
+                os.remove(socket_path)
+
+
+def parse_arguments(args: List[str] = None) -> argparse.Namespace:
+    """
+    解析serve子命令的参数
+
+    参数:
+        args: 命令行参数列表（不含serve）
+
+    返回:
+        解析后的参数对象
+    """
+    parser = argparse.ArgumentParser(prog='autowire serve', description='autowire常驻分析服务（JSON-RPC 2.0，每行一个JSON对象）')
+    parser.add_argument('--socket', type=str, help='Unix套接字路径，默认使用标准输入输出')
+    parser.add_argument('--max-files', type=int, default=DEFAULT_MAX_FILES, help='缓存解析结果的最大文件数')
+    parser.add_argument('--config', '-c', type=str, help='配置文件路径')
+    parser.add_argument('--exclude', '-e', type=str, nargs='+', help='排除匹配模式列表，支持正则表达式')
+    parser.add_argument('--default-width', '-d', type=str, help='默认位宽')
+    parser.add_argument('--define', '-D', type=str, action='append', metavar='NAME[=VALUE]', help='预定义宏，可多次指定')
+    parser.add_argument('--include-dir', '-I', type=str, action='append', metavar='DIR',
+                        help='`include头文件的搜索路径，可多次指定')
+    parser.add_argument('--output-dir', '-o', type=str, help='generate请求的输出目录')
+    parser.add_argument('--append', '-a', action='store_true', help='generate请求将定义追加到原始文件')
+    parser.add_argument('--emit', type=str, choices=list(EMITTERS), help='generate请求生成内容的格式')
+    parser.add_argument('--debug', action='store_true', help='错误响应中包含堆栈跟踪')
+    return parser.parse_args(args)
+
+
+def main(args: List[str] = None) -> int:
+    """
+    serve子命令入口
+
+    参数:
+        args: 命令行参数列表（不含serve）
+
+    返回:
+        执行状态码
+    """
+    from .main import load_config
+
+    options = parse_arguments(args)
+    # 标准输出只用于协议，其余输出（如排除模式的警告）转到标准错误
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        service = AnalysisService(load_config(options), options.max_files)
+        if options.socket:
+            print(f"autowire {__version__} 正在监听 {options.socket}")
+            serve_socket(service, options.socket)
+        else:
+            serve_stdio(service, sys.stdin, protocol_out)
+    except VerilogError as e:
+        print(format_error(e, options.debug))
+        return 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stdout = protocol_out
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+监视模式模块
+轮询输入的文件、目录和文件列表，源文件保存后经过防抖只重新处理受影响的文件，
+并记录每次重新生成的反应时间（从最后一次保存到处理完成）
+
+只使用标准库：按 (修改时间, 大小) 比较文件状态，不依赖inotify等平台接口
+"""
+
+import os
+import sys
+import time
+from typing import Iterable, List, Optional, Set, Tuple
+
+from ..core.filelist import collect_sources
+from ..core.project import ProjectIndex
+from ..core.utils import VerilogError, format_error
+from ..config.config import Config
+from .. import __version__
+
+# 默认轮询间隔（秒）
+DEFAULT_INTERVAL = 0.5
+
+# 默认防抖时间（秒）：最后一次变化后保持这么久没有新变化才开始处理
+DEFAULT_DEBOUNCE = 0.3
+
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    """文件的 (修改时间纳秒, 大小)，文件不存在时返回None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class SourceWatcher:
+    """
+    源文件监视类
+
+    每次轮询重新展开输入项，因此目录中新增的文件和文件列表的修改都会被发现
+    """
+
+    def __init__(self, inputs: Iterable[str], filelists: Optional[Iterable[str]] = None,
+                 interval: float = DEFAULT_INTERVAL, debounce: float = DEFAULT_DEBOUNCE):
+        """
+        初始化监视器并记录当前的文件状态
+
+        参数:
+            inputs: 文件、通配符或目录
+            filelists: .f文件列表路径
+            interval: 轮询间隔（秒）
+            debounce: 防抖时间（秒）
+
+        异常:
+            ParseError: 输入项无效
+        """
+        self.inputs = list(inputs)
+        self.filelists = list(filelists or [])
+        self.interval = interval
+        self.debounce = debounce
+        self.sources = collect_sources(self.inputs, self.filelists)   # 展开的文件列表，含+define+和+incdir+
+        self.files = self.sources.files
+        self.snapshot = {path: _stat(path) for path in self.files}   # 文件路径到状态的映射
+
+    def poll(self) -> Tuple[Set[str], Set[str]]:
+        """
+        比较当前文件状态与上次记录的状态，并更新记录
+
+        返回:
+            (新增或修改的文件, 删除或不再属于输入的文件)
+        """
+        try:
+            files = collect_sources(self.inputs, self.filelists).files
+        except VerilogError:
+            # 保存过程中文件或目录可能暂时不存在，只检查已知的文件
+            files = [path for path in self.files if os.path.exists(path)]
+        current = {path: _stat(path) for path in files}
+        changed = {path for path, state in current.items()
+                   if state is not None and self.snapshot.get(path) != state}
+        removed = set(self.snapshot) - set(current)
+        self.files = files
+        self.snapshot = current
+        return changed, removed
+
+    def refresh(self, paths: Iterable[str]) -> None:
+        """
+        重新记录文件状态，用于忽略工具自身的写入（如追加模式写回原始文件）
+
+        参数:
+            paths: 文件路径
+        """
+        for path in paths:
+            if path in self.snapshot:
+                self.snapshot[path] = _stat(path)
+
+    def wait(self) -> Set[str]:
+        """
+        阻塞直到有文件变化，且之后的防抖时间内没有新的变化
+
+        返回:
+            这段时间内新增或修改的全部文件
+        """
+        pending = set()
+        last_change = None
+        while True:
+            changed, _ = self.poll()
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                last_change = now
+            if pending and now - last_change >= self.debounce:
+                return pending
+            time.sleep(self.interval if not pending else min(self.interval, self.debounce))
+
+
+class WatchSession:
+    """
+    监视模式的重新生成类，保存项目模式下的模块接口指纹，确定每次需要重新处理的文件
+    """
+
+    def __init__(self, config: Config, extract_width: bool = False, jobs: int = 1):
+        """
+        初始化重新生成会话
+
+        参数:
+            config: 配置对象
+            extract_width: 是否显示位宽信息
+            jobs: 并行处理的进程数
+        """
+        self.config = config
+        self.extract_width = extract_width
+        self.jobs = jobs
+        self.fingerprints = {}   # 项目模式下文件到依赖指纹的映射
+
+    def build_index(self, files: List[str]) -> Optional[ProjectIndex]:
+        """
+        项目模式下重建模块接口索引，未变化的文件使用缓存的接口
+
+        参数:
+            files: 全部源文件
+
+        返回:
+            模块接口索引，非项目模式时返回None
+        """
+        if not self.config.project:
+            return None
+        return ProjectIndex(self.config.cache_dir, __version__, self.config.defines,
+                            self.config.include_dirs).build(files)
+
+    def affected_files(self, files: List[str], changed: Set[str],
+                       project_index: Optional[ProjectIndex]) -> List[str]:
+        """
+        确定需要重新处理的文件：修改的文件，以及项目模式下所实例化的子模块接口发生变化的文件
+
+        参数:
+            files: 全部源文件，结果按此顺序排列
+            changed: 新增或修改的文件
+            project_index: 模块接口索引
+
+        返回:
+            需要重新处理的文件列表
+        """
+        affected = set(changed)
+        if project_index is not None:
+            for path in files:
+                fingerprint = project_index.dependency_fingerprint(path)
+                if self.fingerprints.get(path, fingerprint) != fingerprint:
+                    affected.add(path)
+                self.fingerprints[path] = fingerprint
+        return [path for path in files if path in affected]
+
+    def regenerate(self, files: List[str], changed: Set[str]) -> List[dict]:
+        """
+        通过 VerilogParser → SignalAnalyzer → CodeGenerator 重新处理受影响的文件
+
+        参数:
+            files: 全部源文件
+            changed: 新增或修改的文件
+
+        返回:
+            处理结果列表，见process_file()
+        """
+        from .main import process_files
+
+        project_index = self.build_index(files)
+        affected = self.affected_files(files, changed, project_index)
+        if not affected:
+            return []
+        return process_files(affected, self.config, self.extract_width, self.jobs, project_index)
+
+
+def watch(watcher: SourceWatcher, session: WatchSession, project_index: Optional[ProjectIndex] = None) -> int:
+    """
+    监视循环，直到按下Ctrl+C
+
+    参数:
+        watcher: 源文件监视器
+        session: 重新生成会话
+        project_index: 首次处理时建立的模块接口索引，作为项目模式下依赖指纹的初始值
+
+    返回:
+        执行状态码
+    """
+    from .main import print_results
+
+    if session.config.project:
+        session.affected_files(watcher.files, set(), project_index or session.build_index(watcher.files))
+    print(f"\n正在监视 {len(watcher.files)} 个文件，按Ctrl+C退出")
+    try:
+        while True:
+            changed = watcher.wait()
+            detected = time.time()
+            last_saved = max((os.path.getmtime(path) for path in changed if os.path.exists(path)), default=detected)
+            try:
+                results = session.regenerate(watcher.files, changed)
+            except Exception as e:
+                # 单次重新生成失败不结束监视
+                print(format_error(e, session.config.debug), file=sys.stderr)
+                continue
+            if session.config.append_to_original:
+                watcher.refresh(r['file'] for r in results if r['summary'] and r['summary']['output_written'])
+            if len(results) == 1:
+                print(f"\n[{results[0]['file']}]")
+            print_results(results, session.config)
+            finished = time.time()
+            print(f"\n重新生成 {len(results)} 个文件（修改 {len(changed)} 个），"
+                  f"反应时间 {max(0.0, finished - last_saved) * 1000:.0f} ms"
+                  f"（处理 {(finished - detected) * 1000:.0f} ms）")
+    except KeyboardInterrupt:
+        print("\n已停止监视")
+    return 0
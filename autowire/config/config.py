@@ -5,10 +5,15 @@
 
 import json
 import os
-from typing import List, Optional, Dict, Any
+import hashlib
+from typing import List, Optional, Dict, Any, Iterable
 from pathlib import Path
 
 from ..core.utils import ConfigError
+from ..core.cache import DEFAULT_CACHE_DIR
+from ..core.signal_filter import SignalFilter, get_signal_filter
+from ..core.preprocessor import parse_define
+from ..core.emitters import EMITTERS
 
 class Config:
     """配置管理类"""
@@ -18,10 +23,17 @@ class Config:
         self.exclude_patterns: List[str] = []
         self.default_width: Optional[str] = None
         self.output_format: str = "separate"
+        self.emit: str = "wire"
         self.output_dir: Optional[str] = None
         self.debug: bool = False
         self.verbose: bool = False
         self.append_to_original: bool = False
+        self.cache_dir: Optional[str] = DEFAULT_CACHE_DIR
+        self.stream: bool = False
+        self.mmap: bool = False
+        self.project: bool = False
+        self.defines: Dict[str, str] = {}
+        self.include_dirs: List[str] = []
         
     def load_from_file(self, file_path: str) -> None:
         """
@@ -55,10 +67,48 @@ class Config:
             if 'output_format' in config_data:
                 self.output_format = str(config_data['output_format'])
                 
+            # 加载生成内容的格式
+            if 'emit' in config_data:
+                self.emit = str(config_data['emit'])
+                
             # 加载输出目录
             if 'output_dir' in config_data:
                 self.output_dir = str(config_data['output_dir'])
                 
+            # 加载缓存目录
+            if 'cache_dir' in config_data:
+                self.cache_dir = str(config_data['cache_dir']) if config_data['cache_dir'] else None
+                
+            # 加载流式解析选项
+            if 'stream' in config_data:
+                self.stream = bool(config_data['stream'])
+                
+            # 加载内存映射解析选项
+            if 'mmap' in config_data:
+                self.mmap = bool(config_data['mmap'])
+                
+            # 加载项目模式选项
+            if 'project' in config_data:
+                self.project = bool(config_data['project'])
+                
+            # 加载宏定义，可以是对象或 NAME=VALUE 字符串列表
+            if 'defines' in config_data:
+                defines = config_data['defines']
+                if isinstance(defines, dict):
+                    self.defines.update({str(name): '' if value is None else str(value)
+                                         for name, value in defines.items()})
+                elif isinstance(defines, list):
+                    self.defines.update(parse_define(str(item)) for item in defines)
+                else:
+                    raise ConfigError("defines必须是对象或列表")
+                    
+            # 加载头文件搜索路径
+            if 'include_dirs' in config_data:
+                include_dirs = config_data['include_dirs']
+                if not isinstance(include_dirs, list):
+                    raise ConfigError("include_dirs必须是列表")
+                self.add_include_dirs(str(path) for path in include_dirs)
+                
         except json.JSONDecodeError as e:
             raise ConfigError(f"配置文件JSON格式错误：{str(e)}")
         except Exception as e:
@@ -79,6 +129,10 @@ class Config:
         if hasattr(args, 'default_width') and args.default_width:
             self.default_width = args.default_width
             
+        # 加载生成内容的格式
+        if hasattr(args, 'emit') and args.emit:
+            self.emit = args.emit
+            
         # 加载输出目录
         if hasattr(args, 'output_dir') and args.output_dir:
             self.output_dir = args.output_dir
@@ -93,6 +147,80 @@ class Config:
         if hasattr(args, 'append'):
             self.append_to_original = args.append
             
+        # 加载缓存选项
+        if hasattr(args, 'cache_dir') and args.cache_dir:
+            self.cache_dir = args.cache_dir
+        if hasattr(args, 'no_cache') and args.no_cache:
+            self.cache_dir = None
+            
+        # 加载流式解析选项
+        if hasattr(args, 'stream') and args.stream:
+            self.stream = True
+            
+        # 加载内存映射解析选项
+        if hasattr(args, 'mmap') and args.mmap:
+            self.mmap = True
+            
+        # 加载项目模式选项
+        if hasattr(args, 'project') and args.project:
+            self.project = True
+            
+        # 加载宏定义和头文件搜索路径
+        if hasattr(args, 'define') and args.define:
+            self.defines.update(parse_define(item) for item in args.define)
+        if hasattr(args, 'include_dir') and args.include_dir:
+            self.add_include_dirs(args.include_dir)
+            
+    def add_include_dirs(self, include_dirs: Iterable[str]) -> None:
+        """
+        添加头文件搜索路径，重复的路径只保留第一次出现
+        
+        参数:
+            include_dirs: 目录路径的可迭代对象
+        """
+        for path in include_dirs:
+            path = os.path.normpath(path)
+            if path not in self.include_dirs:
+                self.include_dirs.append(path)
+                
+    def add_filelist_options(self, defines: Dict[str, str], include_dirs: List[str]) -> None:
+        """
+        合并文件列表中的+define+和+incdir+，配置文件和命令行中的同名宏定义优先
+        
+        参数:
+            defines: 文件列表中的宏定义
+            include_dirs: 文件列表中的头文件搜索路径
+        """
+        self.defines = dict(defines, **self.defines)
+        self.add_include_dirs(include_dirs)
+            
+    def get_signal_filter(self) -> SignalFilter:
+        """
+        获取由排除模式编译的信号过滤器，同一进程内相同的模式只编译一次
+        
+        返回:
+            信号过滤器
+        """
+        return get_signal_filter(tuple(self.exclude_patterns))
+        
+    def fingerprint(self) -> str:
+        """
+        获取影响分析结果的配置项指纹，用于结果缓存的键
+        
+        返回:
+            十六进制的sha256指纹
+        """
+        data = {
+            'exclude_patterns': self.exclude_patterns,
+            'default_width': self.default_width,
+            'stream': self.stream,
+            'mmap': self.mmap,
+            'project': self.project,
+            'defines': self.defines,
+            'include_dirs': self.include_dirs,
+        }
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+            
     def get_default_config_path(self) -> str:
         """
         获取默认配置文件路径
@@ -116,7 +244,14 @@ class Config:
             'exclude_patterns': self.exclude_patterns,
             'default_width': self.default_width,
             'output_format': self.output_format,
+            'emit': self.emit,
             'output_dir': self.output_dir,
+            'cache_dir': self.cache_dir,
+            'stream': self.stream,
+            'mmap': self.mmap,
+            'project': self.project,
+            'defines': self.defines,
+            'include_dirs': self.include_dirs,
             'version': '2.0.0'
         }
         
@@ -148,6 +283,20 @@ class Config:
                 except ValueError:
                     raise ConfigError("默认位宽必须是正整数或[x:y]格式")
                     
+        # 验证生成内容的格式
+        if self.emit not in EMITTERS:
+            raise ConfigError(f"输出格式必须是 {', '.join(EMITTERS)} 之一")
+        if self.append_to_original and not EMITTERS[self.emit].insertable:
+            raise ConfigError(f"输出格式 {self.emit} 不能追加到原始文件")
+                    
+        # 追加模式需要读入整个原始文件（并忽略其中的生成区域），与流式和内存映射解析的目的冲突
+        if self.stream and self.append_to_original:
+            raise ConfigError("流式解析模式不支持追加到原始文件")
+        if self.mmap and self.append_to_original:
+            raise ConfigError("内存映射解析模式不支持追加到原始文件")
+        if self.stream and self.mmap:
+            raise ConfigError("流式解析和内存映射解析不能同时启用")
+                    
         # 验证排除模式
         for pattern in self.exclude_patterns:
             try:
@@ -7,11 +7,19 @@ from .utils import ParseError, AnalysisError
 from .parser import VerilogParser
 from .analyzer import SignalAnalyzer
 from .generator import CodeGenerator
+from .signal_filter import SignalFilter
+from .project import ProjectIndex, ModuleInterface
+from .profiling import PhaseProfiler, aggregate_profiles
 
 __all__ = [
     'VerilogParser',
     'SignalAnalyzer',
     'CodeGenerator',
+    'SignalFilter',
+    'ProjectIndex',
+    'ModuleInterface',
+    'PhaseProfiler',
+    'aggregate_profiles',
     'ParseError',
     'AnalysisError'
 ]
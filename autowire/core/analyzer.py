@@ -4,10 +4,14 @@
 负责分析Verilog代码中的信号定义和使用
 """
 
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Set, Optional, Union
 from collections import OrderedDict
 
 from .parser import VerilogParser
+from .usage_index import IdentifierUsageIndex
+from .signal_filter import SignalFilter
+from .project import ProjectIndex
+from .profiling import profile_phase
 from .utils import AnalysisError, format_width
 
 class SignalAnalyzer:
@@ -16,23 +20,29 @@ class SignalAnalyzer:
     def __init__(self):
         """初始化分析器"""
         self.parser = None
+        self.module_name = None        # 模块名，来自解析器或载入的结果
         self.undefined_signals = []
         self.signal_widths = {}
         self.default_width = None
-        self.exclude_patterns = []
+        self.signal_filter = SignalFilter()
+        self.project_index = None
+        self.port_width_signals = []   # 位宽来自子模块端口的信号
         
-    def setup(self, parser: VerilogParser, exclude_patterns: List[str] = None, default_width: Optional[str] = None) -> None:
+    def setup(self, parser: Optional[VerilogParser], exclude_patterns: Union[List[str], SignalFilter, None] = None,
+              default_width: Optional[str] = None, project_index: Optional[ProjectIndex] = None) -> None:
         """
         设置分析器
         
         参数:
-            parser: Verilog解析器实例
-            exclude_patterns: 排除模式列表
+            parser: Verilog解析器实例，使用load_results()载入已有结果时可为None
+            exclude_patterns: 排除模式列表，或预先编译好的信号过滤器
             default_width: 默认位宽
+            project_index: 项目模式的模块接口索引，解析器需以record_connections=True创建
         """
         self.parser = parser
-        self.exclude_patterns = exclude_patterns or []
+        self.signal_filter = exclude_patterns if isinstance(exclude_patterns, SignalFilter) else SignalFilter(exclude_patterns)
         self.default_width = default_width
+        self.project_index = project_index
         
     def analyze(self) -> None:
         """
@@ -43,12 +53,18 @@ class SignalAnalyzer:
         """
         if not self.parser:
             raise AnalysisError("分析器未设置解析器")
+        self.module_name = self.parser.module_name
             
         # 获取未定义信号
-        self.undefined_signals = self.parser.get_undefined_signals(self.exclude_patterns)
+        with profile_phase(self.parser.profiler, 'undefined_signals'):
+            self.undefined_signals = self.parser.get_undefined_signals(self.signal_filter)
+            if self.project_index is not None:
+                # 索引中的模块名不是信号（如同一文件中后续模块的模块名）
+                self.undefined_signals = [s for s in self.undefined_signals if s not in self.project_index]
         
         # 提取信号位宽
-        self.analyze_signal_widths()
+        with profile_phase(self.parser.profiler, 'signal_widths'):
+            self.analyze_signal_widths()
         
     def analyze_signal_widths(self) -> None:
         """分析信号位宽"""
@@ -56,6 +72,31 @@ class SignalAnalyzer:
             raise AnalysisError("分析器未设置解析器")
             
         self.signal_widths = self.parser.get_signal_widths(self.undefined_signals)
+        self.port_width_signals = []
+        
+        # 项目模式下，连接到子模块端口的信号以端口位宽为准
+        declarations = self.parser.declarations
+        if self.project_index is not None and declarations is not None and declarations.connections:
+            port_widths = self.project_index.resolve_connections(declarations.connections, declarations.parameters)
+            for signal in self.undefined_signals:
+                width = port_widths.get(signal)
+                if width is not None:
+                    self.signal_widths[signal] = width
+                    self.port_width_signals.append(signal)
+        
+    def load_results(self, undefined_signals: List[str], signal_widths: Dict[str, Optional[str]],
+                     module_name: Optional[str] = None) -> None:
+        """
+        载入已有的分析结果（如缓存结果），无需解析器即可生成信号定义和报告
+        
+        参数:
+            undefined_signals: 未定义信号列表
+            signal_widths: 信号名到位宽的字典
+            module_name: 模块名
+        """
+        self.module_name = module_name
+        self.undefined_signals = list(undefined_signals)
+        self.signal_widths = dict(signal_widths)
         
     def get_undefined_signals(self) -> List[str]:
         """
@@ -66,6 +107,32 @@ class SignalAnalyzer:
         """
         return self.undefined_signals
         
+    def get_usage_index(self) -> IdentifierUsageIndex:
+        """
+        获取解析器构建的标识符使用索引
+        
+        返回:
+            标识符使用索引
+            
+        异常:
+            AnalysisError: 分析器未设置解析器或解析器尚未解析文件
+        """
+        if not self.parser or self.parser.usage_index is None:
+            raise AnalysisError("解析器尚未构建标识符使用索引")
+        return self.parser.usage_index
+        
+    def get_signal_usage(self, signal: str) -> List[str]:
+        """
+        获取信号的使用上下文
+        
+        参数:
+            signal: 信号名
+            
+        返回:
+            排序后的上下文列表，如 ['assign_rhs', 'sensitivity']
+        """
+        return sorted(self.get_usage_index().contexts(signal))
+        
     def get_signal_width(self, signal: str) -> Optional[str]:
         """
         获取信号位宽
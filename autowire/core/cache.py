@@ -0,0 +1,120 @@
+"""
+结果缓存模块
+以源文件内容哈希、有效配置和工具版本为键，在磁盘上缓存未定义信号列表和位宽表，
+源文件未变化时可跳过解析和分析
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from typing import Any, Dict, Optional
+
+# 默认缓存目录（相对于当前工作目录）
+DEFAULT_CACHE_DIR = '.autowire_cache'
+
+# 缓存条目格式版本，条目结构变化时递增
+CACHE_FORMAT = 2
+
+
+class ResultCache:
+    """磁盘结果缓存类"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        初始化缓存
+
+        参数:
+            cache_dir: 缓存目录
+        """
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def make_key(content: bytes, config_fingerprint: str, version: str) -> str:
+        """
+        计算缓存键
+
+        参数:
+            content: 源文件原始内容
+            config_fingerprint: 配置指纹，见Config.fingerprint()
+            version: 工具版本
+
+        返回:
+            十六进制的sha256缓存键
+        """
+        digest = hashlib.sha256()
+        digest.update(content)
+        return _finish_key(digest, config_fingerprint, version)
+
+    @staticmethod
+    def make_file_key(file_path: str, config_fingerprint: str, version: str, chunk_size: int = 1 << 20) -> str:
+        """
+        分块读取源文件计算缓存键，结果与对完整内容调用make_key()相同
+
+        参数:
+            file_path: 源文件路径
+            config_fingerprint: 配置指纹，见Config.fingerprint()
+            version: 工具版本
+            chunk_size: 每次读取的字节数
+
+        返回:
+            十六进制的sha256缓存键
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(chunk_size), b''):
+                digest.update(block)
+        return _finish_key(digest, config_fingerprint, version)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存条目
+
+        参数:
+            key: 缓存键
+
+        返回:
+            缓存的结果字典，不存在或已损坏时返回None
+        """
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get('key') != key:
+            return None
+        return entry.get('result')
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        写入缓存条目，先写临时文件再原子替换，多进程并发写入同一条目是安全的
+
+        参数:
+            key: 缓存键
+            result: 可JSON序列化的结果字典
+        """
+        path = self._entry_path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'result': result}, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _entry_path(self, key: str) -> str:
+        """获取缓存条目的文件路径，按键的前两位分目录"""
+        return os.path.join(self.cache_dir, key[:2], f'{key}.json')
+
+
+def _finish_key(digest: Any, config_fingerprint: str, version: str) -> str:
+    """在源文件内容摘要之后加入配置指纹和版本，得到缓存键"""
+    digest.update(b'\0')
+    digest.update(config_fingerprint.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(f'{version}:{CACHE_FORMAT}'.encode('utf-8'))
+    return digest.hexdigest()
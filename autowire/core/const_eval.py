@@ -0,0 +1,385 @@
+"""
+常量表达式求值模块
+计算参数定义和位宽中的Verilog常量表达式，支持算术、移位、比较、逻辑和位运算、条件运算、
+$clog2、基数数值常量和参数引用。每个模块的参数按依赖顺序只求值一次并记入备忘表，
+之后的位宽查找只需一次字典查询
+"""
+
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .lexer import Token, IDENT, NUMBER, SYSTEM, BRACKET, OP, tokenize
+
+# 二元运算符的优先级，数值越大结合越紧
+_BINARY_PRECEDENCE = {
+    '||': 1,
+    '&&': 2,
+    '|': 3,
+    '^': 4, '~^': 4, '^~': 4,
+    '&': 5,
+    '==': 6, '!=': 6, '===': 6, '!==': 6,
+    '<': 7, '<=': 7, '>': 7, '>=': 7,
+    '<<': 8, '>>': 8, '<<<': 8, '>>>': 8,
+    '+': 9, '-': 9,
+    '*': 10, '/': 10, '%': 10,
+    '**': 11,
+}
+
+# 一元运算符（含归约运算）
+_UNARY_OPERATORS = frozenset({'+', '-', '!', '~', '&', '|', '^', '~&', '~|', '~^', '^~'})
+
+# 移位量和指数的上限，避免恶意或错误的常量导致巨大的整数运算
+_MAX_SHIFT = 4096
+
+# 数值常量的进制
+_BASES = {'b': 2, 'o': 8, 'd': 10, 'h': 16}
+
+
+class _Unresolved(Exception):
+    """表达式包含无法求值的部分（未知参数、宏、x/z值、不支持的语法等）"""
+
+
+class ConstantEvaluator:
+    """
+    常量表达式求值器类
+
+    一个实例对应一个模块（或一个文件）的参数表。参数值在第一次引用时按依赖顺序求值并记入备忘表，
+    循环引用的参数记为无法求值，并在cycles中记录循环路径
+    """
+
+    def __init__(self, parameters: Optional[Mapping[str, str]] = None,
+                 overrides: Optional[Mapping[str, Optional[int]]] = None):
+        """
+        初始化求值器
+
+        参数:
+            parameters: 参数名到表达式文本的映射
+            overrides: 已确定的参数值（如实例的参数覆盖），优先于parameters中的表达式，None表示无法求值
+        """
+        self.expressions = dict(parameters or {})
+        self.values = dict(overrides or {})   # 参数名到整数值的备忘表，无法求值的参数值为None
+        self.cycles = []                      # 检测到的循环引用路径，如 ['A', 'B', 'A']
+        self._memo = {}                       # 表达式文本到值的备忘表
+        self._stack = []                      # 正在求值的参数
+
+    def resolve_all(self) -> Dict[str, int]:
+        """
+        求值全部参数
+
+        返回:
+            参数名到整数值的字典，只包含能够求值的参数
+        """
+        for name in self.expressions:
+            self.value(name)
+        return {name: value for name, value in self.values.items() if value is not None}
+
+    def value(self, name: str) -> Optional[int]:
+        """
+        获取参数值，首次引用时求值
+
+        参数:
+            name: 参数名
+
+        返回:
+            整数值，参数不存在、无法求值或循环引用时返回None
+        """
+        if name in self.values:
+            return self.values[name]
+        if name not in self.expressions:
+            return None
+        if name in self._stack:
+            cycle = self._stack[self._stack.index(name):] + [name]
+            if not any(set(cycle) == set(existing) for existing in self.cycles):
+                self.cycles.append(cycle)
+            return None
+        self._stack.append(name)
+        try:
+            result = self.evaluate(self.expressions[name])
+        finally:
+            self._stack.pop()
+        self.values[name] = result
+        return result
+
+    def evaluate(self, expression: str) -> Optional[int]:
+        """
+        计算常量表达式
+
+        参数:
+            expression: 表达式文本
+
+        返回:
+            整数值，包含无法求值的部分时返回None
+        """
+        if expression in self._memo:
+            return self._memo[expression]
+        try:
+            result = _ExpressionParser(list(tokenize(expression)), self.value).parse()
+        except (_Unresolved, ZeroDivisionError, RecursionError):
+            result = None
+        # 因循环引用得到的None同样成立：依赖循环的表达式本身也无法求值
+        self._memo[expression] = result
+        return result
+
+    def evaluate_range(self, range_text: str) -> Optional[Tuple[int, int]]:
+        """
+        计算位宽声明 [msb:lsb] 或 [size]
+
+        参数:
+            range_text: 含方括号的位宽文本
+
+        返回:
+            (msb, lsb)，[size]形式按 [size-1:0] 处理；格式不支持或无法求值时返回None
+        """
+        bounds = split_range(range_text)
+        if bounds is None:
+            return None
+        values = [self.evaluate(bound) for bound in bounds]
+        if any(value is None for value in values):
+            return None
+        if len(values) == 1:
+            return (values[0] - 1, 0) if values[0] > 0 else None
+        return values[0], values[1]
+
+
+def evaluate(expression: str, values: Optional[Mapping[str, Optional[int]]] = None) -> Optional[int]:
+    """
+    使用已知的参数值计算一个常量表达式
+
+    参数:
+        expression: 表达式文本
+        values: 参数名到整数值的映射
+
+    返回:
+        整数值，包含无法求值的部分时返回None
+    """
+    return ConstantEvaluator(overrides=values).evaluate(expression)
+
+
+def split_range(range_text: str) -> Optional[List[str]]:
+    """
+    拆分位宽文本 [msb:lsb] 或 [size]
+
+    参数:
+        range_text: 含方括号的位宽文本
+
+    返回:
+        边界表达式列表，格式不支持（如 +: 或多个冒号）时返回None
+    """
+    text = range_text.strip()
+    if not (text.startswith('[') and text.endswith(']')):
+        return None
+    inner = text[1:-1]
+    depth = 0
+    colons = []
+    for k, char in enumerate(inner):
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        elif char == ':' and depth == 0:
+            colons.append(k)
+    if not colons:
+        return [inner]
+    if len(colons) > 1 or inner[colons[0] - 1:colons[0]] in ('+', '-'):
+        return None
+    return [inner[:colons[0]], inner[colons[0] + 1:]]
+
+
+def number_value(text: str) -> Optional[int]:
+    """
+    解析Verilog整数常量，如 32、1_000、8'hFF、'd10、4'sb1010
+
+    参数:
+        text: 数值常量文本
+
+    返回:
+        整数值，含x/z/?位、实数或时间单位时返回None
+    """
+    text = text.replace('_', '').replace(' ', '').replace('\t', '')
+    if "'" not in text:
+        return int(text) if text.isdigit() else None
+    size_text, _, rest = text.partition("'")
+    if rest[:1] in ('s', 'S'):
+        rest = rest[1:]
+    if not rest or rest[0].lower() not in _BASES:
+        return None
+    try:
+        value = int(rest[1:], _BASES[rest[0].lower()])
+    except ValueError:
+        return None
+    if size_text:
+        if not size_text.isdigit() or int(size_text) == 0:
+            return None
+        value &= (1 << int(size_text)) - 1
+    return value
+
+
+class _ExpressionParser:
+    """按优先级递归下降解析并同时计算表达式"""
+
+    def __init__(self, tokens: List[Token], lookup):
+        """
+        参数:
+            tokens: 表达式的词法单元列表
+            lookup: 参数名到值的查找函数，无法求值时返回None
+        """
+        self.tokens = tokens
+        self.lookup = lookup
+        self.index = 0
+
+    def parse(self) -> int:
+        """解析完整表达式，存在多余的词法单元时视为无法求值"""
+        value = self._conditional()
+        if self.index != len(self.tokens):
+            raise _Unresolved(self._peek())
+        return value
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.index].value if self.index < len(self.tokens) else None
+
+    def _expect(self, value: str) -> None:
+        if self._peek() != value:
+            raise _Unresolved(value)
+        self.index += 1
+
+    def _conditional(self) -> int:
+        condition = self._binary(1)
+        if self._peek() != '?':
+            return condition
+        self.index += 1
+        when_true = self._conditional()
+        self._expect(':')
+        when_false = self._conditional()
+        return when_true if condition else when_false
+
+    def _binary(self, min_precedence: int) -> int:
+        left = self._unary()
+        while True:
+            token = self.tokens[self.index] if self.index < len(self.tokens) else None
+            if token is None or token.kind != OP:
+                return left
+            precedence = _BINARY_PRECEDENCE.get(token.value)
+            if precedence is None or precedence < min_precedence:
+                return left
+            self.index += 1
+            right = self._binary(precedence + 1)
+            left = _apply_binary(token.value, left, right)
+
+    def _unary(self) -> int:
+        token = self.tokens[self.index] if self.index < len(self.tokens) else None
+        if token is not None and token.kind == OP and token.value in _UNARY_OPERATORS:
+            self.index += 1
+            return _apply_unary(token.value, self._unary())
+        return self._primary()
+
+    def _primary(self) -> int:
+        if self.index >= len(self.tokens):
+            raise _Unresolved('end')
+        token = self.tokens[self.index]
+        self.index += 1
+        if token.kind == NUMBER:
+            value = number_value(token.value)
+            if value is None:
+                raise _Unresolved(token.value)
+            return value
+        if token.kind == IDENT:
+            value = self.lookup(token.value)
+            if value is None:
+                raise _Unresolved(token.value)
+            return value
+        if token.kind == BRACKET and token.value == '(':
+            value = self._conditional()
+            self._expect(')')
+            return value
+        if token.kind == SYSTEM and token.value in ('$clog2', '$signed', '$unsigned'):
+            self._expect('(')
+            value = self._conditional()
+            self._expect(')')
+            if token.value == '$clog2':
+                return (value - 1).bit_length() if value > 1 else 0
+            return value
+        raise _Unresolved(token.value)
+
+
+def _apply_unary(op: str, value: int) -> int:
+    """计算一元运算，结果依赖操作数位宽的运算（~、归约与）视为无法求值"""
+    if op == '+':
+        return value
+    if op == '-':
+        return -value
+    if op == '!':
+        return int(not value)
+    if value < 0 or op in ('~', '&', '~&'):
+        raise _Unresolved(op)
+    if op in ('|', '~|'):
+        result = int(value != 0)
+    else:
+        result = bin(value).count('1') & 1
+    return result if op in ('|', '^') else 1 - result
+
+
+def _apply_binary(op: str, left: int, right: int) -> int:
+    """计算二元运算，除法和取余按Verilog规则向零截断"""
+    if op == '+':
+        return left + right
+    if op == '-':
+        return left - right
+    if op == '*':
+        return left * right
+    if op == '/':
+        quotient = abs(left) // abs(right)
+        return quotient if (left >= 0) == (right >= 0) else -quotient
+    if op == '%':
+        remainder = abs(left) % abs(right)
+        return remainder if left >= 0 else -remainder
+    if op == '**':
+        if right < 0 or right > _MAX_SHIFT:
+            raise _Unresolved(op)
+        return left ** right
+    if op in ('<<', '<<<'):
+        if right < 0 or right > _MAX_SHIFT:
+            raise _Unresolved(op)
+        return left << right
+    if op in ('>>', '>>>'):
+        if right < 0:
+            raise _Unresolved(op)
+        return left >> right
+    if op in ('==', '==='):
+        return int(left == right)
+    if op in ('!=', '!=='):
+        return int(left != right)
+    if op == '<':
+        return int(left < right)
+    if op == '<=':
+        return int(left <= right)
+    if op == '>':
+        return int(left > right)
+    if op == '>=':
+        return int(left >= right)
+    if op == '&&':
+        return int(bool(left) and bool(right))
+    if op == '||':
+        return int(bool(left) or bool(right))
+    if left < 0 or right < 0:
+        raise _Unresolved(op)
+    if op == '&':
+        return left & right
+    if op == '|':
+        return left | right
+    if op == '^':
+        return left ^ right
+    # ~^ 与 ^~ 同样依赖位宽
+    raise _Unresolved(op)
+
+
+def resolve_parameters(parameters: Mapping[str, str]) -> Tuple[Dict[str, int], List[List[str]]]:
+    """
+    按依赖顺序求值一组参数
+
+    参数:
+        parameters: 参数名到表达式文本的映射
+
+    返回:
+        (参数名到整数值的字典, 循环引用路径列表)
+    """
+    evaluator = ConstantEvaluator(parameters)
+    return evaluator.resolve_all(), evaluator.cycles
@@ -0,0 +1,203 @@
+"""
+计数正则表达式模块
+剖析期间运行的模块（lexer、utils、parser、widths、signal_filter、project、emitters）通过本模块编译和调用正则表达式，
+以cre为别名导入以区别于re，用法与re模块相同。
+剖析时按线程统计调用次数和匹配次数：计数器只对进入count_regex()的线程生效，
+其他线程和未剖析时的调用直接转给re的对象，不修改任何模块的全局变量
+"""
+
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+# 核心模块用到的re常量和类型
+DOTALL = re.DOTALL
+MULTILINE = re.MULTILINE
+IGNORECASE = re.IGNORECASE
+Pattern = re.Pattern
+Match = re.Match
+escape = re.escape
+error = re.error
+
+# 未给出endpos时匹配到字符串末尾，与re的默认值相同
+_MAXSIZE = sys.maxsize
+
+
+class RegexCounter:
+    """正则表达式调用次数和匹配次数"""
+
+    __slots__ = ('calls', 'matches')
+
+    def __init__(self):
+        self.calls = 0
+        self.matches = 0
+
+
+class _State(threading.local):
+    """每个线程当前的计数器"""
+    counter = None
+
+
+_state = _State()
+
+
+@contextmanager
+def count_regex(counter: RegexCounter) -> Iterator[RegexCounter]:
+    """
+    在上下文中将当前线程的正则表达式调用计入计数器，可以嵌套，退出时恢复外层的计数器
+
+    参数:
+        counter: 计数器
+    """
+    previous = _state.counter
+    _state.counter = counter
+    try:
+        yield counter
+    finally:
+        _state.counter = previous
+
+
+def _count_iter(iterator: Iterator[Any], counter: RegexCounter) -> Iterator[Any]:
+    counter.calls += 1
+    for match in iterator:
+        counter.matches += 1
+        yield match
+
+
+class CountingPattern:
+    """预编译模式，剖析时统计调用和匹配次数，其余属性来自re的模式对象"""
+
+    __slots__ = ('_pattern',)
+
+    def __init__(self, pattern: Pattern):
+        self._pattern = pattern
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pattern, name)
+
+    def __repr__(self) -> str:
+        return repr(self._pattern)
+
+    def match(self, string, pos=0, endpos=_MAXSIZE):
+        result = self._pattern.match(string, pos, endpos)
+        counter = _state.counter
+        if counter is not None:
+            counter.calls += 1
+            if result is not None:
+                counter.matches += 1
+        return result
+
+    def search(self, string, pos=0, endpos=_MAXSIZE):
+        result = self._pattern.search(string, pos, endpos)
+        counter = _state.counter
+        if counter is not None:
+            counter.calls += 1
+            if result is not None:
+                counter.matches += 1
+        return result
+
+    def fullmatch(self, string, pos=0, endpos=_MAXSIZE):
+        result = self._pattern.fullmatch(string, pos, endpos)
+        counter = _state.counter
+        if counter is not None:
+            counter.calls += 1
+            if result is not None:
+                counter.matches += 1
+        return result
+
+    def findall(self, string, pos=0, endpos=_MAXSIZE):
+        result = self._pattern.findall(string, pos, endpos)
+        counter = _state.counter
+        if counter is not None:
+            counter.calls += 1
+            counter.matches += len(result)
+        return result
+
+    def finditer(self, string, pos=0, endpos=_MAXSIZE):
+        iterator = self._pattern.finditer(string, pos, endpos)
+        counter = _state.counter
+        return iterator if counter is None else _count_iter(iterator, counter)
+
+    def subn(self, repl, string, count=0):
+        result = self._pattern.subn(repl, string, count)
+        counter = _state.counter
+        if counter is not None:
+            counter.calls += 1
+            counter.matches += result[1]
+        return result
+
+    def sub(self, repl, string, count=0):
+        if _state.counter is None:
+            return self._pattern.sub(repl, string, count)
+        return self.subn(repl, string, count)[0]
+
+    def split(self, string, maxsplit=0):
+        result = self._pattern.split(string, maxsplit)
+        counter = _state.counter
+        if counter is not None:
+            counter.calls += 1
+            counter.matches += len(result) - 1
+        return result
+
+
+def compile(pattern, flags: int = 0) -> CountingPattern:
+    """编译正则表达式，见re.compile()"""
+    if isinstance(pattern, CountingPattern):
+        return pattern
+    return CountingPattern(pattern if isinstance(pattern, Pattern) else re.compile(pattern, flags))
+
+
+def _unwrap(pattern):
+    return pattern._pattern if isinstance(pattern, CountingPattern) else pattern
+
+
+# 模块级函数在未剖析时直接调用re的函数（使用re的模式缓存），剖析时经计数模式调用
+
+def match(pattern, string, flags=0):
+    if _state.counter is None:
+        return re.match(_unwrap(pattern), string, flags)
+    return compile(pattern, flags).match(string)
+
+
+def search(pattern, string, flags=0):
+    if _state.counter is None:
+        return re.search(_unwrap(pattern), string, flags)
+    return compile(pattern, flags).search(string)
+
+
+def fullmatch(pattern, string, flags=0):
+    if _state.counter is None:
+        return re.fullmatch(_unwrap(pattern), string, flags)
+    return compile(pattern, flags).fullmatch(string)
+
+
+def findall(pattern, string, flags=0):
+    if _state.counter is None:
+        return re.findall(_unwrap(pattern), string, flags)
+    return compile(pattern, flags).findall(string)
+
+
+def finditer(pattern, string, flags=0):
+    if _state.counter is None:
+        return re.finditer(_unwrap(pattern), string, flags)
+    return compile(pattern, flags).finditer(string)
+
+
+def sub(pattern, repl, string, count=0, flags=0):
+    if _state.counter is None:
+        return re.sub(_unwrap(pattern), repl, string, count, flags)
+    return compile(pattern, flags).sub(repl, string, count)
+
+
+def subn(pattern, repl, string, count=0, flags=0):
+    if _state.counter is None:
+        return re.subn(_unwrap(pattern), repl, string, count, flags)
+    return compile(pattern, flags).subn(repl, string, count)
+
+
+def split(pattern, string, maxsplit=0, flags=0):
+    if _state.counter is None:
+        return re.split(_unwrap(pattern), string, maxsplit, flags)
+    return compile(pattern, flags).split(string, maxsplit)
@@ -0,0 +1,388 @@
+"""
+声明提取模块
+基于词法单元流提取wire/reg/端口声明和参数定义
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from collections import OrderedDict
+
+from .lexer import Token, IDENT, KEYWORD, BRACKET, iter_statements, match_bracket, join_tokens
+
+# 端口方向关键字
+DIRECTION_KEYWORDS = frozenset({'input', 'output', 'inout'})
+
+# wire类线网关键字
+NET_KEYWORDS = frozenset({
+    'wire', 'tri', 'tri0', 'tri1', 'triand', 'trior', 'trireg', 'wand', 'wor',
+    'uwire', 'supply0', 'supply1',
+})
+
+# 其他变量声明关键字（只记录为已定义信号）
+VARIABLE_KEYWORDS = frozenset({
+    'logic', 'bit', 'byte', 'int', 'integer', 'genvar', 'real', 'realtime', 'time',
+    'shortint', 'longint', 'string', 'event',
+})
+
+# 声明中可出现在信号名之前的类型修饰关键字
+TYPE_MODIFIERS = NET_KEYWORDS | VARIABLE_KEYWORDS | frozenset({
+    'reg', 'signed', 'unsigned', 'var', 'scalared', 'vectored',
+})
+
+# 参数声明关键字
+PARAMETER_KEYWORDS = frozenset({'parameter', 'localparam'})
+
+# 模块声明关键字
+MODULE_KEYWORDS = frozenset({'module', 'macromodule'})
+
+# 函数/任务声明关键字
+SUBROUTINE_KEYWORDS = frozenset({'function', 'task'})
+
+
+class DeclarationExtractor:
+    """声明提取器类，逐条语句处理词法单元并记录其中的声明"""
+
+    def __init__(self, record_connections: bool = False):
+        """
+        初始化提取器
+
+        参数:
+            record_connections: 是否记录实例的参数覆盖和端口连接（项目模式使用）
+        """
+        self.record_connections = record_connections
+        self.module_name = ""
+        self.module_names = []       # 按出现顺序记录的模块名
+        self.port_signals = set()    # 端口信号
+        self.port_order = []         # 按端口列表顺序记录的端口名，用于按位置连接
+        self.wire_signals = set()    # wire类型信号
+        self.reg_signals = set()     # reg类型信号
+        self.other_signals = set()   # logic/integer/genvar等其他声明
+        self.parameters = OrderedDict()
+        self.localparams = set()     # 以localparam声明、不能被实例覆盖的参数
+        self.port_directions = {}    # 端口名到方向的映射
+        self.ranges = {}             # 信号名到声明位宽文本的映射，如"[7:0]"
+        self.instances = []          # 模块实例化列表，元素为(模块名, 实例名)
+        self.connections = []        # 实例连接列表，见_parse_instance()
+        self.block_labels = set()    # begin/end块名，如 begin : gen_loop
+        self._in_subroutine = False  # 是否位于function/task内部，其中的input/output不是模块端口
+
+    @property
+    def defined_signals(self) -> Set[str]:
+        """所有已声明的信号"""
+        return self.port_signals | self.wire_signals | self.reg_signals | self.other_signals
+
+    def extract(self, tokens: Iterable[Token]) -> 'DeclarationExtractor':
+        """
+        从词法单元流中提取全部声明
+
+        参数:
+            tokens: 词法单元流（已过滤编译指令）
+
+        返回:
+            提取器自身，便于链式调用
+        """
+        for statement in iter_statements(tokens):
+            self.feed(statement)
+        return self
+
+    def feed(self, statement: List[Token]) -> None:
+        """
+        处理一条语句
+
+        参数:
+            statement: 语句的词法单元列表
+        """
+        n = len(statement)
+        if n > 1 and statement[0].value == ':' and statement[1].kind == IDENT:
+            # 上一条语句以begin/end结束，紧随其后的是块名
+            self.block_labels.add(statement[1].value)
+        elif n > 2 and statement[0].kind == IDENT:
+            self._parse_instance(statement)
+            
+        i = 0
+        while i < n:
+            token = statement[i]
+            if token.kind != KEYWORD:
+                i += 1
+                continue
+            value = token.value
+            if value in DIRECTION_KEYWORDS:
+                i = self._parse_declaration(statement, i + 1, self.port_signals, direction=value)
+            elif value in NET_KEYWORDS:
+                i = self._parse_declaration(statement, i + 1, self.wire_signals)
+            elif value == 'reg':
+                i = self._parse_declaration(statement, i + 1, self.reg_signals)
+            elif value in VARIABLE_KEYWORDS:
+                i = self._parse_declaration(statement, i + 1, self.other_signals)
+            elif value in PARAMETER_KEYWORDS:
+                i = self._parse_parameters(statement, i + 1, local=value == 'localparam')
+            elif value in MODULE_KEYWORDS:
+                i = self._parse_module_header(statement, i + 1)
+            elif value in SUBROUTINE_KEYWORDS:
+                self._in_subroutine = True
+                i = self._parse_subroutine_name(statement, i + 1)
+            elif value in ('endfunction', 'endtask'):
+                self._in_subroutine = False
+                i += 1
+            else:
+                i += 1
+
+    def _parse_declaration(self, statement: List[Token], i: int, signal_set: Set[str],
+                           direction: Optional[str] = None) -> int:
+        """
+        解析一条声明中的信号名列表
+
+        参数:
+            statement: 语句的词法单元列表
+            i: 声明关键字之后的位置
+            signal_set: 信号所属的集合
+            direction: 端口方向，非端口声明为None
+
+        返回:
+            声明结束后的位置
+        """
+        n = len(statement)
+        # 跳过类型修饰
+        while i < n and statement[i].kind == KEYWORD and statement[i].value in TYPE_MODIFIERS:
+            i += 1
+
+        # 打包位宽，只记录第一维
+        range_text = ""
+        while i < n and statement[i].value == '[':
+            end = match_bracket(statement, i)
+            if not range_text:
+                range_text = join_tokens(statement[i:end + 1])
+            i = end + 1
+
+        while i < n:
+            token = statement[i]
+            if token.kind != IDENT:
+                return i
+            signal_set.add(token.value)
+            if direction:
+                self.port_directions[token.value] = direction
+                if not self._in_subroutine:
+                    self._add_port(token.value)
+            if range_text:
+                self.ranges.setdefault(token.value, range_text)
+            i += 1
+            # 非打包维度，如 mem [0:15]
+            while i < n and statement[i].value == '[':
+                i = match_bracket(statement, i) + 1
+            # 声明时赋初值
+            if i < n and statement[i].value == '=':
+                i = self._skip_expression(statement, i + 1)
+            if i < n and statement[i].value == ',' and i + 1 < n and statement[i + 1].kind == IDENT:
+                i += 1
+                continue
+            return i + 1 if i < n and statement[i].value == ',' else i
+        return i
+
+    def _parse_parameters(self, statement: List[Token], i: int, local: bool = False) -> int:
+        """
+        解析parameter/localparam定义
+
+        参数:
+            statement: 语句的词法单元列表
+            i: 参数关键字之后的位置
+            local: 是否为localparam
+
+        返回:
+            定义结束后的位置
+        """
+        n = len(statement)
+        while i < n and statement[i].kind == KEYWORD and statement[i].value in TYPE_MODIFIERS:
+            i += 1
+        while i < n and statement[i].value == '[':
+            i = match_bracket(statement, i) + 1
+
+        while i + 1 < n and statement[i].kind == IDENT and statement[i + 1].value == '=':
+            name = statement[i].value
+            start = i + 2
+            i = self._skip_expression(statement, start)
+            self.parameters[name] = join_tokens(statement[start:i])
+            if local:
+                self.localparams.add(name)
+            if i < n and statement[i].value == ',' and i + 1 < n and statement[i + 1].kind == IDENT:
+                i += 1
+                continue
+            break
+        return i
+
+    def _parse_module_header(self, statement: List[Token], i: int) -> int:
+        """
+        解析模块头，记录模块名和端口列表中的端口名
+
+        端口列表中的方向声明和参数定义由feed()继续处理
+
+        参数:
+            statement: 语句的词法单元列表
+            i: module关键字之后的位置
+
+        返回:
+            模块名之后的位置
+        """
+        n = len(statement)
+        if i >= n or statement[i].kind != IDENT:
+            return i
+        name = statement[i].value
+        if not self.module_name:
+            self.module_name = name
+        self.module_names.append(name)
+        i += 1
+
+        # 跳过参数列表 #(...)
+        j = i
+        if j < n and statement[j].value == '#' and j + 1 < n and statement[j + 1].value == '(':
+            j = match_bracket(statement, j + 1) + 1
+        if j < n and statement[j].value == '(':
+            end = match_bracket(statement, j)
+            # 端口列表中直接跟随逗号或右括号的标识符即为端口名
+            depth = 0
+            for k in range(j, end):
+                token = statement[k]
+                if token.kind == BRACKET:
+                    depth += 1 if token.value in '([{' else -1
+                elif (depth == 1 and token.kind == IDENT
+                      and statement[k + 1].value in (',', ')')
+                      and statement[k - 1].value != '.'):
+                    self.port_signals.add(token.value)
+                    self._add_port(token.value)
+        return i
+
+    def _add_port(self, name: str) -> None:
+        """按出现顺序记录端口名"""
+        if name not in self.port_order:
+            self.port_order.append(name)
+
+    def _parse_instance(self, statement: List[Token]) -> None:
+        """
+        解析模块实例化语句：模块名 [#(...)] 实例名 [数组维度] (...) [, 实例名 (...)] ;
+
+        启用record_connections时，每个实例在connections中记录一个字典：module、instance、parameters（参数覆盖）和ports（端口连接），
+        后两者的键为按名称连接时的名称或按位置连接时的序号，值为连接表达式文本
+
+        参数:
+            statement: 以标识符开头的语句
+        """
+        n = len(statement)
+        module = statement[0].value
+        parameters = {}
+        i = 1
+        if i < n and statement[i].value == '#':
+            if i + 1 < n and statement[i + 1].value == '(':
+                end = match_bracket(statement, i + 1)
+                parameters = _split_arguments(statement, i + 1, end)
+                i = end + 1
+            else:
+                if i + 1 < n:
+                    parameters = {0: statement[i + 1].value}
+                i += 2
+        while i < n and statement[i].kind == IDENT:
+            instance = statement[i].value
+            i += 1
+            while i < n and statement[i].value == '[':
+                i = match_bracket(statement, i) + 1
+            if i >= n or statement[i].value != '(':
+                return
+            self.instances.append((module, instance))
+            end = match_bracket(statement, i)
+            if self.record_connections:
+                self.connections.append({
+                    'module': module,
+                    'instance': instance,
+                    'parameters': parameters,
+                    'ports': _split_arguments(statement, i, end),
+                })
+            i = end + 1
+            if i < n and statement[i].value == ',':
+                i += 1
+            else:
+                return
+
+    def _parse_subroutine_name(self, statement: List[Token], i: int) -> int:
+        """
+        解析函数/任务名，记录为已定义名称
+
+        参数:
+            statement: 语句的词法单元列表
+            i: function/task关键字之后的位置
+
+        返回:
+            函数/任务名之后的位置
+        """
+        n = len(statement)
+        while i < n and statement[i].kind == KEYWORD:
+            i += 1
+        while i < n and statement[i].value == '[':
+            i = match_bracket(statement, i) + 1
+        if i < n and statement[i].kind == IDENT:
+            self.other_signals.add(statement[i].value)
+            i += 1
+        return i
+
+    @staticmethod
+    def _skip_expression(statement: List[Token], i: int) -> int:
+        """
+        跳过一个表达式，直到同层的逗号、分号或右括号
+
+        参数:
+            statement: 语句的词法单元列表
+            i: 表达式起始位置
+
+        返回:
+            表达式结束位置（指向终止符）
+        """
+        depth = 0
+        n = len(statement)
+        while i < n:
+            token = statement[i]
+            if token.kind == BRACKET:
+                if token.value in '([{':
+                    depth += 1
+                elif depth == 0:
+                    return i
+                else:
+                    depth -= 1
+            elif depth == 0 and token.value in (',', ';'):
+                return i
+            i += 1
+        return i
+
+
+def _split_arguments(statement: List[Token], open_index: int, close_index: int) -> Dict[Union[str, int], str]:
+    """
+    拆分实例化的参数列表或端口列表
+
+    参数:
+        statement: 语句的词法单元列表
+        open_index: 左括号所在位置
+        close_index: 右括号所在位置
+
+    返回:
+        .name(expr) 形式以名称为键，按位置给出时以序号为键，值为表达式文本；空连接为空字符串
+    """
+    arguments = {}
+    items = []
+    start = open_index + 1
+    depth = 0
+    for k in range(open_index + 1, close_index):
+        token = statement[k]
+        if token.kind == BRACKET:
+            depth += 1 if token.value in '([{' else -1
+        elif depth == 0 and token.value == ',':
+            items.append((start, k))
+            start = k + 1
+    if start < close_index or items:
+        items.append((start, close_index))
+
+    for position, (start, end) in enumerate(items):
+        if (end - start >= 3 and statement[start].value == '.' and statement[start + 1].kind == IDENT
+                and statement[start + 2].value == '('):
+            inner_end = match_bracket(statement, start + 2)
+            arguments[statement[start + 1].value] = join_tokens(statement[start + 3:inner_end])
+        elif end - start == 2 and statement[start].value == '.' and statement[start + 1].kind == IDENT:
+            # .name 隐式连接同名信号
+            arguments[statement[start + 1].value] = statement[start + 1].value
+        else:
+            arguments[position] = join_tokens(statement[start:end])
+    return arguments
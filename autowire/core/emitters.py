@@ -0,0 +1,248 @@
+"""
+输出格式模块
+将分析结果渲染为不同格式：Verilog wire声明、SystemVerilog logic声明、JSON报告和Tcl变量，
+并负责追加模式下源文件中生成区域的插入与替换
+
+生成区域以标记行包围，重新运行时整体替换而不是再次插入，解析时区域内的声明被忽略，
+因此重复运行不会使文件增长，结果也不会在两次运行间来回变化
+"""
+
+import os
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Type, Union
+
+from . import counted_re as cre  # 剖析时按线程统计正则表达式调用
+from .utils import ParseError
+
+# 生成区域的开始和结束标记
+REGION_BEGIN = "// autowire:begin"
+REGION_END = "// autowire:end"
+
+# 追加模式的插入位置：模块头部（端口列表）结束的分号之后
+_MODULE_HEADER_PATTERN = cre.compile(r'\bmodule\s+\w+[^;]*;')
+
+# 已注册的输出格式，格式名到输出格式类的映射
+EMITTERS = OrderedDict()
+
+
+def register_emitter(emitter_class: Type['Emitter']) -> Type['Emitter']:
+    """
+    注册输出格式，可用作类装饰器
+
+    参数:
+        emitter_class: 输出格式类，name为格式名
+
+    返回:
+        输出格式类本身
+    """
+    EMITTERS[emitter_class.name] = emitter_class
+    return emitter_class
+
+
+def get_emitter(emitter: Union[str, 'Emitter', None] = None) -> 'Emitter':
+    """
+    获取输出格式实例
+
+    参数:
+        emitter: 格式名或输出格式实例，为None时使用wire
+
+    返回:
+        输出格式实例
+
+    异常:
+        ParseError: 未知的格式名
+    """
+    if isinstance(emitter, Emitter):
+        return emitter
+    name = emitter or 'wire'
+    if name not in EMITTERS:
+        raise ParseError(f"未知的输出格式：{name}（可选 {', '.join(EMITTERS)}）")
+    return EMITTERS[name]()
+
+
+class Emitter:
+    """输出格式基类，子类设置name并实现render()"""
+
+    name = ""
+    suffix = "_autogen"      # 独立文件模式下输出文件名在源文件主名后追加的后缀
+    extension = None         # 输出文件扩展名，为None时沿用源文件扩展名
+    insertable = False       # 是否可以插入到源文件中（追加模式）
+
+    def render(self, analyzer: Any, file_path: str) -> List[str]:
+        """
+        渲染分析结果
+
+        参数:
+            analyzer: 已完成分析（或已载入缓存结果）的信号分析器
+            file_path: 源文件路径
+
+        返回:
+            输出内容的行列表（每行包含换行符）
+        """
+        raise NotImplementedError
+
+    def output_path(self, file_path: str, output_dir: Optional[str] = None) -> str:
+        """
+        独立文件模式下的输出文件路径
+
+        参数:
+            file_path: 源文件路径
+            output_dir: 输出目录，为None时与源文件在同一目录
+
+        返回:
+            输出文件路径
+        """
+        base_name = os.path.basename(file_path)
+        stem, extension = os.path.splitext(base_name)
+        output_file_name = stem + self.suffix + (self.extension or extension)
+        return os.path.join(output_dir if output_dir else os.path.dirname(file_path), output_file_name)
+
+
+@register_emitter
+class WireEmitter(Emitter):
+    """Verilog wire声明（默认格式）"""
+
+    name = "wire"
+    insertable = True
+
+    def render(self, analyzer: Any, file_path: str) -> List[str]:
+        lines = ["// 自动生成的wire声明\n"]
+        for definition in analyzer.get_signal_definitions().values():
+            lines.append(f"{definition}\n")
+        return lines
+
+    def output_path(self, file_path: str, output_dir: Optional[str] = None) -> str:
+        # 沿用原有的命名方式
+        base_name = os.path.basename(file_path)
+        output_file_name = base_name.replace('.v', '_autogen.v').replace('.sv', '_autogen.sv')
+        return os.path.join(output_dir if output_dir else os.path.dirname(file_path), output_file_name)
+
+
+@register_emitter
+class LogicEmitter(Emitter):
+    """SystemVerilog logic声明"""
+
+    name = "sv"
+    extension = ".sv"
+    insertable = True
+
+    def render(self, analyzer: Any, file_path: str) -> List[str]:
+        lines = ["// 自动生成的logic声明\n"]
+        for signal, width in analyzer.get_formatted_signal_widths().items():
+            lines.append(f"logic {width} {signal};\n" if width else f"logic {signal};\n")
+        return lines
+
+
+@register_emitter
+class JsonEmitter(Emitter):
+    """JSON报告，包含每个信号的位宽、声明以及汇总信息"""
+
+    name = "json"
+    extension = ".json"
+
+    def render(self, analyzer: Any, file_path: str) -> List[str]:
+        widths = analyzer.get_formatted_signal_widths()
+        definitions = analyzer.get_signal_definitions()
+        report = analyzer.get_report()
+        data = OrderedDict([
+            ('file', file_path),
+            ('module', analyzer.module_name),
+            ('signals', [OrderedDict([
+                ('name', signal),
+                ('width', widths.get(signal) or None),
+                ('inferred', analyzer.signal_widths.get(signal) is not None),
+                ('declaration', definitions[signal]),
+            ]) for signal in analyzer.undefined_signals]),
+            ('summary', {key: report[key] for key in ('total_signals', 'signals_with_width',
+                                                      'signals_with_default_width', 'signals_without_width')}),
+        ])
+        return [json.dumps(data, indent=2, ensure_ascii=False) + "\n"]
+
+
+@register_emitter
+class TclEmitter(Emitter):
+    """Tcl变量：信号列表和信号名到位宽的数组，供综合和形式验证脚本读取"""
+
+    name = "tcl"
+    extension = ".tcl"
+
+    def render(self, analyzer: Any, file_path: str) -> List[str]:
+        widths = analyzer.get_formatted_signal_widths()
+        lines = [
+            "# 自动生成的未定义信号列表\n",
+            f"set autowire_file {{{file_path}}}\n",
+            "set autowire_signals [list " + ' '.join(f"{{{signal}}}" for signal in analyzer.undefined_signals) + "]\n",
+            "array set autowire_widths {\n",
+        ]
+        for signal in analyzer.undefined_signals:
+            lines.append(f"    {{{signal}}} {{{widths.get(signal, '')}}}\n")
+        lines.append("}\n")
+        return lines
+
+
+def find_region(content: str) -> Optional[Dict[str, int]]:
+    """
+    查找源代码中的生成区域
+
+    参数:
+        content: 源代码
+
+    返回:
+        {'start': 开始标记所在行的起点, 'end': 结束标记所在行的终点（含换行符）}，没有生成区域时返回None
+
+    异常:
+        ParseError: 只有开始标记而没有结束标记
+    """
+    begin = content.find(REGION_BEGIN)
+    if begin < 0:
+        return None
+    end = content.find(REGION_END, begin)
+    if end < 0:
+        raise ParseError(f"生成区域缺少结束标记 {REGION_END}")
+    newline = content.find('\n', end)
+    return {'start': content.rfind('\n', 0, begin) + 1, 'end': len(content) if newline < 0 else newline + 1}
+
+
+def strip_region(content: str) -> str:
+    """
+    将生成区域替换为等长的空白，保持行号和偏移不变；区域中的声明是工具的输出而不是输入
+
+    参数:
+        content: 源代码
+
+    返回:
+        去除生成区域后的源代码
+    """
+    if REGION_BEGIN not in content:
+        return content
+    try:
+        region = find_region(content)
+    except ParseError:
+        return content
+    blanked = cre.sub(r'[^\n]', ' ', content[region['start']:region['end']])
+    return content[:region['start']] + blanked + content[region['end']:]
+
+
+def insert_region(content: str, block: str) -> str:
+    """
+    将生成的代码块放入源代码的生成区域：已有区域时整体替换，否则插入到模块头部之后
+
+    参数:
+        content: 源代码
+        block: 生成的代码块
+
+    返回:
+        新的源代码
+
+    异常:
+        ParseError: 找不到模块定义或生成区域不完整
+    """
+    region_text = f"{REGION_BEGIN}\n{block}{REGION_END}\n"
+    region = find_region(content)
+    if region is not None:
+        return content[:region['start']] + region_text + content[region['end']:]
+    match = _MODULE_HEADER_PATTERN.search(content)
+    if not match:
+        raise ParseError("无法找到模块定义位置，无法追加到原始文件")
+    return content[:match.end()] + '\n\n' + region_text + content[match.end():]
@@ -0,0 +1,205 @@
+"""
+文件列表模块
+展开命令行给出的文件、通配符、目录以及EDA工具常用的.f文件列表
+"""
+
+import os
+import glob
+import shlex
+from typing import Iterable, List, Optional
+
+from .utils import ParseError
+
+# 目录模式下收集的源文件扩展名
+SOURCE_EXTENSIONS = ('.v', '.sv')
+
+# 工具自身生成的输出文件后缀，目录模式下跳过
+GENERATED_SUFFIXES = ('_autogen.v', '_autogen.sv')
+
+# 文件列表中带一个参数、与源文件无关的选项
+_OPTIONS_WITH_ARGUMENT = frozenset({'-v', '-y', '-l', '-o', '-top', '-timescale'})
+
+
+class FileList:
+    """文件列表类，记录源文件、头文件搜索路径和宏定义"""
+
+    def __init__(self):
+        """初始化文件列表"""
+        self.files = []          # 源文件路径，保持出现顺序且不重复
+        self.include_dirs = []   # +incdir+ 指定的头文件搜索路径
+        self.defines = {}        # +define+ 指定的宏定义，无值时为空字符串
+        self._seen = set()
+        self._filelists = []     # 已读取的文件列表，用于检测循环引用
+
+    def add_file(self, path: str) -> None:
+        """
+        添加源文件，重复的文件只保留第一次出现
+
+        参数:
+            path: 文件路径
+        """
+        path = os.path.normpath(path)
+        key = os.path.abspath(path)
+        if key not in self._seen:
+            self._seen.add(key)
+            self.files.append(path)
+
+    def add_include_dir(self, path: str) -> None:
+        """
+        添加头文件搜索路径
+
+        参数:
+            path: 目录路径
+        """
+        path = os.path.normpath(path)
+        if path not in self.include_dirs:
+            self.include_dirs.append(path)
+
+    def add_input(self, item: str) -> None:
+        """
+        添加一个命令行输入项：文件、通配符或目录（递归收集）
+
+        参数:
+            item: 输入项
+
+        异常:
+            ParseError: 输入项不存在或未匹配到任何源文件
+        """
+        if os.path.isdir(item):
+            found = find_sources(item)
+            if not found:
+                raise ParseError(f"目录中未找到Verilog源文件：{item}")
+            for path in found:
+                self.add_file(path)
+        elif glob.has_magic(item):
+            matches = sorted(path for path in glob.glob(item, recursive=True) if os.path.isfile(path))
+            if not matches:
+                raise ParseError(f"通配符未匹配到任何文件：{item}")
+            for path in matches:
+                self.add_file(path)
+        elif os.path.isfile(item):
+            self.add_file(item)
+        else:
+            raise ParseError(f"文件不存在：{item}")
+
+    def load_filelist(self, filelist_path: str, relative_to_filelist: bool = False) -> None:
+        """
+        读取.f格式的文件列表
+
+        支持 // 和 # 注释、环境变量、+incdir+、+define+、嵌套的 -f/-F，
+        其中 -F 引用的文件列表中的相对路径相对于该文件列表所在目录
+
+        参数:
+            filelist_path: 文件列表路径
+            relative_to_filelist: 相对路径是否相对于文件列表所在目录，否则相对于当前目录
+
+        异常:
+            ParseError: 文件列表不存在或存在循环引用
+        """
+        key = os.path.abspath(filelist_path)
+        if key in self._filelists:
+            raise ParseError(f"文件列表存在循环引用：{filelist_path}")
+        if not os.path.isfile(filelist_path):
+            raise ParseError(f"文件列表不存在：{filelist_path}")
+        self._filelists.append(key)
+
+        base_dir = os.path.dirname(filelist_path) if relative_to_filelist else ''
+        with open(filelist_path, 'r', encoding='utf-8') as f:
+            tokens = _split_filelist(f.read())
+
+        i = 0
+        while i < len(tokens):
+            token = os.path.expandvars(tokens[i])
+            i += 1
+            if token in ('-f', '-F'):
+                if i >= len(tokens):
+                    raise ParseError(f"文件列表 {filelist_path} 中 {token} 缺少参数")
+                nested = _resolve(base_dir, os.path.expandvars(tokens[i]))
+                i += 1
+                self.load_filelist(nested, relative_to_filelist=(token == '-F'))
+            elif token.startswith('+incdir+'):
+                for path in token[len('+incdir+'):].split('+'):
+                    if path:
+                        self.add_include_dir(_resolve(base_dir, path))
+            elif token.startswith('+define+'):
+                for define in token[len('+define+'):].split('+'):
+                    if define:
+                        name, _, value = define.partition('=')
+                        self.defines[name] = value
+            elif token in _OPTIONS_WITH_ARGUMENT:
+                i += 1
+            elif token.startswith('+') or token.startswith('-'):
+                # 其他仿真/综合工具选项与信号分析无关
+                continue
+            else:
+                path = _resolve(base_dir, token)
+                if not os.path.isfile(path):
+                    raise ParseError(f"文件列表 {filelist_path} 中的文件不存在：{token}")
+                self.add_file(path)
+
+        self._filelists.pop()
+
+
+def find_sources(directory: str) -> List[str]:
+    """
+    递归查找目录下的Verilog源文件，结果按路径排序
+
+    参数:
+        directory: 目录路径
+
+    返回:
+        源文件路径列表
+    """
+    sources = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            if name.endswith(SOURCE_EXTENSIONS) and not name.endswith(GENERATED_SUFFIXES):
+                sources.append(os.path.join(root, name))
+    return sorted(sources)
+
+
+def collect_sources(inputs: Iterable[str], filelists: Optional[Iterable[str]] = None) -> FileList:
+    """
+    收集命令行输入项和文件列表中的全部源文件
+
+    参数:
+        inputs: 文件、通配符或目录
+        filelists: .f文件列表路径
+
+    返回:
+        文件列表对象
+
+    异常:
+        ParseError: 输入项无效
+    """
+    file_list = FileList()
+    for filelist in filelists or []:
+        file_list.load_filelist(filelist)
+    for item in inputs:
+        file_list.add_input(item)
+    return file_list
+
+
+def _split_filelist(content: str) -> List[str]:
+    """
+    去除注释并按空白切分文件列表内容
+
+    参数:
+        content: 文件列表内容
+
+    返回:
+        选项和路径列表
+    """
+    tokens = []
+    for line in content.splitlines():
+        line = line.split('//', 1)[0]
+        tokens.extend(shlex.split(line, comments=True, posix=True))
+    return tokens
+
+
+def _resolve(base_dir: str, path: str) -> str:
+    """将文件列表中的相对路径转换为相对于基准目录的路径"""
+    if base_dir and not os.path.isabs(path):
+        return os.path.join(base_dir, path)
+    return path
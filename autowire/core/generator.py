@@ -1,15 +1,14 @@
 """
 代码生成器模块
-负责生成wire声明代码并处理输出
+负责按输出格式生成声明代码并处理输出，输出格式见emitters模块
 """
 
 import os
-import re
-from typing import List, Dict, Optional, Any
-from pathlib import Path
+from typing import List, Dict, Optional, Any, Union
 
 from .analyzer import SignalAnalyzer
-from .utils import write_file, ensure_dir, ParseError
+from .emitters import Emitter, get_emitter, insert_region, find_region
+from .utils import write_file, write_file_if_changed, ensure_dir, ParseError
 
 class CodeGenerator:
     """代码生成器类"""
@@ -20,10 +19,13 @@ class CodeGenerator:
         self.file_path = ""
         self.output_dir = None
         self.append_mode = False
+        self.emitter = get_emitter()
         self.definitions = []
+        self.output_written = False  # 最近一次write_to_file()是否实际写入了文件
         
     def setup(self, analyzer: SignalAnalyzer, file_path: str, 
-              output_dir: Optional[str] = None, append: bool = False) -> None:
+              output_dir: Optional[str] = None, append: bool = False,
+              emitter: Union[str, Emitter, None] = None) -> None:
         """
         设置生成器
         
@@ -32,11 +34,18 @@ class CodeGenerator:
             file_path: 源文件路径
             output_dir: 输出目录
             append: 是否追加到原始文件
+            emitter: 输出格式名（见emitters.EMITTERS）或输出格式实例，默认为wire
+            
+        异常:
+            ParseError: 未知的输出格式，或该格式不能追加到原始文件
         """
         self.analyzer = analyzer
         self.file_path = file_path
         self.output_dir = output_dir
         self.append_mode = append
+        self.emitter = get_emitter(emitter)
+        if append and not self.emitter.insertable:
+            raise ParseError(f"输出格式 {self.emitter.name} 不能追加到原始文件")
         
     def generate(self) -> List[str]:
         """
@@ -51,22 +60,12 @@ class CodeGenerator:
         if not self.analyzer:
             raise ParseError("生成器未设置分析器")
             
-        # 获取信号定义
-        definitions_dict = self.analyzer.get_signal_definitions()
-        
-        # 组织输出内容
-        output_lines = ["// 自动生成的wire声明\n"]
-        
-        # 添加信号定义
-        for signal, definition in definitions_dict.items():
-            output_lines.append(f"{definition}\n")
-            
-        self.definitions = output_lines
-        return output_lines
+        self.definitions = self.emitter.render(self.analyzer, self.file_path)
+        return self.definitions
         
     def write_to_file(self) -> str:
         """
-        将生成的代码写入文件
+        将生成的代码写入文件，每个文件一次整体写入，内容未变化时不重写
         
         返回:
             输出文件路径
@@ -89,58 +88,52 @@ class CodeGenerator:
         返回:
             输出文件路径
         """
-        # 确定输出文件名
-        base_name = os.path.basename(self.file_path)
-        output_file_name = base_name.replace('.v', '_autogen.v').replace('.sv', '_autogen.sv')
-        
-        if self.output_dir:
-            output_file = os.path.join(self.output_dir, output_file_name)
-        else:
-            output_dir = os.path.dirname(self.file_path)
-            output_file = os.path.join(output_dir, output_file_name)
+        output_file = self._get_expected_output_path()
         
         # 确保输出目录存在
-        ensure_dir(output_file)
+        ensure_dir(os.path.dirname(output_file))
         
-        # 写入文件
+        # 写入文件，内容未变化时不重写，避免下游基于时间戳的流程重新构建
         content = ''.join(self.definitions)
-        write_file(output_file, content)
+        self.output_written = write_file_if_changed(output_file, content)
         
         return output_file
         
     def _append_to_original(self) -> str:
         """
-        追加到原始文件
+        写入原始文件的生成区域：已有区域时整体替换，否则插入到模块头部之后
         
         返回:
             输出文件路径
         """
-        # 读取原始文件内容
         with open(self.file_path, 'r', encoding='utf-8') as file:
             original_content = file.read()
-            
-        # 查找模块头部结束位置
-        module_pattern = re.compile(r'module\s+\w+\s*\([^;]*;', re.DOTALL)
-        match = module_pattern.search(original_content)
+        new_content = insert_region(original_content, ''.join(self.definitions))
         
-        if match:
-            insert_pos = match.end()
-            
-            # 组合新内容
-            new_content = (
-                original_content[:insert_pos] + 
-                '\n\n' + 
-                ''.join(self.definitions) + 
-                '\n' + 
-                original_content[insert_pos:]
-            )
-            
-            # 写入文件
+        # 重复运行时区域内容相同，不重写文件
+        self.output_written = new_content != original_content
+        if self.output_written:
             write_file(self.file_path, new_content)
-            
-            return self.file_path
-        else:
-            raise ParseError("无法找到模块定义位置，无法追加到原始文件")
+        return self.file_path
+        
+    def clear_region(self) -> bool:
+        """
+        没有未定义信号时清空原始文件中已有的生成区域，保留标记行，避免上次生成的声明与新增的声明重复
+        
+        返回:
+            是否实际写入了文件；文件中没有生成区域时不修改文件
+        """
+        with open(self.file_path, 'r', encoding='utf-8') as file:
+            original_content = file.read()
+        self.definitions = []
+        self.output_written = False
+        if find_region(original_content) is None:
+            return False
+        new_content = insert_region(original_content, '')
+        self.output_written = new_content != original_content
+        if self.output_written:
+            write_file(self.file_path, new_content)
+        return self.output_written
             
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -161,6 +154,7 @@ class CodeGenerator:
             "signals_with_default_width": report["signals_with_default_width"],
             "signals_without_width": report["signals_without_width"],
             "output_mode": "追加到原始文件" if self.append_mode else "独立文件",
+            "output_format": self.emitter.name,
             "output_file": self.file_path if self.append_mode else self._get_expected_output_path()
         }
         
@@ -171,11 +165,4 @@ class CodeGenerator:
         返回:
             输出文件路径
         """
-        base_name = os.path.basename(self.file_path)
-        output_file_name = base_name.replace('.v', '_autogen.v').replace('.sv', '_autogen.sv')
-        
-        if self.output_dir:
-            return os.path.join(self.output_dir, output_file_name)
-        else:
-            output_dir = os.path.dirname(self.file_path)
-            return os.path.join(output_dir, output_file_name)
\ No newline at end of file
+        return self.emitter.output_path(self.file_path, self.output_dir)
@@ -0,0 +1,303 @@
+"""
+Verilog词法分析模块
+一次扫描将源代码切分为词法单元流（标识符、关键字、数字、括号、标点等），
+供声明提取、信号收集等后续分析共享，避免对全文反复执行正则匹配
+"""
+
+import mmap
+from typing import Iterator, Iterable, List, NamedTuple, Union
+
+from . import counted_re as cre  # 剖析时按线程统计正则表达式调用
+
+# 词法单元类型
+IDENT = 'IDENT'          # 标识符
+KEYWORD = 'KEYWORD'      # 关键字
+NUMBER = 'NUMBER'        # 数字常量，如 8'hFF、32、1.5、10ns
+STRING = 'STRING'        # 字符串
+DIRECTIVE = 'DIRECTIVE'  # 编译指令或宏引用，如 `define、`WIDTH
+SYSTEM = 'SYSTEM'        # 系统任务/函数，如 $display
+BRACKET = 'BRACKET'      # 括号 ( ) [ ] { }
+OP = 'OP'                # 运算符及其他标点
+COMMENT = 'COMMENT'      # 注释（默认不输出）
+
+# 词法分析识别的保留字（Verilog-2005及常用SystemVerilog关键字）
+KEYWORDS = frozenset({
+    "always", "always_comb", "always_ff", "always_latch", "and", "assign", "automatic",
+    "begin", "bit", "buf", "bufif0", "bufif1", "byte", "case", "casex", "casez", "cmos",
+    "deassign", "default", "defparam", "disable", "edge", "else", "end", "endcase",
+    "endfunction", "endgenerate", "endinterface", "endmodule", "endpackage", "endprimitive",
+    "endspecify", "endtable", "endtask", "enum", "event", "for", "force", "forever", "fork",
+    "function", "generate", "genvar", "highz0", "highz1", "if", "ifnone", "import", "initial",
+    "inout", "input", "int", "integer", "interface", "join", "join_any", "join_none",
+    "large", "localparam", "logic", "longint", "macromodule", "medium", "modport", "module",
+    "nand", "negedge", "nmos", "nor", "not", "notif0", "notif1", "or", "output", "package",
+    "packed", "parameter", "pmos", "posedge", "primitive", "priority", "pull0", "pull1",
+    "pulldown", "pullup", "rcmos", "real", "realtime", "reg", "release", "repeat", "return",
+    "rnmos", "rpmos", "rtran", "rtranif0", "rtranif1", "scalared", "shortint", "signed",
+    "small", "specify", "specparam", "string", "strong0", "strong1", "struct", "supply0",
+    "supply1", "table", "task", "time", "timeprecision", "timeunit", "tran", "tranif0",
+    "tranif1", "tri", "tri0", "tri1", "triand", "trior", "trireg", "typedef", "unique",
+    "unsigned", "uwire", "var", "vectored", "void", "wait", "wand", "weak0", "weak1",
+    "while", "wire", "wor", "xnor", "xor",
+})
+
+# 主词法规则，按优先级排列；各分组互斥，一次finditer即可完成切分
+# 行内空白作为前缀直接跳过，换行及其后的缩进单独匹配以便统计行号
+_TOKEN_SPEC = [
+    ('NL', r'\n\s*'),
+    (IDENT, r'[A-Za-z_][A-Za-z0-9_$]*|\\\S+'),
+    (BRACKET, r'[()\[\]{}]'),
+    (NUMBER, r"(?:\d[\d_]*\s*)?'[sS]?[bBoOdDhH]\s*[0-9a-fA-FxXzZ?_]+"
+             r"|'[01xXzZ](?![A-Za-z0-9_])"
+             r"|\d[\d_]*(?:\.\d[\d_]*)?(?:[eE][+-]?\d+)?(?:(?:fs|ps|ns|us|ms|s)(?![A-Za-z0-9_]))?"),
+    (COMMENT, r'//[^\n]*|/\*[\s\S]*?\*/|/\*[\s\S]*'),
+    (STRING, r'"(?:[^"\\\n]|\\.)*"'),
+    (DIRECTIVE, r'`[A-Za-z_][A-Za-z0-9_$]*'),
+    (SYSTEM, r'\$[A-Za-z_][A-Za-z0-9_$]*'),
+    (OP, r'<<<|>>>|===|!==|<=|>=|==|!=|&&|\|\||<<|>>|\*\*|\+:|-:|->|::|~&|~\||~\^|\^~|.'),
+]
+_TOKEN_PATTERN = cre.compile(
+    r'[ \t\r\f\v]*(?:' + '|'.join(f'(?P<{name}>{regex})' for name, regex in _TOKEN_SPEC) + ')'
+)
+# 同一规则的字节版本，直接在bytes/mmap缓冲区上匹配；非ASCII字符按完整的UTF-8序列作为一个单元
+_BYTES_TOKEN_PATTERN = cre.compile((
+    r'[ \t\r\f\v]*(?:' + '|'.join(
+        f'(?P<{name}>[\\xc0-\\xff][\\x80-\\xbf]*|{regex})' if name == OP else f'(?P<{name}>{regex})'
+        for name, regex in _TOKEN_SPEC
+    ) + ')'
+).encode('ascii'))
+
+# 结束当前语句的关键字
+_STATEMENT_END_KEYWORDS = frozenset({
+    'begin', 'end', 'endmodule', 'endcase', 'endgenerate', 'endfunction', 'endtask',
+    'endinterface', 'endpackage', 'endprimitive', 'endspecify', 'endtable',
+})
+
+class Token(NamedTuple):
+    """词法单元"""
+    kind: str    # 单元类型
+    value: str   # 原始文本
+    line: int    # 行号（从1开始）
+    col: int     # 列号（从1开始）
+    pos: int     # 在源文本中的偏移
+
+def tokenize(content: str, keep_comments: bool = False) -> Iterator[Token]:
+    """
+    将Verilog源代码切分为词法单元流
+
+    参数:
+        content: 源代码内容
+        keep_comments: 是否输出注释单元
+
+    返回:
+        词法单元迭代器
+    """
+    line = 1
+    line_start = 0
+    keywords = KEYWORDS
+    make = tuple.__new__
+    for match in _TOKEN_PATTERN.finditer(content):
+        kind = match.lastgroup
+        if kind is None:
+            # 文件末尾的行内空白
+            continue
+        value = match.group(kind)
+        pos = match.start(kind)
+        if kind == 'NL' or kind == COMMENT or kind == STRING:
+            if kind != 'NL' and (keep_comments or kind == STRING):
+                yield make(Token, (kind, value, line, pos - line_start + 1, pos))
+            newlines = value.count('\n')
+            if newlines:
+                line += newlines
+                line_start = pos + value.rfind('\n') + 1
+            continue
+        if kind == IDENT and value in keywords:
+            kind = KEYWORD
+        yield make(Token, (kind, value, line, pos - line_start + 1, pos))
+
+def tokenize_stream(chunks: Iterable[str], keep_comments: bool = False) -> Iterator[Token]:
+    """
+    将分块读入的Verilog源代码增量地切分为词法单元流，结果与tokenize()对完整内容的切分一致
+
+    每次只切分缓冲区中的完整行，行尾不完整的内容和未闭合的块注释留到下一块拼接后再处理，
+    因此缓冲区大小只与最长的行（或跨行的块注释）有关，而与文件大小无关
+
+    参数:
+        chunks: 源代码文本块序列，分块边界可以位于任意位置
+        keep_comments: 是否输出注释单元
+
+    返回:
+        词法单元迭代器，pos为在整个源文本中的偏移
+    """
+    pending = ''      # 上一块中尚未切分的内容
+    base = 0          # pending在源文本中的偏移
+    line = 1
+    line_start = 0
+    keywords = KEYWORDS
+    make = tuple.__new__
+    chunks = iter(chunks)
+    final = False
+    while not final:
+        chunk = next(chunks, None)
+        if chunk is None:
+            final = True
+            buffer = pending
+            endpos = len(buffer)
+        else:
+            buffer = pending + chunk if pending else chunk
+            endpos = buffer.rfind('\n') + 1
+            if endpos == 0:
+                pending = buffer
+                continue
+        consumed = endpos
+        for match in _TOKEN_PATTERN.finditer(buffer, 0, endpos):
+            kind = match.lastgroup
+            if kind is None:
+                continue
+            value = match.group(kind)
+            if kind == COMMENT and not final and match.end() == endpos and value.startswith('/*'):
+                # 块注释在本块内未闭合
+                consumed = match.start()
+                break
+            pos = base + match.start(kind)
+            if kind == 'NL' or kind == COMMENT or kind == STRING:
+                if kind != 'NL' and (keep_comments or kind == STRING):
+                    yield make(Token, (kind, value, line, pos - line_start + 1, pos))
+                newlines = value.count('\n')
+                if newlines:
+                    line += newlines
+                    line_start = pos + value.rfind('\n') + 1
+                continue
+            if kind == IDENT and value in keywords:
+                kind = KEYWORD
+            yield make(Token, (kind, value, line, pos - line_start + 1, pos))
+        pending = buffer[consumed:]
+        base += consumed
+
+def tokenize_buffer(buffer: Union[bytes, bytearray, memoryview, mmap.mmap],
+                    keep_comments: bool = False) -> Iterator[Token]:
+    """
+    在字节缓冲区（如内存映射的文件）上直接进行词法分析，不解码整个文件
+
+    只有输出的词法单元文本按UTF-8解码，注释和空白不解码；pos和col为字节偏移。
+    对ASCII源代码结果与tokenize()对解码后内容的切分一致
+
+    参数:
+        buffer: 源代码字节缓冲区
+        keep_comments: 是否输出注释单元
+
+    返回:
+        词法单元迭代器
+    """
+    line = 1
+    line_start = 0
+    keywords = KEYWORDS
+    make = tuple.__new__
+    for match in _BYTES_TOKEN_PATTERN.finditer(buffer):
+        kind = match.lastgroup
+        if kind is None:
+            continue
+        pos = match.start(kind)
+        if kind == 'NL' or kind == COMMENT:
+            value = match.group(kind)
+            if kind == COMMENT and keep_comments:
+                yield make(Token, (kind, value.decode('utf-8', 'replace'), line, pos - line_start + 1, pos))
+            newlines = value.count(b'\n')
+            if newlines:
+                line += newlines
+                line_start = pos + value.rfind(b'\n') + 1
+            continue
+        value = match.group(kind).decode('utf-8', 'replace')
+        if kind == IDENT and value in keywords:
+            kind = KEYWORD
+        yield make(Token, (kind, value, line, pos - line_start + 1, pos))
+
+def release_consumed(tokens: Iterable[Token], mapped: mmap.mmap, step: int = 64 << 20) -> Iterator[Token]:
+    """
+    在词法分析推进过程中释放内存映射中已处理部分的物理页，使常驻内存不随文件大小增长
+
+    词法单元的文本已解码为独立的字符串，释放之前的页不影响后续分析；
+    当前平台不支持madvise时原样输出
+
+    参数:
+        tokens: tokenize_buffer()在mapped上输出的词法单元流
+        mapped: 内存映射对象
+        step: 每处理多少字节释放一次
+
+    返回:
+        词法单元迭代器
+    """
+    if not hasattr(mapped, 'madvise') or not hasattr(mmap, 'MADV_DONTNEED'):
+        yield from tokens
+        return
+    released = 0
+    for token in tokens:
+        if token.pos - released >= step:
+            end = token.pos // mmap.PAGESIZE * mmap.PAGESIZE
+            mapped.madvise(mmap.MADV_DONTNEED, released, end - released)
+            released = end
+        yield token
+
+def iter_statements(tokens: Iterable[Token]) -> Iterator[List[Token]]:
+    """
+    将词法单元流按语句分组
+
+    语句以分号或begin/end类关键字结束，分组粒度与声明、赋值的边界一致
+
+    参数:
+        tokens: 词法单元流
+
+    返回:
+        语句（词法单元列表）迭代器
+    """
+    statement = []
+    for token in tokens:
+        statement.append(token)
+        if token.value == ';' or (token.kind == KEYWORD and token.value in _STATEMENT_END_KEYWORDS):
+            yield statement
+            statement = []
+    if statement:
+        yield statement
+
+def match_bracket(tokens: List[Token], index: int) -> int:
+    """
+    查找与指定左括号匹配的右括号位置
+
+    参数:
+        tokens: 词法单元列表
+        index: 左括号所在位置
+
+    返回:
+        匹配的右括号位置，未闭合时返回列表末尾位置
+    """
+    depth = 0
+    for i in range(index, len(tokens)):
+        value = tokens[i].value
+        if tokens[i].kind != BRACKET:
+            continue
+        if value in '([{':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(tokens) - 1
+
+def join_tokens(tokens: Iterable[Token]) -> str:
+    """
+    将词法单元还原为文本，原文中相邻单元间的空白统一为单个空格
+
+    参数:
+        tokens: 词法单元序列
+
+    返回:
+        还原后的文本
+    """
+    parts = []
+    end = None
+    for token in tokens:
+        if end is not None and token.pos > end:
+            parts.append(' ')
+        parts.append(token.value)
+        end = token.pos + len(token.value)
+    return ''.join(parts)
@@ -4,11 +4,22 @@ Verilog解析器模块
 负责解析Verilog代码并提取基础信息
 """
 
-import re
-from typing import List, Dict, Set, Tuple, Optional, Any
+import mmap
+from typing import List, Dict, Set, Tuple, Optional, Any, Union, Iterable
 from collections import OrderedDict
 
-from .utils import read_file, remove_comments, extract_parameters, ParseError, is_common_constant
+from . import counted_re as cre  # 剖析时按线程统计正则表达式调用
+from .utils import read_file, iter_file_chunks, map_file, remove_comments, extract_parameters, ParseError
+from .lexer import tokenize, tokenize_stream, tokenize_buffer, release_consumed, iter_statements, IDENT, Token
+from .preprocessor import Preprocessor
+from .emitters import strip_region
+from .declarations import DeclarationExtractor
+from .const_eval import ConstantEvaluator
+from .profiling import PhaseProfiler, profile_phase
+from .usage_index import IdentifierUsageIndex
+from .signal_filter import SignalFilter
+from .widths import (WidthTable, SLICE_PATTERNS, DECLARATION_PATTERNS, resolve_slice_width,
+                     resolve_declaration_width)
 
 # Verilog/SystemVerilog保留关键字集合
 VERILOG_KEYWORDS = {
@@ -25,11 +36,35 @@ INSTANCE_PREFIXES = ["u_", "i_", "inst_", "g_", "gen_", "x_", "m_", "s_", "p_",
                      "r_", "w_", "dut_", "tb_", "f_", "d_", "l_", "h_", "v_", "n_", 
                      "b_", "a_", "e_"]
 
+# 流式解析每次读取的字符数
+STREAM_CHUNK_SIZE = 1 << 20
+
+# 预编译的数值常量模式，多次解析间共用
+_NUMBER_PATTERN = cre.compile(r'^\d+$')
+_VERILOG_NUMBER_PATTERN = cre.compile(r'\d+\'[hbd][\w_]+')
+
 class VerilogParser:
     """Verilog解析器类"""
     
-    def __init__(self):
-        """初始化解析器"""
+    def __init__(self, use_lexer: bool = True, record_connections: bool = False,
+                 profiler: Optional[PhaseProfiler] = None, defines: Optional[Dict[str, str]] = None,
+                 include_dirs: Optional[List[str]] = None):
+        """
+        初始化解析器
+        
+        参数:
+            use_lexer: 是否使用单遍词法分析提取声明，False时使用原有的正则扫描方式
+            record_connections: 是否记录实例的端口连接（declarations.connections），项目模式使用
+            profiler: 分阶段剖析器，记录解析和分析各阶段的耗时
+            defines: 预定义的宏，决定条件编译中生效的分支
+            include_dirs: `include头文件的搜索路径
+        """
+        self.use_lexer = use_lexer
+        self.record_connections = record_connections
+        self.profiler = profiler
+        self.defines = dict(defines or {})
+        self.include_dirs = list(include_dirs or [])
+        self.preprocessor = None     # 最近一次预处理使用的预处理器，记录宏定义和头文件
         self.file_path = ""
         self.content = ""
         self.original_content = ""  # 保存原始内容用于位宽推断
@@ -45,6 +80,12 @@ class VerilogParser:
         self.module_instances = set()
         self.module_names = set()
         self.instance_module_names = []
+        self.declarations = None     # 词法模式下的声明提取结果
+        self.usage_index = None      # 标识符使用上下文索引
+        self.width_table = None      # 批量位宽推断表
+        self.streaming = False       # 是否为流式或内存映射解析（不保留源文本）
+        self.parameter_evaluator = None  # 参数求值器，见get_parameter_values()
+        self._parameter_values = None
         
     def parse_file(self, file_path: str) -> None:
         """
@@ -56,17 +97,86 @@ class VerilogParser:
         异常:
             ParseError: 文件解析失败
         """
+        with profile_phase(self.profiler, 'read'):
+            content = read_file(file_path)
+        self.parse_text(content, file_path)
+        
+    def parse_text(self, content: str, file_path: str = "") -> None:
+        """
+        解析内存中的Verilog源代码，如编辑器中尚未保存的缓冲区
+        
+        参数:
+            content: 源代码
+            file_path: 源文件路径，只用于记录
+        """
         self.file_path = file_path
-        self.content = read_file(file_path)
-        self._preprocess()
+        # 追加模式生成的区域是工具的输出，不参与分析
+        self.content = strip_region(content)
+        with profile_phase(self.profiler, 'preprocess'):
+            self._preprocess()
         self._extract_signals()
-        self._extract_module_info()
+        with profile_phase(self.profiler, 'module_info'):
+            self._extract_module_info()
+        
+    def parse_stream(self, file_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        """
+        流式解析Verilog文件，用于超大的生成网表
+        
+        文件分块读入并增量词法分析，声明、标识符和位宽在扫描中逐条语句提取，
+        不保留源文本，内存占用与最长的语句及标识符数量有关而与文件大小无关。
+        解析后不能使用依赖源文本的逐信号位宽推断（get_signal_widths(batched=False)）
+        
+        参数:
+            file_path: 文件路径
+            chunk_size: 每次读取的字符数
+            
+        异常:
+            ParseError: 解析器未启用词法分析
+        """
+        if not self.use_lexer:
+            raise ParseError("流式解析需要启用词法分析（use_lexer=True）")
+        self.file_path = file_path
+        self.streaming = True
+        # 读取与提取交替进行，读取时间计入extract_signals
+        with profile_phase(self.profiler, 'extract_signals'):
+            self._extract_signals_from_tokens(tokenize_stream(iter_file_chunks(file_path, chunk_size)))
+        with profile_phase(self.profiler, 'module_info'):
+            self._extract_module_info()
+        
+    def parse_mapped(self, file_path: str) -> None:
+        """
+        通过内存映射解析Verilog文件，用于ASCII编码的大型RTL
+        
+        词法分析直接在映射的字节缓冲区上进行，不解码整个文件，只有提取出的词法单元文本被解码，
+        已扫描部分的物理页随扫描释放。与流式解析一样不保留源文本，词法单元位置为字节偏移
+        
+        参数:
+            file_path: 文件路径
+            
+        异常:
+            ParseError: 解析器未启用词法分析
+        """
+        if not self.use_lexer:
+            raise ParseError("内存映射解析需要启用词法分析（use_lexer=True）")
+        self.file_path = file_path
+        self.streaming = True
+        with profile_phase(self.profiler, 'extract_signals'), map_file(file_path) as buffer:
+            tokens = tokenize_buffer(buffer)
+            if isinstance(buffer, mmap.mmap):
+                tokens = release_consumed(tokens, buffer)
+            try:
+                self._extract_signals_from_tokens(tokens)
+            finally:
+                # 关闭生成器以释放对映射缓冲区的引用，之后才能解除映射
+                tokens.close()
+        with profile_phase(self.profiler, 'module_info'):
+            self._extract_module_info()
         
     def _preprocess(self) -> None:
         """
         预处理文件内容
         - 移除注释
-        - 处理宏定义
+        - 处理编译指令（词法模式下在词法单元流上处理，见_extract_signals_from_tokens()）
         """
         # 保存原始内容以备信号位宽推断
         self.original_content = self.content
@@ -74,26 +184,31 @@ class VerilogParser:
         # 移除注释
         self.processed_content = remove_comments(self.content)
         
-        # 处理宏定义
-        self._process_macros()
+        # 处理编译指令
+        if not self.use_lexer:
+            self._process_macros()
         
         # 分割为行
         self.lines = self.processed_content.splitlines()
         
-        # 提取参数定义
-        self.parameters = extract_parameters(self.processed_content)
+        # 提取参数定义（词法模式下由声明提取器完成）
+        if not self.use_lexer:
+            self.parameters = extract_parameters(self.processed_content)
+            self._parameter_values = None
     
     def _process_macros(self) -> None:
-        """处理Verilog宏定义"""
-        # 替换宏定义，保留空格以保持行号一致
-        self.processed_content = re.sub(r'`\w+', ' ', self.processed_content)
+        """处理编译指令：丢弃未生效的条件编译分支，指令和宏引用替换为空白以保持行号一致"""
+        self.preprocessor = self._new_preprocessor()
+        self.processed_content = self.preprocessor.process_text(self.processed_content, self.file_path)
         
-        # 特殊处理include语句
-        self.processed_content = re.sub(r'`include\s+["<].*?[">]', ' ', self.processed_content)
+    def _new_preprocessor(self) -> Preprocessor:
+        """创建使用本解析器宏定义和头文件搜索路径的预处理器"""
+        return Preprocessor(self.defines, self.include_dirs)
         
-        # 处理条件编译指令
-        conditional_pattern = re.compile(r'`(ifdef|ifndef|else|endif|elsif|define|undef).*?$', re.MULTILINE)
-        self.processed_content = conditional_pattern.sub(' ', self.processed_content)
+    @property
+    def included_files(self) -> List[str]:
+        """最近一次解析读取的头文件路径"""
+        return self.preprocessor.included_files if self.preprocessor is not None else []
         
     def _extract_signals(self) -> None:
         """
@@ -101,15 +216,65 @@ class VerilogParser:
         - 已定义信号
         - 所有可能的信号
         """
+        if self.use_lexer:
+            with profile_phase(self.profiler, 'extract_signals'):
+                self._extract_signals_from_tokens()
+            return
+            
         # 提取已定义的信号
-        self._extract_defined_signals()
+        with profile_phase(self.profiler, 'extract_defined_signals'):
+            self._extract_defined_signals()
         
         # 提取所有可能的信号（保持顺序）
-        signal_pattern = re.compile(r'\b(\w+)\b')
-        for line in self.lines:
-            for signal in signal_pattern.findall(line):
-                if signal not in self.all_signals:
-                    self.all_signals[signal] = True
+        with profile_phase(self.profiler, 'extract_signals'):
+            signal_pattern = cre.compile(r'\b(\w+)\b')
+            for line in self.lines:
+                for signal in signal_pattern.findall(line):
+                    if signal not in self.all_signals:
+                        self.all_signals[signal] = True
+    
+    def _extract_signals_from_tokens(self, tokens: Optional[Iterable[Token]] = None) -> None:
+        """
+        单遍扫描词法单元流，同时提取声明、参数、实例端口名和所有可能的信号
+        
+        参数:
+            tokens: 词法单元流，默认对self.content进行词法分析
+        """
+        declarations = DeclarationExtractor(self.record_connections)
+        usage_index = IdentifierUsageIndex()
+        width_table = WidthTable(None if self.streaming else self.content)
+        all_signals = self.all_signals
+        module_instances = self.module_instances
+        if tokens is None:
+            tokens = tokenize(self.content)
+        self.preprocessor = self._new_preprocessor()
+        
+        for statement in iter_statements(self.preprocessor.process(tokens, self.file_path)):
+            declarations.feed(statement)
+            usage_index.feed(statement)
+            width_table.feed(statement)
+            previous = None
+            for token in statement:
+                if token.kind == IDENT:
+                    if token.value not in all_signals:
+                        all_signals[token.value] = True
+                    # .port(...) 形式的实例端口名
+                    if previous is not None and previous.value == '.':
+                        module_instances.add(token.value)
+                previous = token
+                
+        self.declarations = declarations
+        self.usage_index = usage_index
+        self.width_table = width_table
+        self.wire_signals.update(declarations.wire_signals)
+        self.reg_signals.update(declarations.reg_signals)
+        self.port_signals.update(declarations.port_signals)
+        self.defined_signals.update(declarations.defined_signals)
+        self.parameters = dict(declarations.parameters)
+        self._parameter_values = None
+        
+        # 检查并排除端口信号和内部使用的相同名称信号
+        self._exclude_port_signal_wire_declaration()
     
     def _extract_defined_signals(self) -> None:
         """提取已定义的信号"""
@@ -178,14 +343,14 @@ class VerilogParser:
             pattern: 正则表达式模式
             signal_set: 如果提供，将提取的信号添加到此集合
         """
-        pattern_obj = re.compile(pattern)
+        pattern_obj = cre.compile(pattern)
         
         for match in pattern_obj.finditer(self.processed_content):
             signals_str = match.group(1)
             # 处理逗号分隔的多个信号情况
-            for signal in re.split(r'\s*,\s*', signals_str):
+            for signal in cre.split(r'\s*,\s*', signals_str):
                 signal = signal.strip()
-                if signal and re.match(r'^[a-zA-Z_]\w*$', signal):
+                if signal and cre.match(r'^[a-zA-Z_]\w*$', signal):
                     self.defined_signals.add(signal)
                     if signal_set is not None:
                         signal_set.add(signal)
@@ -197,30 +362,39 @@ class VerilogParser:
         - 模块实例
         - 实例模块名
         """
-        # 提取模块名
-        module_pattern = re.compile(r'\bmodule\s+(\w+)')
-        module_matches = module_pattern.search(self.processed_content)
-        if module_matches:
-            self.module_name = module_matches.group(1)
-            self.module_names.add(self.module_name)
-        
-        # 提取模块实例化信号
-        instance_pattern = re.compile(r'\.(\w+)')
-        self.module_instances.update(instance_pattern.findall(self.processed_content))
-        
-        # 提取实例模块名
-        instance_module_patterns = [
-            re.compile(r'(\w+)\s+(?:u_|i_|inst_|g_|gen_|x_|m_|s_|p_|c_|r_|w_|dut_|tb_|f_|d_|l_|h_|v_|n_|b_|a_|e_)?(\w+)\s*\(\.'),  # 模块名 [前缀]实例名(.端口
-            re.compile(r'(\w+)\s+(\w+)\s*\('),  # 模块名 实例名(
-            re.compile(r'(\w+)\s+(?:u_|i_|inst_|g_|gen_|x_|m_|s_|p_|c_|r_|w_|dut_|tb_|f_|d_|l_|h_|v_|n_|b_|a_|e_)(\w+)\s*\('),  # 模块名 前缀实例名(
-            re.compile(r'generate\s+.*?\s+(\w+)\s*:'),  # generate块名称
-            re.compile(r'//\s*generate\s+.*?\s+(\w+)'),  # generate注释名
-            re.compile(r'//.*?generate\s+.*?\s+(\w+)'),  # 更宽松的generate注释名匹配
-            re.compile(r'endgenerate\s+.*?\s+(\w+)')  # endgenerate块名称
-        ]
+        if self.declarations is not None:
+            # 模块名和实例端口名已在词法扫描中提取
+            self.module_name = self.declarations.module_name
+            if self.module_name:
+                self.module_names.add(self.module_name)
+            # 实例化语句中的模块名、实例名以及块名均不是信号
+            self.instance_module_names.extend(self.declarations.instances)
+            self.instance_module_names.extend(self.declarations.block_labels)
+        else:
+            # 提取模块名
+            module_pattern = cre.compile(r'\bmodule\s+(\w+)')
+            module_matches = module_pattern.search(self.processed_content)
+            if module_matches:
+                self.module_name = module_matches.group(1)
+                self.module_names.add(self.module_name)
+            
+            # 提取模块实例化信号
+            instance_pattern = cre.compile(r'\.(\w+)')
+            self.module_instances.update(instance_pattern.findall(self.processed_content))
+            
+            # 提取实例模块名
+            instance_module_patterns = [
+                cre.compile(r'(\w+)\s+(?:u_|i_|inst_|g_|gen_|x_|m_|s_|p_|c_|r_|w_|dut_|tb_|f_|d_|l_|h_|v_|n_|b_|a_|e_)?(\w+)\s*\(\.'),  # 模块名 [前缀]实例名(.端口
+                cre.compile(r'(\w+)\s+(\w+)\s*\('),  # 模块名 实例名(
+                cre.compile(r'(\w+)\s+(?:u_|i_|inst_|g_|gen_|x_|m_|s_|p_|c_|r_|w_|dut_|tb_|f_|d_|l_|h_|v_|n_|b_|a_|e_)(\w+)\s*\('),  # 模块名 前缀实例名(
+                cre.compile(r'generate\s+.*?\s+(\w+)\s*:'),  # generate块名称
+                cre.compile(r'//\s*generate\s+.*?\s+(\w+)'),  # generate注释名
+                cre.compile(r'//.*?generate\s+.*?\s+(\w+)'),  # 更宽松的generate注释名匹配
+                cre.compile(r'endgenerate\s+.*?\s+(\w+)')  # endgenerate块名称
+            ]
         
-        for pattern in instance_module_patterns:
-            self.instance_module_names.extend(pattern.findall(self.processed_content))
+            for pattern in instance_module_patterns:
+                self.instance_module_names.extend(pattern.findall(self.processed_content))
     
     def get_signal_bitwidth(self, signal_name: str) -> Optional[str]:
         """
@@ -231,28 +405,15 @@ class VerilogParser:
             
         返回:
             位宽字符串，如"[7:0]"，如果无法确定返回None
+            
+        异常:
+            ParseError: 流式解析后调用
         """
-        # 查找信号使用位宽的地方
-        patterns = [
-            # 例如：assign data[7:0] = value;
-            re.compile(rf'{signal_name}\s*\[(\d+):(\d+)\]'),
-            # 例如：assign data[WIDTH-1:0] = value;
-            re.compile(rf'{signal_name}\s*\[(\w+)\s*-\s*1\s*:\s*0\]'),
-            # 例如：assign data[WIDTH:0] = value;
-            re.compile(rf'{signal_name}\s*\[(\w+)\s*:\s*0\]'),
-            # 例如：assign data[0] = value; (单比特)
-            re.compile(rf'{signal_name}\s*\[(\d+)\]'),
-            # 例如：assign data[WIDTH] = value; (参数索引)
-            re.compile(rf'{signal_name}\s*\[(\w+)\]'),
-            # 例如：assign data[WIDTH+:8] = value; (增量范围)
-            re.compile(rf'{signal_name}\s*\[(\w+)\s*\+\s*:\s*(\d+)\]'),
-            # 例如：assign data[WIDTH-:8] = value; (减量范围)
-            re.compile(rf'{signal_name}\s*\[(\w+)\s*\-\s*:\s*(\d+)\]'),
-            # 例如：assign data[8*i+:8] = value; (表达式增量范围)
-            re.compile(rf'{signal_name}\s*\[([\w\d\*\+\-\s]+)\+:(\d+)\]'),
-            # 例如：assign data[8*i-:8] = value; (表达式减量范围)
-            re.compile(rf'{signal_name}\s*\[([\w\d\*\+\-\s]+)\-:(\d+)\]')
-        ]
+        if self.streaming:
+            raise ParseError("流式解析不保留源文本，请使用批量位宽推断")
+            
+        # 查找信号使用位宽的地方，例如 assign data[7:0] = value;
+        patterns = [cre.compile(rf'{signal_name}\s*\[{pattern.pattern}\]') for pattern in SLICE_PATTERNS]
         
         # 使用原始内容进行匹配，以便正确处理位宽
         content_to_search = self.original_content
@@ -261,78 +422,32 @@ class VerilogParser:
             matches = pattern.findall(content_to_search)
             if matches:
                 # 处理第一个匹配
-                if len(matches[0]) == 2:  # 范围 [x:y]
-                    high, low = matches[0]
-                    # 如果是参数，尝试替换
-                    if high in self.parameters:
-                        try:
-                            high_val = int(self.parameters[high])
-                            high = str(high_val)
-                        except ValueError:
-                            # 如果参数值不是简单数字，保留原始参数名
-                            pass
-                    if low in self.parameters:
-                        try:
-                            low_val = int(self.parameters[low])
-                            low = str(low_val)
-                        except ValueError:
-                            # 如果参数值不是简单数字，保留原始参数名
-                            pass
-                    return f"[{high}:{low}]"
-                elif len(matches[0]) == 1:  # 单比特 [x]
-                    index = matches[0][0]
-                    # 如果是参数，尝试替换
-                    if index in self.parameters:
-                        try:
-                            index_val = int(self.parameters[index])
-                            return f"[{index_val}:0]"  # 假设是位宽参数
-                        except ValueError:
-                            return "[0:0]"  # 无法解析参数值，默认为单比特
-                    try:
-                        # 尝试将索引转换为整数
-                        index_val = int(index)
-                        return "[0:0]"  # 单比特索引转换为范围格式
-                    except ValueError:
-                        # 如果不是数字，可能是参数名但未在参数列表中找到
-                        return f"[{index}:0]"  # 假设是位宽参数
+                width = resolve_slice_width(matches[0], self.parameters, self.get_parameter_values())
+                if width is not None:
+                    return width
         
         # 尝试从输入/输出信号定义推断
         type_patterns = [
-            # 标准位宽格式 input [7:0] data;
-            re.compile(rf'(?:input|output|inout)\s+(?:\[\s*(\d+)\s*:\s*(\d+)\s*\])\s+{signal_name}'),
-            # 带类型的位宽格式 input wire [7:0] data;
-            re.compile(rf'(?:input|output|inout)\s+(?:wire|reg|logic)\s+(?:\[\s*(\d+)\s*:\s*(\d+)\s*\])\s+{signal_name}'),
-            # 参数化位宽 input [WIDTH-1:0] data;
-            re.compile(rf'(?:input|output|inout)\s+(?:\[\s*(\w+)\s*-\s*1\s*:\s*0\s*\])\s+{signal_name}')
+            cre.compile(r'(?:input|output|inout)\s+' + (r'(?:wire|reg|logic)\s+' if typed else '')
+                       + rf'(?:\[{pattern.pattern}\])\s+{signal_name}')
+            for typed, pattern in DECLARATION_PATTERNS
         ]
         
         for pattern in type_patterns:
             match = pattern.search(content_to_search)
             if match:
-                # 确保在访问前检查捕获组的数量和存在性
-                groups = match.groups()
-                if len(groups) >= 2 and groups[0] is not None and groups[1] is not None:
-                    # 标准位宽格式 [x:y]
-                    return f"[{groups[0]}:{groups[1]}]"
-                elif len(groups) >= 1 and groups[0] is not None:
-                    # 参数化位宽 [PARAM-1:0]
-                    param_name = groups[0]
-                    if param_name in self.parameters:
-                        try:
-                            param_val = int(self.parameters[param_name])
-                            return f"[{param_val-1}:0]"
-                        except ValueError:
-                            return f"[{param_name}-1:0]"
-                    return f"[{param_name}-1:0]"
+                width = resolve_declaration_width(match.groups(), self.parameters, self.get_parameter_values())
+                if width is not None:
+                    return width
         
         return None
     
-    def get_undefined_signals(self, exclude_patterns: List[str] = None) -> List[str]:
+    def get_undefined_signals(self, exclude_patterns: Union[List[str], SignalFilter, None] = None) -> List[str]:
         """
         获取未定义信号列表
         
         参数:
-            exclude_patterns: 排除模式列表
+            exclude_patterns: 排除模式列表，或预先编译好的信号过滤器
             
         返回:
             未定义信号列表
@@ -344,9 +459,9 @@ class VerilogParser:
         exclude_set.update(self.module_instances)
         exclude_set.update(self.parameters.keys())
         
-        # 强制排除所有输入/输出信号 - 这是一个额外的保障措施
+        # 强制排除所有输入/输出信号 - 这是一个额外的保障措施（词法模式下端口已在已定义信号中）
         input_output_signals = set()
-        io_patterns = [
+        io_patterns = [] if self.use_lexer else [
             r'\b(input|output|inout)\s+(?:wire|reg|logic)?\s+(?:\[\s*[\w\d\:\-\+]+\s*\])?\s*([\w\d_,\s]+);',
             r'\b(input|output|inout)\s+(?:\[\s*[\w\d\:\-\+]+\s*\])?\s*([\w\d_,\s]+);',
             r'\b(input|output|inout)\s+(?:wire|reg|logic)?\s+\[\s*[\w\d_]+\s*(?:[\-\+]\s*[\w\d_]+)?\s*:\s*[\w\d_]+\s*\]\s*([\w\d_,\s]+);',
@@ -354,35 +469,29 @@ class VerilogParser:
         ]
         
         for pattern in io_patterns:
-            matches = re.finditer(pattern, self.original_content)
+            matches = cre.finditer(pattern, self.original_content)
             for match in matches:
                 signal_group = match.group(2)
                 if signal_group:
-                    for signal in re.split(r'\s*,\s*', signal_group):
+                    for signal in cre.split(r'\s*,\s*', signal_group):
                         signal = signal.strip()
-                        if signal and re.match(r'^[a-zA-Z_]\w*$', signal):
+                        if signal and cre.match(r'^[a-zA-Z_]\w*$', signal):
                             input_output_signals.add(signal)
         
         # 将所有输入/输出信号添加到排除集合中
         exclude_set.update(input_output_signals)
         
         # 排除数字
-        number_pattern = re.compile(r'^\d+$')
-        exclude_numbers = {signal for signal in self.all_signals if number_pattern.match(signal)}
+        exclude_numbers = {signal for signal in self.all_signals if _NUMBER_PATTERN.match(signal)}
         exclude_set.update(exclude_numbers)
         
         # 排除Verilog数值常量 (如1'h0, 8'b00101010等)
-        verilog_number_pattern = re.compile(r'\d+\'[hbd][\w_]+')
         verilog_numbers = set()
         for line in self.lines:
-            for match in verilog_number_pattern.finditer(line):
+            for match in _VERILOG_NUMBER_PATTERN.finditer(line):
                 verilog_numbers.add(match.group(0))
         exclude_set.update(verilog_numbers)
         
-        # 排除常量名称
-        exclude_constants = {signal for signal in self.all_signals if is_common_constant(signal)}
-        exclude_set.update(exclude_constants)
-        
         # 排除带有常用前缀的实例名
         flat_instance_names = [item for sublist in self.instance_module_names for item in (sublist if isinstance(sublist, tuple) else [sublist])]
         prefixed_instances = set()
@@ -396,58 +505,86 @@ class VerilogParser:
                     prefixed_instances.add(prefixed_name)
         exclude_set.update(prefixed_instances)
         
-        # 应用用户自定义排除模式
-        if exclude_patterns:
-            user_exclude_patterns = []
-            for pattern in exclude_patterns:
-                try:
-                    user_exclude_patterns.append(re.compile(pattern))
-                except re.error:
-                    print(f"警告：无效的正则表达式模式 '{pattern}'，已忽略")
-                    
-            for pattern in user_exclude_patterns:
-                for signal in list(self.all_signals.keys()):
-                    if pattern.search(signal):
-                        exclude_set.add(signal)
+        # 词法模式下实例化和块名是精确识别的，直接排除
+        if self.use_lexer:
+            exclude_set.update(name for name in flat_instance_names if isinstance(name, str))
+        
+        # 应用用户自定义排除模式和常量命名规则，过滤器只编译一次，每个信号一次判定
+        signal_filter = exclude_patterns if isinstance(exclude_patterns, SignalFilter) else SignalFilter(exclude_patterns)
         
         # 提取未定义信号
         undefined_signals = []
         for signal in self.all_signals:
-            if signal not in exclude_set:
+            if signal not in exclude_set and not signal_filter.excludes(signal):
                 undefined_signals.append(signal)
                 
         return undefined_signals
         
-    def get_signal_widths(self, signals: List[str]) -> Dict[str, Optional[str]]:
+    def get_parameter_values(self) -> Dict[str, int]:
+        """
+        获取参数的整数值，首次调用时按依赖顺序求值全部参数，之后直接返回结果
+        
+        返回:
+            参数名到整数值的字典，只包含能够求值的参数；循环引用见parameter_cycles
+        """
+        if self._parameter_values is None:
+            self.parameter_evaluator = ConstantEvaluator(self.parameters)
+            self._parameter_values = self.parameter_evaluator.resolve_all()
+        return self._parameter_values
+        
+    @property
+    def parameter_cycles(self) -> List[List[str]]:
+        """参数定义中的循环引用路径，如 [['A', 'B', 'A']]"""
+        self.get_parameter_values()
+        return self.parameter_evaluator.cycles
+        
+    def get_signal_widths(self, signals: List[str], batched: bool = True) -> Dict[str, Optional[str]]:
         """
         获取信号位宽字典
         
         参数:
             signals: 信号列表
+            batched: 是否使用位宽表批量推断，False时逐个信号调用get_signal_bitwidth
             
         返回:
             信号名到位宽的字典
         """
         signal_widths = {}
-        for signal in signals:
-            signal_widths[signal] = self.get_signal_bitwidth(signal)
+        if batched:
+            signal_widths.update(self._get_width_table().resolve_many(signals, self.parameters,
+                                                                      self.get_parameter_values()))
+        else:
+            for signal in signals:
+                signal_widths[signal] = self.get_signal_bitwidth(signal)
         return signal_widths
+    
+    def _get_width_table(self) -> WidthTable:
+        """
+        获取位宽表，词法模式下已在扫描中构建，否则按需构建
+        
+        返回:
+            位宽表
+        """
+        if self.width_table is None:
+            statements = iter_statements(self._new_preprocessor().process(tokenize(self.content), self.file_path))
+            self.width_table = WidthTable(self.content).build(statements)
+        return self.width_table
 
     def _extract_port_signals_from_module_declaration(self) -> None:
         """从模块声明中提取端口信号"""
         # 匹配模块声明及其端口列表
-        module_pattern = re.compile(r'\bmodule\s+\w+\s*#?\s*\(.*?\)\s*\(([\s\S]*?)\);', re.DOTALL)
+        module_pattern = cre.compile(r'\bmodule\s+\w+\s*#?\s*\(.*?\)\s*\(([\s\S]*?)\);', cre.DOTALL)
         match = module_pattern.search(self.original_content)
         
         if match:
             port_list = match.group(1)
             # 找出所有端口名称
-            port_pattern = re.compile(r'\b(\w+)(?:\s*,|\s*\)|\s*$)')
+            port_pattern = cre.compile(r'\b(\w+)(?:\s*,|\s*\)|\s*$)')
             ports = port_pattern.findall(port_list)
             
             # 将这些端口名称添加到端口信号集合中
             for port in ports:
-                if port and re.match(r'^[a-zA-Z_]\w*$', port) and port not in VERILOG_KEYWORDS:
+                if port and cre.match(r'^[a-zA-Z_]\w*$', port) and port not in VERILOG_KEYWORDS:
                     self.port_signals.add(port)
                     # 直接将所有端口信号添加到已定义信号集合中
                     self.defined_signals.add(port)
@@ -461,14 +598,14 @@ class VerilogParser:
         ]
         
         for pattern in io_patterns:
-            pattern_obj = re.compile(pattern)
+            pattern_obj = cre.compile(pattern)
             matches = pattern_obj.finditer(self.original_content)
             for match in matches:
                 signal_group = match.group(2)
                 if signal_group:
-                    for signal in re.split(r'\s*,\s*', signal_group):
+                    for signal in cre.split(r'\s*,\s*', signal_group):
                         signal = signal.strip()
-                        if signal and re.match(r'^[a-zA-Z_]\w*$', signal):
+                        if signal and cre.match(r'^[a-zA-Z_]\w*$', signal):
                             self.port_signals.add(signal)
                             self.defined_signals.add(signal)
                     
@@ -478,8 +615,8 @@ class VerilogParser:
         for port_signal in self.port_signals:
             self.defined_signals.add(port_signal)
         
-        # 匹配input/output/inout声明
-        io_patterns = [
+        # 匹配input/output/inout声明（词法模式下端口声明已由声明提取器完整收集）
+        io_patterns = [] if self.use_lexer else [
             r'\b(input|output|inout)\s+(?:wire|reg|logic)?\s+(?:\[\s*[\w\d\:\-\+]+\s*\])?\s*([\w\d_,\s]+);',
             r'\b(input|output|inout)\s+(?:\[\s*[\w\d\:\-\+]+\s*\])?\s*([\w\d_,\s]+);',
             r'\b(input|output|inout)\s+(?:wire|reg|logic)?\s+\[\s*[\w\d_]+\s*(?:[\-\+]\s*[\w\d_]+)?\s*:\s*[\w\d_]+\s*\]\s*([\w\d_,\s]+);',
@@ -487,46 +624,12 @@ class VerilogParser:
         ]
         
         for pattern in io_patterns:
-            matches = re.finditer(pattern, self.original_content)
+            matches = cre.finditer(pattern, self.original_content)
             for match in matches:
                 signal_group = match.group(2)
                 if signal_group:
-                    for signal in re.split(r'\s*,\s*', signal_group):
+                    for signal in cre.split(r'\s*,\s*', signal_group):
                         signal = signal.strip()
                         if signal:
                             self.defined_signals.add(signal)
-                            self.port_signals.add(signal)
-        
-        # 下面是原有的额外检查逻辑，保留以确保完全排除所有端口信号
-        # 对于模块内部直接使用但与端口同名的信号，可能需要额外处理
-        for port_signal in self.port_signals:
-            # 排除简单赋值：assign port_signal = xxx; 或 xxx = port_signal;
-            assignment_patterns = [
-                re.compile(f'assign\\s+{port_signal}\\s*='),
-                re.compile(f'=\\s*{port_signal}\\b')
-            ]
-            
-            for pattern in assignment_patterns:
-                if pattern.search(self.processed_content):
-                    # 如果端口信号在赋值中使用，则标记为已定义
-                    self.defined_signals.add(port_signal)
-                    
-            # 排除在always块内使用
-            always_pattern = re.compile(f'always\\s+@.*?{port_signal}')
-            if always_pattern.search(self.processed_content):
-                self.defined_signals.add(port_signal)
-                
-            # 排除在实例化端口连接中使用
-            port_connection_pattern = re.compile(f'\\.\\w+\\s*\\(\\s*{port_signal}\\s*\\)')
-            if port_connection_pattern.search(self.processed_content):
-                self.defined_signals.add(port_signal)
-                
-            # 排除在case语句中使用
-            case_pattern = re.compile(f'case\\s*\\(.*?{port_signal}|{port_signal}\\s*:')
-            if case_pattern.search(self.processed_content):
-                self.defined_signals.add(port_signal)
-                
-            # 排除在if条件中使用
-            if_pattern = re.compile(f'if\\s*\\(.*?{port_signal}')
-            if if_pattern.search(self.processed_content):
-                self.defined_signals.add(port_signal)
\ No newline at end of file
+                            self.port_signals.add(signal)
\ No newline at end of file
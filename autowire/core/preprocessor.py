@@ -0,0 +1,375 @@
+"""
+预处理模块
+在词法单元流上单遍完成Verilog预处理：按宏定义求值`ifdef/`ifndef/`elsif/`else条件编译，
+未生效分支的内容在进入后续分析前丢弃；记录`define/`undef，并从`include的头文件中读取宏定义
+
+宏引用（如`WIDTH）不展开，保留为DIRECTIVE单元，作为不透明的值参与后续分析；
+头文件只用于收集宏定义，其内容不并入当前文件，因此词法单元的位置始终对应当前文件
+"""
+
+import os
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .lexer import tokenize, DIRECTIVE, STRING, Token
+from .utils import read_file
+
+# 条件编译指令
+_CONDITIONAL_DIRECTIVES = frozenset({'`ifdef', '`ifndef', '`elsif', '`else', '`endif'})
+
+# 需要丢弃整行内容的编译指令（`define单独处理）
+_LINE_DIRECTIVES = frozenset({
+    '`timescale', '`default_nettype', '`line', '`pragma',
+    '`unconnected_drive', '`begin_keywords', '`end_keywords',
+})
+
+# 无参数的编译指令
+_BARE_DIRECTIVES = frozenset({
+    '`resetall', '`celldefine', '`endcelldefine', '`nounconnected_drive', '`undefineall',
+})
+
+# 全部编译指令，其余以反引号开头的单元是宏引用
+_COMPILER_DIRECTIVES = (_CONDITIONAL_DIRECTIVES | _LINE_DIRECTIVES | _BARE_DIRECTIVES
+                        | {'`define', '`undef', '`include'})
+
+# 头文件嵌套包含的最大深度
+MAX_INCLUDE_DEPTH = 32
+
+
+def parse_define(text: str) -> Tuple[str, str]:
+    """
+    解析 NAME 或 NAME=VALUE 形式的宏定义（-D选项、+define+）
+
+    参数:
+        text: 宏定义文本
+
+    返回:
+        (宏名, 宏值)，无值时宏值为空字符串
+    """
+    name, _, value = text.partition('=')
+    return name.strip(), value
+
+
+def include_state(paths: Iterable[str]) -> List[List]:
+    """
+    记录头文件的状态，用于判断缓存的结果是否仍然有效
+
+    参数:
+        paths: 头文件路径
+
+    返回:
+        [路径, 修改时间纳秒, 大小] 列表，文件不存在时后两项为None
+    """
+    state = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            state.append([path, st.st_mtime_ns, st.st_size])
+        except OSError:
+            state.append([path, None, None])
+    return state
+
+
+def includes_unchanged(state: Iterable[List]) -> bool:
+    """
+    判断include_state()记录的头文件是否都未变化
+
+    参数:
+        state: include_state()的结果
+
+    返回:
+        全部未变化时返回True
+    """
+    state = list(state)
+    return include_state(path for path, _, _ in state) == state
+
+
+class IncludeCache:
+    """
+    头文件词法单元缓存类
+
+    按 (修改时间, 大小) 判断头文件是否变化，同一进程中被多个文件包含的头文件只读取和词法分析一次
+    """
+
+    def __init__(self, max_files: int = 256):
+        """
+        初始化缓存
+
+        参数:
+            max_files: 最多缓存的头文件数，超出时淘汰最久未使用的文件
+        """
+        self.max_files = max_files
+        self.entries = OrderedDict()   # 绝对路径到 (状态, 词法单元列表) 的映射
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str) -> Optional[List[Token]]:
+        """
+        获取头文件的词法单元
+
+        参数:
+            path: 头文件路径
+
+        返回:
+            词法单元列表，文件无法读取时返回None
+        """
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None
+        state = (st.st_mtime_ns, st.st_size)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == state:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        try:
+            tokens = list(tokenize(read_file(key)))
+        except IOError:
+            return None
+        self.misses += 1
+        self.entries[key] = (state, tokens)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_files:
+            self.entries.popitem(last=False)
+        return tokens
+
+
+# 进程内共享的头文件缓存
+_INCLUDE_CACHE = IncludeCache()
+
+
+class Preprocessor:
+    """
+    Verilog预处理器类
+
+    用法:
+        preprocessor = Preprocessor({'SYNTHESIS': ''}, ['rtl/include'])
+        for token in preprocessor.process(tokenize(content), 'rtl/top.v'):
+            ...
+    """
+
+    def __init__(self, defines: Optional[Dict[str, str]] = None, include_dirs: Optional[Iterable[str]] = None,
+                 include_cache: Optional[IncludeCache] = None):
+        """
+        初始化预处理器
+
+        参数:
+            defines: 预定义的宏（-D、+define+），无值时为空字符串
+            include_dirs: 头文件搜索路径（-I、+incdir+），在当前文件所在目录之后搜索
+            include_cache: 头文件缓存，默认使用进程内共享的缓存
+        """
+        self.defines = dict(defines or {})
+        self.include_dirs = list(include_dirs or [])
+        self.include_cache = include_cache if include_cache is not None else _INCLUDE_CACHE
+        self.included_files = []     # 已读取的头文件路径，按首次包含的顺序
+        self.missing_includes = []   # 未找到的头文件名
+        self._include_stack = []     # 正在处理的头文件，用于检测循环包含
+
+    def process(self, tokens: Iterable[Token], file_path: str = "",
+                dropped: Optional[List[Token]] = None) -> Iterator[Token]:
+        """
+        预处理词法单元流
+
+        参数:
+            tokens: 词法单元流
+            file_path: 源文件路径，用于解析相对路径的`include
+            dropped: 不为None时收集被丢弃的词法单元（指令、指令参数和未生效分支的内容）
+
+        返回:
+            生效的词法单元迭代器，普通宏引用保留为DIRECTIVE单元
+        """
+        stack = []      # 每层条件编译的 [外层是否生效, 是否已有分支生效]
+        active = True
+        pending = None  # 读取指令参数时多读出的下一个单元
+        tokens = iter(tokens)
+        drop = dropped.append if dropped is not None else _discard
+        while True:
+            if pending is not None:
+                token, pending = pending, None
+            else:
+                token = next(tokens, None)
+                if token is None:
+                    break
+            if token.kind != DIRECTIVE:
+                if active:
+                    yield token
+                else:
+                    drop(token)
+                continue
+
+            directive = token.value
+            if active and directive not in _COMPILER_DIRECTIVES:
+                # 普通宏引用
+                yield token
+                continue
+            drop(token)
+            if directive in _CONDITIONAL_DIRECTIVES:
+                name = None
+                if directive != '`else' and directive != '`endif':
+                    name = next(tokens, None)
+                    if name is not None:
+                        drop(name)
+                active = self._conditional(stack, directive, name.value if name is not None else "", active)
+            elif not active:
+                continue
+            elif directive == '`define':
+                line, pending = _read_line(tokens, token.line)
+                for item in line:
+                    drop(item)
+                if line:
+                    self.defines[line[0].value] = ' '.join(item.value for item in line[1:] if item.value != '\\')
+            elif directive in _LINE_DIRECTIVES:
+                line, pending = _read_line(tokens, token.line)
+                for item in line:
+                    drop(item)
+            elif directive == '`undef':
+                name = next(tokens, None)
+                if name is not None:
+                    drop(name)
+                    self.defines.pop(name.value, None)
+            elif directive == '`include':
+                name, pending = _read_include_name(tokens, token.line, drop)
+                if name:
+                    self._include(name, file_path)
+
+    def process_text(self, content: str, file_path: str = "") -> str:
+        """
+        预处理源代码文本，指令、宏引用和未生效分支替换为等长的空白，保持行号和偏移不变
+
+        参数:
+            content: 源代码
+            file_path: 源文件路径
+
+        返回:
+            预处理后的源代码
+        """
+        dropped = []
+        for token in self.process(tokenize(content), file_path, dropped):
+            if token.kind == DIRECTIVE:
+                dropped.append(token)
+        if not dropped:
+            return content
+        dropped.sort(key=lambda token: token.pos)
+        pieces = []
+        last = 0
+        for token in dropped:
+            pieces.append(content[last:token.pos])
+            pieces.append(' ' * len(token.value))
+            last = token.pos + len(token.value)
+        pieces.append(content[last:])
+        return ''.join(pieces)
+
+    def resolve_include(self, name: str, file_path: str = "") -> Optional[str]:
+        """
+        查找头文件：先在当前文件所在目录，再按顺序在头文件搜索路径中查找
+
+        参数:
+            name: `include中的文件名
+            file_path: 当前文件路径
+
+        返回:
+            头文件路径，未找到时返回None
+        """
+        if os.path.isabs(name):
+            return name if os.path.isfile(name) else None
+        directories = [os.path.dirname(file_path)] if file_path else ['']
+        directories.extend(self.include_dirs)
+        for directory in directories:
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                return os.path.normpath(path)
+        return None
+
+    def _conditional(self, stack: List[List[bool]], directive: str, name: str, active: bool) -> bool:
+        """处理条件编译指令，返回之后的内容是否生效；不匹配的`elsif/`else/`endif被忽略"""
+        if directive == '`ifdef' or directive == '`ifndef':
+            taken = (name in self.defines) == (directive == '`ifdef')
+            stack.append([active, taken])
+            return active and taken
+        if not stack:
+            return active
+        parent, taken = stack[-1]
+        if directive == '`endif':
+            stack.pop()
+            return parent
+        if directive == '`elsif':
+            branch = not taken and name in self.defines
+        else:
+            branch = not taken
+        if branch:
+            stack[-1][1] = True
+        return parent and branch
+
+    def _include(self, name: str, file_path: str) -> None:
+        """读取头文件并处理其中的指令以收集宏定义，头文件内容不输出"""
+        path = self.resolve_include(name, file_path)
+        if path is None:
+            if name not in self.missing_includes:
+                self.missing_includes.append(name)
+            return
+        key = os.path.abspath(path)
+        if key in self._include_stack or len(self._include_stack) >= MAX_INCLUDE_DEPTH:
+            return
+        tokens = self.include_cache.get(path)
+        if tokens is None:
+            if name not in self.missing_includes:
+                self.missing_includes.append(name)
+            return
+        if path not in self.included_files:
+            self.included_files.append(path)
+        self._include_stack.append(key)
+        try:
+            for _ in self.process(tokens, path):
+                pass
+        finally:
+            self._include_stack.pop()
+
+
+def _discard(token: Token) -> None:
+    """不收集被丢弃的词法单元"""
+
+
+def _read_line(tokens: Iterator[Token], line: int) -> Tuple[List[Token], Optional[Token]]:
+    """
+    读取指令所在行的其余单元，行尾反斜杠表示续行
+
+    返回:
+        (该行的单元列表, 下一行的第一个单元)
+    """
+    items = []
+    for token in tokens:
+        if token.line != line:
+            return items, token
+        items.append(token)
+        if token.value == '\\':
+            line += 1
+    return items, None
+
+
+def _read_include_name(tokens: Iterator[Token], line: int, drop) -> Tuple[str, Optional[Token]]:
+    """
+    读取`include的文件名，支持 "file.vh" 和 <file.vh> 两种形式
+
+    返回:
+        (文件名, 多读出的下一个单元)，缺少文件名时文件名为空字符串
+    """
+    token = next(tokens, None)
+    if token is None:
+        return "", None
+    if token.kind == STRING:
+        drop(token)
+        return token.value[1:-1], None
+    if token.value != '<' or token.line != line:
+        return "", token
+    drop(token)
+    parts = []
+    for token in tokens:
+        if token.line != line:
+            return ''.join(parts), token
+        drop(token)
+        if token.value == '>':
+            return ''.join(parts), None
+        parts.append(token.value)
+    return ''.join(parts), None
@@ -0,0 +1,196 @@
+"""
+性能剖析模块
+按阶段（读取、预处理、信号提取、未定义信号、位宽推断、生成、写入等）记录每个文件的耗时、
+正则表达式调用与匹配次数和内存，并可汇总多个文件的记录，找出占用时间最多的文件和阶段
+
+正则表达式计数由核心模块使用的counted_re按线程进行，只统计进入剖析器的线程中的调用
+"""
+
+import json
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from .utils import peak_memory_mb
+from .counted_re import RegexCounter, count_regex
+
+# 剖析结果的格式版本
+PROFILE_FORMAT = 2
+
+
+def _reset_peak() -> None:
+    """重置tracemalloc的峰值；reset_peak()需要Python 3.9，更早的版本重新开始跟踪"""
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.stop()
+        tracemalloc.start()
+
+
+class PhaseProfiler:
+    """
+    单个文件的分阶段剖析器类
+
+    用法:
+        profiler = PhaseProfiler('top.v')
+        with profiler.active():
+            with profiler.phase('read'):
+                ...
+        profiler.to_dict()
+    """
+
+    def __init__(self, file_path: str = "", trace_memory: bool = False, regex_counts: bool = True):
+        """
+        初始化剖析器
+
+        参数:
+            file_path: 文件路径
+            trace_memory: 是否使用tracemalloc记录每个阶段的Python内存分配峰值（耗时会明显增加）
+            regex_counts: 是否统计正则表达式调用，只需要耗时时可关闭以减少开销
+        """
+        self.file_path = file_path
+        self.trace_memory = trace_memory
+        self.regex_counts = regex_counts
+        self.phases = OrderedDict()   # 阶段名到 {'seconds', 'calls', 'regex_calls', 'regex_matches', ...} 的映射
+        self.total_seconds = 0.0
+        self.peak_rss_mb = None       # 文件处理结束时的进程峰值内存
+        self.counter = RegexCounter()
+        self._depth = 0               # active()的嵌套层数
+
+    @contextmanager
+    def active(self) -> Iterator['PhaseProfiler']:
+        """在上下文中统计当前线程的正则表达式调用，需要时启动tracemalloc，并记录总耗时和进程峰值内存；可以嵌套进入"""
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+            return
+        self._depth = 1
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            with count_regex(self.counter) if self.regex_counts else nullcontext():
+                yield self
+        finally:
+            self._depth = 0
+            self.total_seconds += time.perf_counter() - start
+            self.peak_rss_mb = peak_memory_mb()
+            if started_tracing:
+                tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        记录一个阶段，同名阶段多次进入时累加
+
+        参数:
+            name: 阶段名
+        """
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            _reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        calls, matches = self.counter.calls, self.counter.matches
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            record = self.phases.setdefault(name, {
+                'seconds': 0.0, 'calls': 0, 'regex_calls': 0, 'regex_matches': 0,
+            })
+            record['seconds'] += seconds
+            record['calls'] += 1
+            record['regex_calls'] += self.counter.calls - calls
+            record['regex_matches'] += self.counter.matches - matches
+            if tracing:
+                peak = (tracemalloc.get_traced_memory()[1] - base) / (1024 * 1024)
+                record['peak_alloc_mb'] = max(record.get('peak_alloc_mb', 0.0), peak)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的字典，时间单位为秒"""
+        phases = OrderedDict()
+        for name, record in self.phases.items():
+            phases[name] = dict(record, seconds=round(record['seconds'], 6))
+        return {
+            'file': self.file_path,
+            'total_seconds': round(self.total_seconds, 6),
+            'peak_rss_mb': self.peak_rss_mb,
+            'phases': phases,
+        }
+
+
+def profile_phase(profiler: Optional[PhaseProfiler], name: str):
+    """
+    返回记录阶段的上下文管理器，profiler为None时不做任何事
+
+    参数:
+        profiler: 剖析器
+        name: 阶段名
+    """
+    return profiler.phase(name) if profiler is not None else nullcontext()
+
+
+def aggregate_profiles(records: Iterable[Dict[str, Any]], top: int = 10) -> Dict[str, Any]:
+    """
+    汇总多个文件的剖析记录
+
+    参数:
+        records: PhaseProfiler.to_dict()的结果
+        top: 列出的最慢文件数
+
+    返回:
+        汇总字典，包含format、files（逐文件记录）、phases（按阶段累计，按耗时降序）、
+        slowest_files和total_seconds
+    """
+    records = list(records)
+    phases = {}
+    for record in records:
+        for name, phase in record['phases'].items():
+            total = phases.setdefault(name, {'seconds': 0.0, 'files': 0, 'regex_calls': 0,
+                                             'regex_matches': 0, 'slowest_file': None, 'slowest_seconds': 0.0})
+            total['seconds'] += phase['seconds']
+            total['files'] += 1
+            total['regex_calls'] += phase['regex_calls']
+            total['regex_matches'] += phase['regex_matches']
+            if phase['seconds'] >= total['slowest_seconds']:
+                total['slowest_file'] = record['file']
+                total['slowest_seconds'] = phase['seconds']
+    total_seconds = sum(record['total_seconds'] for record in records)
+    ordered = OrderedDict()
+    for name, total in sorted(phases.items(), key=lambda item: item[1]['seconds'], reverse=True):
+        total['seconds'] = round(total['seconds'], 6)
+        total['slowest_seconds'] = round(total['slowest_seconds'], 6)
+        total['share'] = round(total['seconds'] / total_seconds, 4) if total_seconds else 0.0
+        ordered[name] = total
+    slowest = sorted(records, key=lambda record: record['total_seconds'], reverse=True)[:top]
+    return {
+        'format': PROFILE_FORMAT,
+        'total_seconds': round(total_seconds, 6),
+        'phases': ordered,
+        'slowest_files': [{'file': r['file'], 'total_seconds': r['total_seconds']} for r in slowest],
+        'files': records,
+    }
+
+
+def write_profile(path: str, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    汇总剖析记录并写入JSON文件
+
+    参数:
+        path: 输出文件路径
+        records: PhaseProfiler.to_dict()的结果
+
+    返回:
+        汇总字典，见aggregate_profiles()
+    """
+    report = aggregate_profiles(records)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return report
@@ -0,0 +1,359 @@
+"""
+项目模式模块
+一次解析文件列表中的全部模块，建立模块接口索引（模块名到端口、方向和位宽的映射），
+实例端口连接的信号可直接使用子模块端口的位宽。索引按文件缓存在磁盘上，
+之后的运行只重新解析内容发生变化的文件
+"""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from . import counted_re as cre  # 剖析时按线程统计正则表达式调用
+from .lexer import KEYWORD, tokenize_stream, iter_statements
+from .declarations import DeclarationExtractor, MODULE_KEYWORDS
+from .cache import ResultCache, DEFAULT_CACHE_DIR
+from .const_eval import ConstantEvaluator
+from .preprocessor import Preprocessor, include_state, includes_unchanged
+from .utils import iter_file_chunks
+
+# 接口缓存条目的指纹，接口结构变化时递增
+INTERFACE_FORMAT = 'interfaces:2'
+
+# 单个标识符构成的连接表达式
+_IDENTIFIER = cre.compile(r'[A-Za-z_][A-Za-z0-9_$]*')
+
+
+class ModuleInterface:
+    """模块接口类，记录模块的端口（按声明顺序）、参数默认值和实例化的子模块"""
+
+    def __init__(self, name: str, file_path: str = "", ports: Optional[Dict[str, Dict[str, str]]] = None,
+                 parameters: Optional[Dict[str, str]] = None, localparams: Iterable[str] = (),
+                 instances: Iterable[str] = ()):
+        """
+        初始化模块接口
+
+        参数:
+            name: 模块名
+            file_path: 模块所在文件
+            ports: 端口名到 {'direction': 方向, 'range': 声明位宽文本} 的有序字典
+            parameters: 参数名到默认值表达式的有序字典
+            localparams: 不能被实例覆盖的参数名
+            instances: 模块内实例化的子模块名
+        """
+        self.name = name
+        self.file_path = file_path
+        self.ports = OrderedDict(ports or {})
+        self.parameters = OrderedDict(parameters or {})
+        self.localparams = set(localparams)
+        self.instances = list(instances)
+
+    @classmethod
+    def from_declarations(cls, declarations: DeclarationExtractor, file_path: str = "") -> 'ModuleInterface':
+        """
+        由单个模块的声明提取结果创建接口
+
+        参数:
+            declarations: 只处理了一个模块的声明提取器
+            file_path: 模块所在文件
+
+        返回:
+            模块接口
+        """
+        ports = OrderedDict()
+        for port in declarations.port_order:
+            ports[port] = {
+                'direction': declarations.port_directions.get(port, ''),
+                'range': declarations.ranges.get(port, ''),
+            }
+        instances = list(OrderedDict.fromkeys(module for module, _ in declarations.instances))
+        return cls(declarations.module_name, file_path, ports, declarations.parameters,
+                   declarations.localparams, instances)
+
+    @property
+    def port_names(self) -> List[str]:
+        """按声明顺序排列的端口名"""
+        return list(self.ports)
+
+    @property
+    def overridable_parameters(self) -> List[str]:
+        """可被实例覆盖的参数名，按声明顺序排列，用于按位置的参数覆盖"""
+        return [name for name in self.parameters if name not in self.localparams]
+
+    def bind_parameters(self, overrides: Optional[Dict[Union[str, int], str]] = None,
+                        parent: Optional[ConstantEvaluator] = None) -> ConstantEvaluator:
+        """
+        创建实例的参数求值器
+
+        参数:
+            overrides: 实例的参数覆盖，键为参数名或位置序号，值为父模块中的表达式文本
+            parent: 父模块的参数求值器，用于计算覆盖表达式
+
+        返回:
+            以参数默认值和覆盖值初始化的求值器
+        """
+        parent = parent or ConstantEvaluator()
+        overridable = self.overridable_parameters
+        values = {}
+        for key, expression in (overrides or {}).items():
+            if isinstance(key, int):
+                if key >= len(overridable):
+                    continue
+                key = overridable[key]
+            elif key not in self.parameters or key in self.localparams:
+                continue
+            values[key] = parent.evaluate(expression)
+        return ConstantEvaluator(self.parameters, values)
+
+    def port_width(self, port: str, evaluator: Optional[ConstantEvaluator] = None) -> Optional[str]:
+        """
+        计算端口位宽
+
+        参数:
+            port: 端口名
+            evaluator: 实例的参数求值器，见bind_parameters()，默认使用参数默认值
+
+        返回:
+            数值化的位宽文本，如"[7:0]"；单比特端口为"[0:0]"；端口不存在或位宽依赖无法计算的表达式时返回None
+        """
+        info = self.ports.get(port)
+        if info is None:
+            return None
+        if not info['range']:
+            return "[0:0]"
+        bounds = (evaluator or ConstantEvaluator(self.parameters)).evaluate_range(info['range'])
+        if bounds is None:
+            return None
+        return f"[{bounds[0]}:{bounds[1]}]"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的字典"""
+        return {
+            'name': self.name,
+            'file': self.file_path,
+            'ports': [[port, info['direction'], info['range']] for port, info in self.ports.items()],
+            'parameters': [[name, value] for name, value in self.parameters.items()],
+            'localparams': sorted(self.localparams),
+            'instances': self.instances,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ModuleInterface':
+        """由to_dict()的结果创建接口"""
+        ports = OrderedDict((port, {'direction': direction, 'range': range_text})
+                            for port, direction, range_text in data['ports'])
+        return cls(data['name'], data.get('file', ''), ports, OrderedDict(data['parameters']),
+                   data.get('localparams', ()), data.get('instances', ()))
+
+
+def extract_interfaces(tokens: Iterable, file_path: str = "",
+                       preprocessor: Optional[Preprocessor] = None) -> List[ModuleInterface]:
+    """
+    从词法单元流中提取每个模块的接口
+
+    参数:
+        tokens: 词法单元流
+        file_path: 源文件路径
+        preprocessor: 预处理器，决定条件编译中生效的分支，默认不使用预定义的宏
+
+    返回:
+        按出现顺序排列的模块接口列表
+    """
+    interfaces = []
+    declarations = None
+    preprocessor = preprocessor or Preprocessor()
+    for statement in iter_statements(preprocessor.process(tokens, file_path)):
+        if any(token.kind == KEYWORD and token.value in MODULE_KEYWORDS for token in statement):
+            declarations = DeclarationExtractor()
+        if declarations is None:
+            continue
+        declarations.feed(statement)
+        if statement[-1].value == 'endmodule':
+            if declarations.module_name:
+                interfaces.append(ModuleInterface.from_declarations(declarations, file_path))
+            declarations = None
+    if declarations is not None and declarations.module_name:
+        interfaces.append(ModuleInterface.from_declarations(declarations, file_path))
+    return interfaces
+
+
+class ProjectIndex:
+    """
+    模块接口索引类
+
+    按文件内容哈希缓存每个文件的模块接口，重复构建时未变化的文件直接读取缓存
+    """
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR, version: str = "",
+                 defines: Optional[Dict[str, str]] = None, include_dirs: Optional[List[str]] = None):
+        """
+        初始化索引
+
+        参数:
+            cache_dir: 接口缓存目录，为None时不使用缓存
+            version: 工具版本，参与缓存键的计算
+            defines: 预定义的宏
+            include_dirs: `include头文件的搜索路径
+        """
+        self.cache = ResultCache(cache_dir) if cache_dir else None
+        self.version = version
+        self.defines = dict(defines or {})
+        self.include_dirs = list(include_dirs or [])
+        # 宏定义和头文件搜索路径不同时接口可能不同
+        self.fingerprint = INTERFACE_FORMAT
+        if self.defines or self.include_dirs:
+            options = json.dumps([self.defines, self.include_dirs], sort_keys=True)
+            self.fingerprint += ':' + hashlib.sha256(options.encode('utf-8')).hexdigest()
+        self.modules = OrderedDict()   # 模块名到接口的映射，重名模块以先出现的为准
+        self.file_modules = {}         # 文件绝对路径到其中模块名列表的映射
+        self.duplicates = []           # 重复定义的模块名
+        self.parsed_files = 0          # 本次重新解析的文件数
+        self.cached_files = 0          # 从缓存读取的文件数
+
+    def build(self, files: Iterable[str]) -> 'ProjectIndex':
+        """
+        解析全部文件并建立索引
+
+        参数:
+            files: 源文件路径列表
+
+        返回:
+            索引自身，便于链式调用
+        """
+        for file_path in files:
+            self.add_file(file_path)
+        return self
+
+    def add_file(self, file_path: str) -> List[ModuleInterface]:
+        """
+        解析单个文件并将其中的模块加入索引
+
+        参数:
+            file_path: 源文件路径
+
+        返回:
+            文件中的模块接口列表
+        """
+        key = None
+        interfaces = None
+        if self.cache is not None:
+            key = self.cache.make_file_key(file_path, self.fingerprint, self.version)
+            cached = self.cache.get(key)
+            if cached is not None and includes_unchanged(cached.get('includes', [])):
+                interfaces = [ModuleInterface.from_dict(data) for data in cached['modules']]
+                self.cached_files += 1
+
+        if interfaces is None:
+            preprocessor = Preprocessor(self.defines, self.include_dirs)
+            interfaces = extract_interfaces(tokenize_stream(iter_file_chunks(file_path)), file_path, preprocessor)
+            self.parsed_files += 1
+            if key is not None:
+                try:
+                    self.cache.put(key, {'modules': [interface.to_dict() for interface in interfaces],
+                                         'includes': include_state(preprocessor.included_files)})
+                except OSError:
+                    # 缓存写入失败不影响索引
+                    pass
+
+        for interface in interfaces:
+            interface.file_path = file_path
+            if interface.name in self.modules:
+                self.duplicates.append(interface.name)
+            else:
+                self.modules[interface.name] = interface
+        self.file_modules[os.path.abspath(file_path)] = [interface.name for interface in interfaces]
+        return interfaces
+
+    def get(self, module: str) -> Optional[ModuleInterface]:
+        """
+        获取模块接口
+
+        参数:
+            module: 模块名
+
+        返回:
+            模块接口，索引中不存在时返回None
+        """
+        return self.modules.get(module)
+
+    def __contains__(self, module: str) -> bool:
+        return module in self.modules
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    def dependency_fingerprint(self, file_path: str) -> str:
+        """
+        计算文件所实例化的子模块接口的指纹，子模块接口变化时使该文件的结果缓存失效
+
+        参数:
+            file_path: 源文件路径
+
+        返回:
+            十六进制的sha256指纹
+        """
+        dependencies = set()
+        for name in self.file_modules.get(os.path.abspath(file_path), ()):
+            dependencies.update(self.modules[name].instances if name in self.modules else ())
+        data = []
+        for name in sorted(dependencies):
+            interface = self.modules.get(name)
+            if interface is None:
+                data.append([name, None])
+            else:
+                entry = interface.to_dict()
+                entry.pop('file')
+                data.append([name, entry])
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def resolve_connections(self, connections: Iterable[Dict[str, Any]],
+                            parent_parameters: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        按子模块端口位宽推断连接信号的位宽
+
+        只处理连接表达式为单个标识符的端口，同一信号连接到多个端口时取最宽的位宽
+
+        参数:
+            connections: 实例连接列表，见DeclarationExtractor.connections
+            parent_parameters: 父模块（当前文件）的参数定义
+
+        返回:
+            信号名到位宽文本的字典
+        """
+        widths = {}
+        bound = {}
+        parent = ConstantEvaluator(parent_parameters)
+        for connection in connections:
+            interface = self.modules.get(connection['module'])
+            if interface is None:
+                continue
+            overrides = connection['parameters']
+            cache_key = (interface.name, json.dumps(sorted(overrides.items(), key=str)))
+            if cache_key not in bound:
+                bound[cache_key] = interface.bind_parameters(overrides, parent)
+            evaluator = bound[cache_key]
+            port_names = None
+            for port, expression in connection['ports'].items():
+                if not _IDENTIFIER.fullmatch(expression):
+                    continue
+                if isinstance(port, int):
+                    if port_names is None:
+                        port_names = interface.port_names
+                    if port >= len(port_names):
+                        continue
+                    port = port_names[port]
+                width = interface.port_width(port, evaluator)
+                if width is None:
+                    continue
+                previous = widths.get(expression)
+                if previous is None or _range_size(width) > _range_size(previous):
+                    widths[expression] = width
+        return widths
+
+
+def _range_size(range_text: str) -> int:
+    """数值化位宽文本的位数"""
+    msb, lsb = range_text[1:-1].split(':')
+    return abs(int(msb) - int(lsb)) + 1
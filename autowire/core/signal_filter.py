@@ -0,0 +1,170 @@
+"""
+信号过滤模块
+将用户排除模式和常量命名规则预编译为一个过滤器，每个标识符只需一次判定
+"""
+
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from . import counted_re as cre  # 剖析时按线程统计正则表达式调用
+from .utils import is_common_constant
+
+# 可直接按字符串处理的字面量（Verilog标识符字符）
+_LITERAL = cre.compile(r'[A-Za-z0-9_]+')
+# 合并后会改变含义的模式：反向引用、内联全局标志
+_UNMERGEABLE = cre.compile(r'\\[1-9]|\(\?P=|\(\?[aiLmsux]+\)')
+
+
+class SignalFilter:
+    """
+    信号过滤器类
+
+    排除模式沿用re.search语义。形如 ^name$、^prefix.*、.*suffix$、substring 的字面量模式
+    分别归入集合、前缀元组、后缀元组和子串元组，其余模式合并为一个正则表达式
+    """
+
+    def __init__(self, exclude_patterns: Optional[Iterable[str]] = None, exclude_constants: bool = True):
+        """
+        初始化过滤器
+
+        参数:
+            exclude_patterns: 排除模式列表，支持正则表达式，无效模式会被忽略
+            exclude_constants: 是否排除常见常量命名（见utils.is_common_constant）
+        """
+        self.patterns = list(exclude_patterns or [])
+        self.exclude_constants = exclude_constants
+        self.exact = set()        # ^name$
+        self.prefixes = ()        # ^prefix 或 ^prefix.*
+        self.suffixes = ()        # suffix$ 或 .*suffix$
+        self.substrings = ()      # substring 或 .*substring.*
+        self.regex = None         # 其余模式合并后的正则表达式
+        self.fallback = []        # 无法合并的正则表达式
+        self.invalid = []         # 无效的模式
+        self._compile()
+
+    def _compile(self) -> None:
+        """对排除模式分类并编译"""
+        prefixes, suffixes, substrings, regexes = [], [], [], []
+        for pattern in self.patterns:
+            try:
+                compiled = cre.compile(pattern)
+            except cre.error:
+                print(f"警告：无效的正则表达式模式 '{pattern}'，已忽略")
+                self.invalid.append(pattern)
+                continue
+
+            literal = _classify_literal(pattern)
+            if literal is None:
+                if _UNMERGEABLE.search(pattern):
+                    self.fallback.append(compiled)
+                else:
+                    regexes.append(pattern)
+                continue
+            kind, text = literal
+            if kind == 'exact':
+                self.exact.add(text)
+            elif kind == 'prefix':
+                prefixes.append(text)
+            elif kind == 'suffix':
+                suffixes.append(text)
+            else:
+                substrings.append(text)
+
+        self.prefixes = tuple(prefixes)
+        self.suffixes = tuple(suffixes)
+        self.substrings = tuple(substrings)
+        if regexes:
+            try:
+                self.regex = cre.compile('|'.join(f'(?:{pattern})' for pattern in regexes))
+            except cre.error:
+                # 个别模式合并后无法编译时逐个匹配
+                self.fallback.extend(cre.compile(pattern) for pattern in regexes)
+
+    def excludes(self, signal: str) -> bool:
+        """
+        判断信号是否应被排除
+
+        参数:
+            signal: 信号名
+
+        返回:
+            匹配任一排除模式或常量规则时返回True
+        """
+        if signal in self.exact:
+            return True
+        if self.prefixes and signal.startswith(self.prefixes):
+            return True
+        if self.suffixes and signal.endswith(self.suffixes):
+            return True
+        for text in self.substrings:
+            if text in signal:
+                return True
+        if self.regex is not None and self.regex.search(signal):
+            return True
+        for pattern in self.fallback:
+            if pattern.search(signal):
+                return True
+        return self.exclude_constants and is_common_constant(signal)
+
+    def filter(self, signals: Iterable[str]) -> List[str]:
+        """
+        过滤信号列表，保持原有顺序
+
+        参数:
+            signals: 信号名序列
+
+        返回:
+            未被排除的信号列表
+        """
+        excludes = self.excludes
+        return [signal for signal in signals if not excludes(signal)]
+
+
+@lru_cache(maxsize=16)
+def get_signal_filter(exclude_patterns: Tuple[str, ...], exclude_constants: bool = True) -> SignalFilter:
+    """
+    获取排除模式对应的过滤器，同一进程内相同的模式只编译一次
+
+    参数:
+        exclude_patterns: 排除模式元组
+        exclude_constants: 是否排除常见常量命名
+
+    返回:
+        信号过滤器
+    """
+    return SignalFilter(exclude_patterns, exclude_constants)
+
+
+def _classify_literal(pattern: str) -> Optional[tuple]:
+    """
+    识别字面量排除模式
+
+    参数:
+        pattern: 排除模式
+
+    返回:
+        (类型, 字面量)，类型为exact/prefix/suffix/substring；不是字面量模式时返回None
+    """
+    core = pattern
+    anchored_start = core.startswith('^')
+    if anchored_start:
+        core = core[1:]
+    anchored_end = core.endswith('$') and not core.endswith('\\$')
+    if anchored_end:
+        core = core[:-1]
+    # 开头或结尾的 .* 可以匹配空串，等价于取消该侧的锚定
+    if core.startswith('.*'):
+        core = core[2:]
+        anchored_start = False
+    if core.endswith('.*') and not core.endswith('\\.*'):
+        core = core[:-2]
+        anchored_end = False
+    if not _LITERAL.fullmatch(core):
+        return None
+    if anchored_start and anchored_end:
+        return 'exact', core
+    if anchored_start:
+        return 'prefix', core
+    if anchored_end:
+        return 'suffix', core
+    return 'substring', core
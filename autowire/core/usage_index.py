@@ -0,0 +1,321 @@
+"""
+标识符使用索引模块
+在词法扫描过程中记录每个标识符出现的上下文（赋值左/右侧、敏感列表、实例端口连接、条件表达式），
+后续分析只需查字典，无需针对每个信号重新扫描全文
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+from .lexer import Token, IDENT, KEYWORD, BRACKET, iter_statements, match_bracket
+
+# 使用上下文
+ASSIGN_LHS = 'assign_lhs'                    # 赋值左侧，如 assign a = ...; a <= ...;
+ASSIGN_RHS = 'assign_rhs'                    # 赋值右侧及左侧的下标表达式
+SENSITIVITY = 'sensitivity'                  # 敏感列表，如 always @(posedge clk)
+INSTANCE_CONNECTION = 'instance_connection'  # 实例端口连接，如 .port(sig)
+CONDITION = 'condition'                      # if/case条件及case分支项
+
+ALL_CONTEXTS = frozenset({ASSIGN_LHS, ASSIGN_RHS, SENSITIVITY, INSTANCE_CONNECTION, CONDITION})
+
+# 括号内为条件表达式的关键字
+_CONDITION_KEYWORDS = frozenset({'if', 'case', 'casex', 'casez', 'while', 'wait'})
+# case语句关键字
+_CASE_KEYWORDS = frozenset({'case', 'casex', 'casez'})
+# 括号内不做分类的控制关键字
+_SKIP_PAREN_KEYWORDS = frozenset({'for', 'repeat'})
+# 赋值运算符
+_ASSIGN_OPS = frozenset({'=', '<='})
+# 查找case分支项冒号时遇到即停止的单元
+_ITEM_STOP = frozenset({'=', '<=', '?', ';'})
+
+_EMPTY = frozenset()
+
+
+class IdentifierUsageIndex:
+    """标识符使用索引类，记录标识符到其使用上下文集合的映射"""
+
+    def __init__(self):
+        """初始化索引"""
+        self._usage = {}       # 标识符到上下文集合的映射
+        self._case_depth = 0   # 当前case语句嵌套深度
+
+    def build(self, tokens: Iterable[Token]) -> 'IdentifierUsageIndex':
+        """
+        从词法单元流构建索引
+
+        参数:
+            tokens: 词法单元流（已过滤编译指令）
+
+        返回:
+            索引自身，便于链式调用
+        """
+        for statement in iter_statements(tokens):
+            self.feed(statement)
+        return self
+
+    def feed(self, statement: List[Token]) -> None:
+        """
+        处理一条语句，记录其中标识符的使用上下文
+
+        参数:
+            statement: 语句的词法单元列表
+        """
+        n = len(statement)
+        i = 0
+        # case语句内部，语句开头可能是分支项
+        item_start = self._case_depth > 0
+        while i < n:
+            token = statement[i]
+            value = token.value
+            if item_start:
+                item_start = False
+                i = self._mark_case_item(statement, i)
+                continue
+            if token.kind == KEYWORD:
+                if value == 'endcase':
+                    self._case_depth = max(self._case_depth - 1, 0)
+                elif value in _CONDITION_KEYWORDS and i + 1 < n and statement[i + 1].value == '(':
+                    end = match_bracket(statement, i + 1)
+                    self._mark(statement, i + 2, end, CONDITION)
+                    i = end + 1
+                    if value in _CASE_KEYWORDS:
+                        self._case_depth += 1
+                        item_start = True
+                    continue
+                elif value in _SKIP_PAREN_KEYWORDS and i + 1 < n and statement[i + 1].value == '(':
+                    i = match_bracket(statement, i + 1) + 1
+                    continue
+                i += 1
+            elif value == '@':
+                i = self._mark_sensitivity(statement, i + 1)
+            elif value == '#':
+                # 延时或参数覆盖，#(...) 中的 .N(W) 按实例连接处理
+                if i + 1 < n and statement[i + 1].value == '(':
+                    end = match_bracket(statement, i + 1)
+                    self._mark_connections(statement, i + 2, end)
+                    i = end + 1
+                else:
+                    i += 2
+            elif value == '.' and i + 2 < n and statement[i + 1].kind == IDENT and statement[i + 2].value == '(':
+                i = self._mark_connections(statement, i, n)
+            elif token.kind == IDENT or value in ('[', '{'):
+                i = self._mark_assignment(statement, i)
+            else:
+                i += 1
+
+    def contexts(self, name: str) -> FrozenSet[str]:
+        """
+        获取标识符出现过的上下文集合
+
+        参数:
+            name: 标识符
+
+        返回:
+            上下文集合，未出现时为空集合
+        """
+        return frozenset(self._usage.get(name, _EMPTY))
+
+    def is_used_in(self, name: str, *contexts: str) -> bool:
+        """
+        判断标识符是否在任一指定上下文中出现
+
+        参数:
+            name: 标识符
+            contexts: 上下文，不指定时判断是否在任意已记录上下文中出现
+
+        返回:
+            是否出现
+        """
+        usage = self._usage.get(name)
+        if not usage:
+            return False
+        if not contexts:
+            return True
+        return not usage.isdisjoint(contexts)
+
+    def names_in(self, context: str) -> Set[str]:
+        """
+        获取在指定上下文中出现过的所有标识符
+
+        参数:
+            context: 上下文
+
+        返回:
+            标识符集合
+        """
+        return {name for name, usage in self._usage.items() if context in usage}
+
+    def as_dict(self) -> Dict[str, List[str]]:
+        """
+        以可序列化的形式导出索引
+
+        返回:
+            标识符到排序后上下文列表的字典
+        """
+        return {name: sorted(usage) for name, usage in self._usage.items()}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._usage
+
+    def __len__(self) -> int:
+        return len(self._usage)
+
+    def _mark(self, statement: List[Token], start: int, end: int, context: str) -> None:
+        """
+        将区间内的所有标识符记录为指定上下文
+
+        参数:
+            statement: 语句的词法单元列表
+            start: 起始位置
+            end: 结束位置（不包含）
+            context: 上下文
+        """
+        usage = self._usage
+        for k in range(start, end):
+            token = statement[k]
+            if token.kind == IDENT:
+                contexts = usage.get(token.value)
+                if contexts is None:
+                    usage[token.value] = {context}
+                else:
+                    contexts.add(context)
+
+    def _mark_sensitivity(self, statement: List[Token], i: int) -> int:
+        """
+        记录敏感列表中的标识符，支持 @(...)、@* 和 @clk 形式
+
+        参数:
+            statement: 语句的词法单元列表
+            i: @之后的位置
+
+        返回:
+            敏感列表之后的位置
+        """
+        n = len(statement)
+        if i < n and statement[i].value == '(':
+            end = match_bracket(statement, i)
+            self._mark(statement, i + 1, end, SENSITIVITY)
+            return end + 1
+        if i < n and statement[i].kind == IDENT:
+            self._mark(statement, i, i + 1, SENSITIVITY)
+        return i + 1
+
+    def _mark_connections(self, statement: List[Token], i: int, end: int) -> int:
+        """
+        记录 .port(expr) 形式连接中的标识符，端口名本身不记录
+
+        参数:
+            statement: 语句的词法单元列表
+            i: 起始位置
+            end: 结束位置（不包含）
+
+        返回:
+            处理结束后的位置
+        """
+        while i < end:
+            if (statement[i].value == '.' and i + 2 < end
+                    and statement[i + 1].kind == IDENT and statement[i + 2].value == '('):
+                close = match_bracket(statement, i + 2)
+                self._mark(statement, i + 3, close, INSTANCE_CONNECTION)
+                i = close + 1
+            elif statement[i].value == ')' or statement[i].value == ';':
+                return i + 1
+            else:
+                i += 1
+        return i
+
+    def _mark_case_item(self, statement: List[Token], i: int) -> int:
+        """
+        记录case分支项（冒号之前的表达式）中的标识符
+
+        参数:
+            statement: 语句的词法单元列表
+            i: 语句或分支的起始位置
+
+        返回:
+            分支项冒号之后的位置，不是分支项时返回原位置
+        """
+        n = len(statement)
+        depth = 0
+        for k in range(i, n):
+            token = statement[k]
+            if token.kind == BRACKET:
+                depth += 1 if token.value in '([{' else -1
+            elif depth == 0:
+                if token.value == ':':
+                    self._mark(statement, i, k, CONDITION)
+                    return k + 1
+                if token.value in _ITEM_STOP or token.kind == KEYWORD:
+                    break
+        return i
+
+    def _mark_assignment(self, statement: List[Token], i: int) -> int:
+        """
+        记录赋值语句中的标识符：同层赋值运算符左侧为左值（下标表达式除外），右侧为右值
+
+        参数:
+            statement: 语句的词法单元列表
+            i: 赋值目标的起始位置
+
+        返回:
+            赋值语句结束后的位置
+        """
+        n = len(statement)
+        depth = 0
+        op = -1
+        stop = n
+        # 左值只能由标识符、层次分隔符和下标/拼接组成，遇到其他单元即可判定不是赋值
+        for k in range(i, n):
+            token = statement[k]
+            value = token.value
+            if token.kind == BRACKET:
+                if value in '[{' or (value == '(' and depth):
+                    depth += 1
+                elif depth == 0:
+                    stop = k
+                    break
+                else:
+                    depth -= 1
+            elif depth == 0:
+                if value in _ASSIGN_OPS:
+                    op = k
+                    break
+                if token.kind != IDENT and value != '.':
+                    stop = k
+                    break
+        if op < 0:
+            return max(stop, i + 1)
+
+        # 左侧：拼接 {a, b} 中的标识符为左值，下标 [idx] 中的标识符为右值
+        usage = self._usage
+        index_depth = 0
+        for k in range(i, op):
+            token = statement[k]
+            if token.value == '[':
+                index_depth += 1
+            elif token.value == ']':
+                index_depth -= 1
+            elif token.kind == IDENT:
+                context = ASSIGN_RHS if index_depth else ASSIGN_LHS
+                contexts = usage.get(token.value)
+                if contexts is None:
+                    usage[token.value] = {context}
+                else:
+                    contexts.add(context)
+
+        end = op + 1
+        depth = 0
+        while end < n:
+            token = statement[end]
+            if token.kind == BRACKET:
+                if token.value in '([{':
+                    depth += 1
+                elif depth == 0:
+                    break
+                else:
+                    depth -= 1
+            elif depth == 0 and token.value in (';', ','):
+                break
+            end += 1
+        self._mark(statement, op + 1, end, ASSIGN_RHS)
+        return end + 1
@@ -4,10 +4,18 @@
 """
 
 import os
-import re
 import sys
+import mmap
 import traceback
-from typing import Dict, Optional, Any
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Any, Union
+
+from . import counted_re as cre  # 剖析时按线程统计正则表达式调用
+
+try:
+    import resource
+except ImportError:  # Windows下不可用
+    resource = None
 
 class VerilogError(Exception):
     """Verilog错误异常基类"""
@@ -25,22 +33,42 @@ class ConfigError(VerilogError):
     """配置错误异常类"""
     pass
 
-def handle_error(error: Exception, debug: bool = False) -> None:
+class ServiceError(VerilogError):
+    """分析服务请求错误异常类，code为JSON-RPC错误码"""
+    
+    def __init__(self, message: str, code: int = -32000):
+        super().__init__(message)
+        self.code = code
+
+def format_error(error: Exception, debug: bool = False) -> str:
     """
-    处理异常并打印错误信息
+    格式化异常信息
     
     参数:
         error: 捕获的异常
-        debug: 是否打印完整堆栈跟踪
+        debug: 是否附带完整堆栈跟踪
+        
+    返回:
+        错误信息文本
     """
     if isinstance(error, VerilogError):
-        print(f"\n错误: {str(error)}", file=sys.stderr)
+        message = f"\n错误: {str(error)}"
     else:
-        print(f"\n发生未知错误: {str(error)}", file=sys.stderr)
+        message = f"\n发生未知错误: {str(error)}"
     
     if debug:
-        print("\n堆栈跟踪:", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
+        message += "\n\n堆栈跟踪:\n" + traceback.format_exc().rstrip()
+    return message
+
+def handle_error(error: Exception, debug: bool = False) -> None:
+    """
+    处理异常并打印错误信息
+    
+    参数:
+        error: 捕获的异常
+        debug: 是否打印完整堆栈跟踪
+    """
+    print(format_error(error, debug), file=sys.stderr)
 
 def read_file(file_path: str) -> str:
     """
@@ -68,6 +96,78 @@ def read_file(file_path: str) -> str:
     except Exception as e:
         raise IOError(f"无法读取文件 {file_path}: {str(e)}")
 
+def iter_file_chunks(file_path: str, chunk_size: int = 1 << 20) -> Iterator[str]:
+    """
+    分块读取文件内容，用于流式解析超大文件
+    
+    无法按UTF-8解码的字节替换为U+FFFD，这类字节只会出现在注释或字符串中，不影响标识符
+    
+    参数:
+        file_path: 文件路径
+        chunk_size: 每块的字符数
+        
+    返回:
+        文本块迭代器
+        
+    异常:
+        IOError: 文件读取失败
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    except OSError as e:
+        raise IOError(f"无法读取文件 {file_path}: {str(e)}")
+
+@contextmanager
+def map_file(file_path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """
+    以只读方式将文件映射到内存，内容按需分页读入而不复制到Python对象中
+    
+    参数:
+        file_path: 文件路径
+        
+    返回:
+        上下文管理器，产出内存映射对象；空文件无法映射，产出b''
+        
+    异常:
+        IOError: 文件读取失败
+    """
+    try:
+        file = open(file_path, 'rb')
+    except OSError as e:
+        raise IOError(f"无法读取文件 {file_path}: {str(e)}")
+    with file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b''
+            return
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+def peak_memory_mb(children: bool = False) -> Optional[float]:
+    """
+    获取进程的峰值常驻内存
+    
+    参数:
+        children: 是否同时统计已结束的子进程（取两者中的较大值）
+        
+    返回:
+        峰值内存（MB），当前平台不支持时返回None
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if children:
+        peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # macOS以字节为单位，Linux以KB为单位
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
 def write_file(file_path: str, content: str) -> None:
     """
     写入文件内容
@@ -86,6 +186,30 @@ def write_file(file_path: str, content: str) -> None:
     except Exception as e:
         raise IOError(f"无法写入文件 {file_path}: {str(e)}")
 
+def write_file_if_changed(file_path: str, content: str) -> bool:
+    """
+    写入文件内容，文件已存在且内容逐字节相同时不重写，以保持文件修改时间不变
+    
+    参数:
+        file_path: 文件路径
+        content: 要写入的内容
+        
+    返回:
+        是否实际写入了文件
+        
+    异常:
+        IOError: 文件写入失败
+    """
+    expected = content.replace('\n', os.linesep).encode('utf-8')
+    try:
+        with open(file_path, 'rb') as file:
+            if file.read() == expected:
+                return False
+    except OSError:
+        pass
+    write_file(file_path, content)
+    return True
+
 def ensure_dir(directory: str) -> None:
     """
     确保目录存在，不存在则创建
@@ -113,10 +237,10 @@ def remove_comments(content: str) -> str:
         移除注释后的代码内容
     """
     # 移除多行注释 /* ... */
-    content = re.sub(r'/\*[\s\S]*?\*/', ' ', content)
+    content = cre.sub(r'/\*[\s\S]*?\*/', ' ', content)
     
     # 移除单行注释 // ...
-    content = re.sub(r'//.*?$', ' ', content, flags=re.MULTILINE)
+    content = cre.sub(r'//.*?$', ' ', content, flags=cre.MULTILINE)
     
     return content
 
@@ -134,11 +258,11 @@ def format_width(width: str) -> str:
     if width.isdigit():
         return f"[{int(width)-1}:0]"
     # 如果已经是[x:y]格式，则直接使用
-    elif re.match(r'\[\s*\d+\s*:\s*\d+\s*\]', width):
+    elif cre.match(r'\[\s*\d+\s*:\s*\d+\s*\]', width):
         return width
     # 如果是其他格式，尝试提取数字并转换为[数字-1:0]格式
     else:
-        match = re.search(r'(\d+)', width)
+        match = cre.search(r'(\d+)', width)
         if match:
             return f"[{int(match.group(1))-1}:0]"
         else:
@@ -156,7 +280,7 @@ def extract_parameters(content: str) -> Dict[str, str]:
         参数名到参数值的字典
     """
     # 匹配参数定义，如parameter WIDTH = 8
-    param_pattern = re.compile(r'parameter\s+(\w+)\s*=\s*([^,;]+)')
+    param_pattern = cre.compile(r'parameter\s+(\w+)\s*=\s*([^,;]+)')
     
     # 查找所有匹配项
     params = {}
@@ -164,12 +288,24 @@ def extract_parameters(content: str) -> Dict[str, str]:
         params[name] = value.strip()
     
     # 匹配localparam定义
-    localparam_pattern = re.compile(r'localparam\s+(\w+)\s*=\s*([^,;]+)')
+    localparam_pattern = cre.compile(r'localparam\s+(\w+)\s*=\s*([^,;]+)')
     for name, value in localparam_pattern.findall(content):
         params[name] = value.strip()
     
     return params
 
+# 常见常量名模式，合并为一个正则表达式预编译
+_COMMON_CONSTANT_PATTERN = cre.compile('|'.join(f'(?:{pattern})' for pattern in [
+    r'^[A-Z][A-Z0-9_]*$',        # 全大写
+    r'^[A-Z][A-Z0-9_]*_[a-z]+$', # 全大写加小写后缀
+    r'^e_\w+$',                  # e_前缀
+    r'^c_\w+$',                  # c_前缀
+    r'^k_\w+$',                  # k_前缀
+    r'^PARAM_\w+$',              # PARAM_前缀
+    r'^CONST_\w+$',              # CONST_前缀
+    r'^[0-9]+$',                 # 纯数字
+]))
+
 def is_common_constant(signal: str) -> bool:
     """
     检查信号名是否是常见常量名
@@ -180,19 +316,4 @@ def is_common_constant(signal: str) -> bool:
     返回:
         如果是常见常量名则返回True，否则返回False
     """
-    # 常见常量名模式
-    constant_patterns = [
-        r'^[A-Z][A-Z0-9_]*$',        # 全大写
-        r'^[A-Z][A-Z0-9_]*_[a-z]+$', # 全大写加小写后缀
-        r'^e_\w+$',                  # e_前缀
-        r'^c_\w+$',                  # c_前缀
-        r'^k_\w+$',                  # k_前缀
-        r'^PARAM_\w+$',              # PARAM_前缀
-        r'^CONST_\w+$',              # CONST_前缀
-        r'^[0-9]+$',                 # 纯数字
-    ]
-    
-    for pattern in constant_patterns:
-        if re.match(pattern, signal):
-            return True
-    return False
\ No newline at end of file
+    return _COMMON_CONSTANT_PATTERN.match(signal) is not None
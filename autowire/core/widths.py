@@ -0,0 +1,352 @@
+"""
+信号位宽推断模块
+在词法扫描过程中一次性收集所有 name[...] 切片和带位宽的端口声明，
+批量推断信号位宽，避免针对每个信号重新在全文中执行正则匹配
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+from . import counted_re as cre  # 剖析时按线程统计正则表达式调用
+from .lexer import Token, IDENT, KEYWORD, match_bracket, join_tokens
+
+# 切片位宽模式（匹配方括号内的文本），按优先级排列
+SLICE_PATTERNS = [
+    # 例如：data[7:0]
+    cre.compile(r'(\d+):(\d+)'),
+    # 例如：data[WIDTH-1:0]
+    cre.compile(r'(\w+)\s*-\s*1\s*:\s*0'),
+    # 例如：data[WIDTH:0]
+    cre.compile(r'(\w+)\s*:\s*0'),
+    # 例如：data[0] (单比特)
+    cre.compile(r'(\d+)'),
+    # 例如：data[WIDTH] (参数索引)
+    cre.compile(r'(\w+)'),
+    # 例如：data[WIDTH+:8] (增量范围)
+    cre.compile(r'(\w+)\s*\+\s*:\s*(\d+)'),
+    # 例如：data[WIDTH-:8] (减量范围)
+    cre.compile(r'(\w+)\s*\-\s*:\s*(\d+)'),
+    # 例如：data[8*i+:8] (表达式增量范围)
+    cre.compile(r'([\w\d\*\+\-\s]+)\+:(\d+)'),
+    # 例如：data[8*i-:8] (表达式减量范围)
+    cre.compile(r'([\w\d\*\+\-\s]+)\-:(\d+)'),
+]
+
+# 端口声明位宽模式（匹配方括号内的文本），元素为(是否带wire/reg/logic类型, 模式)，按优先级排列
+DECLARATION_PATTERNS = [
+    # 标准位宽格式 input [7:0] data;
+    (False, cre.compile(r'\s*(\d+)\s*:\s*(\d+)\s*')),
+    # 带类型的位宽格式 input wire [7:0] data;
+    (True, cre.compile(r'\s*(\d+)\s*:\s*(\d+)\s*')),
+    # 参数化位宽 input [WIDTH-1:0] data;
+    (False, cre.compile(r'\s*(\w+)\s*-\s*1\s*:\s*0\s*')),
+]
+
+# 端口方向关键字
+_DIRECTIONS = frozenset({'input', 'output', 'inout'})
+# 端口声明中可出现的类型关键字
+_PORT_TYPES = frozenset({'wire', 'reg', 'logic'})
+
+# findall风格的匹配结果：单个分组时为字符串，多个分组时为元组
+SliceMatch = Union[str, Tuple[str, ...]]
+
+
+def resolve_slice_width(match: SliceMatch, parameters: Dict[str, str],
+                        values: Optional[Mapping[str, int]] = None) -> Optional[str]:
+    """
+    根据切片匹配结果推断位宽
+
+    参数:
+        match: 切片模式的第一个匹配结果（findall风格）
+        parameters: 参数定义
+        values: 参数求值结果（见ConstantEvaluator.resolve_all()），默认只识别值为整数的参数
+
+    返回:
+        位宽字符串，如"[7:0]"，无法从该匹配推断时返回None
+    """
+    if values is None:
+        values = _integer_parameters(parameters)
+    if len(match) == 2:  # 范围 [x:y]
+        high, low = match
+        # 如果是参数，尝试替换；参数值无法求值时保留原始参数名
+        if high in values:
+            high = str(values[high])
+        if low in values:
+            low = str(values[low])
+        return f"[{high}:{low}]"
+    elif len(match) == 1:  # 单比特 [x]
+        index = match[0]
+        # 如果是参数，尝试替换
+        if index in parameters:
+            if index in values:
+                return f"[{values[index]}:0]"  # 假设是位宽参数
+            return "[0:0]"  # 无法求值参数，默认为单比特
+        try:
+            # 尝试将索引转换为整数
+            index_val = int(index)
+            return "[0:0]"  # 单比特索引转换为范围格式
+        except ValueError:
+            # 如果不是数字，可能是参数名但未在参数列表中找到
+            return f"[{index}:0]"  # 假设是位宽参数
+    return None
+
+
+def resolve_declaration_width(groups: Tuple[Optional[str], ...], parameters: Dict[str, str],
+                              values: Optional[Mapping[str, int]] = None) -> Optional[str]:
+    """
+    根据端口声明位宽的匹配分组推断位宽
+
+    参数:
+        groups: 声明模式的匹配分组
+        parameters: 参数定义
+        values: 参数求值结果（见ConstantEvaluator.resolve_all()），默认只识别值为整数的参数
+
+    返回:
+        位宽字符串，无法推断时返回None
+    """
+    if len(groups) >= 2 and groups[0] is not None and groups[1] is not None:
+        # 标准位宽格式 [x:y]
+        return f"[{groups[0]}:{groups[1]}]"
+    elif len(groups) >= 1 and groups[0] is not None:
+        # 参数化位宽 [PARAM-1:0]
+        param_name = groups[0]
+        if values is None:
+            values = _integer_parameters(parameters)
+        if param_name in values:
+            return f"[{values[param_name]-1}:0]"
+        return f"[{param_name}-1:0]"
+    return None
+
+
+def _integer_parameters(parameters: Dict[str, str]) -> Dict[str, int]:
+    """取出值为整数的参数"""
+    values = {}
+    for name, value in parameters.items():
+        try:
+            values[name] = int(value)
+        except ValueError:
+            continue
+    return values
+
+
+def _findall_item(match: 'cre.Match') -> SliceMatch:
+    """将匹配对象转换为与re.findall相同形式的结果"""
+    groups = match.groups()
+    return groups[0] if len(groups) == 1 else groups
+
+
+class WidthTable:
+    """
+    位宽表类，按标识符记录各切片模式和声明模式的第一个匹配
+
+    为与逐信号正则匹配的结果保持一致，推断时沿用原有正则的匹配范围：
+    信号名匹配以其结尾的切片标识符（如 data 匹配 wdata[7:0]），
+    以及以其开头的端口声明名（如 data 匹配 input [7:0] data_out）
+    """
+
+    def __init__(self, content: Optional[str] = None):
+        """
+        初始化位宽表
+
+        参数:
+            content: 被词法分析的源代码，用于取出方括号内的原始文本；
+                     流式解析时为None，方括号内文本由词法单元还原（连续空白合并为一个空格、注释被去除）
+        """
+        self.content = content
+        self.slices = {}        # 标识符到{模式序号: (位置, 第一个匹配)}的映射
+        self.declarations = {}  # 端口名到{模式序号: (位置, 匹配分组)}的映射
+        self._slice_lookup = None        # 信号名到其可匹配切片的合并结果
+        self._declaration_lookup = None  # 信号名到其可匹配声明的合并结果
+
+    def build(self, statements: Iterable[List[Token]]) -> 'WidthTable':
+        """
+        从语句流构建位宽表
+
+        参数:
+            statements: 语句（词法单元列表）流
+
+        返回:
+            位宽表自身，便于链式调用
+        """
+        for statement in statements:
+            self.feed(statement)
+        return self
+
+    def feed(self, statement: List[Token]) -> None:
+        """
+        处理一条语句，记录其中的切片和端口声明位宽
+
+        参数:
+            statement: 语句的词法单元列表
+        """
+        n = len(statement)
+        for i in range(n - 1):
+            token = statement[i]
+            if statement[i + 1].value != '[':
+                continue
+            if token.kind == IDENT:
+                self._add_slice(token.value, statement, i + 1)
+            elif token.kind == KEYWORD and token.value in _DIRECTIONS:
+                self._add_declaration(statement, i + 1, typed=False)
+            elif (token.kind == KEYWORD and token.value in _PORT_TYPES and i > 0
+                  and statement[i - 1].kind == KEYWORD and statement[i - 1].value in _DIRECTIONS):
+                self._add_declaration(statement, i + 1, typed=True)
+
+    def resolve(self, signal_name: str, parameters: Dict[str, str],
+                values: Optional[Mapping[str, int]] = None) -> Optional[str]:
+        """
+        推断信号位宽，结果与VerilogParser.get_signal_bitwidth的推断规则一致
+
+        参数:
+            signal_name: 信号名
+            parameters: 参数定义
+            values: 参数求值结果，见resolve_slice_width()
+
+        返回:
+            位宽字符串，无法确定时返回None
+        """
+        if self._slice_lookup is None:
+            self._slice_lookup = self._merge(self.slices, suffix=True)
+            self._declaration_lookup = self._merge(self.declarations, suffix=False)
+        if values is None:
+            values = _integer_parameters(parameters)
+        return self._resolve(signal_name, parameters, values, self._slice_lookup, self._declaration_lookup)
+
+    def resolve_many(self, signals: Iterable[str], parameters: Dict[str, str],
+                     values: Optional[Mapping[str, int]] = None) -> Dict[str, Optional[str]]:
+        """
+        批量推断信号位宽，只为给定的信号合并记录，不构建全部标识符的后缀/前缀查找表
+
+        参数:
+            signals: 信号名序列
+            parameters: 参数定义
+            values: 参数求值结果，见resolve_slice_width()
+
+        返回:
+            信号名到位宽的字典
+        """
+        signals = list(signals)
+        wanted = set(signals)
+        slice_lookup = self._merge(self.slices, suffix=True, wanted=wanted)
+        declaration_lookup = self._merge(self.declarations, suffix=False, wanted=wanted)
+        if values is None:
+            values = _integer_parameters(parameters)
+        return {signal: self._resolve(signal, parameters, values, slice_lookup, declaration_lookup)
+                for signal in signals}
+
+    @staticmethod
+    def _resolve(signal_name: str, parameters: Dict[str, str], values: Mapping[str, int],
+                 slice_lookup: Dict[str, Dict[int, tuple]],
+                 declaration_lookup: Dict[str, Dict[int, tuple]]) -> Optional[str]:
+        """按合并后的查找表推断一个信号的位宽"""
+        slices = slice_lookup.get(signal_name)
+        if slices:
+            for index in sorted(slices):
+                width = resolve_slice_width(slices[index][1], parameters, values)
+                if width is not None:
+                    return width
+        declarations = declaration_lookup.get(signal_name)
+        if declarations:
+            for index in sorted(declarations):
+                width = resolve_declaration_width(declarations[index][1], parameters, values)
+                if width is not None:
+                    return width
+        return None
+
+    @staticmethod
+    def _merge(table: Dict[str, Dict[int, tuple]], suffix: bool,
+               wanted: Optional[Set[str]] = None) -> Dict[str, Dict[int, tuple]]:
+        """
+        按标识符的后缀（或前缀）合并记录，每个模式保留文件中最先出现的匹配
+
+        参数:
+            table: 标识符到{模式序号: (位置, 匹配)}的映射
+            suffix: True按后缀合并，False按前缀合并
+            wanted: 只合并这些信号名，为None时合并全部后缀（或前缀）
+
+        返回:
+            信号名到{模式序号: (位置, 匹配)}的映射
+        """
+        lookup = {}
+        for name, entries in table.items():
+            for k in range(len(name)):
+                key = name[k:] if suffix else name[:k + 1]
+                if wanted is not None and key not in wanted:
+                    continue
+                merged = lookup.get(key)
+                if merged is None:
+                    lookup[key] = dict(entries)
+                    continue
+                for index, entry in entries.items():
+                    current = merged.get(index)
+                    if current is None or entry[0] < current[0]:
+                        merged[index] = entry
+        return lookup
+
+    def _inner_text(self, statement: List[Token], open_index: int) -> Tuple[str, int]:
+        """
+        取出方括号内的原始文本
+
+        参数:
+            statement: 语句的词法单元列表
+            open_index: 左方括号所在位置
+
+        返回:
+            (方括号内文本, 右方括号所在位置)
+        """
+        close_index = match_bracket(statement, open_index)
+        if self.content is None:
+            return _bracket_text(statement, open_index, close_index), close_index
+        start = statement[open_index].pos + 1
+        return self.content[start:statement[close_index].pos], close_index
+
+    def _add_slice(self, name: str, statement: List[Token], open_index: int) -> None:
+        """记录 name[...] 切片在各模式下的第一个匹配"""
+        slices = self.slices.get(name)
+        if slices is None:
+            slices = self.slices[name] = {}
+        elif len(slices) == len(SLICE_PATTERNS):
+            return
+        text, _ = self._inner_text(statement, open_index)
+        position = statement[open_index].pos
+        for index, pattern in enumerate(SLICE_PATTERNS):
+            if index in slices:
+                continue
+            match = pattern.fullmatch(text)
+            if match:
+                slices[index] = (position, _findall_item(match))
+        self._slice_lookup = None
+
+    def _add_declaration(self, statement: List[Token], open_index: int, typed: bool) -> None:
+        """记录 input/output/inout [..] name 声明中第一个端口名的位宽"""
+        text, close_index = self._inner_text(statement, open_index)
+        name_index = close_index + 1
+        if name_index >= len(statement) or statement[name_index].kind != IDENT:
+            return
+        previous = statement[open_index - 1]
+        # 与原有正则一致：方向/类型关键字与位宽之间、位宽与信号名之间必须有空白
+        if previous.pos + len(previous.value) == statement[open_index].pos:
+            return
+        if statement[close_index].pos + 1 == statement[name_index].pos:
+            return
+        declarations = self.declarations.setdefault(statement[name_index].value, {})
+        for index, (pattern_typed, pattern) in enumerate(DECLARATION_PATTERNS):
+            if pattern_typed != typed or index in declarations:
+                continue
+            match = pattern.fullmatch(text)
+            if match:
+                declarations[index] = (statement[name_index].pos, match.groups())
+        self._slice_lookup = None
+
+
+def _bracket_text(statement: List[Token], open_index: int, close_index: int) -> str:
+    """由词法单元还原方括号内文本，括号内侧的空白同样保留为一个空格"""
+    inner = statement[open_index + 1:close_index]
+    if not inner:
+        return ''
+    text = join_tokens(inner)
+    if inner[0].pos > statement[open_index].pos + 1:
+        text = ' ' + text
+    last = inner[-1]
+    if statement[close_index].pos > last.pos + len(last.value):
+        text += ' '
+    return text
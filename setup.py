@@ -19,7 +19,7 @@ setup(
             'autowire=autowire.cli.main:main',
         ],
     },
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autosgdc CDC分析测试模块
+"""
+
+import unittest
+import logging
+import tempfile
+import sys
+import os
+from unittest import mock
+
+# autosgdc的脚本使用同目录导入
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'autosgdc', 'src'))
+
+from verilog_parser import VerilogParser, VerilogModule
+from cdc_analyzer import CDCAnalyzer
+from fanin_graph import iter_assignments, assignment_targets
+from bench_cdc import generate_design, legacy_cdc_signals
+from sync_chains import SYNC_2FF, SYNC_3FF, SYNC_HANDSHAKE, SYNC_GRAY
+
+
+def parse_source(source):
+    """将源代码写入临时文件并解析"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'top.v')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        return VerilogParser(path).parse_all()
+
+
+class TestFaninGraph(unittest.TestCase):
+    """扇入图CDC检测测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_assignments(self):
+        """测试赋值语句识别：比较运算符、for循环头部和拼接左值"""
+        content = (
+            "always @(posedge clk) begin\n"
+            "  if (a <= b && c == d) q <= e;\n"
+            "  for (i = 0; i < 4; i = i + 1) mem[i] <= f;\n"
+            "  {x, y[1]} <= {g, h};\n"
+            "end\n"
+            "assign w = (a >= b);\n"
+        )
+        assignments = [(assignment_targets(lhs), rhs.strip()) for lhs, rhs in iter_assignments(content)]
+        self.assertEqual(assignments, [
+            (['q'], 'e'),
+            (['mem'], 'f'),
+            (['x', 'y'], '{g, h}'),
+            (['w'], '(a >= b)'),
+        ])
+
+    def test_example_design(self):
+        """测试示例设计的跨时钟域信号，切换信号经移位寄存器写法的2FF同步器同步"""
+        modules = VerilogParser(os.path.join(PROJECT_ROOT, 'autosgdc', 'rtl', 'cdc_example.v')).parse_all()
+        analyzer = CDCAnalyzer(modules, 'cdc_example')
+        cdc_signals = analyzer.detect_cdc()
+        self.assertEqual(cdc_signals, {
+            'clk_fast->clk_slow': ['fast_data_reg'],
+            'clk_slow->clk_fast': ['slow_data_reg'],
+        })
+        sync = analyzer.synchronizers['clk_slow']['fast_toggle']
+        self.assertEqual((sync.type, sync.depth, sync.stages), (SYNC_2FF, 2, ['cdc_example.fast_toggle_sync']))
+
+    def test_crossing_through_combinational_logic(self):
+        """测试经过组合逻辑的跨时钟域路径，以及同时钟域路径不被报告"""
+        modules = parse_source(
+            "module top (input wire clk_a, input wire clk_b, input wire d);\n"
+            "  reg a_q;\n"
+            "  reg a_q2;\n"
+            "  reg b_q;\n"
+            "  wire mix;\n"
+            "  assign mix = a_q & d;\n"
+            "  always @(posedge clk_a) begin a_q <= d; a_q2 <= mix; end\n"
+            "  always @(posedge clk_b) b_q <= ~mix;\n"
+            "endmodule\n"
+        )
+        analyzer = CDCAnalyzer(modules, 'top')
+        self.assertEqual(analyzer.detect_cdc(), {'clk_a->clk_b': ['a_q'], 'clk_b->clk_a': []})
+
+    def test_matches_pairwise_scan(self):
+        """测试合成设计上与原有逐对扫描的结果一致"""
+        modules = parse_source(generate_design(96, num_clocks=3, cross_every=4, block_size=16, sync_every=0))
+        analyzer = CDCAnalyzer(modules, 'cdc_bench')
+        cdc_signals = analyzer.detect_cdc()
+        expected = {key: sorted(signals) for key, signals in legacy_cdc_signals(analyzer).items()}
+        self.assertEqual(cdc_signals, expected)
+        self.assertEqual(sum(len(signals) for signals in cdc_signals.values()), 24)
+
+
+class TestSynchronizers(unittest.TestCase):
+    """同步器结构识别测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def analyze(self, body):
+        modules = parse_source(
+            "module top (input wire clk_a, input wire clk_b, input wire d);\n" + body + "endmodule\n"
+        )
+        analyzer = CDCAnalyzer(modules, 'top')
+        return analyzer, analyzer.detect_cdc()
+
+    def test_flop_chains(self):
+        """测试3FF链、被多个负载使用的信号和多位总线"""
+        analyzer, cdc_signals = self.analyze(
+            "  reg a_q; reg a_r; reg [3:0] a_bus;\n"
+            "  reg s1; reg s2; reg s3; reg u1; reg u2; reg [3:0] bus1; reg [3:0] bus2;\n"
+            "  always @(posedge clk_a) begin a_q <= d; a_r <= ~d; a_bus <= {4{d}}; end\n"
+            "  always @(posedge clk_b) begin\n"
+            "    s1 <= a_q; s2 <= s1; s3 <= s2;\n"
+            "    u1 <= a_r; u2 <= a_r & d;\n"
+            "    {bus2, bus1} <= {bus1, a_bus};\n"
+            "  end\n"
+        )
+        self.assertEqual(cdc_signals['clk_a->clk_b'], ['a_bus', 'a_r'])
+        sync = analyzer.synchronizers['clk_b']['a_q']
+        self.assertEqual((sync.type, sync.depth), (SYNC_3FF, 3))
+        self.assertEqual(sync.stages, ['top.s1', 'top.s2', 'top.s3'])
+
+    def test_handshake_and_gray_pointer(self):
+        """测试请求/应答握手和异步FIFO格雷码指针"""
+        analyzer, cdc_signals = self.analyze(
+            "  reg req; reg req_s1; reg req_s2; reg ack_s1; reg ack_s2;\n"
+            "  reg [3:0] wbin; reg [3:0] wptr; reg [3:0] wq1; reg [3:0] wq2;\n"
+            "  wire [3:0] wgray_next;\n"
+            "  assign wgray_next = (wbin >> 1) ^ wbin;\n"
+            "  always @(posedge clk_a) begin\n"
+            "    req <= ~ack_s2; ack_s1 <= req_s2; ack_s2 <= ack_s1;\n"
+            "    wbin <= wbin + d; wptr <= wgray_next;\n"
+            "  end\n"
+            "  always @(posedge clk_b) begin req_s1 <= req; req_s2 <= req_s1; {wq2, wq1} <= {wq1, wptr}; end\n"
+        )
+        self.assertEqual(cdc_signals, {'clk_a->clk_b': [], 'clk_b->clk_a': []})
+        self.assertEqual(analyzer.synchronizers['clk_b']['req'].type, SYNC_HANDSHAKE)
+        self.assertEqual(analyzer.synchronizers['clk_a']['req_s2'].type, SYNC_HANDSHAKE)
+        gray = analyzer.synchronizers['clk_b']['wptr']
+        self.assertEqual((gray.type, gray.stages), (SYNC_GRAY, ['top.wq1', 'top.wq2']))
+
+
+class TestHierarchy(unittest.TestCase):
+    """层次遍历测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_port_mapped_instances(self):
+        """测试实例的时钟经端口映射到顶层时钟，信号使用层次名，模块定义只分析一次"""
+        modules = parse_source(
+            "module stage (input wire clk, input wire d, output reg q);\n"
+            "  always @(posedge clk) q <= d;\n"
+            "endmodule\n"
+            "module pair (input wire clk, input wire d, output wire q);\n"
+            "  wire mid;\n"
+            "  stage u_first (.clk(clk), .d(d), .q(mid));\n"
+            "  stage u_second (clk, mid, q);\n"
+            "endmodule\n"
+            "module top (input wire clk_a, input wire clk_b, input wire din);\n"
+            "  wire a_out;\n"
+            "  wire b_out;\n"
+            "  pair u_a (.clk(clk_a), .d(din), .q(a_out));\n"
+            "  pair u_b (.clk(clk_b), .d(a_out), .q(b_out));\n"
+            "  pair u_c (.clk(clk_a), .d(b_out), .q());\n"
+            "endmodule\n"
+        )
+        analyzer = CDCAnalyzer(modules, 'top')
+        with mock.patch.object(VerilogModule, 'extract_clock_domains', autospec=True,
+                               side_effect=VerilogModule.extract_clock_domains) as extract:
+            cdc_signals = analyzer.detect_cdc()
+        self.assertEqual(extract.call_count, 3)
+        self.assertEqual(sorted(analyzer.clock_domains['clk_b']), ['top.u_b.u_first.q', 'top.u_b.u_second.q'])
+        # 相邻实例的两级stage在目标时钟域中构成2FF同步器，经端口和线网相连
+        self.assertEqual(cdc_signals, {'clk_a->clk_b': [], 'clk_b->clk_a': []})
+        sync = analyzer.synchronizers['clk_b']['u_a.u_second.q']
+        self.assertEqual((sync.type, sync.stages), (SYNC_2FF, ['top.u_b.u_first.q', 'top.u_b.u_second.q']))
+        self.assertIn('u_b.u_second.q', analyzer.synchronizers['clk_a'])
+
+    def test_recursive_instantiation(self):
+        """测试递归实例化不会无限遍历"""
+        modules = parse_source(
+            "module loop (input wire clk_a, input wire clk_b, input wire d);\n"
+            "  reg a_q;\n"
+            "  always @(posedge clk_a) a_q <= d;\n"
+            "  loop u_loop (.clk_a(clk_b), .clk_b(clk_a), .d(a_q));\n"
+            "endmodule\n"
+        )
+        analyzer = CDCAnalyzer(modules, 'loop')
+        self.assertEqual(analyzer.detect_cdc(), {'clk_a->clk_b': [], 'clk_b->clk_a': []})
+        self.assertEqual(analyzer.clock_domains, {'clk_a': {'loop.a_q'}, 'clk_b': set()})
+
+
+if __name__ == '__main__':
+    unittest.main()
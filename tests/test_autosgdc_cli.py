@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autosgdc 时钟配置、SGDC写入和批处理测试模块
+"""
+
+import unittest
+import logging
+import argparse
+import tempfile
+import gzip
+import json
+import sys
+import os
+from unittest import mock
+
+# autosgdc的脚本使用同目录导入
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'autosgdc', 'src'))
+
+import sgdc_generator
+from sgdc_generator import SGDCGenerator, load_clock_config
+from verilog_parser import VerilogModule
+from auto_sgdc_gen_v2 import run_batch
+
+RTL_DIR = os.path.join(PROJECT_ROOT, 'autosgdc', 'rtl')
+
+
+class TestClockConfig(unittest.TestCase):
+    """时钟配置文件测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def load(self, data):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'clocks.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            return load_clock_config(path)
+
+    def test_example_file(self):
+        """测试示例配置文件加载为ClockConfig，配置中的时钟不被默认规则修改"""
+        configs = load_clock_config(os.path.join(RTL_DIR, 'cdc_example_clocks.json'))
+        self.assertEqual(configs['clk_slow'].period, 40.0)
+        self.assertEqual(configs['clk_slow'].waveform, (0, 20))
+        self.assertEqual(configs['clk_fast'].uncertainty, 0.5)
+
+        module = VerilogModule(name='top', file_path='top.v', content='')
+        generator = SGDCGenerator(module, ['clk_fast', 'clk_slow', 'clk_100mhz'], {}, configs)
+        generator.configure_clocks_default()
+        self.assertEqual(generator.preset_clocks, {'clk_fast', 'clk_slow'})
+        self.assertEqual(generator.clock_configs['clk_slow'].period, 40.0)
+        self.assertEqual(generator.clock_configs['clk_100mhz'].period, 10.0)
+        self.assertIsNot(generator.clock_configs['clk_fast'], configs['clk_fast'])
+
+        # 全部时钟由配置给出时不再交互询问
+        generator = SGDCGenerator(module, ['clk_fast', 'clk_slow'], {}, configs)
+        with mock.patch('builtins.input', side_effect=AssertionError('unexpected prompt')):
+            generator.configure_clocks_interactive()
+
+    def test_generated_clock_defaults(self):
+        """测试未给出的字段由周期推算"""
+        configs = self.load({'clk_div2': {'period': 20, 'generated': True, 'source': 'clk', 'divide_by': 2}})
+        config = configs['clk_div2']
+        self.assertEqual((config.uncertainty, config.waveform), (1.0, (0, 10.0)))
+        self.assertEqual((config.generated, config.source, config.divide_by, config.multiply_by),
+                         (True, 'clk', 2, 1))
+
+    def test_invalid_values(self):
+        """测试无效字段报告时钟名"""
+        for data in ({'clk': {'period': -1}}, {'clk': {'period': '10'}},
+                     {'clk': {'waveform': [0]}}, {'clk': 10}, ['clk']):
+            with self.assertRaises(ValueError, msg=data):
+                self.load(data)
+
+
+class TestSGDCWriter(unittest.TestCase):
+    """SGDC文件写入测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_streamed_file_matches_content(self):
+        """测试逐批写入的文件（包括gzip压缩的文件）与generate_sgdc()的内容相同"""
+        clocks = ['clk_a', 'clk_b', 'clk_c']
+        cdc_signals = {f"{src}->{dst}": [f"{src}_to_{dst}_{index}" for index in range(50)]
+                       for src in clocks for dst in clocks if src != dst}
+        module = VerilogModule(name='top', file_path='top.v', content='')
+        generator = SGDCGenerator(module, clocks, cdc_signals, {})
+        generator.configure_clocks_default()
+
+        def strip(text):
+            return [line for line in text.split('\n') if not line.startswith('// Generated:')]
+
+        expected = strip(generator.generate_sgdc())
+        self.assertEqual(sum(line.startswith('set_cdc_signal') for line in expected), 300)
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                mock.patch.object(sgdc_generator, 'WRITE_BATCH_LINES', 7):
+            plain = os.path.join(tmp_dir, 'top.sgdc')
+            generator.write_sgdc(plain)
+            with open(plain, encoding='utf-8') as f:
+                self.assertEqual(strip(f.read()), expected)
+            compressed = os.path.join(tmp_dir, 'top.sgdc.gz')
+            generator.write_sgdc(compressed)
+            with gzip.open(compressed, 'rt', encoding='utf-8') as f:
+                self.assertEqual(strip(f.read()), expected)
+
+
+class TestBatch(unittest.TestCase):
+    """批处理模式测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def run_manifest(self, tmp_dir, jobs):
+        manifest = os.path.join(tmp_dir, 'manifest.json')
+        with open(manifest, 'w', encoding='utf-8') as f:
+            json.dump([
+                {'top': 'cdc_example', 'clock_file': os.path.join(RTL_DIR, 'cdc_example_clocks.json'),
+                 'output': 'out/cdc_example.sgdc'},
+                {'top': 'i3c_regs'},
+            ], f)
+        args = argparse.Namespace(
+            verilog_files=[os.path.join(RTL_DIR, 'cdc_example.v'), os.path.join(RTL_DIR, 'i3c_regs.v')],
+            batch=manifest, include=None, mmap=False, jobs=jobs, skip_cdc=False, report=False, gzip=False,
+            top=None, output=None, clock_file=None,
+        )
+        return run_batch(args)
+
+    def read(self, path):
+        with open(path, encoding='utf-8') as f:
+            return [line for line in f if not line.startswith('// Generated:')]
+
+    def test_sequential_and_parallel(self):
+        """测试批处理为每个顶层模块生成SGDC，并行结果与顺序结果相同"""
+        with tempfile.TemporaryDirectory() as seq_dir, tempfile.TemporaryDirectory() as par_dir:
+            self.assertEqual(self.run_manifest(seq_dir, 1), 0)
+            self.assertEqual(self.run_manifest(par_dir, 2), 0)
+            for name in ('out/cdc_example.sgdc', 'i3c_regs.sgdc'):
+                self.assertEqual(self.read(os.path.join(par_dir, name)), self.read(os.path.join(seq_dir, name)))
+            content = ''.join(self.read(os.path.join(seq_dir, 'out/cdc_example.sgdc')))
+            self.assertIn('create_clock -name clk_slow -period 40.0 -waveform {0 20}', content)
+            self.assertIn('[get_nets fast_data_reg]', content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autosgdc 设计数据库测试模块
+"""
+
+import unittest
+import logging
+import tempfile
+import sys
+import os
+from unittest import mock
+
+# autosgdc的脚本使用同目录导入
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'autosgdc', 'src'))
+
+from verilog_parser import VerilogParser, VerilogModule
+from design_db import DesignDatabase
+
+
+class TestDesignDatabase(unittest.TestCase):
+    """设计数据库测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.db_path = os.path.join(self.tmp_dir.name, 'design.sqlite')
+        self.header = os.path.join(self.tmp_dir.name, 'widths.vh')
+        self.write(self.header, 'wire [7:0] shared;\n')
+        self.paths = []
+        for index in range(3):
+            path = os.path.join(self.tmp_dir.name, f'm{index}.v')
+            self.write(path, f'module m{index} (input wire clk, input wire d, output reg q);\n'
+                             f'  `include "widths.vh"\n'
+                             f'  always @(posedge clk) q <= d;\n'
+                             f'endmodule\n')
+            self.paths.append(path)
+
+    def write(self, path, content):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def parse(self):
+        """通过数据库解析，返回 (模块字典, 被重新解析的文件列表)"""
+        database = DesignDatabase(self.db_path)
+        self.addCleanup(database.close)
+        parser = VerilogParser(self.paths, database=database)
+        with mock.patch.object(VerilogParser, '_parse_file', autospec=True,
+                               side_effect=VerilogParser._parse_file) as parse_file:
+            modules = parser.parse_all()
+        return modules, [call.args[1] for call in parse_file.call_args_list]
+
+    def test_warm_parse(self):
+        """测试未变化的文件从数据库载入（包括时钟域划分），内容变化的文件和引用变化头文件的文件重新解析"""
+        cold, parsed = self.parse()
+        self.assertEqual(parsed, self.paths)
+
+        warm, parsed = self.parse()
+        self.assertEqual(parsed, [])
+        self.assertEqual(warm, cold)
+        self.assertEqual(warm['m0'].clock_domain_cache, {'clk': {'q'}})
+        self.assertIn('shared', warm['m1'].signals)
+
+        # 修改时间变化但内容未变化的文件不重新解析
+        os.utime(self.paths[0], ns=(0, 0))
+        self.write(self.paths[1], open(self.paths[1]).read().replace('q <= d', 'q <= ~d'))
+        _, parsed = self.parse()
+        self.assertEqual(parsed, [self.paths[1]])
+
+        self.write(self.header, 'wire [15:0] shared_wide;\n')
+        modules, parsed = self.parse()
+        self.assertEqual(parsed, self.paths)
+        self.assertIn('shared_wide', modules['m2'].signals)
+
+    def test_missing_header(self):
+        """测试解析时找不到的头文件之后出现，或出现遮蔽原有头文件的同名头文件时，引用它的文件重新解析"""
+        include_dir = os.path.join(self.tmp_dir.name, 'include')
+        os.mkdir(include_dir)
+        os.replace(self.header, os.path.join(include_dir, 'widths.vh'))
+        self.write(self.paths[2], 'module m2 (input wire clk);\n  `include "defs.vh"\nendmodule\n')
+
+        def parse():
+            database = DesignDatabase(self.db_path)
+            self.addCleanup(database.close)
+            parser = VerilogParser(self.paths, include_dirs=[include_dir], database=database)
+            modules = parser.parse_all()
+            return modules, parser.stats['cached']
+
+        modules, _ = parse()
+        self.assertIn('shared', modules['m0'].signals)
+        self.assertEqual(parse()[1], 3)
+
+        self.write(os.path.join(include_dir, 'defs.vh'), 'wire defined;\n')
+        modules, cached = parse()
+        self.assertEqual(cached, 2)
+        self.assertIn('defined', modules['m2'].signals)
+
+        # 源文件所在目录中的同名头文件优先于include目录
+        self.write(os.path.join(self.tmp_dir.name, 'widths.vh'), 'wire shadow;\n')
+        modules, cached = parse()
+        self.assertEqual(cached, 1)
+        self.assertIn('shadow', modules['m0'].signals)
+        self.assertNotIn('shared', modules['m1'].signals)
+
+    def test_analysis_key(self):
+        """测试分析结果的键只在源文件都有有效数据时存在，并随文件内容和选项变化"""
+        database = DesignDatabase(self.db_path)
+        self.addCleanup(database.close)
+        self.assertIsNone(database.analysis_key(self.paths, None, {}))
+        VerilogParser(self.paths, database=database).parse_all()
+        key = database.analysis_key(self.paths, None, {})
+        self.assertIsNotNone(key)
+        self.assertNotEqual(database.analysis_key(self.paths, 'm0', {}), key)
+        module = VerilogModule(name='m0', file_path=self.paths[0], content='')
+        database.store_analysis(key, 'm0', (module.to_compact(), ['clk'], {}))
+
+        database = DesignDatabase(self.db_path)
+        self.addCleanup(database.close)
+        self.assertEqual(database.load_analysis(database.analysis_key(self.paths, None, {}))[1], ['clk'])
+        self.write(self.paths[2], 'module m2 (input wire clk); endmodule\n')
+        database = DesignDatabase(self.db_path)
+        self.addCleanup(database.close)
+        self.assertIsNone(database.analysis_key(self.paths, None, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autosgdc Verilog解析器测试模块
+"""
+
+import unittest
+import logging
+import tempfile
+import glob
+import sys
+import os
+
+# autosgdc的脚本使用同目录导入
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'autosgdc', 'src'))
+
+from verilog_parser import VerilogParser
+
+
+class TestMappedParse(unittest.TestCase):
+    """内存映射解析测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def assert_same_modules(self, path):
+        """断言内存映射路径与文本路径解析出的模块一致"""
+        text = VerilogParser(path)
+        text.parse_all()
+        mapped = VerilogParser(path, use_mmap=True)
+        mapped.parse_all()
+        self.assertEqual(mapped.modules, text.modules, path)
+        return mapped.modules
+
+    def test_rtl_examples(self):
+        """测试示例RTL"""
+        for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, 'autosgdc', 'rtl', '*.v'))):
+            self.assertTrue(self.assert_same_modules(path), path)
+
+    def test_comments_and_multiple_modules(self):
+        """测试注释中的module/endmodule被跳过，多个模块分别提取"""
+        source = (
+            "// module fake_a (x);\n"
+            "module a (input clk, output reg q);\n"
+            "  /* endmodule */\n"
+            "  always @(posedge clk) q <= ~q;\n"
+            "endmodule\n"
+            "/* module fake_b; endmodule */\n"
+            "module b (input clk);\n"
+            "  a u_a (.clk(clk), .q());\n"
+            "endmodule\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'top.v')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(source)
+            modules = self.assert_same_modules(path)
+        self.assertEqual(list(modules), ['a', 'b'])
+        self.assertTrue(modules['a'].is_instantiated)
+
+
+class TestParallelParse(unittest.TestCase):
+    """并行解析测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_matches_sequential(self):
+        """测试进程池解析与顺序解析的结果和模块顺序一致，重复定义以后出现的为准"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = sorted(glob.glob(os.path.join(PROJECT_ROOT, 'autosgdc', 'rtl', '*.v')))
+            for index in range(6):
+                path = os.path.join(tmp_dir, f'leaf{index}.v')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(f"module leaf{index % 4} (input wire clk, output reg q{index});\n"
+                            f"  always @(posedge clk) q{index} <= ~q{index};\n"
+                            "endmodule\n")
+                paths.append(path)
+            sequential = VerilogParser(paths)
+            sequential.parse_all()
+            parallel = VerilogParser(paths, jobs=3)
+            parallel.parse_all()
+        self.assertEqual(list(parallel.modules), list(sequential.modules))
+        self.assertEqual(parallel.modules, sequential.modules)
+        self.assertIn('q5', parallel.modules['leaf1'].ports)
+        self.assertEqual(parallel.stats['files'], len(paths))
+        self.assertEqual(parallel.stats['jobs'], 3)
+        self.assertIn('文件/秒', parallel.throughput())
+
+
+class TestIncludes(unittest.TestCase):
+    """包含文件缓存测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def write(self, path, content):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_shared_nested_header(self):
+        """测试嵌套头文件递归展开，多个文件共享的头文件只读取一次，修改后重新读取"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            inc_dir = os.path.join(tmp_dir, 'inc')
+            os.mkdir(inc_dir)
+            self.write(os.path.join(inc_dir, 'defines.vh'), '`include "widths.vh"\n')
+            self.write(os.path.join(inc_dir, 'widths.vh'), 'module shared_leaf (input wire a); endmodule\n')
+            paths = []
+            for index in range(4):
+                path = os.path.join(tmp_dir, f'm{index}.v')
+                self.write(path, f'`include "defines.vh"\nmodule m{index} (input wire clk);\nendmodule\n')
+                paths.append(path)
+            parser = VerilogParser(paths, include_dirs=[inc_dir])
+            modules = parser.parse_all()
+            self.assertIn('shared_leaf', modules)
+            stats = parser.include_stats
+            self.assertEqual((stats['references'], stats['misses'], stats['hits']), (5, 2, 3))
+            self.assertEqual(stats['bytes_saved'], 3 * (stats['bytes_read']))
+
+            self.write(os.path.join(inc_dir, 'widths.vh'), 'module shared_leaf2 (input wire a); endmodule\n')
+            parser = VerilogParser(paths, include_dirs=[inc_dir])
+            self.assertIn('shared_leaf2', parser.parse_all())
+            self.assertEqual(parser.include_stats['misses'], 2)
+
+    def test_include_cycle(self):
+        """测试循环包含被检测并跳过"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.write(os.path.join(tmp_dir, 'a.vh'), '`include "b.vh"\n')
+            self.write(os.path.join(tmp_dir, 'b.vh'), '`include "a.vh"\nmodule from_b (input wire x); endmodule\n')
+            path = os.path.join(tmp_dir, 'top.v')
+            self.write(path, '`include "a.vh"\nmodule top (input wire clk);\nendmodule\n')
+            parser = VerilogParser(path, include_dirs=[tmp_dir])
+            modules = parser.parse_all()
+        self.assertEqual(sorted(modules), ['from_b', 'top'])
+        self.assertEqual(parser.include_stats['cycles'], 1)
+        self.assertEqual(parser.include_cache.graph[os.path.join(os.path.abspath(tmp_dir), 'a.vh')],
+                         [os.path.join(os.path.abspath(tmp_dir), 'b.vh')])
+
+
+if __name__ == '__main__':
+    unittest.main()
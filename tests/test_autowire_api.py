@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire库接口测试模块
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire import analyze_text, analyze_many, Config
+from autowire.core.parser import VerilogParser
+from autowire.core.analyzer import SignalAnalyzer
+
+SOURCE = """
+module demo #(parameter W = 4) (input clk);
+  reg [W-1:0] counter;
+  assign bus[7:0] = {counter, counter};
+  assign flag = counter[0];
+  assign tmp_dbg = flag;
+endmodule
+"""
+
+
+class TestAnalyzeText(unittest.TestCase):
+    """库接口测试类"""
+
+    def test_analyze_text(self):
+        """测试返回未定义信号、位宽和声明代码块"""
+        result = analyze_text(SOURCE, name='demo.v')
+        self.assertEqual(result.module_name, 'demo')
+        self.assertEqual(result.undefined_signals, ['bus', 'flag', 'tmp_dbg'])
+        self.assertEqual(result.signal_widths['bus'], '[7:0]')
+        self.assertEqual(result.definitions['flag'], 'wire flag;')
+        self.assertEqual(result.declaration_block,
+                         "// 自动生成的wire声明\nwire [7:0] bus;\nwire flag;\nwire tmp_dbg;\n")
+        self.assertEqual(result.to_dict()['definitions'][0], 'wire [7:0] bus;')
+
+    def test_config_and_no_disk_access(self):
+        """测试使用配置中的排除模式和默认位宽，且不写入任何文件"""
+        config = Config()
+        config.exclude_patterns = ['^tmp_']
+        config.default_width = '8'
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cwd = os.getcwd()
+            os.chdir(tmp_dir)
+            try:
+                result = analyze_text(SOURCE, config)
+                self.assertEqual(os.listdir(tmp_dir), [])
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(result.undefined_signals, ['bus', 'flag'])
+        self.assertEqual(result.definitions['flag'], 'wire [7:0] flag;')
+
+    def test_analyze_many_matches_file_pipeline(self):
+        """测试批量接口按输入顺序返回结果，与按文件处理的结果一致"""
+        test_dir = os.path.dirname(os.path.abspath(__file__))
+        names = ['test_complex_signals.v', 'test_macros.v', 'test_multiline_comments.v']
+        sources = []
+        for name in names:
+            with open(os.path.join(test_dir, name), 'r', encoding='utf-8') as f:
+                sources.append((name, f.read()))
+        results = list(analyze_many(sources + [SOURCE]))
+        self.assertEqual([r.name for r in results], names + ['<source 3>'])
+        for name, result in zip(names, results):
+            parser = VerilogParser()
+            parser.parse_file(os.path.join(test_dir, name))
+            analyzer = SignalAnalyzer()
+            analyzer.setup(parser)
+            analyzer.analyze()
+            self.assertEqual(result.undefined_signals, analyzer.undefined_signals)
+            self.assertEqual(result.signal_widths, analyzer.signal_widths)
+
+
+if __name__ == '__main__':
+    unittest.main()
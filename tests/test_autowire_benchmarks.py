@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire规模扩展基准测试模块的测试
+"""
+
+import unittest
+import tempfile
+import json
+import sys
+import os
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.benchmarks.synthetic import generate_design
+from autowire.benchmarks.bench_scaling import fit_exponent, check_regressions, find_previous, main
+from autowire.api import analyze_text
+
+
+class TestScalingBenchmark(unittest.TestCase):
+    """规模扩展基准测试类"""
+
+    def test_generated_design(self):
+        """测试合成设计中未声明的连接信号被识别，注释中的内容被忽略"""
+        source = generate_design(300, num_modules=2, num_ports=4, num_instances=2, comment_lines=3)
+        self.assertGreaterEqual(source.count('\n'), 300)
+        result = analyze_text(source)
+        self.assertIn('bus_0_0_1', result.undefined_signals)
+        self.assertIn('gen_sig_0', result.undefined_signals)
+        self.assertFalse([s for s in result.undefined_signals if s.startswith('fake_')])
+
+    def test_fit_exponent(self):
+        """测试对数坐标拟合的扩展指数，过短的测量值不参与拟合"""
+        sizes = [1000, 10000, 100000]
+        self.assertAlmostEqual(fit_exponent(sizes, [0.01, 0.1, 1.0]), 1.0, places=2)
+        self.assertAlmostEqual(fit_exponent(sizes, [0.001, 0.1, 10.0]), 2.0, places=2)
+        self.assertIsNone(fit_exponent(sizes, [0.0, 0.0, 0.001]))
+
+    def test_check_regressions(self):
+        """测试指数超过上限或比历史记录明显变大时报告问题"""
+        entry = {'sizes': [1, 2], 'design': {}, 'mode': 'whole',
+                 'stages': {'extract_signals': {'exponent': 1.2}, 'module_info': {'exponent': None}}}
+        previous = {'sizes': [1, 2], 'design': {}, 'mode': 'whole', 'commit': 'abc123',
+                    'stages': {'extract_signals': {'exponent': 1.0}}}
+        self.assertEqual(check_regressions(entry, None, 1.35, 0.15), [])
+        problems = check_regressions(entry, previous, 1.35, 0.15)
+        self.assertEqual(len(problems), 1)
+        self.assertIn('abc123', problems[0])
+        self.assertEqual(len(check_regressions(entry, None, 1.1, 0.15)), 1)
+        self.assertIs(find_previous([previous, dict(previous, mode='stream')], entry), previous)
+
+    def test_main_appends_history(self):
+        """测试每次运行向历史文件追加一条记录"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            history = os.path.join(tmp_dir, 'history.json')
+            args = ['--sizes', '200', '400', '--repeat', '1', '--comment-lines', '2', '--history', history,
+                    '--max-exponent', '100', '--max-increase', '100']
+            with open(os.devnull, 'w') as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    self.assertEqual(main(args), 0)
+                    self.assertEqual(main(args), 0)
+                finally:
+                    sys.stdout = stdout
+            with open(history, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+            self.assertEqual(len(records), 2)
+            self.assertIn('extract_signals', records[0]['stages'])
+
+
+if __name__ == '__main__':
+    unittest.main()
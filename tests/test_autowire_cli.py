@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire命令行多文件模式测试模块
+"""
+
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+import io
+from contextlib import redirect_stdout, redirect_stderr
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.core.filelist import collect_sources
+from autowire.core.utils import ParseError
+from autowire.cli.main import main
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = ['test_complex_signals.v', 'test_macros.v', 'test_multiline_comments.v']
+
+
+class TestFileList(unittest.TestCase):
+    """文件列表测试类"""
+
+    def setUp(self):
+        """创建临时目录"""
+        self.temp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.temp_dir, 'rtl', 'sub'))
+        for name in FIXTURES:
+            shutil.copy(os.path.join(TESTS_DIR, name), os.path.join(self.temp_dir, 'rtl', 'sub'))
+
+    def tearDown(self):
+        """删除临时目录"""
+        shutil.rmtree(self.temp_dir)
+
+    def path(self, *parts):
+        """拼接临时目录下的路径"""
+        return os.path.join(self.temp_dir, *parts)
+
+    def test_directory_is_sorted_and_skips_generated(self):
+        """测试目录递归收集按路径排序并跳过生成文件"""
+        open(self.path('rtl', 'top.sv'), 'w').close()
+        open(self.path('rtl', 'top_autogen.sv'), 'w').close()
+        files = collect_sources([self.path('rtl')]).files
+        self.assertEqual([os.path.basename(f) for f in files], FIXTURES + ['top.sv'])
+
+    def test_filelist(self):
+        """测试.f文件列表：注释、嵌套-F、+incdir+、+define+和去重"""
+        with open(self.path('rtl', 'sub', 'sub.f'), 'w') as f:
+            f.write('test_macros.v  # 行尾注释\n+incdir+inc\n')
+        with open(self.path('top.f'), 'w') as f:
+            f.write('// 顶层文件列表\n'
+                    f'+define+SIM+WIDTH=8\n-timescale 1ns/1ps\n-F {self.path("rtl", "sub", "sub.f")}\n'
+                    f'{self.path("rtl", "sub", "test_macros.v")}\n'
+                    f'{self.path("rtl", "sub", "test_complex_signals.v")}\n')
+        file_list = collect_sources([], [self.path('top.f')])
+        self.assertEqual([os.path.basename(f) for f in file_list.files],
+                         ['test_macros.v', 'test_complex_signals.v'])
+        self.assertEqual(file_list.include_dirs, [self.path('rtl', 'sub', 'inc')])
+        self.assertEqual(file_list.defines, {'SIM': '', 'WIDTH': '8'})
+
+    def test_missing_input(self):
+        """测试不存在的输入项"""
+        with self.assertRaises(ParseError):
+            collect_sources([self.path('missing.v')])
+        with self.assertRaises(ParseError):
+            collect_sources([self.path('rtl', '*.vhd')])
+
+
+class TestMultiFileCli(unittest.TestCase):
+    """命令行多文件模式测试类"""
+
+    def setUp(self):
+        """创建临时目录"""
+        self.temp_dir = tempfile.mkdtemp()
+        for name in FIXTURES:
+            shutil.copy(os.path.join(TESTS_DIR, name), self.temp_dir)
+        self.output_dir = os.path.join(self.temp_dir, 'out')
+
+    def tearDown(self):
+        """删除临时目录"""
+        shutil.rmtree(self.temp_dir)
+
+    def run_cli(self, *args):
+        """运行命令行并返回(状态码, 标准输出)，缓存目录位于临时目录中"""
+        stdout = io.StringIO()
+        cache_args = ['--cache-dir', os.path.join(self.temp_dir, '.autowire_cache')]
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            code = main(list(args) + cache_args)
+        return code, stdout.getvalue()
+
+    def test_parallel_run_is_deterministic(self):
+        """测试并行处理的输出与串行一致且按输入顺序排列"""
+        code, serial = self.run_cli(self.temp_dir, '-o', self.output_dir, '--no-cache')
+        self.assertEqual(code, 0)
+        shutil.rmtree(self.output_dir)
+        code, parallel = self.run_cli(self.temp_dir, '-o', self.output_dir, '--no-cache', '--jobs', '2')
+        self.assertEqual(code, 0)
+        self.assertEqual(serial, parallel)
+        positions = [serial.index(name) for name in FIXTURES]
+        self.assertEqual(positions, sorted(positions))
+        self.assertIn('处理文件数: 3', serial)
+        self.assertIn('总共处理信号数量: 9', serial)
+        for name in FIXTURES:
+            self.assertTrue(os.path.isfile(os.path.join(self.output_dir, name.replace('.v', '_autogen.v'))))
+
+    def test_cache_hit_skips_rewrite(self):
+        """测试源文件和配置未变化时命中缓存且不重写输出文件"""
+        code, first = self.run_cli(self.temp_dir, '-o', self.output_dir)
+        self.assertEqual(code, 0)
+        self.assertIn('缓存命中: 0', first)
+        output_file = os.path.join(self.output_dir, 'test_complex_signals_autogen.v')
+        os.utime(output_file, (0, 0))
+
+        code, second = self.run_cli(self.temp_dir, '-o', self.output_dir)
+        self.assertEqual(code, 0)
+        self.assertIn('缓存命中: 3', second)
+        self.assertIn('未变化未重写的输出文件: 3', second)
+        self.assertEqual(os.path.getmtime(output_file), 0)
+
+        # 排除模式变化时缓存失效，输出内容变化时重写
+        code, third = self.run_cli(self.temp_dir, '-o', self.output_dir, '-e', '^condition$')
+        self.assertIn('缓存命中: 0', third)
+        self.assertNotEqual(os.path.getmtime(output_file), 0)
+
+    def test_failure_sets_exit_code(self):
+        """测试任一文件处理失败时返回非零状态码"""
+        with open(os.path.join(self.temp_dir, 'bad.v'), 'w') as f:
+            f.write('assign a = b;\n')
+        code, output = self.run_cli(self.temp_dir, '--append', '-j', '2')
+        self.assertEqual(code, 1)
+        self.assertIn('失败: 1', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire常量表达式求值测试模块
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.core.const_eval import ConstantEvaluator, evaluate, number_value
+from autowire.core.parser import VerilogParser
+
+
+class TestConstantEvaluator(unittest.TestCase):
+    """常量表达式求值器测试类"""
+
+    def test_numbers(self):
+        """测试十进制、基数和带位宽的数值常量"""
+        self.assertEqual(number_value("1_000"), 1000)
+        self.assertEqual(number_value("8'hFF"), 255)
+        self.assertEqual(number_value("4'hFF"), 15)
+        self.assertEqual(number_value("'d10"), 10)
+        self.assertEqual(number_value("4'sb1010"), 10)
+        self.assertIsNone(number_value("8'bx1"))
+        self.assertIsNone(number_value("1.5"))
+
+    def test_operators(self):
+        """测试运算符优先级、向零截断的除法、条件运算和$clog2"""
+        self.assertEqual(evaluate("2 + 3 * 4 ** 2"), 50)
+        self.assertEqual(evaluate("1 << 2 + 1"), 8)
+        self.assertEqual(evaluate("-7 / 2"), -3)
+        self.assertEqual(evaluate("-7 % 2"), -1)
+        self.assertEqual(evaluate("W > 8 ? W : 8", {'W': 16}), 16)
+        self.assertEqual(evaluate("$clog2(DEPTH)", {'DEPTH': 17}), 5)
+        self.assertEqual(evaluate("$clog2(1)"), 0)
+        self.assertIsNone(evaluate("`WIDTH - 1"))
+        self.assertIsNone(evaluate("UNKNOWN + 1"))
+        self.assertIsNone(evaluate("1 / 0"))
+        self.assertIsNone(evaluate("~4'd3"))
+
+    def test_dependency_order_and_cycles(self):
+        """测试参数按依赖顺序求值，循环引用记录路径且不影响其他参数"""
+        evaluator = ConstantEvaluator({
+            'WIDTH': 'DATA_W*2', 'DATA_W': '16', 'AW': '$clog2(WIDTH)',
+            'A': 'B + 1', 'B': 'A * 2', 'C': 'A + WIDTH',
+        })
+        self.assertEqual(evaluator.resolve_all(), {'WIDTH': 32, 'DATA_W': 16, 'AW': 5})
+        self.assertEqual(evaluator.cycles, [['A', 'B', 'A']])
+        self.assertEqual(evaluator.evaluate_range("[WIDTH-1:0]"), (31, 0))
+        self.assertEqual(evaluator.evaluate_range("[AW]"), (4, 0))
+        self.assertIsNone(evaluator.evaluate_range("[C:0]"))
+
+    def test_overrides(self):
+        """测试覆盖值优先于参数表达式"""
+        evaluator = ConstantEvaluator({'W': '8', 'D': 'W * 2'}, {'W': 4})
+        self.assertEqual(evaluator.value('D'), 8)
+
+
+class TestParameterWidths(unittest.TestCase):
+    """参数化位宽推断测试类"""
+
+    SOURCE = """
+module m(input clk);
+  parameter DATA_W = 16;
+  parameter WIDTH = DATA_W*2;
+  localparam LOOP_A = LOOP_B;
+  localparam LOOP_B = LOOP_A;
+  input [WIDTH-1:0] din_port;
+  assign y = a[WIDTH-1:0];
+endmodule
+"""
+
+    def test_expression_parameters(self):
+        """测试由表达式定义的参数在位宽中被替换为数值，批量与逐信号推断一致"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'm.v')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.SOURCE)
+            parser = VerilogParser()
+            parser.parse_file(path)
+        signals = ['din']
+        widths = parser.get_signal_widths(signals)
+        self.assertEqual(widths, {'din': '[31:0]'})
+        self.assertEqual(parser.get_signal_widths(signals, batched=False), widths)
+        self.assertEqual(parser.get_parameter_values(), {'DATA_W': 16, 'WIDTH': 32})
+        self.assertEqual(parser.parameter_cycles, [['LOOP_A', 'LOOP_B', 'LOOP_A']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire输出格式与生成区域测试模块
+"""
+
+import unittest
+import tempfile
+import json
+import sys
+import os
+import io
+from contextlib import redirect_stdout
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.core.parser import VerilogParser
+from autowire.core.analyzer import SignalAnalyzer
+from autowire.core.generator import CodeGenerator
+from autowire.core.emitters import EMITTERS, REGION_BEGIN, REGION_END, insert_region, strip_region
+from autowire.core.utils import ParseError, ConfigError
+from autowire.config.config import Config
+from autowire.cli.main import main
+
+SOURCE = """module demo(input clk);
+  reg [7:0] counter;
+  assign data_out[7:0] = counter;
+  assign flag = counter[0];
+endmodule
+"""
+
+
+def generate(emitter, source=SOURCE, file_path='demo.v'):
+    """按指定格式生成内容"""
+    parser = VerilogParser()
+    parser.parse_text(source, file_path)
+    analyzer = SignalAnalyzer()
+    analyzer.setup(parser)
+    analyzer.analyze()
+    generator = CodeGenerator()
+    generator.setup(analyzer, file_path, emitter=emitter)
+    return ''.join(generator.generate()), generator
+
+
+class TestEmitters(unittest.TestCase):
+    """输出格式测试类"""
+
+    def test_formats(self):
+        """测试各输出格式的内容和输出文件名"""
+        wire, generator = generate('wire')
+        self.assertIn('wire [7:0] data_out;\nwire flag;\n', wire)
+        self.assertEqual(generator._get_expected_output_path(), 'demo_autogen.v')
+
+        logic, generator = generate('sv')
+        self.assertIn('logic [7:0] data_out;\nlogic flag;\n', logic)
+        self.assertEqual(generator._get_expected_output_path(), 'demo_autogen.sv')
+
+        report = json.loads(generate('json')[0])
+        self.assertEqual(report['module'], 'demo')
+        self.assertEqual([signal['name'] for signal in report['signals']], ['data_out', 'flag'])
+        self.assertEqual(report['signals'][0]['width'], '[7:0]')
+        self.assertEqual(report['summary']['total_signals'], 2)
+
+        tcl, generator = generate('tcl')
+        self.assertIn('set autowire_signals [list {data_out} {flag}]', tcl)
+        self.assertEqual(generator._get_expected_output_path(), 'demo_autogen.tcl')
+
+    def test_invalid_emitter(self):
+        """测试未知格式和不能追加的格式"""
+        analyzer = SignalAnalyzer()
+        with self.assertRaises(ParseError):
+            CodeGenerator().setup(analyzer, 'demo.v', emitter='vhdl')
+        with self.assertRaises(ParseError):
+            CodeGenerator().setup(analyzer, 'demo.v', append=True, emitter='json')
+        config = Config()
+        config.emit, config.append_to_original = 'tcl', True
+        with self.assertRaises(ConfigError):
+            config.validate()
+        self.assertEqual(list(EMITTERS)[:1], ['wire'])
+
+
+    def test_json_after_cache_hit(self):
+        """测试从结果缓存载入时JSON报告仍包含模块名，与首次运行的输出相同"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'demo.v')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(SOURCE)
+            args = ['--cache-dir', os.path.join(tmp_dir, 'cache'), '--emit', 'json',
+                    '-o', os.path.join(tmp_dir, 'out'), path]
+            reports = []
+            for _ in range(2):
+                with redirect_stdout(io.StringIO()):
+                    self.assertEqual(main(args), 0)
+                with open(os.path.join(tmp_dir, 'out', 'demo_autogen.json'), encoding='utf-8') as f:
+                    reports.append(f.read())
+            self.assertTrue(os.listdir(os.path.join(tmp_dir, 'cache')))
+            self.assertEqual(reports[0], reports[1])
+            self.assertEqual(json.loads(reports[1])['module'], 'demo')
+
+
+class TestGeneratedRegion(unittest.TestCase):
+    """生成区域测试类"""
+
+    def test_insert_replaces_region(self):
+        """测试已有生成区域时整体替换，解析时忽略区域中的声明"""
+        first = insert_region(SOURCE, 'wire a;\n')
+        self.assertEqual(first.count(REGION_BEGIN), 1)
+        self.assertEqual(insert_region(first, 'wire a;\n'), first)
+        second = insert_region(first, 'wire b;\n')
+        self.assertNotIn('wire a;', second)
+        self.assertEqual(second.count(REGION_END), 1)
+
+        stripped = strip_region(second)
+        self.assertEqual(len(stripped), len(second))
+        self.assertNotIn('wire b;', stripped)
+        with self.assertRaises(ParseError):
+            insert_region(REGION_BEGIN + '\nmodule m;\n', '')
+
+    def test_repeated_append_is_stable(self):
+        """测试重复追加不增长文件，新增信号后区域包含全部未定义信号"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'demo.v')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(SOURCE)
+            contents = []
+            for _ in range(2):
+                with redirect_stdout(io.StringIO()):
+                    self.assertEqual(main(['--no-cache', '--append', '-w', path]), 0)
+                with open(path, encoding='utf-8') as f:
+                    contents.append(f.read())
+            self.assertEqual(contents[0], contents[1])
+            self.assertIn('wire [7:0] data_out;', contents[0])
+
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(contents[1].replace('endmodule', '  assign extra = flag;\nendmodule'))
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(main(['--no-cache', '--append', '-w', path]), 0)
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+            self.assertEqual(content.count(REGION_BEGIN), 1)
+            self.assertIn('wire [7:0] data_out;\nwire flag;\nwire extra;\n', content)
+
+    def test_append_clears_region_when_declared(self):
+        """测试源代码声明了全部信号后重新追加，生成区域被清空，不留下重复声明"""
+        source = "module demo(input a);\n  assign x = a;\nendmodule\n"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'demo.v')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(source)
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(main(['--no-cache', '--append', path]), 0)
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+            self.assertIn('wire x;', content)
+
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content.replace('  assign x', '  wire x;\n  assign x'))
+            for _ in range(2):
+                with redirect_stdout(io.StringIO()):
+                    self.assertEqual(main(['--no-cache', '--append', path]), 0)
+                with open(path, encoding='utf-8') as f:
+                    content = f.read()
+                self.assertEqual(content.count('wire x;'), 1)
+                self.assertIn(f'{REGION_BEGIN}\n{REGION_END}\n', content)
+
+
+if __name__ == '__main__':
+    unittest.main()
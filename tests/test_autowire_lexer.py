@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire词法分析与声明提取测试模块
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.core.lexer import tokenize, IDENT, KEYWORD, NUMBER, DIRECTIVE
+from autowire.core.preprocessor import Preprocessor
+from autowire.core.declarations import DeclarationExtractor
+from autowire.core.parser import VerilogParser
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestLexer(unittest.TestCase):
+    """词法分析器测试类"""
+
+    def test_token_kinds_and_positions(self):
+        """测试词法单元类型和行列号"""
+        tokens = list(tokenize("module m;\n  assign a = 8'hFF; // b\nendmodule"))
+        self.assertEqual([t.value for t in tokens],
+                         ['module', 'm', ';', 'assign', 'a', '=', "8'hFF", ';', 'endmodule'])
+        self.assertEqual(tokens[0].kind, KEYWORD)
+        self.assertEqual(tokens[4].kind, IDENT)
+        self.assertEqual(tokens[6].kind, NUMBER)
+        self.assertEqual((tokens[4].line, tokens[4].col), (2, 10))
+        self.assertEqual(tokens[8].line, 3)
+
+    def test_comments_are_skipped(self):
+        """测试多行注释不产生词法单元且不影响行号"""
+        tokens = list(tokenize("/* wire a;\n wire b; */ wire c;"))
+        self.assertEqual([t.value for t in tokens], ['wire', 'c', ';'])
+        self.assertEqual(tokens[0].line, 2)
+
+    def test_preprocessed_directives(self):
+        """测试预处理后编译指令及其参数被丢弃，宏引用保留为DIRECTIVE单元"""
+        source = '`define W 8\n`include "defs.vh"\n`ifdef W\nwire [`W-1:0] a;\n`endif\n'
+        values = [t.value for t in Preprocessor().process(tokenize(source))]
+        self.assertEqual(values, ['wire', '[', '`W', '-', '1', ':', '0', ']', 'a', ';'])
+        self.assertEqual(list(Preprocessor().process(tokenize('`W')))[0].kind, DIRECTIVE)
+
+
+class TestDeclarationExtractor(unittest.TestCase):
+    """声明提取器测试类"""
+
+    def extract(self, source):
+        """提取源代码中的声明"""
+        return DeclarationExtractor().extract(Preprocessor().process(tokenize(source)))
+
+    def test_ansi_ports_and_parameters(self):
+        """测试ANSI风格端口和参数"""
+        decl = self.extract(
+            "module top #(parameter W = 8, parameter D = W*2) (\n"
+            "  input wire clk, rst_n,\n"
+            "  output reg [W-1:0] q\n"
+            ");\nendmodule\n"
+        )
+        self.assertEqual(decl.module_name, 'top')
+        self.assertEqual(decl.port_signals, {'clk', 'rst_n', 'q'})
+        self.assertEqual(decl.port_directions['q'], 'output')
+        self.assertEqual(decl.ranges['q'], '[W-1:0]')
+        self.assertEqual(dict(decl.parameters), {'W': '8', 'D': 'W*2'})
+
+    def test_non_ansi_and_internal_declarations(self):
+        """测试非ANSI端口、wire/reg声明和实例化"""
+        decl = self.extract(
+            "module top (a, b);\n"
+            "input a; output [3:0] b;\n"
+            "wire x = a, y;\n"
+            "reg [7:0] mem [0:3], r;\n"
+            "sub #(.N(2)) u_sub (.i(x), .o(y));\n"
+            "generate if (1) begin : g_blk end endgenerate\n"
+            "endmodule\n"
+        )
+        self.assertEqual(decl.port_signals, {'a', 'b'})
+        self.assertEqual(decl.wire_signals, {'x', 'y'})
+        self.assertEqual(decl.reg_signals, {'mem', 'r'})
+        self.assertEqual(decl.instances, [('sub', 'u_sub')])
+        self.assertIn('g_blk', decl.block_labels)
+
+
+class TestParserFixtures(unittest.TestCase):
+    """基于tests目录下Verilog样例的解析测试"""
+
+    def parse(self, name, use_lexer=True):
+        """解析样例文件"""
+        parser = VerilogParser(use_lexer=use_lexer)
+        parser.parse_file(os.path.join(TESTS_DIR, name))
+        return parser
+
+    def test_complex_signals(self):
+        """测试复杂信号定义样例"""
+        parser = self.parse('test_complex_signals.v')
+        self.assertTrue({'clk', 'rst_n', 'data_out'} <= parser.port_signals)
+        self.assertTrue({'complex_wire1', 'complex_wire3', 'multi_line_wire2'} <= parser.wire_signals)
+        self.assertEqual(parser.get_undefined_signals(),
+                         ['data', 'undefined_wire', 'condition', 'another_undefined'])
+
+    def test_multiline_comments(self):
+        """测试注释中的声明不被提取"""
+        parser = self.parse('test_multiline_comments.v')
+        self.assertNotIn('test_wire1', parser.defined_signals)
+        self.assertIn('some_signal', parser.get_undefined_signals())
+
+    def test_lexer_matches_regex_declarations(self):
+        """测试词法路径提取的wire/reg声明覆盖原正则路径"""
+        for name in ('test_complex_signals.v', 'test_macros.v'):
+            lexer_parser = self.parse(name)
+            regex_parser = self.parse(name, use_lexer=False)
+            self.assertTrue(regex_parser.wire_signals <= lexer_parser.wire_signals)
+            self.assertTrue(regex_parser.reg_signals <= lexer_parser.reg_signals)
+
+
+if __name__ == '__main__':
+    unittest.main()
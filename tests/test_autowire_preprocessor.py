@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire预处理模块测试
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+import io
+from contextlib import redirect_stdout
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.core.lexer import tokenize
+from autowire.core.preprocessor import Preprocessor, IncludeCache
+from autowire.core.parser import VerilogParser
+from autowire.cli.main import main
+
+SOURCE = """module top(input clk);
+`ifdef USE_A
+  assign a_only = clk;
+`elsif USE_B
+  assign b_only = clk;
+  `ifndef NO_NESTED
+    assign nested = clk;
+  `endif
+`else
+  assign neither = clk;
+`endif
+`define LOCAL
+`ifdef LOCAL
+  assign local_on = clk;
+`endif
+`undef LOCAL
+`ifdef LOCAL
+  assign local_off = clk;
+`endif
+  assign data = `WIDTH;
+endmodule
+"""
+
+
+def identifiers(preprocessor, source, file_path=""):
+    """预处理后保留的标识符"""
+    return [token.value for token in preprocessor.process(tokenize(source), file_path) if token.kind == 'IDENT']
+
+
+class TestPreprocessor(unittest.TestCase):
+    """预处理器测试类"""
+
+    def test_conditional_branches(self):
+        """测试按宏定义选择分支，文件中的`define/`undef影响之后的条件"""
+        kept = identifiers(Preprocessor(), SOURCE)
+        self.assertIn('neither', kept)
+        self.assertIn('local_on', kept)
+        for name in ('a_only', 'b_only', 'nested', 'local_off', 'LOCAL', 'USE_A'):
+            self.assertNotIn(name, kept)
+
+        kept = identifiers(Preprocessor({'USE_B': '', 'NO_NESTED': ''}), SOURCE)
+        self.assertIn('b_only', kept)
+        self.assertNotIn('nested', kept)
+        self.assertNotIn('neither', kept)
+
+    def test_macro_reference_kept(self):
+        """测试普通宏引用保留为DIRECTIVE单元"""
+        tokens = list(Preprocessor().process(tokenize(SOURCE)))
+        self.assertIn('`WIDTH', [token.value for token in tokens if token.kind == 'DIRECTIVE'])
+
+    def test_process_text_preserves_positions(self):
+        """测试文本预处理将未生效分支替换为等长空白"""
+        text = Preprocessor().process_text(SOURCE)
+        self.assertEqual(len(text), len(SOURCE))
+        self.assertEqual(text.count('\n'), SOURCE.count('\n'))
+        self.assertNotIn('a_only', text)
+        self.assertNotIn('`', text)
+        self.assertEqual(text.index('neither'), SOURCE.index('neither'))
+
+    def test_include_defines_and_cache(self):
+        """测试从搜索路径中的头文件读取宏定义，头文件只读取一次，修改后重新读取"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            include_dir = os.path.join(tmp_dir, 'inc')
+            os.makedirs(include_dir)
+            header = os.path.join(include_dir, 'cfg.vh')
+            with open(header, 'w') as f:
+                f.write('`define USE_A\n')
+            source = '`include "cfg.vh"\n`include "missing.vh"\n' + SOURCE
+            cache = IncludeCache()
+            for _ in range(2):
+                preprocessor = Preprocessor(include_dirs=[include_dir], include_cache=cache)
+                self.assertIn('a_only', identifiers(preprocessor, source, os.path.join(tmp_dir, 'top.v')))
+            self.assertEqual((cache.misses, cache.hits), (1, 1))
+            self.assertEqual(preprocessor.included_files, [os.path.normpath(header)])
+            self.assertEqual(preprocessor.missing_includes, ['missing.vh'])
+
+            with open(header, 'w') as f:
+                f.write('`define USE_B \\\n  1\n')
+            preprocessor = Preprocessor(include_dirs=[include_dir], include_cache=cache)
+            self.assertIn('b_only', identifiers(preprocessor, source, os.path.join(tmp_dir, 'top.v')))
+            self.assertEqual(preprocessor.defines['USE_B'], '1')
+
+
+class TestParserDefines(unittest.TestCase):
+    """解析器和命令行的宏定义测试类"""
+
+    def test_parser_modes_agree(self):
+        """测试词法模式和原有正则模式都只分析生效的分支"""
+        for defines, expected, dropped in (({}, 'neither', 'a_only'), ({'USE_A': ''}, 'a_only', 'neither')):
+            for use_lexer in (True, False):
+                parser = VerilogParser(use_lexer=use_lexer, defines=defines)
+                parser.parse_text(SOURCE)
+                undefined = parser.get_undefined_signals()
+                self.assertIn(expected, undefined)
+                self.assertNotIn(dropped, undefined)
+                self.assertNotIn('local_off', undefined)
+
+    def test_cli_define_and_filelist(self):
+        """测试-D和文件列表中的+define+决定生效的分支"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'top.v')
+            with open(path, 'w') as f:
+                f.write(SOURCE)
+            filelist = os.path.join(tmp_dir, 'top.f')
+            with open(filelist, 'w') as f:
+                f.write(f'+define+USE_A\n{path}\n')
+            output = os.path.join(tmp_dir, 'top_autogen.v')
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(main(['--no-cache', '-D', 'USE_B', path]), 0)
+            with open(output) as f:
+                self.assertIn('wire b_only;', f.read())
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(main(['--no-cache', '-f', filelist]), 0)
+            with open(output) as f:
+                content = f.read()
+            self.assertIn('wire a_only;', content)
+            self.assertNotIn('neither', content)
+
+
+if __name__ == '__main__':
+    unittest.main()
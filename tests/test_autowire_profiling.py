@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire性能剖析测试模块
+"""
+
+import unittest
+import tempfile
+import json
+import threading
+import tracemalloc
+import types
+import sys
+import os
+from unittest import mock
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire import analyze_text, analyze_many
+from autowire.core import lexer, widths, profiling
+from autowire.core.profiling import PhaseProfiler, aggregate_profiles
+from autowire.config.config import Config
+from autowire.cli.main import main
+
+SOURCE = """
+module demo(input clk);
+  reg [7:0] counter; // comment
+  assign data_out[7:0] = counter;
+  assign flag = counter[0];
+endmodule
+"""
+
+
+class TestPhaseProfiler(unittest.TestCase):
+    """分阶段剖析测试类"""
+
+    def test_phases_and_regex_counts(self):
+        """测试记录各阶段耗时和正则表达式调用次数，结果与未剖析时相同"""
+        profiler = PhaseProfiler('demo.v')
+        result = analyze_text(SOURCE, profiler=profiler)
+        self.assertEqual(result.undefined_signals, analyze_text(SOURCE).undefined_signals)
+        phases = result.profile['phases']
+        self.assertEqual(list(phases), ['preprocess', 'extract_signals', 'module_info',
+                                        'undefined_signals', 'signal_widths', 'generate'])
+        # 词法模式下预处理只移除注释（编译指令在词法单元流上处理），词法分析的每个单元是一次匹配
+        self.assertEqual(phases['preprocess']['regex_calls'], 2)
+        self.assertGreater(phases['extract_signals']['regex_matches'], 20)
+        self.assertNotIn('peak_rss_mb', phases['generate'])
+        self.assertIn('peak_rss_mb', result.profile)
+        self.assertGreaterEqual(result.profile['total_seconds'],
+                                sum(phase['seconds'] for phase in phases.values()))
+
+    def test_exclude_patterns_counted(self):
+        """测试排除模式的匹配计入undefined_signals阶段"""
+        config = Config()
+        config.exclude_patterns = ['^fl.*g$']
+        counts = []
+        for options in (None, config):
+            result = analyze_text(SOURCE, config=options, profiler=PhaseProfiler('demo.v'))
+            counts.append(result.profile['phases']['undefined_signals']['regex_calls'])
+        self.assertEqual(result.undefined_signals, ['data_out'])
+        self.assertGreater(counts[1], counts[0])
+
+    def test_counts_per_thread(self):
+        """测试正则表达式计数只计入进入剖析器的线程，并发剖析的结果与单独剖析相同，核心模块的模式不被替换"""
+        token_pattern = lexer._TOKEN_PATTERN
+        slice_patterns = list(widths.SLICE_PATTERNS)
+        expected = next(analyze_many([SOURCE], profile=True)).profile['phases']
+
+        profiler = PhaseProfiler('idle.v')
+        results = []
+        barrier = threading.Barrier(4)
+
+        def work():
+            barrier.wait()
+            results.append(next(analyze_many([SOURCE], profile=True)).profile['phases'])
+            analyze_text(SOURCE)
+
+        with profiler.active():
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(profiler.counter.calls, 0)
+        for phases in results:
+            self.assertEqual({name: phase['regex_calls'] for name, phase in phases.items()},
+                             {name: phase['regex_calls'] for name, phase in expected.items()})
+        self.assertIs(lexer._TOKEN_PATTERN, token_pattern)
+        self.assertEqual(widths.SLICE_PATTERNS, slice_patterns)
+
+    def test_memory_without_reset_peak(self):
+        """测试tracemalloc没有reset_peak()（Python 3.9之前）时仍记录各阶段的内存分配峰值"""
+        legacy = types.SimpleNamespace(**{name: getattr(tracemalloc, name) for name in
+                                          ('start', 'stop', 'is_tracing', 'get_traced_memory')})
+        profiler = PhaseProfiler('demo.v', trace_memory=True)
+        with mock.patch.object(profiling, 'tracemalloc', legacy):
+            analyze_text(SOURCE, profiler=profiler)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreater(profiler.phases['extract_signals']['peak_alloc_mb'], 0)
+
+    def test_aggregate(self):
+        """测试汇总多个文件的记录，阶段按累计耗时降序排列"""
+        records = [
+            {'file': 'a.v', 'total_seconds': 1.0, 'phases': {
+                'read': {'seconds': 0.1, 'regex_calls': 0, 'regex_matches': 0},
+                'extract_signals': {'seconds': 0.9, 'regex_calls': 1, 'regex_matches': 10}}},
+            {'file': 'b.v', 'total_seconds': 3.0, 'phases': {
+                'read': {'seconds': 2.0, 'regex_calls': 0, 'regex_matches': 0},
+                'extract_signals': {'seconds': 1.0, 'regex_calls': 1, 'regex_matches': 5}}},
+        ]
+        report = aggregate_profiles(records)
+        self.assertEqual(list(report['phases']), ['read', 'extract_signals'])
+        self.assertEqual(report['phases']['read']['slowest_file'], 'b.v')
+        self.assertEqual(report['phases']['extract_signals']['regex_matches'], 15)
+        self.assertAlmostEqual(report['phases']['read']['share'], 0.525)
+        self.assertEqual(report['slowest_files'][0]['file'], 'b.v')
+
+    def test_cli_profile(self):
+        """测试--profile写入逐文件和汇总的JSON，--profile-dump写入cProfile结果"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ('a.v', 'b.v'):
+                with open(os.path.join(tmp_dir, name), 'w', encoding='utf-8') as f:
+                    f.write(SOURCE)
+            profile_path = os.path.join(tmp_dir, 'profile.json')
+            dump_path = os.path.join(tmp_dir, 'profile.out')
+            status = main([tmp_dir, '--no-cache', '-o', os.path.join(tmp_dir, 'out'),
+                           '--profile', profile_path, '--profile-dump', dump_path])
+            self.assertEqual(status, 0)
+            with open(profile_path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            self.assertEqual(len(report['files']), 2)
+            self.assertIn('write', report['phases'])
+            self.assertEqual(report['phases']['extract_signals']['files'], 2)
+            self.assertTrue(os.path.getsize(dump_path) > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
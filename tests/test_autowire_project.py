@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire项目模式测试模块
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.core.lexer import tokenize
+from autowire.core.project import ProjectIndex, extract_interfaces
+from autowire.core.parser import VerilogParser
+from autowire.core.analyzer import SignalAnalyzer
+
+SUBMODULES = """
+module fifo #(parameter DW = 8, parameter AW = $clog2(16), localparam DEPTH = 1 << AW) (
+  input clk,
+  input [DW-1:0] din,
+  output [DW-1:0] dout,
+  output [AW:0] count,
+  output full
+);
+  function [3:0] pick; input [3:0] x; pick = x; endfunction
+endmodule
+
+module adder(a, b, s);
+  parameter W = 4;
+  input [W-1:0] a, b;
+  output [W:0] s;
+endmodule
+"""
+
+TOP = """
+module top(input clk);
+  parameter WIDTH = 16;
+  fifo #(.DW(WIDTH*2)) u_fifo (.clk(clk), .din(wdata), .dout(rdata), .count(cnt), .full(full_flag));
+  adder #(WIDTH) u_add (x_in, y_in, sum);
+  adder u_add8 (.a(narrow), .b(sum[3:0]), .s());
+  assign z = rdata[3:0];
+endmodule
+"""
+
+
+class TestProjectIndex(unittest.TestCase):
+    """模块接口索引测试类"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.sub_path = self.write('sub.v', SUBMODULES)
+        self.top_path = self.write('top.v', TOP)
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_extract_interfaces(self):
+        """测试按模块提取端口顺序、方向、位宽和参数，函数的input不计为端口"""
+        fifo, adder = extract_interfaces(tokenize(SUBMODULES))
+        self.assertEqual(fifo.port_names, ['clk', 'din', 'dout', 'count', 'full'])
+        self.assertEqual(fifo.ports['dout'], {'direction': 'output', 'range': '[DW-1:0]'})
+        self.assertEqual(fifo.overridable_parameters, ['DW', 'AW'])
+        self.assertEqual(adder.port_names, ['a', 'b', 's'])
+        self.assertEqual(adder.port_width('s'), '[4:0]')
+        self.assertEqual(fifo.port_width('count'), '[4:0]')
+        self.assertEqual(fifo.port_width('full'), '[0:0]')
+
+    def test_resolve_connections(self):
+        """测试按名称和按位置连接的信号使用子模块端口位宽，参数覆盖在父模块中求值"""
+        index = ProjectIndex(None).build([self.sub_path, self.top_path])
+        parser = VerilogParser(record_connections=True)
+        parser.parse_file(self.top_path)
+        analyzer = SignalAnalyzer()
+        analyzer.setup(parser, project_index=index)
+        analyzer.analyze()
+        widths = analyzer.signal_widths
+        self.assertEqual(widths['wdata'], '[31:0]')
+        self.assertEqual(widths['cnt'], '[4:0]')
+        self.assertEqual(widths['full_flag'], '[0:0]')
+        self.assertEqual(widths['x_in'], '[15:0]')
+        # 同一信号连接到多个端口时取最宽的位宽，表达式连接不参与推断
+        self.assertEqual(widths['sum'], '[16:0]')
+        self.assertEqual(widths['narrow'], '[3:0]')
+        self.assertIsNone(widths['z'])
+        self.assertNotIn('z', analyzer.port_width_signals)
+
+    def test_cache_reparses_changed_files_only(self):
+        """测试接口缓存只重新解析内容变化的文件，依赖指纹随子模块接口变化"""
+        first = ProjectIndex(self.cache_dir, 'test').build([self.sub_path, self.top_path])
+        self.assertEqual((first.parsed_files, first.cached_files), (2, 0))
+        fingerprint = first.dependency_fingerprint(self.top_path)
+
+        second = ProjectIndex(self.cache_dir, 'test').build([self.sub_path, self.top_path])
+        self.assertEqual((second.parsed_files, second.cached_files), (0, 2))
+        self.assertEqual(second.dependency_fingerprint(self.top_path), fingerprint)
+
+        self.write('sub.v', SUBMODULES.replace('parameter W = 4;', 'parameter W = 6;'))
+        third = ProjectIndex(self.cache_dir, 'test').build([self.sub_path, self.top_path])
+        self.assertEqual((third.parsed_files, third.cached_files), (1, 1))
+        self.assertNotEqual(third.dependency_fingerprint(self.top_path), fingerprint)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire分析服务测试模块
+"""
+
+import unittest
+import tempfile
+import json
+import sys
+import os
+import socket
+import threading
+
+# 添加项目根目录到PATH
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from autowire.cli.server import (AnalysisService, METHOD_NOT_FOUND, INVALID_PARAMS,
+                                 PARSE_ERROR, SERVER_ERROR, serve_socket)
+from autowire.cli.client import AutowireClient
+from autowire.config.config import Config
+from autowire.core.utils import ServiceError
+
+SOURCE = """
+module demo(input clk);
+  reg [7:0] counter;
+  assign data_out[7:0] = counter;
+  assign flag = counter[0];
+endmodule
+"""
+
+
+class TestAnalysisService(unittest.TestCase):
+    """分析服务请求处理测试类"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'demo.v')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(SOURCE)
+        self.service = AnalysisService(Config(), max_files=2)
+        self.next_id = 0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def request(self, method, **params):
+        self.next_id += 1
+        line = json.dumps({'jsonrpc': '2.0', 'id': self.next_id, 'method': method, 'params': params})
+        response = json.loads(self.service.handle(line))
+        self.assertEqual(response['id'], self.next_id)
+        return response
+
+    def test_analyze_uses_cache_until_content_changes(self):
+        """测试内容未变化时命中缓存，编辑器内容变化时重新分析"""
+        first = self.request('analyze', file=self.path)['result']
+        self.assertFalse(first['cached'])
+        self.assertEqual(sorted(first['undefined_signals']), ['data_out', 'flag'])
+        self.assertIn('wire [7:0] data_out;', first['definitions'])
+
+        second = self.request('analyze', file=self.path)['result']
+        self.assertTrue(second['cached'])
+
+        edited = self.request('analyze', file=self.path,
+                              content=SOURCE.replace('assign flag = counter[0];', ''))['result']
+        self.assertFalse(edited['cached'])
+        self.assertEqual(edited['undefined_signals'], ['data_out'])
+        self.assertEqual(self.service.stats()['hits'], 1)
+
+    def test_lru_eviction_and_invalidate(self):
+        """测试超过缓存文件数时淘汰最久未使用的文件，invalidate丢弃缓存"""
+        for name in ('a.v', 'b.v', 'c.v'):
+            self.request('analyze', file=os.path.join(self.tmp_dir.name, name), content=SOURCE)
+        self.assertEqual(len(self.service.entries), 2)
+        self.assertNotIn(os.path.join(self.tmp_dir.name, 'a.v'), self.service.entries)
+        self.assertEqual(self.request('invalidate', file=os.path.join(self.tmp_dir.name, 'b.v'))['result'],
+                         {'removed': 1})
+        self.assertEqual(self.request('invalidate')['result'], {'removed': 1})
+
+    def test_generate_writes_output(self):
+        """测试generate按配置写出声明文件"""
+        output_dir = os.path.join(self.tmp_dir.name, 'out')
+        result = self.request('generate', file=self.path, output_dir=output_dir)['result']
+        self.assertTrue(result['output_written'])
+        with open(result['output_file'], 'r', encoding='utf-8') as f:
+            self.assertIn('wire flag;', f.read())
+
+    def test_errors(self):
+        """测试错误请求返回JSON-RPC错误码且不影响后续请求"""
+        self.assertEqual(json.loads(self.service.handle('{bad'))['error']['code'], PARSE_ERROR)
+        self.assertEqual(self.request('unknown')['error']['code'], METHOD_NOT_FOUND)
+        self.assertEqual(self.request('analyze', path=self.path)['error']['code'], INVALID_PARAMS)
+        missing = os.path.join(self.tmp_dir.name, 'missing.v')
+        self.assertEqual(self.request('analyze', file=missing)['error']['code'], SERVER_ERROR)
+        # 通知请求没有响应
+        self.assertIsNone(self.service.handle(json.dumps({'jsonrpc': '2.0', 'method': 'stats'})))
+        self.assertIn('result', self.request('analyze', file=self.path))
+
+    def test_stdio_client_round_trip(self):
+        """测试客户端通过标准输入输出与服务子进程通信"""
+        env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+        with AutowireClient(env=env) as client:
+            result = client.analyze(self.path)
+            self.assertIn('wire flag;', result['definitions'])
+            self.assertTrue(client.analyze(self.path)['cached'])
+            client.shutdown()
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), '需要Unix套接字')
+    def test_socket_path_checks(self):
+        """测试监听前只替换遗留的套接字文件，不删除普通文件，也不抢占正在监听的套接字"""
+        path = os.path.join(self.tmp_dir.name, 'autowire.sock')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('keep')
+        with self.assertRaises(ServiceError):
+            serve_socket(self.service, path)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'keep')
+        os.remove(path)
+
+        # 遗留的套接字文件：已绑定但没有进程监听
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        ready = threading.Event()
+        thread = threading.Thread(target=serve_socket, args=(self.service, path, ready.set), daemon=True)
+        thread.start()
+        self.assertTrue(ready.wait(5))
+
+        with self.assertRaises(ServiceError):
+            serve_socket(AnalysisService(Config()), path)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(path)
+        with client, client.makefile('rwb') as stream:
+            stream.write(b'{"jsonrpc": "2.0", "id": 1, "method": "shutdown"}\n')
+            stream.flush()
+            self.assertEqual(json.loads(stream.readline())['id'], 1)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire信号过滤器测试模块
+"""
+
+import unittest
+import json
+import re
+import sys
+import os
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.core.signal_filter import SignalFilter
+from autowire.core.utils import is_common_constant
+from autowire.core.parser import VerilogParser
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SIGNALS = [
+    'clk', 'rst_n', 'debug_en', 'my_debug', 'data_tmp', 'tmp_data', 'test_mode', 'WIDTH',
+    'ADDR_W', 'state_q', 'i_core', 'u_fifo', 'cnt', 'unused_1', 'x', 'A', 'a_b_c', 'DATA_out',
+]
+
+
+def naive_excludes(patterns, signal):
+    """逐个模式匹配的参考实现"""
+    if is_common_constant(signal):
+        return True
+    for pattern in patterns:
+        try:
+            if re.search(pattern, signal):
+                return True
+        except re.error:
+            continue
+    return False
+
+
+class TestSignalFilter(unittest.TestCase):
+    """信号过滤器测试类"""
+
+    def assert_equivalent(self, patterns):
+        """断言过滤结果与逐个模式匹配一致"""
+        signal_filter = SignalFilter(patterns)
+        for signal in SIGNALS:
+            self.assertEqual(signal_filter.excludes(signal), naive_excludes(patterns, signal),
+                             f"{signal} / {patterns}")
+
+    def test_literal_patterns_are_classified(self):
+        """测试字面量模式分别归入集合、前缀、后缀和子串"""
+        signal_filter = SignalFilter(['^clk$', '^debug_.*', '.*_tmp$', 'test', 'st.*_q'])
+        self.assertEqual(signal_filter.exact, {'clk'})
+        self.assertEqual(signal_filter.prefixes, ('debug_',))
+        self.assertEqual(signal_filter.suffixes, ('_tmp',))
+        self.assertEqual(signal_filter.substrings, ('test',))
+        self.assertIsNotNone(signal_filter.regex)
+        self.assertEqual(signal_filter.filter(['clk', 'debug_en', 'data_tmp', 'my_test', 'state_q', 'cnt']), ['cnt'])
+
+    def test_matches_naive_search(self):
+        """测试各类模式与re.search语义一致"""
+        self.assert_equivalent([])
+        self.assert_equivalent(['^clk$', '^debug_.*', '.*_tmp$', 'test', '^u_', 'unused'])
+        self.assert_equivalent(['^[a-z]$', r'_\d+$', '(?i)data_out', r'^(a)_\1', '[', 'x|cnt'])
+
+    def test_default_config_patterns(self):
+        """测试默认配置文件中的排除模式"""
+        with open(os.path.join(PROJECT_ROOT, 'autowire', 'config', 'auto_wire_config.json'), 'r', encoding='utf-8') as f:
+            patterns = json.load(f).get('exclude_patterns', [])
+        self.assert_equivalent(patterns)
+
+    def test_parser_accepts_filter(self):
+        """测试解析器接受模式列表和预编译过滤器时结果一致"""
+        patterns = ['^debug_.*', '_tmp$']
+        parser = VerilogParser()
+        parser.parse_file(os.path.join(TESTS_DIR, 'test_complex_signals.v'))
+        self.assertEqual(parser.get_undefined_signals(patterns),
+                         parser.get_undefined_signals(SignalFilter(patterns)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire流式解析与内存映射解析测试模块
+"""
+
+import unittest
+import tempfile
+import glob
+import sys
+import os
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.core.lexer import tokenize, tokenize_stream, tokenize_buffer
+from autowire.core.parser import VerilogParser
+from autowire.core.utils import ParseError
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def split(content, size):
+    """按固定字符数切分文本"""
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+class TestTokenizeStream(unittest.TestCase):
+    """增量词法分析测试类"""
+
+    def test_chunk_boundaries(self):
+        """测试分块边界位于注释、字符串和标识符中间时结果与整体切分一致"""
+        source = (
+            "module m(input a, output y); /* block\n comment */\n"
+            "wire [7:0] long_identifier_name; // tail\n"
+            "initial $display(\"a;b\");\n"
+            "assign y = long_identifier_name[3] & 8'hFF;\n"
+            "endmodule"
+        )
+        expected = list(tokenize(source, keep_comments=True))
+        for size in (1, 2, 5, 17, len(source)):
+            self.assertEqual(list(tokenize_stream(split(source, size), keep_comments=True)), expected, size)
+
+    def test_fixtures(self):
+        """测试样例文件的增量切分结果与整体切分一致"""
+        for path in sorted(glob.glob(os.path.join(TESTS_DIR, '*.v'))):
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            self.assertEqual(list(tokenize_stream(split(content, 64))), list(tokenize(content)), path)
+
+
+class TestTokenizeBuffer(unittest.TestCase):
+    """字节缓冲区词法分析测试类"""
+
+    def test_fixtures(self):
+        """测试样例文件在字节上的切分结果与整体切分一致（注释中含中文时位置按字节计算，只比较类型、文本和行号）"""
+        for path in sorted(glob.glob(os.path.join(TESTS_DIR, '*.v'))):
+            with open(path, 'rb') as f:
+                data = f.read()
+            self.assertEqual([token[:3] for token in tokenize_buffer(data, keep_comments=True)],
+                             [token[:3] for token in tokenize(data.decode('utf-8'), keep_comments=True)], path)
+
+    def test_byte_offsets(self):
+        """测试ASCII内容的位置与整体切分完全一致"""
+        source = "module m;\n  wire [3:0] a; // x\n  assign a = b;\nendmodule\n"
+        self.assertEqual(list(tokenize_buffer(source.encode('ascii'))), list(tokenize(source)))
+
+
+class TestParseStream(unittest.TestCase):
+    """流式解析测试类"""
+
+    def test_matches_parse_file(self):
+        """测试流式解析和内存映射解析的未定义信号、参数和位宽与整体解析一致"""
+        for path in sorted(glob.glob(os.path.join(TESTS_DIR, '*.v'))):
+            whole = VerilogParser()
+            whole.parse_file(path)
+            stream = VerilogParser()
+            stream.parse_stream(path, chunk_size=32)
+            mapped = VerilogParser()
+            mapped.parse_mapped(path)
+            undefined = whole.get_undefined_signals()
+            signals = list(whole.all_signals)
+            for parser in (stream, mapped):
+                self.assertEqual(parser.get_undefined_signals(), undefined, path)
+                self.assertEqual(parser.parameters, whole.parameters, path)
+                self.assertEqual(parser.get_signal_widths(signals), whole.get_signal_widths(signals), path)
+                self.assertEqual(parser.content, "")
+
+    def test_requires_lexer_and_batched_widths(self):
+        """测试流式解析和内存映射解析需要词法模式，且不支持逐信号位宽推断"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'm.v')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("module m; assign a = b[3:0]; endmodule\n")
+            with self.assertRaises(ParseError):
+                VerilogParser(use_lexer=False).parse_stream(path)
+            with self.assertRaises(ParseError):
+                VerilogParser(use_lexer=False).parse_mapped(path)
+            parser = VerilogParser()
+            parser.parse_stream(path)
+            self.assertEqual(parser.get_signal_widths(['b']), {'b': '[3:0]'})
+            with self.assertRaises(ParseError):
+                parser.get_signal_widths(['b'], batched=False)
+
+    def test_mapped_empty_file(self):
+        """测试空文件的内存映射解析"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'empty.v')
+            open(path, 'w').close()
+            parser = VerilogParser()
+            parser.parse_mapped(path)
+            self.assertEqual(parser.get_undefined_signals(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire标识符使用索引测试模块
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.core.lexer import tokenize
+from autowire.core.preprocessor import Preprocessor
+from autowire.core.usage_index import (IdentifierUsageIndex, ASSIGN_LHS, ASSIGN_RHS, SENSITIVITY,
+                                       INSTANCE_CONNECTION, CONDITION)
+from autowire.core.parser import VerilogParser
+from autowire.core.analyzer import SignalAnalyzer
+
+SOURCE = """module m(input clk, input [1:0] sel, output reg [3:0] y);
+always @(posedge clk or negedge rst_n)
+  case (sel)
+    S0, S1: y <= a[idx];
+    default: y <= 4'd0;
+  endcase
+assign w = s ? t : u;
+sub #(.N(W)) u0 (.i(w), .o(z));
+always @* if (en) mem[addr] = din;
+endmodule
+"""
+
+
+class TestIdentifierUsageIndex(unittest.TestCase):
+    """标识符使用索引测试类"""
+
+    def setUp(self):
+        """构建索引"""
+        self.index = IdentifierUsageIndex().build(Preprocessor().process(tokenize(SOURCE)))
+
+    def test_assignment_contexts(self):
+        """测试赋值左右侧及下标表达式"""
+        self.assertEqual(self.index.contexts('y'), {ASSIGN_LHS})
+        self.assertEqual(self.index.contexts('a'), {ASSIGN_RHS})
+        self.assertEqual(self.index.contexts('idx'), {ASSIGN_RHS})
+        self.assertEqual(self.index.contexts('mem'), {ASSIGN_LHS})
+        self.assertEqual(self.index.contexts('addr'), {ASSIGN_RHS})
+
+    def test_sensitivity_condition_and_connection(self):
+        """测试敏感列表、条件表达式、case分支项和实例端口连接"""
+        self.assertEqual(self.index.contexts('rst_n'), {SENSITIVITY})
+        self.assertEqual(self.index.contexts('sel'), {CONDITION})
+        self.assertEqual(self.index.contexts('S1'), {CONDITION})
+        self.assertEqual(self.index.contexts('en'), {CONDITION})
+        self.assertEqual(self.index.contexts('w'), {ASSIGN_LHS, INSTANCE_CONNECTION})
+        # 端口名本身不是使用
+        self.assertNotIn('i', self.index)
+
+    def test_is_used_in(self):
+        """测试上下文查询"""
+        self.assertTrue(self.index.is_used_in('t'))
+        self.assertTrue(self.index.is_used_in('z', INSTANCE_CONNECTION, CONDITION))
+        self.assertFalse(self.index.is_used_in('z', ASSIGN_LHS))
+        self.assertFalse(self.index.is_used_in('missing'))
+
+    def test_analyzer_exposes_parser_index(self):
+        """测试分析器复用解析器构建的索引"""
+        parser = VerilogParser()
+        parser.parse_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_complex_signals.v'))
+        analyzer = SignalAnalyzer()
+        analyzer.setup(parser)
+        self.assertIs(analyzer.get_usage_index(), parser.usage_index)
+        self.assertEqual(analyzer.get_signal_usage('clk'), [SENSITIVITY])
+        self.assertEqual(analyzer.get_signal_usage('undefined_wire'), [ASSIGN_RHS])
+
+
+if __name__ == '__main__':
+    unittest.main()
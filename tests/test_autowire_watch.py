@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire监视模式测试模块
+"""
+
+import unittest
+import tempfile
+import time
+import sys
+import os
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.cli.watch import SourceWatcher, WatchSession
+from autowire.config.config import Config
+
+LEAF = """
+module leaf #(parameter W = 4) (input [W-1:0] a, output [W-1:0] y);
+endmodule
+"""
+
+TOP = """
+module top;
+  leaf u_leaf (.a(in_bus), .y(out_bus));
+endmodule
+"""
+
+OTHER = """
+module other;
+  assign x = 1'b0;
+endmodule
+"""
+
+
+class TestSourceWatcher(unittest.TestCase):
+    """源文件监视测试类"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.rtl = os.path.join(self.tmp_dir.name, 'rtl')
+        os.makedirs(self.rtl)
+        self.leaf = self.write('leaf.v', LEAF)
+        self.top = self.write('top.v', TOP)
+        self.other = self.write('other.v', OTHER)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.rtl, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        # 保证修改时间与上次不同
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+        return path
+
+    def test_poll_detects_changes_new_and_removed_files(self):
+        """测试轮询发现修改、新增和删除的文件，生成的输出文件不被监视"""
+        watcher = SourceWatcher([self.rtl])
+        self.assertEqual(watcher.poll(), (set(), set()))
+        self.write('top.v', TOP + '\n')
+        new = self.write('new.v', OTHER)
+        self.write('top_autogen.v', 'wire x;\n')
+        os.remove(self.other)
+        changed, removed = watcher.poll()
+        self.assertEqual(changed, {self.top, new})
+        self.assertEqual(removed, {self.other})
+
+    def test_refresh_ignores_own_writes(self):
+        """测试refresh后工具自身写回的文件不再算作修改"""
+        watcher = SourceWatcher([self.rtl])
+        self.write('top.v', TOP + 'wire in_bus;\n')
+        watcher.refresh([self.top])
+        self.assertEqual(watcher.poll(), (set(), set()))
+
+    def test_wait_debounces_bursts(self):
+        """测试防抖时间内的连续保存合并为一次变化"""
+        watcher = SourceWatcher([self.rtl], interval=0.01, debounce=0.1)
+        self.write('top.v', TOP + '\n')
+        self.write('other.v', OTHER + '\n')
+        start = time.monotonic()
+        self.assertEqual(watcher.wait(), {self.top, self.other})
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+    def test_affected_files_follow_interface_changes(self):
+        """测试项目模式下子模块接口变化时，实例化它的文件也被重新处理"""
+        config = Config()
+        config.project = True
+        config.cache_dir = None
+        session = WatchSession(config)
+        watcher = SourceWatcher([self.rtl])
+        files = watcher.files
+        session.affected_files(files, set(), session.build_index(files))
+
+        # 只改注释，接口不变
+        self.write('leaf.v', LEAF + '// comment\n')
+        changed, _ = watcher.poll()
+        self.assertEqual(session.affected_files(files, changed, session.build_index(files)), [self.leaf])
+
+        self.write('leaf.v', LEAF.replace('W = 4', 'W = 8'))
+        changed, _ = watcher.poll()
+        self.assertEqual(session.affected_files(files, changed, session.build_index(files)), [self.leaf, self.top])
+
+        results = session.regenerate(files, {self.top})
+        self.assertEqual([r['file'] for r in results], [self.top])
+        self.assertTrue(results[0]['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+autowire批量位宽推断测试模块
+"""
+
+import unittest
+import glob
+import sys
+import os
+
+# 添加项目根目录到PATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autowire.core.parser import VerilogParser
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestBatchedWidths(unittest.TestCase):
+    """批量位宽推断测试类"""
+
+    def parse_source(self, source):
+        """解析源代码字符串"""
+        parser = VerilogParser()
+        parser.content = source
+        parser._preprocess()
+        parser._extract_signals()
+        parser._extract_module_info()
+        return parser
+
+    def test_fixtures_match_per_signal_inference(self):
+        """测试样例文件中所有标识符的批量推断结果与逐信号推断一致"""
+        for path in sorted(glob.glob(os.path.join(TESTS_DIR, '*.v'))):
+            parser = VerilogParser()
+            parser.parse_file(path)
+            signals = list(parser.all_signals)
+            self.assertEqual(parser.get_signal_widths(signals, batched=True),
+                             parser.get_signal_widths(signals, batched=False), path)
+
+    def test_slice_and_declaration_widths(self):
+        """测试切片、参数化位宽和端口声明位宽"""
+        parser = self.parse_source(
+            "module m #(parameter W = 8) (input [3:0] port_a, output wire [15:0] port_b);\n"
+            "assign a = x[7:0];\n"
+            "assign b = y[W-1:0] | y[3];\n"
+            "assign c = z[N+:4];\n"
+            "assign d = bus[W];\n"
+            "endmodule\n"
+        )
+        widths = parser.get_signal_widths(['x', 'y', 'z', 'bus', 'port_a', 'port_b', 'a'])
+        self.assertEqual(widths, {
+            'x': '[7:0]', 'y': '[8:0]', 'z': '[N:4]', 'bus': '[8:0]',
+            'port_a': '[3:0]', 'port_b': '[15:0]', 'a': None,
+        })
+        self.assertEqual(widths, parser.get_signal_widths(list(widths), batched=False))
+
+
+if __name__ == '__main__':
+    unittest.main()